@@ -0,0 +1,351 @@
+import os
+import json
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from github import GithubException, RateLimitExceededException
+from rich.console import Console
+
+from cache import repo_cache_dir
+
+try:
+    import fcntl
+except ImportError:  # Windows: the journal is not guarded against a second process
+    fcntl = None
+
+console = Console()
+
+JOURNAL_FILE = "queue.jsonl"
+JOURNAL_LOCK = "queue.lock"
+REPLAY_LOCK = "replay.lock"
+DEFAULT_WORKERS = 4
+# Seconds to wait for a connection to GitHub before a command falls back to the journal
+CONNECT_TIMEOUT = 3.0
+
+# Result of a project field change whose issue is not on the board (nothing to set)
+SKIPPED = "skipped"
+
+# Marker appended to queued comments so a replay can tell whether one already went out
+COMMENT_MARKER = "<!-- gh-skill:{id} -->"
+
+def _coalesce_key(action):
+    """Actions with the same key supersede each other; None means never coalesced."""
+    op, args = action['op'], action['args']
+    if op == "set_labels":
+        return ("labels", args['number'])
+    if op in ("assign", "unassign"):
+        return ("assignee", args['number'], args['login'])
+    if op == "close":
+        return ("close", args['number'])
+    if op == "project_status":
+        return ("field", args['content_id'], "Status")
+    if op == "project_field":
+        return ("field", args['content_id'], args['field'])
+    return None
+
+def coalesce(actions):
+    """Collapse superseded actions, keeping the last one of each key in queue order.
+
+    Returns [(action, [superseded ids])].
+    """
+    last = {}
+    for action in actions:
+        key = _coalesce_key(action)
+        if key is not None:
+            last[key] = action['id']
+
+    result = []
+    superseded = {}
+    for action in actions:
+        key = _coalesce_key(action)
+        if key is not None and last[key] != action['id']:
+            superseded.setdefault(last[key], []).append(action['id'])
+    for action in actions:
+        key = _coalesce_key(action)
+        if key is None or last[key] == action['id']:
+            result.append((action, superseded.get(action['id'], [])))
+    return result
+
+def is_network_error(error):
+    """True for failures worth retrying later (no connection, timeouts, 5xx, rate limits)."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout, RateLimitExceededException)):
+        return True
+    if isinstance(error, GithubException):
+        return error.status is not None and error.status >= 500
+    return error.__cause__ is not None and is_network_error(error.__cause__)
+
+def connect_or_offline(args, connect):
+    """Run connect() -> (g, repo, store) unless --offline; returns (None, None, None) offline.
+
+    The requests made by connect() get a short connect timeout. If GitHub
+    cannot be reached, args.offline is switched on, so the command works
+    from the local snapshot and journals its writes for `gh-skill sync`
+    instead of failing. Other errors propagate.
+    """
+    if not args.offline:
+        from http_cache import connect_timeout
+        try:
+            with connect_timeout(CONNECT_TIMEOUT):
+                return connect()
+        except Exception as e:
+            if not is_network_error(e):
+                raise
+            console.print("[yellow]GitHub is unreachable; working offline, run `gh-skill sync` when back online.[/]")
+            args.offline = True
+    return None, None, None
+
+class ActionQueue:
+    """Append-only, fsync'd journal of GitHub actions waiting to be sent.
+
+    Each line is one JSON record: an action, or a 'started', 'done' or
+    'failed' marker for an action id. Replaying skips done actions, so it
+    can be interrupted and run again safely.
+    """
+
+    def __init__(self, repo_full_name, path=None):
+        self.repo_full_name = repo_full_name
+        self.path = path or repo_cache_dir(repo_full_name) / JOURNAL_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    # --- journal ---
+
+    def _append(self, records):
+        data = "".join(json.dumps(r) + "\n" for r in records)
+        with self._lock, _FileLock(self.path.parent / JOURNAL_LOCK):
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _read(self):
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # A torn last line from a crash mid-append
+                    continue
+        return records
+
+    def _state(self):
+        actions, started, finished = [], set(), set()
+        for record in self._read():
+            kind = record.get('type')
+            if kind == "action":
+                actions.append(record)
+            elif kind == "started":
+                started.add(record['id'])
+            elif kind in ("done", "failed"):
+                finished.add(record['id'])
+        return actions, started, finished
+
+    def enqueue(self, op, **args):
+        """Journal one action and return it."""
+        action = {"type": "action", "id": uuid.uuid4().hex, "op": op, "args": args, "queued_at": time.time()}
+        self._append([action])
+        return action
+
+    def pending(self):
+        """Actions not yet done or failed, in queue order."""
+        actions, _, finished = self._state()
+        return [a for a in actions if a['id'] not in finished]
+
+    def compact(self):
+        """Rewrite the journal with only pending actions (and their started markers)."""
+        with self._lock, _FileLock(self.path.parent / JOURNAL_LOCK):
+            actions, started, finished = self._state()
+            if not finished:
+                return
+            keep = []
+            for action in actions:
+                if action['id'] not in finished:
+                    keep.append(action)
+                    if action['id'] in started:
+                        keep.append({"type": "started", "id": action['id']})
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("".join(json.dumps(r) + "\n" for r in keep))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+
+    # --- replay ---
+
+    def replay(self, g, repo, ids=None, workers=DEFAULT_WORKERS):
+        """Send pending actions (all, or only those in ids).
+
+        Issue actions run in parallel per issue and in order within one issue;
+        project field changes go out as batched mutations per project and field.
+        Stops sending on the first network error. Returns {action id: True,
+        'queued', SKIPPED or error message}.
+        """
+        with _FileLock(self.path.parent / REPLAY_LOCK):
+            actions, started, finished = self._state()
+            pending = [a for a in actions if a['id'] not in finished and (ids is None or a['id'] in ids)]
+            plan = coalesce(pending)
+            results = {a['id']: "queued" for a in pending}
+            offline = threading.Event()
+
+            def run(group):
+                for action, superseded in group:
+                    if offline.is_set():
+                        return
+                    self._append([{"type": "started", "id": action['id']}])
+                    try:
+                        _HANDLERS[action['op']](g, repo, action, action['id'] in started)
+                    except Exception as e:
+                        if is_network_error(e):
+                            offline.set()
+                            return
+                        self._fail(action, superseded, str(e), results)
+                        continue
+                    self._finish(action, superseded, results)
+
+            by_issue, fields = {}, []
+            for action, superseded in plan:
+                if action['op'] in PROJECT_OPS:
+                    fields.append((action, superseded))
+                else:
+                    by_issue.setdefault(action['args']['number'], []).append((action, superseded))
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(run, by_issue.values()))
+
+            if fields and not offline.is_set():
+                try:
+                    self._replay_fields(g, fields, results)
+                except Exception as e:
+                    if not is_network_error(e):
+                        for action, superseded in fields:
+                            if results[action['id']] == "queued":
+                                self._fail(action, superseded, str(e), results)
+
+        self.compact()
+        return results
+
+    def _finish(self, action, superseded, results, outcome=True):
+        self._append([{"type": "done", "id": i} for i in [action['id']] + superseded])
+        for i in [action['id']] + superseded:
+            results[i] = outcome
+
+    def _fail(self, action, superseded, message, results):
+        self._append([{"type": "failed", "id": i, "error": message} for i in [action['id']] + superseded])
+        for i in [action['id']] + superseded:
+            results[i] = message
+
+    def _replay_fields(self, g, fields, results):
+        from bootstrap import ensure_project_v2
+        from project_utils import find_project_item_by_content, set_items_field
+
+        login = g.get_user().login
+        by_project = {}
+        for action, superseded in fields:
+            by_project.setdefault(action['args']['project_title'], []).append((action, superseded))
+
+        for title, group in by_project.items():
+            proj_action = ensure_project_v2(login, title, self.repo_full_name)
+            if proj_action['type'] == 'EXISTS':
+                project_id = proj_action['id']
+            else:
+                project_id = proj_action['action']()['id']
+
+            by_field = {}
+            for action, superseded in group:
+                item_id = find_project_item_by_content(project_id, action['args']['content_id'])
+                if item_id:
+                    field, value = _field_value(action)
+                    by_field.setdefault(field, {})[item_id] = (action, superseded, value)
+                else:
+                    # Not on the board: there is no field to set, which is not an error
+                    self._finish(action, superseded, results, SKIPPED)
+
+            for field, items in by_field.items():
+                outcome = set_items_field(project_id, field, [(i, value) for i, (_, _, value) in items.items()])
+                for item_id, (action, superseded, _) in items.items():
+                    if outcome.get(item_id) is True:
+                        self._finish(action, superseded, results)
+                    else:
+                        self._fail(action, superseded, outcome.get(item_id) or "Not updated.", results)
+
+class _FileLock:
+    """Exclusive inter-process lock held on a side file (no-op without fcntl)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        if fcntl is not None:
+            self.file = open(self.path, "w")
+            fcntl.flock(self.file, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if self.file is not None:
+            fcntl.flock(self.file, fcntl.LOCK_UN)
+            self.file.close()
+
+# --- handlers (each must be safe to run twice) ---
+
+def _comment(g, repo, action, retried):
+    issue = repo.get_issue(action['args']['number'])
+    marker = COMMENT_MARKER.format(id=action['id'])
+    # Only a retry after an interrupted attempt can have posted it already
+    if retried and any(marker in (c.body or "") for c in issue.get_comments()):
+        return
+    issue.create_comment(f"{action['args']['body']}\n\n{marker}")
+
+def _close(g, repo, action, retried):
+    reason = action['args'].get('reason')
+    if reason:
+        repo.get_issue(action['args']['number']).edit(state='closed', state_reason=reason)
+    else:
+        repo.get_issue(action['args']['number']).edit(state='closed')
+
+def _set_labels(g, repo, action, retried):
+    repo.get_issue(action['args']['number']).edit(labels=action['args']['labels'])
+
+def _assign(g, repo, action, retried):
+    repo.get_issue(action['args']['number']).add_to_assignees(action['args']['login'])
+
+def _unassign(g, repo, action, retried):
+    repo.get_issue(action['args']['number']).remove_from_assignees(action['args']['login'])
+
+# Project single-select changes, batched per project and field instead of run per issue
+PROJECT_OPS = ("project_status", "project_field")
+
+def _field_value(action):
+    args = action['args']
+    if action['op'] == "project_status":
+        return "Status", args['status']
+    return args['field'], args['value']
+
+_HANDLERS = {
+    "comment": _comment,
+    "close": _close,
+    "set_labels": _set_labels,
+    "assign": _assign,
+    "unassign": _unassign,
+}
+
+def submit(queue, actions, g=None, repo=None, offline=False, store=None, workers=DEFAULT_WORKERS):
+    """Send just-journaled actions now, leaving them queued if offline or unreachable.
+
+    Returns {action id: True, 'queued' or error message}. Issues touched by
+    sent actions are refreshed in the local mirror.
+    """
+    if offline or g is None:
+        return {a['id']: "queued" for a in actions}
+    results = queue.replay(g, repo, ids={a['id'] for a in actions}, workers=workers)
+    if store is not None:
+        sent = {a['args']['number'] for a in actions if 'number' in a['args'] and results.get(a['id']) is True}
+        for number in sent:
+            store.upsert_issue(repo.get_issue(number))
+    return results
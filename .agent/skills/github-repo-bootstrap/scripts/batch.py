@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Batch executor
+Runs many operations from NDJSON on stdin through one GitHub client.
+
+Each input line is an object like {"op": "close-issue", "number": 12}. Operations
+on the same issue or PR run in input order; different numbers run in parallel.
+One NDJSON result per operation is written to stdout as soon as it finishes,
+and a throughput summary goes to stderr.
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils import load_config, get_github_client, get_current_repo, add_input_flags
+
+DEFAULT_WORKERS = 8
+
+class Batch:
+    """Shared state for one batch run: client, repo, project ID and fetched issues."""
+
+    def __init__(self, g, repo):
+        self.g = g
+        self.repo = repo
+        self._lock = threading.Lock()
+        self._project_id = None
+
+    def issue(self, cache, number):
+        # Ops on one number run in a single worker, so each issue is fetched once
+        if number not in cache:
+            cache[number] = self.repo.get_issue(number)
+        return cache[number]
+
+    def project_id(self):
+        with self._lock:
+            if self._project_id is None:
+                from bootstrap import ensure_project_v2
+                proj_conf = load_config().get('projects_v2', {})
+                title = proj_conf.get('title') or self.repo.name
+                proj_action = ensure_project_v2(self.g.get_user().login, title, self.repo.full_name)
+                if proj_action['type'] == 'EXISTS':
+                    self._project_id = proj_action['id']
+                else:
+                    self._project_id = proj_action['action']()['id']
+            return self._project_id
+
+# --- operations: (batch, op, issue cache) -> JSON-serialisable result ---
+
+def _create_issue(batch, op, cache):
+    issue = batch.repo.create_issue(title=op['title'], body=op.get('body', ""), labels=op.get('labels', []))
+    cache[issue.number] = issue
+    return {"number": issue.number, "url": issue.html_url}
+
+def _comment(batch, op, cache):
+    comment = batch.issue(cache, op['number']).create_comment(op['body'])
+    return {"url": comment.html_url}
+
+def _close_issue(batch, op, cache):
+    issue = batch.issue(cache, op['number'])
+    if op.get('comment'):
+        issue.create_comment(op['comment'])
+    issue.edit(state='closed')
+    return {"number": issue.number, "state": "closed"}
+
+def _set_labels(batch, op, cache):
+    batch.issue(cache, op['number']).edit(labels=op['labels'])
+    return {"labels": op['labels']}
+
+def _assign(batch, op, cache):
+    batch.issue(cache, op['number']).add_to_assignees(*_logins(op))
+    return {"assignees": _logins(op)}
+
+def _unassign(batch, op, cache):
+    batch.issue(cache, op['number']).remove_from_assignees(*_logins(op))
+    return {"unassigned": _logins(op)}
+
+def _set_status(batch, op, cache):
+    from project_utils import find_project_item_by_content, add_item_to_project, set_items_status
+    project_id = batch.project_id()
+    content_id = batch.issue(cache, op['number']).raw_data['node_id']
+    item_id = find_project_item_by_content(project_id, content_id) or add_item_to_project(project_id, content_id)
+    outcome = set_items_status(project_id, [(item_id, op['status'])]).get(item_id)
+    if outcome is not True:
+        raise RuntimeError(outcome or "Status not updated.")
+    return {"status": op['status']}
+
+def _review_pr(batch, op, cache):
+    pr = batch.repo.get_pull(op['number'])
+    pr.create_review(body=op.get('body', ""), event=op.get('event', "COMMENT"))
+    return {"event": op.get('event', "COMMENT")}
+
+def _merge_pr(batch, op, cache):
+    status = batch.repo.get_pull(op['number']).merge(merge_method=op.get('method', "merge"))
+    return {"merged": status.merged, "sha": status.sha}
+
+def _logins(op):
+    return op['logins'] if 'logins' in op else [op['login']]
+
+OPS = {
+    "create-issue": _create_issue,
+    "comment": _comment,
+    "close-issue": _close_issue,
+    "set-labels": _set_labels,
+    "assign": _assign,
+    "unassign": _unassign,
+    "set-status": _set_status,
+    "review-pr": _review_pr,
+    "merge-pr": _merge_pr,
+}
+
+def parse_ops(lines):
+    """Parse NDJSON lines into (index, op) pairs; bad lines become error results."""
+    ops, errors = [], []
+    for index, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            op = json.loads(line)
+        except ValueError as e:
+            errors.append({"index": index, "ok": False, "error": f"Invalid JSON: {e}"})
+            continue
+        if not isinstance(op, dict) or op.get('op') not in OPS:
+            name = op.get('op') if isinstance(op, dict) else None
+            errors.append({"index": index, "op": name, "ok": False, "error": f"Unknown op {name!r}."})
+            continue
+        ops.append((index, op))
+    return ops, errors
+
+def group_ops(ops):
+    """Ops on the same number keep their order; ops without one run on their own."""
+    groups = {}
+    for index, op in ops:
+        key = op['number'] if 'number' in op else ("index", index)
+        groups.setdefault(key, []).append((index, op))
+    return list(groups.values())
+
+def run_batch(batch, ops, emit, workers=DEFAULT_WORKERS):
+    """Execute ops, calling emit(result) as each one finishes. Returns the failure count."""
+    failed = 0
+    emit_lock = threading.Lock()
+
+    def run(group):
+        nonlocal failed
+        cache = {}
+        for index, op in group:
+            result = {"index": index, "op": op['op']}
+            if 'id' in op:
+                result['id'] = op['id']
+            try:
+                result.update(ok=True, result=OPS[op['op']](batch, op, cache))
+            except KeyError as e:
+                result.update(ok=False, error=f"Missing field {e}.")
+            except Exception as e:
+                result.update(ok=False, error=str(e))
+            with emit_lock:
+                failed += not result['ok']
+                emit(result)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed([pool.submit(run, group) for group in group_ops(ops)]):
+            future.result()
+    return failed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run NDJSON operations from stdin through one client")
+    parser.add_argument("--workers", type=int, help="Issues/PRs worked on in parallel")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = args.workers or load_config().get('batch', {}).get('workers', DEFAULT_WORKERS)
+
+    def emit(result):
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+    ops, errors = parse_ops(sys.stdin)
+    for error in errors:
+        emit(error)
+
+    start = time.monotonic()
+    failed = len(errors)
+    if ops:
+        try:
+            g = get_github_client()
+            batch = Batch(g, get_current_repo(g, raise_error=True))
+        except Exception as e:
+            print(f"batch: failed to initialize GitHub client: {e}", file=sys.stderr)
+            sys.exit(1)
+        failed += run_batch(batch, ops, emit, workers)
+    elapsed = time.monotonic() - start
+
+    total = len(ops) + len(errors)
+    rate = len(ops) / elapsed if elapsed > 0 else 0.0
+    print(f"batch: {total} op(s), {failed} failed, {elapsed:.2f}s ({rate:.1f} ops/s, {workers} workers)",
+          file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
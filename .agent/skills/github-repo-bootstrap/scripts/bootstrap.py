@@ -4,111 +4,208 @@ import os
 import subprocess
 import requests
 import json
+import time
+import hashlib
+import argparse
 import questionary
+from concurrent.futures import ThreadPoolExecutor
+from github import RateLimitExceededException
 from rich.console import Console
 from rich.table import Table
 from rich.progress import track
 
-from utils import load_config, get_github_client, get_current_repo, RepositoryNotFoundError
+from utils import load_config, get_github_client, get_current_repo, RepositoryNotFoundError, add_input_flags, ask
+from graphql_client import gql_request
+from cache import project_cache, project_key, DEFAULT_TTL
+from project_utils import invalidate_project_schema
 
 console = Console()
 config = load_config()
 
-def sync_labels(repo, intended_labels):
-    """Create or update labels."""
-    existing = {l.name: l for l in repo.get_labels()}
-    
+# Colors for configured labels that only give a name
+DEFAULT_LABEL_COLORS = {
+    "type:bug": "d73a4a",
+    "type:feature": "a2eeef",
+    "type:refactor": "cfd3d7",
+    "type:docs": "0075ca",
+    "p0": "b60205",
+    "p1": "ff9f1c",
+    "p2": "f9c74f"
+}
+FALLBACK_LABEL_COLOR = "ededed"
+LABEL_WORKERS = 4
+
+def desired_labels(intended_labels):
+    """Flatten the labels config into {name: {"color", "description"}}.
+
+    Entries are label names or {name, color, description} mappings. A missing
+    color falls back to DEFAULT_LABEL_COLORS (or None: never changed on an
+    existing label); a missing description leaves the existing one alone.
+    """
+    desired = {}
+    for items in (intended_labels or {}).values():
+        for item in items or []:
+            if isinstance(item, str):
+                item = {"name": item}
+            color = item.get('color') or DEFAULT_LABEL_COLORS.get(item['name'])
+            desired[item['name']] = {
+                "color": str(color).lstrip('#').lower() if color else None,
+                "description": item.get('description'),
+            }
+    return desired
+
+def diff_labels(existing, desired, prune=False):
+    """Compare existing labels with the desired ones.
+
+    existing: {name: {"color", "description"}} as on GitHub. Names match
+    case-insensitively, like GitHub does. Returns (type, name, changes) tuples
+    for CREATE, UPDATE and, with prune, DELETE.
+    """
+    by_lower = {name.lower(): name for name in existing}
+    changes = []
+    for name, want in desired.items():
+        current_name = by_lower.get(name.lower())
+        if current_name is None:
+            changes.append(("CREATE", name, {"color": want['color'] or FALLBACK_LABEL_COLOR,
+                                             "description": want['description'] or ""}))
+            continue
+        have = existing[current_name]
+        diff = {}
+        if current_name != name:
+            diff['name'] = name
+        if want['color'] and want['color'] != (have['color'] or "").lower():
+            diff['color'] = want['color']
+        if want['description'] is not None and want['description'] != (have['description'] or ""):
+            diff['description'] = want['description']
+        if diff:
+            changes.append(("UPDATE", current_name, diff))
+    if prune:
+        wanted = {name.lower() for name in desired}
+        changes.extend(("DELETE", name, {}) for name in existing if name.lower() not in wanted)
+    return changes
+
+def _label_action(repo, get_label, kind, name, diff):
+    if kind == "CREATE":
+        return lambda: repo.create_label(name=name, color=diff['color'], description=diff['description'])
+    if kind == "DELETE":
+        return lambda: get_label(name).delete()
+
+    def update():
+        label = get_label(name)
+        kwargs = {"description": diff['description']} if 'description' in diff else {}
+        label.edit(diff.get('name', name), diff.get('color', label.color), **kwargs)
+    return update
+
+def sync_labels(repo, intended_labels, prune=False, existing=None):
+    """Plan label creates, updates (color/description/case) and optional deletes.
+
+    Without existing, the labels are fetched once and each action makes one
+    API call. existing ({name: {"color", "description"}}, e.g. from the
+    bootstrap state query) skips the fetch; updates and deletes then read
+    their label when applied, one extra call each.
+    """
+    if existing is None:
+        labels = {l.name: l for l in repo.get_labels()}
+        existing = {name: {"color": l.color, "description": l.description} for name, l in labels.items()}
+        get_label, lookup = labels.__getitem__, 0
+    else:
+        get_label, lookup = repo.get_label, 1
     actions = []
-    
-    for name, color_desc in intended_labels.items():
-        # In config, we have list of strings "type:bug", or dict? 
-        # Config structure in yaml is: labels: type: ["type:bug", ...]
-        # Let's simplify: flattened list of objects needed.
-        pass
-
-    # Re-reading config structure:
-    # labels:
-    #   type: ["type:bug", ...]
-    #   priority: ["p0", ...]
-    
-    # We'll map them to colors for now (defaults)
-    COLORS = {
-        "type:bug": "d73a4a",
-        "type:feature": "a2eeef",
-        "type:refactor": "cfd3d7",
-        "type:docs": "0075ca",
-        "p0": "b60205",
-        "p1": "ff9f1c",
-        "p2": "f9c74f"
-    }
-    
-    flattened = []
-    for cat, items in intended_labels.items():
-        for item in items:
-            flattened.append((item, COLORS.get(item, "ededed")))
-            
-    for name, color in flattened:
-        if name not in existing:
-            action = lambda n=name, c=color: repo.create_label(name=n, color=c)
-            actions.append({"name": name, "type": "CREATE", "action": action})
-        else:
-            # Check color match? Optional. For now just create missing.
-            pass
-            
+    for kind, name, diff in diff_labels(existing, desired_labels(intended_labels), prune):
+        detail = ", ".join(f"{k} → {v}" if k != 'description' else k for k, v in diff.items())
+        actions.append({"name": name, "type": kind, "detail": detail if kind == "UPDATE" else "",
+                        "calls": 1 + (lookup if kind != "CREATE" else 0),
+                        "action": _label_action(repo, get_label, kind, name, diff)})
     return actions
 
-def gql_request(query, variables=None):
-    # Use gh api to avoid requests/token issues
-    import subprocess
-    import json
-    
-    input_data = {'query': query, 'variables': variables or {}}
-    input_json = json.dumps(input_data)
-    
-    try:
-        # gh api graphql --input -
-        # We need to ensure we run it in a way that captures output
-        res = subprocess.run(
-            ["gh", "api", "graphql", "--input", "-"],
-            input=input_json,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        data = json.loads(res.stdout)
-        
-        if 'errors' in data:
-            raise Exception(f"GraphQL Error: {json.dumps(data['errors'], indent=2)}")
-        if 'data' not in data:
-             raise Exception(f"GraphQL Response missing data: {json.dumps(data, indent=2)}")
-        return data
-        
-    except subprocess.CalledProcessError as e:
-        raise Exception(f"Query failed: {e.stderr}")
-    except Exception as e:
-        raise Exception(f"GraphQL invocation failed: {e}")
-
-def ensure_project_v2(user_login, project_title):
-    # 1. Find user node ID
-    # 1. Find user node ID
-    q_user = """
-    query($login: String!, $title: String!) {
-      user(login: $login) {
-        id
-        projectsV2(first: 20, query: $title) {
-          nodes { id title url closed }
+def apply_label_actions(actions, workers=LABEL_WORKERS, log=console.print):
+    """Run label actions on a bounded pool; raises after all ran if any failed."""
+    if not actions:
+        return
+    verbs = {"CREATE": "Created", "UPDATE": "Updated", "DELETE": "Deleted"}
+    failed = []
+
+    def run(a):
+        try:
+            a['action']()
+            log(f"{verbs[a['type']]} label {a['name']}")
+        except Exception as e:
+            failed.append(f"{a['name']}: {e}")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(run, actions))
+    if failed:
+        raise RuntimeError(f"{len(failed)} label change(s) failed: " + "; ".join(failed))
+
+def _project_cache(repo_full_name):
+    cache_conf = config.get('cache', {})
+    if not repo_full_name or not cache_conf.get('enabled', True):
+        return None
+    return project_cache(repo_full_name, cache_conf.get('ttl_seconds', DEFAULT_TTL))
+
+def ensure_project_v2(user_login, project_title, repo_full_name=None, refresh=False):
+    """Find or plan creation of a user-level project.
+
+    When repo_full_name is given, the project node ID, URL and repository node
+    ID are cached on disk so warm runs skip the projectsV2 lookup. Pass
+    refresh=True to bypass the cached entry (the result is still stored).
+    """
+    cache = _project_cache(repo_full_name)
+    key = project_key(user_login, project_title)
+    if cache and not refresh:
+        cached = cache.get(key)
+        if cached:
+            return {"name": project_title, "type": "EXISTS", "id": cached['id'], "url": cached['url'],
+                    "closed": cached.get('closed', False), "repo_id": cached.get('repo_id'),
+                    "cached": True, "action": lambda: cached['url']}
+
+    if repo_full_name:
+        owner, name = repo_full_name.split('/')
+        q_user = """
+        query($login: String!, $title: String!, $owner: String!, $name: String!) {
+          user(login: $login) {
+            id
+            projectsV2(first: 20, query: $title) {
+              nodes { id title url closed }
+            }
+          }
+          repository(owner: $owner, name: $name) { id }
         }
-      }
-    }
+        """
+        res = gql_request(q_user, {"login": user_login, "title": project_title, "owner": owner, "name": name})
+        repo_id = res['data']['repository']['id']
+    else:
+        q_user = """
+        query($login: String!, $title: String!) {
+          user(login: $login) {
+            id
+            projectsV2(first: 20, query: $title) {
+              nodes { id title url closed }
+            }
+          }
+        }
+        """
+        res = gql_request(q_user, {"login": user_login, "title": project_title})
+        repo_id = None
+    return _project_action(project_title, res['data']['user'], repo_id, cache, key)
+
+def _project_action(project_title, user, repo_id, cache=None, key=None):
+    """EXISTS/CREATE action from a user node with its projectsV2 nodes.
+
+    Field nodes queried along with the project are passed on as "fields".
     """
-    res = gql_request(q_user, {"login": user_login, "title": project_title})
-    user_id = res['data']['user']['id']
-    existing = res['data']['user']['projectsV2']['nodes']
+    user_id = user['id']
+    existing = user['projectsV2']['nodes']
     
     target = next((p for p in existing if p['title'] == project_title), None)
     
     if target:
-        return {"name": project_title, "type": "EXISTS", "id": target['id'], "url": target['url'], "closed": target['closed'], "action": lambda: target['url']}
+        if cache:
+            cache.set(key, {"id": target['id'], "url": target['url'], "closed": target['closed'], "repo_id": repo_id})
+        proj_action = {"name": project_title, "type": "EXISTS", "id": target['id'], "url": target['url'], "closed": target['closed'], "repo_id": repo_id, "action": lambda: target['url']}
+        if 'fields' in target:
+            proj_action['fields'] = target['fields']['nodes']
+        return proj_action
     else:
         # Create action
         def create():
@@ -121,11 +218,18 @@ def ensure_project_v2(user_login, project_title):
             """
             r = gql_request(q_create, {"ownerId": user_id, "title": project_title})
             project_data = r['data']['createProjectV2']['projectV2']
+            if cache:
+                cache.set(key, {"id": project_data['id'], "url": project_data['url'], "closed": False, "repo_id": repo_id})
             return {"id": project_data['id'], "url": project_data['url']}
             
-        return {"name": project_title, "type": "CREATE", "action": create}
+        return {"name": project_title, "type": "CREATE", "repo_id": repo_id, "action": create}
 
 def get_repo_id(owner, name):
+    cache = _project_cache(f"{owner}/{name}")
+    if cache:
+        cached = cache.get("repository")
+        if cached:
+            return cached['id']
     q = """
     query($owner: String!, $name: String!) {
       repository(owner: $owner, name: $name) {
@@ -134,9 +238,13 @@ def get_repo_id(owner, name):
     }
     """
     res = gql_request(q, {"owner": owner, "name": name})
-    return res['data']['repository']['id']
+    repo_id = res['data']['repository']['id']
+    if cache:
+        cache.set("repository", {"id": repo_id})
+    return repo_id
 
 def link_project_to_repo(project_id, repo_id):
+    """True if the project was linked, False if it already was; other errors propagate."""
     q = """
     mutation($projectId: ID!, $repositoryId: ID!) {
       linkProjectV2ToRepository(input: {projectId: $projectId, repositoryId: $repositoryId}) {
@@ -150,24 +258,24 @@ def link_project_to_repo(project_id, repo_id):
     except Exception as e:
         if "already linked" in str(e).lower():
             return False
-        # Ignore other errors for now? Or warn?
-        console.print(f"[yellow]Warning: Failed to link project: {e}[/]")
-        return False
+        raise
+
+PROJECT_FIELDS_FRAGMENT = """
+fields(first: 20) {
+  nodes {
+    ... on ProjectV2Field { id name dataType }
+    ... on ProjectV2SingleSelectField { id name dataType options { id name } }
+  }
+}
+"""
 
 def get_project_fields(project_id):
-    q = """
-    query($projectId: ID!) {
-      node(id: $projectId) {
-        ... on ProjectV2 {
-          fields(first: 20) {
-            nodes {
-              ... on ProjectV2Field { id name dataType }
-              ... on ProjectV2SingleSelectField { id name dataType options { id name } }
-            }
-          }
-        }
-      }
-    }
+    q = f"""
+    query($projectId: ID!) {{
+      node(id: $projectId) {{
+        ... on ProjectV2 {{ {PROJECT_FIELDS_FRAGMENT} }}
+      }}
+    }}
     """
     res = gql_request(q, {"projectId": project_id})
     return res['data']['node']['fields']['nodes']
@@ -241,7 +349,363 @@ def update_single_select_field(field_node, desired_options):
         console.print(f"[red]Failed to update field {field_node['name']}: {e}[/]")
         return False
 
-def main():
+TEMPLATE_COMMIT_MESSAGE = "chore: sync issue and PR templates"
+
+def git_blob_sha(data):
+    """The SHA git (and GitHub) gives a file with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+def local_templates():
+    """{destination path: content} for the bundled issue/PR templates."""
+    from pathlib import Path
+    templates = {}
+    script_dir = Path(__file__).parent
+    assets_dir = script_dir.parent / "assets" / "templates"
+    
+    if assets_dir.exists():
+        for template_file in sorted(assets_dir.glob("*.md")):
+            dest_path = f".github/ISSUE_TEMPLATE/{template_file.name}"
+            if "PULL_REQUEST" in template_file.name:
+                dest_path = ".github/PULL_REQUEST_TEMPLATE.md"
+            templates[dest_path] = template_file.read_bytes().decode("utf-8")
+    return templates
+
+def remote_blob_shas(repo, paths):
+    """{path: blob SHA} on the default branch, listing each parent directory once."""
+    from github import GithubException
+    shas = {}
+    for directory in sorted({p.rsplit('/', 1)[0] for p in paths}):
+        try:
+            entries = repo.get_contents(directory, ref=repo.default_branch)
+        except GithubException as e:
+            # Missing directory, or an empty repository
+            if e.status in (404, 409):
+                continue
+            raise
+        for entry in entries if isinstance(entries, list) else [entries]:
+            shas[entry.path] = entry.sha
+    return shas
+
+def plan_templates(repo, remote=None, templates=None):
+    """CREATE/UPDATE entries for templates whose content differs from the default branch.
+
+    remote ({path: blob SHA}) and templates default to remote_blob_shas and local_templates.
+    """
+    templates = local_templates() if templates is None else templates
+    remote = remote_blob_shas(repo, templates) if remote is None else remote
+    actions = []
+    for path, content in templates.items():
+        if remote.get(path) == git_blob_sha(content.encode("utf-8")):
+            continue
+        actions.append({"name": path, "type": "UPDATE" if path in remote else "CREATE", "content": content})
+    return actions
+
+def commit_templates(repo, actions, message=TEMPLATE_COMMIT_MESSAGE):
+    """Write every changed template in one commit on the default branch.
+
+    Builds one tree on top of the branch head and fast-forwards the branch to
+    a new commit (create-tree, create-commit, update-ref). The update fails
+    rather than overwriting if the branch moved since its head was read.
+    Returns the new commit SHA, or None for an empty repository, where the Git
+    Data API is unavailable and the files are created one by one instead.
+    """
+    from github import GithubException, InputGitTreeElement
+    if not actions:
+        return None
+    branch = repo.default_branch
+    try:
+        ref = repo.get_git_ref(f"heads/{branch}")
+    except GithubException as e:
+        if e.status not in (404, 409):
+            raise
+        for a in actions:
+            repo.create_file(a['name'], message, a['content'], branch=branch)
+        return None
+    head = repo.get_git_commit(ref.object.sha)
+    elements = [InputGitTreeElement(a['name'], "100644", "blob", content=a['content']) for a in actions]
+    tree = repo.create_git_tree(elements, base_tree=head.tree)
+    commit = repo.create_git_commit(message, tree, [head])
+    ref.edit(commit.sha)
+    return commit.sha
+
+class ProjectQueryError(Exception):
+    """Raised when the Projects v2 lookup fails while projects are enabled."""
+    pass
+
+class ProjectSetupError(Exception):
+    """Raised by apply_plan when linking or configuring the project failed."""
+    pass
+
+LABEL_PAGE_SIZE = 100
+
+LABELS_PAGE_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    labels(first: $first, after: $after) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name color description }
+    }
+  }
+}
+"""
+
+def bootstrap_state_query(template_count):
+    """Composite query for everything build_plan reads; $t0..$tN are "HEAD:<path>" expressions."""
+    blob_vars = "".join(f", $t{i}: String!" for i in range(template_count))
+    blobs = "\n        ".join(f"t{i}: object(expression: $t{i}) {{ ... on Blob {{ oid }} }}" for i in range(template_count))
+    return f"""
+    query($owner: String!, $name: String!, $login: String!, $title: String!, $withProject: Boolean!, $first: Int!{blob_vars}) {{
+      repository(owner: $owner, name: $name) {{
+        id
+        labels(first: $first) {{
+          pageInfo {{ hasNextPage endCursor }}
+          nodes {{ name color description }}
+        }}
+        {blobs}
+      }}
+      user(login: $login) @include(if: $withProject) {{
+        id
+        projectsV2(first: 20, query: $title) {{
+          nodes {{ id title url closed {PROJECT_FIELDS_FRAGMENT} }}
+        }}
+      }}
+    }}
+    """
+
+def fetch_bootstrap_state(repo_full_name, user_login, template_paths, project_title=None, page_size=LABEL_PAGE_SIZE):
+    """Read labels, template blob SHAs, the repository ID and (with project_title)
+    the user's matching projects with their fields in one GraphQL request.
+
+    Only repositories with more than page_size labels cost extra requests, one
+    per further page. Returns {"repo_id", "labels", "blobs", "user", "requests"};
+    "blobs" maps each path present on the default branch to its blob SHA.
+    Raises ProjectQueryError when only the project part of the query failed.
+    """
+    from graphql_client import GraphQLError
+    owner, name = repo_full_name.split('/')
+    paths = list(template_paths)
+    variables = {"owner": owner, "name": name, "login": user_login, "title": project_title or "",
+                 "withProject": bool(project_title), "first": page_size}
+    variables.update({f"t{i}": f"HEAD:{path}" for i, path in enumerate(paths)})
+    res = gql_request(bootstrap_state_query(len(paths)), variables, allow_partial=True)
+
+    # Without the 'project' scope only the user part fails; keep that distinguishable
+    errors = res.get('errors') or []
+    project_errors = [e for e in errors if (e.get('path') or [None])[0] == "user"]
+    if len(project_errors) < len(errors) or not res['data'].get('repository'):
+        raise GraphQLError(f"GraphQL Error: {json.dumps(errors, indent=2)}", errors)
+    if project_errors:
+        raise ProjectQueryError("; ".join(e.get('message', "") for e in project_errors))
+
+    repository = res['data']['repository']
+    requests_made = 1
+    labels = {}
+    conn = repository['labels']
+    while True:
+        labels.update({l['name']: {"color": l['color'], "description": l['description']} for l in conn['nodes']})
+        if not conn['pageInfo']['hasNextPage']:
+            break
+        page = gql_request(LABELS_PAGE_QUERY, {"owner": owner, "name": name, "first": page_size,
+                                               "after": conn['pageInfo']['endCursor']})
+        requests_made += 1
+        conn = page['data']['repository']['labels']
+
+    blobs = {path: repository[f"t{i}"]['oid'] for i, path in enumerate(paths) if repository.get(f"t{i}")}
+    return {"repo_id": repository['id'], "labels": labels, "blobs": blobs,
+            "user": res['data'].get('user'), "requests": requests_made}
+
+PLAN_STEPS = ("query", "diff")
+
+def build_plan(repo, user_login, conf=None):
+    """Plan labels, templates and the project for one repository (read-only).
+
+    Everything is read by fetch_bootstrap_state, so checking an already
+    compliant repository costs one request. plan["timings"] holds the seconds
+    spent in each step plus the total; plan["requests"] the requests made.
+    """
+    conf = config if conf is None else conf
+    plan = {"repo": repo, "labels": [], "templates": [], "project": None, "fields": None, "timings": {}}
+    timings = plan["timings"]
+    label_conf = conf.get('label_sync', {})
+    proj_config = conf.get('projects_v2', {})
+    # Use repository name if title is not specified
+    project_title = (proj_config.get('title') or repo.name) if proj_config.get('enabled') else None
+    templates = local_templates()
+    repo_file = conf.get('drift', {}).get('repo_file')
+    if repo_file:
+        # Committed with the templates so `--check` can tell which config was applied
+        from drift import desired_fingerprint, fingerprint_file
+        templates[repo_file] = fingerprint_file(desired_fingerprint(conf, repo.full_name, templates))
+
+    start = time.monotonic()
+    state = fetch_bootstrap_state(repo.full_name, user_login, templates, project_title)
+    timings["query"] = time.monotonic() - start
+    plan["requests"] = state["requests"]
+
+    diff_start = time.monotonic()
+    plan["labels"] = sync_labels(repo, conf.get('labels', {}), prune=label_conf.get('prune', False),
+                                 existing=state["labels"])
+    plan["templates"] = plan_templates(repo, state["blobs"], templates)
+    if project_title:
+        plan["project"] = _project_action(project_title, state["user"], state["repo_id"],
+                                          _project_cache(repo.full_name), project_key(user_login, project_title))
+        plan["fields"] = plan["project"].get('fields')
+    timings["diff"] = time.monotonic() - diff_start
+    timings["total"] = time.monotonic() - start
+    return plan
+
+def plan_is_empty(plan):
+    proj_action = plan["project"]
+    return not plan["labels"] and not plan["templates"] and (not proj_action or proj_action['type'] == "EXISTS")
+
+def plan_calls(plan):
+    """Rough number of API requests apply_plan will make."""
+    calls = sum(a.get('calls', 1) for a in plan["labels"])
+    if plan["templates"]:
+        calls += 5  # get ref, get commit, create tree, create commit, update ref
+    if plan["project"]:
+        # link, Status and Priority updates (+ the create mutation and fields query)
+        calls += 3 + 2 * (plan["project"]['type'] == "CREATE")
+    return calls
+
+def print_plan(plan):
+    table = Table(title="Bootstrap Plan")
+    table.add_column("Category")
+    table.add_column("Item")
+    table.add_column("Action", style="bold")
+    
+    label_styles = {"CREATE": "green", "UPDATE": "yellow", "DELETE": "red"}
+    for a in plan["labels"]:
+        detail = f" [dim]({a['detail']})[/]" if a.get('detail') else ""
+        table.add_row("Label", a['name'], f"[{label_styles.get(a['type'], 'green')}]{a['type']}[/]{detail}")
+        
+    for a in plan["templates"]:
+         style = "green" if a['type'] == "CREATE" else "yellow"
+         table.add_row("File", a['name'], f"[{style}]{a['type']}[/]")
+        
+    proj_action = plan["project"]
+    if proj_action:
+        style = "green" if proj_action['type'] == "CREATE" else "dim"
+        table.add_row("Project", proj_action['name'], f"[{style}]{proj_action['type']}[/]")
+    
+    counts = {kind: sum(a['type'] == kind for a in plan["labels"]) for kind in ("CREATE", "UPDATE", "DELETE")}
+    table.caption = (f"Labels: {counts['CREATE']} create, {counts['UPDATE']} update, {counts['DELETE']} delete · "
+                     f"expected API calls: {plan_calls(plan)}")
+    console.print(table)
+
+def print_plan_timings(plan):
+    """One line with the time spent in each planning step."""
+    timings = plan.get("timings") or {}
+    steps = " · ".join(f"{step} {timings[step]:.2f}s" for step in PLAN_STEPS if step in timings)
+    if steps:
+        requests_made = plan.get("requests", 0)
+        console.print(f"[dim]Planned in {timings.get('total', 0.0):.2f}s with {requests_made} "
+                      f"request{'s' if requests_made != 1 else ''} ({steps})[/]")
+
+def apply_plan(plan, conf=None, log=console.print):
+    """Apply a plan from build_plan; returns the project URL (or None).
+
+    log receives one line per change, so callers running several plans at
+    once can collect or silence the output. Raises ProjectSetupError after
+    the other steps if the project could not be linked or configured.
+    """
+    conf = config if conf is None else conf
+    repo = plan["repo"]
+    proj_config = conf.get('projects_v2', {})
+    proj_action = plan["project"]
+    project_url = None
+    project_id = None
+    failures = []
+    
+    # Labels
+    apply_label_actions(plan["labels"], conf.get('label_sync', {}).get('workers', LABEL_WORKERS), log)
+    
+    # Templates, all in one commit
+    sha = commit_templates(repo, plan["templates"])
+    for a in plan["templates"]:
+        log(f"{'Created' if a['type'] == 'CREATE' else 'Updated'} {a['name']}" + (f" ({sha[:7]})" if sha else ""))
+    
+    # Project
+    if proj_action:
+        result = proj_action['action']()
+        # Handle both string (EXISTS) and dict (CREATE) return types
+        if isinstance(result, dict):
+            project_id = result['id']
+            project_url = result['url']
+        else:
+            project_id = proj_action.get('id')
+            project_url = result
+    
+    # Link and Configure
+    if project_id:
+        try:
+            owner, name = repo.full_name.split('/')
+            repo_node_id = proj_action.get('repo_id') or get_repo_id(owner, name)
+            if link_project_to_repo(project_id, repo_node_id):
+                log(f"Linked project to {repo.full_name}")
+            
+            # Configure Fields
+            log("Configuring project fields...")
+            fields = plan.get("fields") or get_project_fields(project_id)
+            
+            # Status
+            status_field = next((f for f in fields if f['name'] == "Status"), None)
+            desired_status = proj_config.get('fields', {}).get('status', [])
+            if status_field and desired_status:
+                if update_single_select_field(status_field, desired_status):
+                    log("Updated Status options")
+                else:
+                    failures.append("update Status options")
+            
+            # Priority
+            priority_field = next((f for f in fields if f['name'] == "Priority"), None)
+            desired_priority = proj_config.get('fields', {}).get('priority', [])
+            if not priority_field and desired_priority:
+                if create_single_select_field(project_id, "Priority", desired_priority):
+                    log("Created Priority field")
+                else:
+                    failures.append("create Priority field")
+            elif priority_field and desired_priority:
+                if update_single_select_field(priority_field, desired_priority):
+                    log("Updated Priority options")
+                else:
+                    failures.append("update Priority options")
+
+            # Option IDs may have changed; let status updates re-read the schema
+            invalidate_project_schema(project_id)
+
+        except Exception as e:
+            log(f"[red]Failed to link/configure project: {e}[/]")
+            failures.append(f"link/configure project: {e}")
+    if failures:
+        raise ProjectSetupError(f"Project {project_url or project_id} set up incompletely: " + "; ".join(failures))
+    return project_url
+
+def label_overrides(conf, args):
+    """Config with the command-line label options applied."""
+    if not args.prune_labels:
+        return conf
+    return {**conf, "label_sync": {**conf.get('label_sync', {}), "prune": True}}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bootstrap labels, templates and the project board")
+    parser.add_argument("--dry-run", action="store_true", help="Show the plan without applying it")
+    parser.add_argument("--create-repo", metavar="NAME", help="Create the GitHub repository if none is detected")
+    parser.add_argument("--visibility", choices=["public", "private", "internal"], help="Visibility for --create-repo")
+    parser.add_argument("--fleet", metavar="MANIFEST", help="Bootstrap every repository listed in a manifest YAML")
+    parser.add_argument("--workers", type=int, help="Repositories planned/applied in parallel with --fleet")
+    parser.add_argument("--restart", action="store_true", help="With --fleet, ignore the saved progress and start over")
+    parser.add_argument("--prune-labels", action="store_true", help="Also delete labels that are not in the config")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the repository (or with --fleet, any repository) drifted from the config, without planning")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.fleet:
+        from fleet import run_fleet
+        run_fleet(args)
+        return
     console.print("[bold blue]GitHub Repo Bootstrap[/]")
     
     try:
@@ -250,13 +714,22 @@ def main():
             repo = get_current_repo(g, raise_error=True)
         except RepositoryNotFoundError:
             console.print("[yellow]No existing repository detected.[/]")
-            if not questionary.confirm("Initialize and create a new GitHub repository here?").ask():
-                console.print("Exiting.")
-                sys.exit(0)
+            if args.check:
+                sys.exit(2)
+            if args.create_repo is None:
+                if args.no_input:
+                    console.print("[red]--create-repo is required with --no-input.[/]")
+                    sys.exit(2)
+                if not questionary.confirm("Initialize and create a new GitHub repository here?").ask():
+                    console.print("Exiting.")
+                    sys.exit(0)
                 
             # Create interactive flow
-            repo_name = questionary.text("Repository Name:", default=os.path.basename(os.getcwd())).ask()
-            visibility = questionary.select("Visibility:", choices=["public", "private", "internal"]).ask()
+            repo_name = ask(args.create_repo, "--create-repo", args.no_input,
+                            lambda: questionary.text("Repository Name:", default=os.path.basename(os.getcwd())))
+            visibility = ask(args.visibility, "--visibility", args.no_input,
+                             lambda: questionary.select("Visibility:", choices=["public", "private", "internal"]),
+                             default="private")
             
             with console.status(f"Creating repository {repo_name}..."):
                 # Initialize git if not already
@@ -275,142 +748,65 @@ def main():
         console.print(f"Repository: [green]{repo.full_name}[/]")
         console.print(f"User: [green]{user.login}[/]")
         
-        # 1. Plan Labels
-        label_actions = sync_labels(repo, config.get('labels', {}))
-
-        # 2. Plan Templates
-        from pathlib import Path
-        template_actions = []
-        script_dir = Path(__file__).parent
-        assets_dir = script_dir.parent / "assets" / "templates"
-        
-        if assets_dir.exists():
-            for template_file in assets_dir.glob("*.md"):
-                dest_path = f".github/ISSUE_TEMPLATE/{template_file.name}"
-                if "PULL_REQUEST" in template_file.name:
-                    dest_path = ".github/PULL_REQUEST_TEMPLATE.md"
-                    
-                def upload_action(tf=template_file, dp=dest_path):
-                    with open(tf, "r", encoding="utf-8") as f: content = f.read()
-                    try:
-                        contents = repo.get_contents(dp)
-                        repo.update_file(contents.path, f"Update {dp}", content, contents.sha)
-                        console.print(f"Updated {dp}")
-                    except:
-                        repo.create_file(dp, f"Create {dp}", content)
-                        console.print(f"Created {dp}")
-
-                template_actions.append({"name": dest_path, "type": "UPLOAD", "action": upload_action})
-
-        # 3. Plan Project
-        proj_config = config.get('projects_v2', {})
-        proj_action = None
-        if proj_config.get('enabled'):
-            try:
-                # Use repository name if title is not specified
-                project_title = proj_config.get('title') or repo.name
-                proj_action = ensure_project_v2(user.login, project_title)
-            except Exception as e:
-                console.print(f"[red]Failed to query Projects v2: {e}[/]")
-                # If project config is enabled, this should be a blocker or at least clearly failed
-                console.print("[red]Aborting bootstrap due to Project v2 error. Please check token scopes (need 'project').[/]")
-                sys.exit(1)
-        
-        # Display Plan
-        table = Table(title="Bootstrap Plan")
-        table.add_column("Category")
-        table.add_column("Item")
-        table.add_column("Action", style="bold")
-        
-        for a in label_actions:
-            table.add_row("Label", a['name'], f"[green]{a['type']}[/]")
-            
-        for a in template_actions:
-             table.add_row("File", a['name'], f"[green]{a['type']}[/]")
-            
-        if proj_action:
-            style = "green" if proj_action['type'] == "CREATE" else "dim"
-            table.add_row("Project", proj_action['name'], f"[{style}]{proj_action['type']}[/]")
+        from drift import run_check, record_fingerprint
+        try:
+            if args.check:
+                sys.exit(run_check(repo.full_name, user.login, label_overrides(config, args)))
+            plan = build_plan(repo, user.login, label_overrides(config, args))
+        except ProjectQueryError as e:
+            console.print(f"[red]Failed to query Projects v2: {e}[/]")
+            # If project config is enabled, this should be a blocker or at least clearly failed
+            console.print("[red]Aborting bootstrap due to Project v2 error. Please check token scopes (need 'project').[/]")
+            sys.exit(1)
+        print_plan_timings(plan)
         
-        if not label_actions and not template_actions and (not proj_action or proj_action['type'] == "EXISTS"):
+        if plan_is_empty(plan):
             console.print("[green]Nothing to do! Repository is already compliant.[/]")
+            record_fingerprint(repo.full_name, label_overrides(config, args))
             return
 
-        console.print(table)
+        print_plan(plan)
         
         # Confirm
-        ans = questionary.select(
-            "Execute these changes?",
-            choices=["Run", "Dry-run", "Cancel"]
-        ).ask()
+        if args.dry_run:
+            ans = "Dry-run"
+        elif args.yes:
+            ans = "Run"
+        elif args.no_input:
+            console.print("[red]Pass --yes to apply the plan or --dry-run to only show it.[/]")
+            sys.exit(2)
+        else:
+            ans = questionary.select(
+                "Execute these changes?",
+                choices=["Run", "Dry-run", "Cancel"]
+            ).ask()
         
         if ans == "Cancel":
             console.print("Aborted.")
             sys.exit(0)
             
         if ans == "Run":
-            project_url = None
-            project_id = None
-            with console.status("Applying changes..."):
-                # Labels
-                for a in label_actions:
-                    a['action']()
-                    console.print(f"Created label {a['name']}")
-                
-                # Templates
-                for a in template_actions:
-                    a['action']()
-                
-                # Project
-                if proj_action:
-                    result = proj_action['action']()
-                    # Handle both string (EXISTS) and dict (CREATE) return types
-                    if isinstance(result, dict):
-                        project_id = result['id']
-                        project_url = result['url']
-                    else:
-                        project_id = proj_action.get('id')
-                        project_url = result
-                    
+            try:
+                with console.status("Applying changes..."):
+                    project_url = apply_plan(plan, label_overrides(config, args))
+            except ProjectSetupError as e:
+                # Labels and templates are applied; only a complete run records the fingerprint
+                console.print(f"[red]{e}[/]")
+                sys.exit(1)
+            record_fingerprint(repo.full_name, label_overrides(config, args))
             console.print("[bold green]Success![/]")
             
             if project_url:
                 console.print(f"Project v2 URL: [link={project_url}]{project_url}[/link]")
-                if proj_action.get('active') is False or proj_action.get('closed') is True:
+                if plan["project"].get('active') is False or plan["project"].get('closed') is True:
                      console.print("[yellow]Note: This project appears to be closed.[/]")
-                     
-                # Link and Configure (Moved out of status block for visibility)
-                if project_id:
-                     try:
-                        owner, name = repo.full_name.split('/')
-                        repo_node_id = get_repo_id(owner, name)
-                        if link_project_to_repo(project_id, repo_node_id):
-                            console.print(f"Linked project to {repo.full_name}")
-                        
-                        # Configure Fields
-                        console.print("Configuring project fields...")
-                        fields = get_project_fields(project_id)
-                        
-                        # Status
-                        status_field = next((f for f in fields if f['name'] == "Status"), None)
-                        desired_status = proj_config.get('fields', {}).get('status', [])
-                        if status_field and desired_status:
-                                update_single_select_field(status_field, desired_status)
-                                console.print("Updated Status options")
-                        
-                        # Priority
-                        priority_field = next((f for f in fields if f['name'] == "Priority"), None)
-                        desired_priority = proj_config.get('fields', {}).get('priority', [])
-                        if not priority_field and desired_priority:
-                            if create_single_select_field(project_id, "Priority", desired_priority):
-                                console.print("Created Priority field")
-                        elif priority_field and desired_priority:
-                                update_single_select_field(priority_field, desired_priority)
-                                console.print("Updated Priority options")
-
-                     except Exception as e:
-                        console.print(f"[red]Failed to link/configure project: {e}[/]")
             
+    except RateLimitExceededException as e:
+        # The scheduler already waited and retried; GitHub is still refusing
+        reset = e.headers.get('x-ratelimit-reset') if e.headers else None
+        hint = f" (resets at {time.strftime('%H:%M:%S', time.localtime(int(reset)))})" if reset else ""
+        console.print(f"[red]GitHub rate limit exceeded{hint}. Re-run later; completed steps are skipped.[/]")
+        sys.exit(1)
     except Exception as e:
         console.print(f"[red]Critical Error: {e}[/]")
         import traceback
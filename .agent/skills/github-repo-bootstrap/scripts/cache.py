@@ -0,0 +1,100 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+from pathlib import Path
+
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+PROJECTS_FILE = "projects.json"
+SCHEMA_FILE = "schema.json"
+ITEMS_FILE = "items.json"
+
+def cache_dir() -> Path:
+    """Root of the on-disk cache (override with GH_SKILL_CACHE_DIR)."""
+    root = os.getenv("GH_SKILL_CACHE_DIR")
+    if root:
+        return Path(root)
+    base = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "gh-skill"
+
+def repo_cache_dir(repo_full_name) -> Path:
+    """Per-repo cache directory, e.g. ~/.cache/gh-skill/owner/repo."""
+    owner, name = repo_full_name.split('/')
+    return cache_dir() / owner / name
+
+class JsonCache:
+    """Small JSON file of key -> value entries with a per-entry TTL."""
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so a crash never leaves a torn file
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp, self.path)
+
+    def get(self, key):
+        entry = self._load().get(key)
+        if not entry:
+            return None
+        if self.ttl and time.time() - entry.get('stored_at', 0) > self.ttl:
+            return None
+        return entry['value']
+
+    def set(self, key, value):
+        entries = self._load()
+        entries[key] = {"stored_at": time.time(), "value": value}
+        self._save(entries)
+
+    def invalidate(self, key):
+        entries = self._load()
+        if entries.pop(key, None) is not None:
+            self._save(entries)
+
+    def invalidate_where(self, predicate):
+        """Drop every entry whose value matches predicate(value)."""
+        entries = self._load()
+        kept = {k: e for k, e in entries.items() if not predicate(e.get('value'))}
+        if len(kept) != len(entries):
+            self._save(kept)
+        return len(entries) - len(kept)
+
+def project_cache(repo_full_name, ttl=DEFAULT_TTL) -> JsonCache:
+    """Cache of project node ID, URL and repository node ID for one repo."""
+    return JsonCache(repo_cache_dir(repo_full_name) / PROJECTS_FILE, ttl)
+
+def project_dir(project_id) -> Path:
+    """Per-project cache directory holding the field schema."""
+    return cache_dir() / "projects" / project_id
+
+def schema_cache(project_id, ttl=DEFAULT_TTL) -> JsonCache:
+    """Cache of the indexed field/option schema of one project."""
+    return JsonCache(project_dir(project_id) / SCHEMA_FILE, ttl)
+
+def item_index_cache(project_id, ttl=DEFAULT_TTL) -> JsonCache:
+    """Cache of the content node ID -> item ID index of one project."""
+    return JsonCache(project_dir(project_id) / ITEMS_FILE, ttl)
+
+def project_key(user_login, project_title):
+    return f"project:{user_login}/{project_title}"
+
+def forget_project(project_id):
+    """Invalidate every cached entry pointing at project_id (e.g. after NOT_FOUND)."""
+    shutil.rmtree(project_dir(project_id), ignore_errors=True)
+    removed = 0
+    for path in cache_dir().glob(f"*/*/{PROJECTS_FILE}"):
+        removed += JsonCache(path).invalidate_where(
+            lambda v: isinstance(v, dict) and v.get('id') == project_id)
+    return removed
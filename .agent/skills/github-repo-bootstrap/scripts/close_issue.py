@@ -1,37 +1,191 @@
 
 import sys
+import time
+import argparse
 import questionary
 from rich.console import Console
 from rich.table import Table
-from utils import load_config, get_github_client, get_current_repo
+from rich.progress import Progress, BarColumn, MofNCompleteColumn, TimeElapsedColumn
+from utils import load_config, get_github_client, get_current_repo, get_repo_full_name, add_input_flags, ask, confirm
+from local_store import open_store, open_snapshot, DEFAULT_MAX_AGE
+from action_queue import ActionQueue, connect_or_offline, submit, SKIPPED
+from graphql_client import gql_request, GraphQLError
+from cache import JsonCache, repo_cache_dir
 
 console = Console()
 config = load_config()
 
-def main():
-    console.print("[bold blue]Close Issue[/]")
-    
-    try:
-        g = get_github_client()
-        repo = get_current_repo(g)
-    except Exception as e:
-        console.print(f"[red]Failed to initialize GitHub client: {e}[/]")
-        sys.exit(1)
-    
-    # 1. List Open Issues
+CHECKPOINT_FILE = "close_checkpoint.json"
+# Issues per mutation document; each issue takes up to three mutations
+BULK_BATCH_SIZE = 25
+STATE_REASONS = ("completed", "not_planned")
+# Per-issue steps of a bulk close, in the order they run within a document
+STEPS = ("comment", "close", "status")
+STEP_ALIASES = {"comment": "c", "close": "x", "status": "s"}
+
+def close_checkpoint(repo_full_name):
+    """Progress of bulk closes per selector (never expires; dropped once a run succeeds)."""
+    return JsonCache(repo_cache_dir(repo_full_name) / CHECKPOINT_FILE, ttl=0)
+
+def selector_key(args):
+    """Stable checkpoint key of the bulk selection given on the command line."""
+    parts = []
+    if args.numbers:
+        parts.append("numbers:" + ",".join(str(n) for n in sorted(set(args.numbers))))
+    if args.label:
+        parts.append("label:" + ",".join(sorted(args.label)))
+    if args.milestone:
+        parts.append(f"milestone:{args.milestone}")
+    if args.search:
+        parts.append(f"search:{args.search}")
+    return " ".join(parts)
+
+def is_bulk(args):
+    return bool(args.numbers or args.label or args.milestone or args.search)
+
+def search_query(args):
+    """Search qualifiers for a milestone/search selection, labels included."""
+    terms = [f'label:"{label}"' for label in args.label or []]
+    if args.milestone:
+        terms.append(f'milestone:"{args.milestone}"')
+    if args.search:
+        terms.append(args.search)
+    return " ".join(terms)
+
+def select_targets(store, args, repo_full_name):
+    """Open issues of the bulk selection as [{"number", "node_id", "title"}].
+
+    Numbers and labels are read from the local mirror; a milestone or search
+    query goes through the search API, which the mirror cannot answer.
+    """
+    if args.milestone or args.search:
+        from repo_queries import search_issues
+        issues, total = search_issues(repo_full_name, search_query(args))
+        if total > len(issues):
+            # Closed issues leave the is:open search, so the next run gets the rest
+            console.print(f"[yellow]The search matches {total} issues but returns only {len(issues)}; "
+                          "run the command again afterwards to close the rest.[/]")
+        return sorted(issues, key=lambda t: t['number'])
+    if args.numbers:
+        issues = []
+        for number in sorted(set(args.numbers)):
+            issue = store.get(number)
+            if issue and issue.state == "open" and not issue.is_pull_request:
+                issues.append(issue)
+            else:
+                console.print(f"[yellow]Skipping #{number}: not an open issue.[/]")
+    else:
+        issues = store.items(kind="issue", state="open", label=args.label[0])
+        issues = [i for i in issues if all(l in i.labels for l in args.label)]
+    return [{"number": i.number, "node_id": i.node_id, "title": i.title} for i in issues]
+
+def close_mutation(batch, comment, reason, status=None):
+    """One aliased mutation document for a batch of issues.
+
+    batch: [{"number", "node_id", "item_id", "steps"}], where steps are the
+           STEPS still to run for that issue.
+    status: {"project_id", "field_id", "option_id"} for the status step.
+    The comment, reason and status option are shared variables. Returns
+    (mutation, variables, {alias: (number, step)}).
+    """
+    params, fields, aliases = [], [], {}
+    variables = {}
+    shared = {
+        "comment": ("$body: String!", {"body": comment}),
+        "close": ("$reason: IssueClosedStateReason", {"reason": reason.upper() if reason else None}),
+        "status": ("$projectId: ID!, $fieldId: ID!, $optionId: String!",
+                   {"projectId": (status or {}).get('project_id'), "fieldId": (status or {}).get('field_id'),
+                    "optionId": (status or {}).get('option_id')}),
+    }
+    used = set()
+    for i, target in enumerate(batch):
+        # Unused variables fail validation, so the issue ID is declared only when needed
+        if "comment" in target['steps'] or "close" in target['steps']:
+            params.append(f"$issue{i}: ID!")
+            variables[f"issue{i}"] = target['node_id']
+        for step in STEPS:
+            if step not in target['steps']:
+                continue
+            used.add(step)
+            alias = f"{STEP_ALIASES[step]}{i}"
+            aliases[alias] = (target['number'], step)
+            if step == "comment":
+                fields.append(f"{alias}: addComment(input: {{subjectId: $issue{i}, body: $body}}) {{ clientMutationId }}")
+            elif step == "close":
+                fields.append(f"{alias}: closeIssue(input: {{issueId: $issue{i}, stateReason: $reason}}) {{ issue {{ state }} }}")
+            else:
+                params.append(f"$item{i}: ID!")
+                variables[f"item{i}"] = target['item_id']
+                fields.append(f"{alias}: updateProjectV2ItemFieldValue(input: {{projectId: $projectId, itemId: $item{i}, "
+                              f"fieldId: $fieldId, value: {{singleSelectOptionId: $optionId}}}}) {{ projectV2Item {{ id }} }}")
+    for step in STEPS:
+        if step in used:
+            params.insert(0, shared[step][0])
+            variables.update(shared[step][1])
+    mutation = f"mutation({', '.join(params)}) {{\n  " + "\n  ".join(fields) + "\n}"
+    return mutation, variables, aliases
+
+def send_close_batch(batch, comment, reason, status=None):
+    """Run one batch; returns {(number, step): True or error message}."""
+    mutation, variables, aliases = close_mutation(batch, comment, reason, status)
     try:
-        issues_list = list(repo.get_issues(state='open'))
-        # Filter out pull requests
-        issues = [i for i in issues_list if not i.pull_request]
-    except Exception as e:
-        console.print(f"[red]Failed to fetch issues: {e}[/]")
-        sys.exit(1)
-    
-    if not issues:
-        console.print("[yellow]No open issues found.[/]")
-        sys.exit(0)
-    
-    # Display issues in a table
+        res = gql_request(mutation, variables, allow_partial=True)
+    except GraphQLError as e:
+        return {key: str(e) for key in aliases.values()}
+
+    outcome = {}
+    for err in res.get('errors', []):
+        path = err.get('path') or []
+        if path and path[0] in aliases:
+            outcome[aliases[path[0]]] = err.get('message', 'Unknown error')
+    data = res.get('data') or {}
+    for alias, key in aliases.items():
+        if key not in outcome:
+            outcome[key] = True if data.get(alias) else "No result returned"
+    return outcome
+
+def pending_steps(entry, target, status=None):
+    """Steps of one target not yet recorded as done in the checkpoint entry."""
+    done = set(entry['done'].get(str(target['number']), []))
+    wanted = [step for step in STEPS if step != "comment" or entry['comment']]
+    if not (status and target.get('item_id')):
+        wanted.remove("status")
+    return [step for step in wanted if step not in done]
+
+def bulk_close(entry, checkpoint, key, status=None, batch_size=BULK_BATCH_SIZE, on_batch=None):
+    """Close the checkpointed targets in batched mutations, saving progress after each batch.
+
+    entry: {"targets", "comment", "reason", "done": {number: [steps]}} as stored
+           under key in the checkpoint. Steps already done are never resent, so
+           an interrupted run can be repeated without duplicate comments.
+    The status step of an issue closed in this run rides along with the next
+    document, so only issues whose close succeeded are moved to Done.
+    Returns {number: {step: True or error message}} for the steps sent.
+    """
+    todo = [dict(t, steps=pending_steps(entry, t, status)) for t in entry['targets']]
+    todo = [t for t in todo if t['steps']]
+    size = max(1, batch_size)
+    results = {}
+    closed = []
+    for batch in [todo[i:i + size] for i in range(0, len(todo), size)] + [[]]:
+        document = [dict(t, steps=[s for s in t['steps'] if s != "status" or "close" not in t['steps']])
+                    for t in batch]
+        document += [dict(t, steps=["status"]) for t in closed]
+        if not document:
+            break
+        outcome = send_close_batch(document, entry['comment'], entry['reason'], status)
+        for (number, step), result in outcome.items():
+            results.setdefault(number, {})[step] = result
+            if result is True:
+                entry['done'].setdefault(str(number), []).append(step)
+        checkpoint.set(key, entry)
+        closed = [t for t in batch if "status" in t['steps'] and "close" in t['steps']
+                  and outcome.get((t['number'], "close")) is True]
+        if on_batch and batch:
+            on_batch(batch)
+    return results
+
+def show_issues(issues):
     table = Table(title="Open Issues")
     table.add_column("#", style="cyan")
     table.add_column("Title", style="green")
@@ -39,8 +193,8 @@ def main():
     table.add_column("Assignee", style="yellow")
     
     for issue in issues:
-        labels = ", ".join([l.name for l in issue.labels]) if issue.labels else "-"
-        assignee = issue.assignee.login if issue.assignee else "-"
+        labels = ", ".join(issue.labels) if issue.labels else "-"
+        assignee = issue.assignee or "-"
         
         table.add_row(
             str(issue.number),
@@ -50,16 +204,219 @@ def main():
         )
     
     console.print(table)
+
+def resolve_status(g, repo_full_name, targets, entry):
+    """Project status target for the bulk close, filling in each target's item ID.
+
+    Returns {"project_id", "field_id", "option_id"} or None when projects are
+    disabled, the project or its Done option is missing. Item IDs come from the
+    project's item index, rescanned once if some issues are not in it.
+    """
+    proj_conf = config.get('projects_v2', {})
+    if not proj_conf.get('enabled'):
+        return None
+    from bootstrap import ensure_project_v2
+    from project_utils import get_item_index, resolve_field_option
+
+    title = proj_conf.get('title') or repo_full_name.split('/')[1]
+    proj_action = ensure_project_v2(g.get_user().login, title, repo_full_name)
+    if proj_action['type'] != 'EXISTS':
+        console.print(f"[yellow]Project '{title}' not found; skipping project status.[/]")
+        return None
+    project_id = proj_action['id']
+    field_id, option_id = resolve_field_option(project_id, "Status", "Done")
+    if not option_id:
+        console.print("[yellow]Status 'Done' not found in project options; skipping project status.[/]")
+        return None
+
+    waiting = [t for t in targets if "status" not in entry['done'].get(str(t['number']), [])]
+    index = get_item_index(project_id)
+    if any(t['node_id'] not in index for t in waiting):
+        index = get_item_index(project_id, refresh=True)
+    for t in targets:
+        t['item_id'] = index.get(t['node_id'])
+    return {"project_id": project_id, "field_id": field_id, "option_id": option_id}
+
+def print_bulk_report(entry, results, elapsed, batches):
+    failures = [(number, step, result) for number, steps in sorted(results.items())
+                for step, result in steps.items() if result is not True]
+    if failures:
+        titles = {t['number']: t['title'] for t in entry['targets']}
+        table = Table(title="Failed")
+        table.add_column("#", style="cyan")
+        table.add_column("Title", style="green")
+        table.add_column("Step")
+        table.add_column("Error", style="red")
+        for number, step, result in failures:
+            title = titles.get(number, "")
+            table.add_row(str(number), title[:50] + "..." if len(title) > 50 else title, step, result)
+        console.print(table)
+    closed = sum("close" in entry['done'].get(str(t['number']), []) for t in entry['targets'])
+    rate = len(results) / elapsed if elapsed > 0 else 0.0
+    console.print(f"[dim]{closed}/{len(entry['targets'])} closed, {len(failures)} failed step(s), "
+                  f"{elapsed:.2f}s in {batches} batch(es) ({rate:.1f} issues/s)[/]")
+    return failures
+
+def bulk_main(args, g, store, queue):
+    """Close every open issue of a label/milestone/search/number selection."""
+    repo_full_name = store.repo_full_name
+    checkpoint = close_checkpoint(repo_full_name)
+    key = selector_key(args)
+    entry = None if args.restart else checkpoint.get(key)
+
+    if entry and (args.comment, args.reason) != (entry['comment'], entry['reason']):
+        console.print(f"[red]An interrupted close of {key} was started with comment {entry['comment']!r} and "
+                      f"reason {entry['reason']!r}. Run it again with the same --comment/--reason to resume, "
+                      "or pass --restart to start over with the new ones.[/]")
+        sys.exit(2)
+    if entry:
+        done = sum("close" in entry['done'].get(str(t['number']), []) for t in entry['targets'])
+        console.print(f"[yellow]Resuming an interrupted close of {key}: {done}/{len(entry['targets'])} "
+                      "closed (--restart to start over).[/]")
+    else:
+        if args.offline and (args.milestone or args.search):
+            console.print("[red]--milestone and --search need the search API; select by --label or --numbers offline.[/]")
+            sys.exit(1)
+        try:
+            targets = select_targets(store, args, repo_full_name)
+        except Exception as e:
+            console.print(f"[red]Failed to fetch issues: {e}[/]")
+            sys.exit(1)
+        if not targets:
+            console.print("[yellow]No open issues match the selection.[/]")
+            sys.exit(0)
+        entry = {"targets": targets, "comment": args.comment, "reason": args.reason, "done": {}}
+
+    console.print(f"\n[bold]Closing {len(entry['targets'])} issue(s):[/] "
+                  + ", ".join(f"#{t['number']}" for t in entry['targets'][:20])
+                  + (" ..." if len(entry['targets']) > 20 else ""))
+    if entry['comment']:
+        console.print(f"  Comment: {entry['comment']}")
+    if entry['reason']:
+        console.print(f"  Reason: {entry['reason']}")
+
+    if not confirm(args, lambda: questionary.confirm(f"Close {len(entry['targets'])} issues?")):
+        console.print("[yellow]Close cancelled.[/]")
+        sys.exit(0)
+
+    if args.offline:
+        # Journal the steps a resumed checkpoint has not done yet for `gh-skill sync`
+        proj_conf = config.get('projects_v2', {})
+        project_title = (proj_conf.get('title') or repo_full_name.split('/')[1]) if proj_conf.get('enabled') else None
+        for t in entry['targets']:
+            steps = pending_steps(entry, t)
+            if "comment" in steps:
+                queue.enqueue("comment", number=t['number'], body=entry['comment'])
+            if "close" in steps:
+                queue.enqueue("close", number=t['number'], reason=entry['reason'])
+            if project_title and "status" not in entry['done'].get(str(t['number']), []):
+                queue.enqueue("project_status", content_id=t['node_id'], status="Done", project_title=project_title)
+            store.patch(t['number'], state="closed")
+        # The journal owns the remaining steps now; an online run must not send them again
+        checkpoint.invalidate(key)
+        console.print(f"[yellow]Close of {len(entry['targets'])} issue(s) queued; run `gh-skill sync` when back online.[/]")
+        return
+
+    checkpoint.set(key, entry)
+    start = time.monotonic()
+    try:
+        status = resolve_status(g, repo_full_name, entry['targets'], entry)
+        todo = sum(bool(pending_steps(entry, t, status)) for t in entry['targets'])
+        batch_size = args.batch_size or BULK_BATCH_SIZE
+        with Progress("[progress.description]{task.description}", BarColumn(), MofNCompleteColumn(),
+                      TimeElapsedColumn(), console=console) as progress:
+            task = progress.add_task("Closing", total=todo)
+            batches = -(-todo // batch_size)
+            sent = []
+
+            def on_batch(batch):
+                sent.append(batch)
+                progress.update(task, advance=len(batch), description=f"Batch {len(sent)}/{batches}")
+
+            results = bulk_close(entry, checkpoint, key, status, batch_size, on_batch)
+    except Exception as e:
+        console.print(f"[red]Bulk close interrupted: {e}[/]")
+        console.print("[yellow]Progress is saved; run the same command again to resume.[/]")
+        sys.exit(1)
+    elapsed = time.monotonic() - start
+
+    for number, steps in results.items():
+        if steps.get("close") is True:
+            store.patch(number, state="closed")
+    failures = print_bulk_report(entry, results, elapsed, len(sent))
+    if failures:
+        console.print("[yellow]Run the same command again to retry the failed steps.[/]")
+        sys.exit(1)
+    checkpoint.invalidate(key)
+    console.print(f"[bold green]✓ Closed {len(entry['targets'])} issue(s).[/]")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Close an issue, or many at once")
+    parser.add_argument("--refresh", action="store_true", help="Re-sync the local issue mirror before reading")
+    parser.add_argument("--offline", action="store_true", help="Queue the close for `gh-skill sync` instead of sending it")
+    parser.add_argument("--number", type=int, help="Issue number to close")
+    parser.add_argument("--comment", help="Closing comment")
+    parser.add_argument("--reason", choices=STATE_REASONS, help="State reason of the close")
+    bulk = parser.add_argument_group("bulk close (every open issue of the selection)")
+    bulk.add_argument("--numbers", type=int, nargs="+", metavar="N", help="These issue numbers")
+    bulk.add_argument("--label", action="append", metavar="LABEL", help="Has this label (repeatable)")
+    bulk.add_argument("--milestone", metavar="TITLE", help="In this milestone")
+    bulk.add_argument("--search", metavar="QUERY", help="Matches this issue search query")
+    bulk.add_argument("--batch-size", type=int, help=f"Issues per mutation request (default {BULK_BATCH_SIZE})")
+    bulk.add_argument("--restart", action="store_true", help="Discard the checkpoint of an interrupted run")
+    add_input_flags(parser)
+    args = parser.parse_args(argv)
+    if args.number is not None and is_bulk(args):
+        parser.error("--number cannot be combined with a bulk selection")
+    if args.numbers and (args.label or args.milestone or args.search):
+        parser.error("--numbers cannot be combined with --label, --milestone or --search")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    console.print("[bold blue]Close Issue[/]")
     
-    # 2. Select Issue
-    issue_choices = [f"#{i.number} - {i.title}" for i in issues]
-    selected = questionary.select("Select issue to close:", choices=issue_choices).ask()
+    try:
+        def connect():
+            g = get_github_client()
+            repo = get_current_repo(g, raise_error=True)
+            return g, repo, open_store(repo, refresh=args.refresh, max_age=config.get('local_store', {}).get('max_age_seconds', DEFAULT_MAX_AGE))
+
+        g, repo, store = connect_or_offline(args, connect)
+        if args.offline:
+            store = open_snapshot(get_repo_full_name())
+        queue = ActionQueue(store.repo_full_name)
+    except Exception as e:
+        console.print(f"[red]Failed to initialize GitHub client: {e}[/]")
+        sys.exit(1)
+
+    if is_bulk(args):
+        bulk_main(args, g, store, queue)
+        return
     
-    if not selected:
+    # 1. List Open Issues
+    try:
+        issues = store.items(kind="issue", state="open")
+    except Exception as e:
+        console.print(f"[red]Failed to fetch issues: {e}[/]")
+        sys.exit(1)
+    
+    if not issues:
+        console.print("[yellow]No open issues found.[/]")
         sys.exit(0)
     
-    issue_number = int(selected.split(" - ")[0].replace("#", ""))
-    issue = next((i for i in issues if i.number == issue_number), None)
+    # 2. Select Issue
+    if args.number is None:
+        show_issues(issues)
+        issue_choices = [f"#{i.number} - {i.title}" for i in issues]
+        selected = ask(None, "--number", args.no_input,
+                       lambda: questionary.select("Select issue to close:", choices=issue_choices))
+        if not selected:
+            sys.exit(0)
+        issue_number = int(selected.split(" - ")[0].replace("#", ""))
+    else:
+        issue_number = args.number
+    issue = store.get(issue_number)
     
     if not issue:
         console.print("[red]Issue not found.[/]")
@@ -69,40 +426,58 @@ def main():
     console.print(f"[dim]URL: {issue.html_url}[/]\n")
     
     # 3. Add closing comment (optional)
-    add_comment = questionary.confirm("Add a closing comment?", default=False).ask()
-    comment = None
-    
-    if add_comment:
-        comment = questionary.text("Closing comment:").ask()
+    comment = args.comment
+    if comment is None and not args.no_input and not args.yes:
+        if questionary.confirm("Add a closing comment?", default=False).ask():
+            comment = questionary.text("Closing comment:").ask()
     
     # 4. Confirm close
     console.print(f"\n[bold]Close Summary:[/]")
     console.print(f"  Issue: #{issue.number} - {issue.title}")
     if comment:
         console.print(f"  Comment: {comment}")
+    if args.reason:
+        console.print(f"  Reason: {args.reason}")
     
-    if not questionary.confirm("Proceed with closing?").ask():
+    if not confirm(args, lambda: questionary.confirm("Proceed with closing?")):
         console.print("[yellow]Close cancelled.[/]")
         sys.exit(0)
     
-    # 5. Close Issue
+    # 5. Journal the close (and the project status), then try to send it
+    actions = []
+    if comment:
+        actions.append(queue.enqueue("comment", number=issue.number, body=comment))
+    close_action = queue.enqueue("close", number=issue.number, reason=args.reason)
+    actions.append(close_action)
+    
+    proj_conf = config.get('projects_v2', {})
+    if proj_conf.get('enabled'):
+        project_title = proj_conf.get('title') or store.repo_full_name.split('/')[1]
+        actions.append(queue.enqueue("project_status", content_id=issue.node_id, status="Done", project_title=project_title))
+    
     try:
         with console.status("Closing issue..."):
-            if comment:
-                issue.create_comment(comment)
-            issue.edit(state='closed')
-        
-        console.print(f"[bold green]✓ Issue #{issue.number} closed successfully![/]")
-        
-        # 6. Update Project Status (if configured)
-        proj_conf = config.get('projects_v2', {})
-        if proj_conf.get('enabled'):
-            console.print("[dim]Note: Project status should be updated to 'Done' manually or via automation.[/]")
-            # Full implementation would require GraphQL to update project item field
-            
+            results = submit(queue, actions, g, repo, offline=args.offline, store=store)
     except Exception as e:
         console.print(f"[red]Failed to close issue: {e}[/]")
         sys.exit(1)
+    
+    outcome = results[close_action['id']]
+    if outcome == "queued":
+        store.patch(issue.number, state="closed")
+        console.print(f"[yellow]Close of issue #{issue.number} queued; run `gh-skill sync` when back online.[/]")
+    elif outcome is not True:
+        console.print(f"[red]Failed to close issue: {outcome}[/]")
+        sys.exit(1)
+    else:
+        console.print(f"[bold green]✓ Issue #{issue.number} closed successfully![/]")
+    
+    steps = {"comment": "add comment", "project_status": "set project status to Done"}
+    for action in actions:
+        if action['op'] == "project_status" and results[action['id']] == SKIPPED:
+            console.print("[dim]The issue is not on the project board; its status was not set.[/]")
+        elif action['op'] in steps and results[action['id']] not in (True, "queued"):
+            console.print(f"[yellow]Could not {steps[action['op']]}: {results[action['id']]}[/]")
 
 if __name__ == "__main__":
     main()
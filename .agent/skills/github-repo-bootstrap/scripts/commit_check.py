@@ -1,10 +1,12 @@
 
 import sys
 import re
+import argparse
 import subprocess
 import questionary
 from rich.console import Console
-from utils import load_config, get_github_client, get_current_repo
+from utils import load_config, get_github_client, get_current_repo, add_input_flags, ask, confirm
+from local_store import open_store, DEFAULT_MAX_AGE
 
 console = Console()
 config = load_config()
@@ -31,7 +33,19 @@ def parse_issue_from_branch(branch_name, pattern):
         return match.group("id")
     return None
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Commit changes with conventional format")
+    parser.add_argument("--refresh", action="store_true", help="Re-sync the local issue mirror before reading")
+    parser.add_argument("--type", help="Commit type (one of commit_assistant.allowed_types)")
+    parser.add_argument("--scope", help="Commit scope")
+    parser.add_argument("--subject", help="Commit subject (at least 5 characters)")
+    parser.add_argument("--issue", help="Issue ID (default: from the branch name)")
+    parser.add_argument("--stage-all", action="store_true", help="Run `git add .` if nothing is staged")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     console.print("[bold blue]Commit Assistant[/]")
     
     # 1. Config & Branch
@@ -40,7 +54,7 @@ def main():
     # Check for staged changes first
     if not check_staged_changes():
         console.print("[yellow]No changes staged for commit.[/]")
-        if questionary.confirm("Would you like to stage all changes (git add .)?").ask():
+        if args.stage_all or (not args.no_input and questionary.confirm("Would you like to stage all changes (git add .)?").ask()):
             subprocess.run(["git", "add", "."])
         else:
             console.print("[red]Aborting. Please stage changes before using Commit Assistant.[/]")
@@ -58,22 +72,33 @@ def main():
     # 2. Interactive Prompts
     types = conf.get('allowed_types', ["feat", "fix", "chore"])
     
-    commit_type = questionary.select("Type:", choices=types).ask()
+    if args.type is not None and args.type not in types:
+        console.print(f"[red]--type must be one of: {', '.join(types)}[/]")
+        sys.exit(2)
+    commit_type = ask(args.type, "--type", args.no_input, lambda: questionary.select("Type:", choices=types))
     if not commit_type: sys.exit(0)
     
-    scope = questionary.text("Scope (optional):").ask()
-    subject = questionary.text("Subject:", validate=lambda text: len(text) >= 5 or "Subject must be at least 5 chars").ask()
+    scope = ask(args.scope, "--scope", args.no_input, lambda: questionary.text("Scope (optional):"), default="")
+    subject = ask(args.subject, "--subject", args.no_input,
+                  lambda: questionary.text("Subject:", validate=lambda text: len(text) >= 5 or "Subject must be at least 5 chars"))
+    if subject is None: sys.exit(0)
+    if len(subject) < 5:
+        console.print("[red]Subject must be at least 5 chars[/]")
+        sys.exit(2)
     
+    if args.issue:
+        issue_id = args.issue
     if not issue_id:
+        if conf.get('enforce_issue_link', True) and args.no_input:
+            console.print("[red]--issue is required with --no-input (the branch name has no issue ID).[/]")
+            sys.exit(2)
         if conf.get('enforce_issue_link', True):
             # Fetch open issues
             try:
                 g = get_github_client()
                 repo = get_current_repo(g)
-                # Convert iterator to list
-                issues_list = list(repo.get_issues(state='open'))
-                # Filter out pull requests
-                issues_only = [i for i in issues_list if not i.pull_request]
+                store = open_store(repo, refresh=args.refresh, max_age=config.get('local_store', {}).get('max_age_seconds', DEFAULT_MAX_AGE))
+                issues_only = store.items(kind="issue", state="open")
                 choices = [f"#{i.number} {i.title}" for i in issues_only]
             except Exception as e:
                 console.print(f"[red]Failed to fetch issues: {e}[/]")
@@ -100,7 +125,7 @@ def main():
     
     console.print(f"\n[bold]Preview:[/]\n{msg}\n")
     
-    if questionary.confirm("Commit with this message?").ask():
+    if confirm(args, lambda: questionary.confirm("Commit with this message?")):
         subprocess.run(["git", "commit", "-m", msg])
     else:
         console.print("Cancelled.")
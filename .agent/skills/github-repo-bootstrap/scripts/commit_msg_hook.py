@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+commit-msg hook
+Validates a commit message against the commit_assistant config without the network.
+
+Runs on every commit, so it only uses the standard library: the YAML config is
+compiled into a JSON snapshot by install_hooks.py, and issue IDs are checked
+against the local SQLite mirror instead of the API.
+"""
+
+import os
+import re
+import sys
+import json
+
+SNAPSHOT_FILE = "gh-skill-commit-msg.json"
+SNAPSHOT_VERSION = 1
+
+# Messages git or the user generate that do not follow the commit format
+SKIP_PREFIXES = ("Merge ", "Revert \"", "fixup! ", "squash! ", "amend! ")
+
+FIELD_PATTERNS = {
+    "type": r"(?P<type>[\w-]+)",
+    "scope": r"(?P<scope>[^()]+)",
+    "subject": r"(?P<subject>.+?)",
+    "issue": r"(?P<issue>\d+)",
+}
+
+def compile_format(fmt, require_issue=True):
+    """Turn a commit_format like '{type}({scope}): {subject} #{issue}' into a regex string.
+
+    The parenthesised scope is optional (commit_check drops it when empty), and
+    so is the issue reference, with the text just before it, unless required.
+    """
+    parts = re.split(r"(\{\w+\})", fmt)
+    pattern = ""
+    i = 0
+    while i < len(parts):
+        part = parts[i]
+        field = part[1:-1] if part.startswith("{") and part.endswith("}") else None
+        if field is None:
+            pattern += re.escape(part)
+        elif field == "scope" and pattern.endswith(r"\(") and parts[i + 1].startswith(")"):
+            pattern = pattern[:-2] + r"(?:\(" + FIELD_PATTERNS["scope"] + r"\))?"
+            parts[i + 1] = parts[i + 1][1:]
+        elif field == "issue" and not require_issue:
+            # Make '<prefix>{issue}' optional, e.g. ' #123'
+            prefix = re.escape(parts[i - 1]) if i and parts[i - 1] else ""
+            if prefix:
+                pattern = pattern[:-len(prefix)]
+            pattern += "(?:" + prefix + FIELD_PATTERNS["issue"] + ")?"
+        else:
+            pattern += FIELD_PATTERNS.get(field, r".+?")
+        i += 1
+    return "^" + pattern + "$"
+
+def build_snapshot(conf, mirror=None, sources=()):
+    """Precompute everything the hook needs from the commit_assistant config."""
+    fmt = conf.get('commit_format', "{type}({scope}): {subject} #{issue}")
+    enforce = conf.get('enforce_issue_link', True)
+    return {
+        "version": SNAPSHOT_VERSION,
+        "commit_format": fmt,
+        "message_pattern": compile_format(fmt, require_issue=enforce),
+        "allowed_types": conf.get('allowed_types', ["feat", "fix", "chore"]),
+        "branch_issue_pattern": conf.get('branch_issue_pattern', r'^(feat|fix|chore|docs|refactor)\/(?P<id>\d+)(-.+)?$'),
+        "enforce_issue_link": enforce,
+        "mirror": str(mirror) if mirror else None,
+        "sources": {str(p): os.path.getmtime(p) for p in sources},
+    }
+
+def read_subject(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                return line
+    return ""
+
+def current_branch(git_dir):
+    """Branch name from HEAD without spawning git (None when detached)."""
+    try:
+        with open(os.path.join(git_dir, "HEAD"), "r", encoding="utf-8") as f:
+            head = f.read().strip()
+    except OSError:
+        return None
+    prefix = "ref: refs/heads/"
+    return head[len(prefix):] if head.startswith(prefix) else None
+
+def lookup_issue(mirror, number):
+    """Return (kind, newest number) from the mirror, or None if there is no mirror."""
+    if not mirror or not os.path.exists(mirror):
+        return None
+    import sqlite3
+    db = sqlite3.connect(f"file:{mirror}?mode=ro", uri=True)
+    try:
+        row = db.execute("SELECT kind FROM items WHERE number = ?", (number,)).fetchone()
+        newest = db.execute("SELECT MAX(number) FROM items").fetchone()[0]
+    except sqlite3.Error:
+        return None
+    finally:
+        db.close()
+    return (row[0] if row else None, newest)
+
+def validate(subject, snapshot, branch=None):
+    """Return (errors, warnings) for a commit subject line."""
+    errors, warnings = [], []
+    if subject.startswith(SKIP_PREFIXES):
+        return errors, warnings
+
+    branch_issue = None
+    if branch:
+        match = re.match(snapshot["branch_issue_pattern"], branch)
+        if match and "id" in match.groupdict():
+            branch_issue = match.group("id")
+
+    match = re.match(snapshot["message_pattern"], subject)
+    if not match:
+        if snapshot["enforce_issue_link"] and branch_issue and not re.search(r"#\d+", subject):
+            errors.append(f"Missing issue reference; this branch is for #{branch_issue}.")
+        errors.append(f"Message does not match the format '{snapshot['commit_format']}'.")
+        return errors, warnings
+
+    fields = match.groupdict()
+    if fields.get("type") and fields["type"] not in snapshot["allowed_types"]:
+        errors.append(f"Type '{fields['type']}' is not one of: {', '.join(snapshot['allowed_types'])}.")
+
+    issue = fields.get("issue")
+    if issue:
+        found = lookup_issue(snapshot.get("mirror"), int(issue))
+        if found is not None:
+            kind, newest = found
+            if kind == "pr":
+                errors.append(f"#{issue} is a pull request, not an issue.")
+            elif kind is None and newest is not None and int(issue) <= newest:
+                errors.append(f"Issue #{issue} not found in the local mirror "
+                              "(run `gh-skill list-issues --refresh` if it was just created).")
+        if branch_issue and issue != branch_issue:
+            warnings.append(f"Message references #{issue} but the branch is for #{branch_issue}.")
+    return errors, warnings
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: commit_msg_hook.py <commit message file>", file=sys.stderr)
+        return 2
+
+    git_dir = os.environ.get("GIT_DIR", ".git")
+    try:
+        with open(os.path.join(git_dir, SNAPSHOT_FILE), "r", encoding="utf-8") as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        print("commit-msg: no config snapshot; run install_hooks.py --mode commit-msg", file=sys.stderr)
+        return 0
+
+    for path, mtime in snapshot.get("sources", {}).items():
+        try:
+            if os.path.getmtime(path) != mtime:
+                print("commit-msg: config changed since the hook was installed; "
+                      "re-run install_hooks.py --mode commit-msg", file=sys.stderr)
+                break
+        except OSError:
+            pass
+
+    errors, warnings = validate(read_subject(argv[0]), snapshot, current_branch(git_dir))
+    for warning in warnings:
+        print(f"commit-msg: warning: {warning}", file=sys.stderr)
+    if errors:
+        for error in errors:
+            print(f"commit-msg: {error}", file=sys.stderr)
+        print("To bypass the hook, use: git commit --no-verify", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,36 +1,55 @@
 
 import sys
 import re
+import argparse
 import subprocess
 import questionary
 from rich.console import Console
-from utils import load_config, get_github_client, get_current_repo
+from utils import load_config, get_github_client, get_current_repo, get_repo_full_name, add_input_flags, ask, confirm
+from local_store import open_store, open_snapshot, DEFAULT_MAX_AGE
+from action_queue import ActionQueue, connect_or_offline, submit
 
 console = Console()
 config = load_config()
 
+BRANCH_TYPES = ["feat", "fix", "chore", "docs", "refactor"]
+
 def slugify(text):
     text = text.lower()
     text = re.sub(r'[^a-z0-9]+', '-', text)
     return text.strip('-')
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Create a branch from an issue")
+    parser.add_argument("--refresh", action="store_true", help="Re-sync the local issue mirror before reading")
+    parser.add_argument("--offline", action="store_true", help="Queue the project status change for `gh-skill sync`")
+    parser.add_argument("--issue", type=int, help="Issue number to branch from")
+    parser.add_argument("--type", choices=BRANCH_TYPES, help="Branch type prefix")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     console.print("[bold blue]Create Branch from Issue[/]")
     
     # 1. Fetch Issues
     try:
-        g = get_github_client()
-        repo = get_current_repo(g)
+        def connect():
+            g = get_github_client()
+            repo = get_current_repo(g, raise_error=True)
+            return g, repo, open_store(repo, refresh=args.refresh, max_age=config.get('local_store', {}).get('max_age_seconds', DEFAULT_MAX_AGE))
+
+        g, repo, store = connect_or_offline(args, connect)
+        if args.offline:
+            store = open_snapshot(get_repo_full_name())
+        queue = ActionQueue(store.repo_full_name)
     except Exception as e:
         console.print(f"[red]Failed to connect: {e}[/]")
         sys.exit(1)
     
     try:
-        # Convert iterator to list to get actual issues
-        issues_list = list(repo.get_issues(state='open'))
-        
-        # Filter out pull requests (GitHub API returns PRs as issues)
-        issues_only = [i for i in issues_list if not i.pull_request]
+        # Open issues from the local mirror (pull requests are stored separately)
+        issues_only = store.items(kind="issue", state="open")
         
         if not issues_only:
             console.print("[yellow]No open issues found.[/]")
@@ -41,24 +60,30 @@ def main():
         console.print(f"[red]Failed to fetch issues: {e}[/]")
         sys.exit(1)
         
-    choice = questionary.select(
-        "Select Issue:",
-        choices=list(issue_map.keys())
-    ).ask()
-    
-    if not choice:
-        console.print("Cancelled.")
-        sys.exit(0)
-    
-    issue = issue_map[choice]
+    if args.issue is not None:
+        issue = next((i for i in issues_only if i.number == args.issue), None)
+        if not issue:
+            console.print(f"[red]Open issue #{args.issue} not found.[/]")
+            sys.exit(1)
+    else:
+        choice = ask(None, "--issue", args.no_input, lambda: questionary.select(
+            "Select Issue:",
+            choices=list(issue_map.keys())
+        ))
+        
+        if not choice:
+            console.print("Cancelled.")
+            sys.exit(0)
+        
+        issue = issue_map[choice]
     
     # 2. Generate Name
     # Default prefix: feature? user choice?
     # Helper wizard.
-    branch_type = questionary.select(
+    branch_type = ask(args.type, "--type", args.no_input, lambda: questionary.select(
         "Branch Type:",
-        choices=["feat", "fix", "chore", "docs", "refactor"]
-    ).ask()
+        choices=BRANCH_TYPES
+    ), default="feat")
     
     slug = slugify(issue.title)
     # limit slug length?
@@ -68,40 +93,27 @@ def main():
     
     console.print(f"Proposed branch: [green]{branch_name}[/]")
     
-    if questionary.confirm("Create and checkout?").ask():
+    if confirm(args, lambda: questionary.confirm("Create and checkout?")):
         try:
             subprocess.run(["git", "checkout", "-b", branch_name], check=True)
             console.print(f"[bold green]Switched to branch {branch_name}[/]")
             
             # --- Auto-update Issue Status ---
-            try:
-                from bootstrap import ensure_project_v2
-                from project_utils import set_project_item_status, find_project_item_by_content
+            proj_conf = config.get('projects_v2', {})
+            if proj_conf.get('enabled'):
+                project_title = proj_conf.get('title') or store.repo_full_name.split('/')[1]
                 
-                user = g.get_user()
-                proj_conf = config.get('projects_v2', {})
-                if proj_conf.get('enabled'):
-                    project_title = proj_conf.get('title') or repo.name
-                    
-                    console.print(f"Updating issue status in project '{project_title}'...")
-                    proj_action = ensure_project_v2(user.login, project_title)
-                    
-                    project_id = None
-                    if proj_action['type'] == 'EXISTS':
-                        project_id = proj_action['id']
-                    elif proj_action['type'] == 'CREATE':
-                        result = proj_action['action']()
-                        project_id = result['id']
-                        
-                    if project_id:
-                        # Find issue item in project
-                        item_id = find_project_item_by_content(project_id, issue.raw_data['node_id'])
-                        if item_id:
-                            set_project_item_status(project_id, item_id, "In Progress")
-                        else:
-                            console.print("[yellow]Issue not found in project.[/]")
-            except Exception as e:
-                console.print(f"[yellow]Failed to update issue status: {e}[/]")
+                console.print(f"Updating issue status in project '{project_title}'...")
+                # Journaled first, so a slow or missing network only delays it
+                action = queue.enqueue("project_status", content_id=issue.node_id, status="In Progress", project_title=project_title)
+                try:
+                    outcome = submit(queue, [action], g, repo, offline=args.offline)[action['id']]
+                    if outcome == "queued":
+                        console.print("[yellow]Status change queued; run `gh-skill sync` when back online.[/]")
+                    elif outcome is not True:
+                        console.print(f"[yellow]Failed to update issue status: {outcome}[/]")
+                except Exception as e:
+                    console.print(f"[yellow]Failed to update issue status: {e}[/]")
             # -------------------------------
             
         except subprocess.CalledProcessError:
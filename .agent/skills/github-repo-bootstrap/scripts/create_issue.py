@@ -1,18 +1,19 @@
 
 import sys
+import argparse
 import questionary
 from rich.console import Console
-from utils import load_config, get_github_client, get_current_repo
+from utils import load_config, get_github_client, get_current_repo, add_input_flags, ask, confirm
 
 console = Console()
 config = load_config()
 
-def add_issue_to_project(issue_node_id, user_login, project_title):
+def add_issue_to_project(issue_node_id, user_login, project_title, repo_full_name=None):
     from bootstrap import ensure_project_v2
     from project_utils import set_project_item_status, add_item_to_project
     
     try:
-        proj_action = ensure_project_v2(user_login, project_title)
+        proj_action = ensure_project_v2(user_login, project_title, repo_full_name)
         
         # Handle both EXISTS and CREATE cases
         project_id = None
@@ -37,48 +38,60 @@ def add_issue_to_project(issue_node_id, user_login, project_title):
     except Exception as e:
         console.print(f"[red]Failed to add to project: {e}[/]")
 
-def main():
+ISSUE_TYPES = ["Bug", "Feature", "Task", "Question"]
+
+# Auto-label based on type
+TYPE_LABELS = {
+    "Bug": "type:bug",
+    "Feature": "type:feature",
+    "Task": "type:custom", # or specific
+}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Create a new issue")
+    parser.add_argument("--type", choices=ISSUE_TYPES, help="Issue type (adds the matching type label)")
+    parser.add_argument("--title", help="Issue title")
+    parser.add_argument("--body", help="Issue description")
+    parser.add_argument("--label", action="append", default=[], help="Extra label (repeatable)")
+    parser.add_argument("--no-project", action="store_true", help="Do not add the issue to the project")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     console.print("[bold blue]Create Issue[/]")
     g = get_github_client()
     repo = get_current_repo(g)
     user = g.get_user()
     
     # 1. Select Template (Mocked for now, or just Type)
-    issue_type = questionary.select(
-        "Issue Type:",
-        choices=["Bug", "Feature", "Task", "Question"]
-    ).ask()
+    issue_type = ask(args.type, "--type", args.no_input,
+                     lambda: questionary.select("Issue Type:", choices=ISSUE_TYPES), default="Task")
     
     if not issue_type: sys.exit(0)
     
     # 2. Input
-    title = questionary.text("Title:").ask()
-    body = questionary.text("Description (Body):").ask()
+    title = ask(args.title, "--title", args.no_input, lambda: questionary.text("Title:"))
+    body = ask(args.body, "--body", args.no_input, lambda: questionary.text("Description (Body):"), default="")
     
-    labels = []
-    # Try to auto-label based on type
-    type_map = {
-        "Bug": "type:bug",
-        "Feature": "type:feature",
-        "Task": "type:custom", # or specific
-    }
-    if issue_type in type_map:
-        labels.append(type_map[issue_type])
+    labels = list(args.label)
+    if issue_type in TYPE_LABELS:
+        labels.append(TYPE_LABELS[issue_type])
         
     # 3. Create
-    if questionary.confirm(f"Create issue '{title}'?").ask():
+    if confirm(args, lambda: questionary.confirm(f"Create issue '{title}'?")):
         with console.status("Creating issue..."):
             issue = repo.create_issue(title=title, body=body, labels=labels)
             console.print(f"[bold green]Created #{issue.number}: {issue.html_url}[/]")
             
             # 4. Link to Project
             proj_conf = config.get('projects_v2', {})
-            if proj_conf.get('enabled'):
+            if proj_conf.get('enabled') and not args.no_project:
                 # We need Node ID for GraphQL. PyGithub Issue object has `raw_data['node_id']`?
                 # Yes, issue.raw_data['node_id']
                 # Use repository name if title is not specified
                 project_title = proj_conf.get('title') or repo.name
-                add_issue_to_project(issue.raw_data['node_id'], user.login, project_title)
+                add_issue_to_project(issue.raw_data['node_id'], user.login, project_title, repo.full_name)
     else:
         console.print("Cancelled.")
 
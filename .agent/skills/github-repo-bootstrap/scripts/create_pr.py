@@ -3,9 +3,10 @@ import sys
 import os
 import subprocess
 import re
+import argparse
 import questionary
 from rich.console import Console
-from utils import load_config, get_github_client, get_current_repo
+from utils import load_config, get_github_client, get_current_repo, add_input_flags, ask, confirm
 
 console = Console()
 config = load_config()
@@ -16,7 +17,16 @@ def get_current_branch():
     except:
         return None
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Create a pull request from the current branch")
+    parser.add_argument("--title", help="PR title (default: last commit subject)")
+    parser.add_argument("--push", action=argparse.BooleanOptionalAction, default=None,
+                        help="Push the current branch first (default: yes with --yes)")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     console.print("[bold blue]Create Pull Request[/]")
     g = get_github_client()
     repo = get_current_repo(g)
@@ -29,7 +39,10 @@ def main():
         
     # 1. Push Branch
     console.print(f"Current branch: [green]{branch}[/]")
-    if questionary.confirm("Push current branch?").ask():
+    push = args.push
+    if push is None:
+        push = confirm(args, lambda: questionary.confirm("Push current branch?"))
+    if push:
         with console.status("Pushing..."):
             try:
                 subprocess.run(["git", "push", "-u", "origin", branch], check=True)
@@ -61,14 +74,15 @@ def main():
     # 4. Input Details
     git_last_commit = subprocess.check_output(["git", "log", "-1", "--pretty=%s"], text=True).strip()
     
-    title = questionary.text("PR Title:", default=git_last_commit).ask()
+    title = ask(args.title, "--title", args.no_input,
+                lambda: questionary.text("PR Title:", default=git_last_commit), default=git_last_commit)
     
     # Allow editing body?
     # questionary definition of "editor" might be useful if installed
     # For now just simple text or skip
     # body = questionary.text("PR Body:", default=body).ask() # Multiline?
     
-    if questionary.confirm("Create PR?").ask():
+    if confirm(args, lambda: questionary.confirm("Create PR?")):
         with console.status("Creating PR..."):
             try:
                 pr = repo.create_pull(
@@ -90,13 +104,13 @@ def main():
                 if proj_conf.get('enabled'):
                     try:
                         from bootstrap import ensure_project_v2
-                        from project_utils import set_project_item_status, add_item_to_project, find_project_item_by_content
+                        from project_utils import set_items_status, add_item_to_project, find_project_item_by_content, BATCH_SIZE
                         
                         # Use repository name if title is not specified
                         project_title = proj_conf.get('title') or repo.name
                         console.print(f"Adding PR to project '{project_title}'...")
                         
-                        proj_action = ensure_project_v2(user.login, project_title)
+                        proj_action = ensure_project_v2(user.login, project_title, repo.full_name)
                         
                         project_id = None
                         if proj_action['type'] == 'EXISTS':
@@ -106,22 +120,31 @@ def main():
                             project_id = result['id']
                             
                         if project_id:
-                            # 1. Add PR to Project & Set Ready
+                            # 1. Add PR to Project (Ready)
                             item_id = add_item_to_project(project_id, pr.raw_data['node_id'])
-                            set_project_item_status(project_id, item_id, "Ready")
+                            statuses = [(item_id, "Ready")]
+                            names = {item_id: f"PR #{pr.number}"}
                             
-                            # 2. Update Linked Issue to Review
+                            # 2. Linked Issue to Review
                             if issue_id:
                                 try:
                                     linked_issue = repo.get_issue(int(issue_id))
                                     linked_item_id = find_project_item_by_content(project_id, linked_issue.raw_data['node_id'])
                                     if linked_item_id:
-                                        set_project_item_status(project_id, linked_item_id, "Review")
-                                        console.print(f"[green]Moved linked issue #{issue_id} to Review[/]")
+                                        statuses.append((linked_item_id, "Review"))
+                                        names[linked_item_id] = f"linked issue #{issue_id}"
                                     else:
                                          console.print(f"[yellow]Linked issue #{issue_id} not found in project.[/]")
                                 except Exception as e:
                                     console.print(f"[yellow]Failed to update linked issue: {e}[/]")
+                            
+                            # 3. Both status changes in one batched mutation
+                            results = set_items_status(project_id, statuses, proj_conf.get('batch_size', BATCH_SIZE))
+                            for item, status in statuses:
+                                if results.get(item) is True:
+                                    console.print(f"[green]Moved {names[item]} to {status}[/]")
+                                else:
+                                    console.print(f"[yellow]Failed to update {names[item]}: {results.get(item)}[/]")
                                     
                     except Exception as e:
                         console.print(f"[red]Failed to update project: {e}[/]")
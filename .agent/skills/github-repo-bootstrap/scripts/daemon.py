@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+gh-skill daemon
+Keeps the GitHub client, repository, project schema and HTTP pool warm between commands.
+
+gh-skill.py forwards non-interactive commands (or ones given --no-input) over a
+per-user Unix socket and streams their output back as NDJSON frames. The daemon
+exits after being idle for daemon.idle_seconds.
+"""
+
+import os
+import io
+import sys
+import json
+import stat
+import time
+import socket
+import hashlib
+import argparse
+import subprocess
+
+IDLE_SECONDS = 900
+POLL_INTERVAL = 1.0
+START_TIMEOUT = 10.0
+
+def supported():
+    return hasattr(socket, "AF_UNIX")
+
+def socket_path(cwd=None):
+    """One socket per user and working directory (config and repo depend on the cwd)."""
+    cwd = os.path.realpath(cwd or os.getcwd())
+    runtime = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    digest = hashlib.sha256(cwd.encode()).hexdigest()[:12]
+    return os.path.join(runtime, f"gh-skill-{os.getuid()}", f"{digest}.sock")
+
+class UnsafeSocketDir(Exception):
+    """The socket directory is not a private directory of the current user."""
+
+def check_socket_dir(directory):
+    """Raise UnsafeSocketDir unless directory is a real directory we own with mode 0700.
+
+    Its name is predictable (/tmp/gh-skill-<uid> without XDG_RUNTIME_DIR), so another
+    local user could create it first and answer commands through a socket of their own.
+    """
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) != 0o700:
+        raise UnsafeSocketDir(f"{directory} is not a private directory (owned by you, mode 0700)")
+
+# --- client ---
+
+def _exchange(message, path, on_frame):
+    """Send one request and pass every reply frame to on_frame until 'exit'.
+
+    Returns the exit code, or None if no daemon is listening on path.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        check_socket_dir(os.path.dirname(path))
+    except UnsafeSocketDir as e:
+        print(f"gh-skill: not using the daemon: {e}", file=sys.stderr)
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+    except OSError:
+        # Stale socket left by a daemon that was killed
+        sock.close()
+        return None
+    with sock, sock.makefile("rwb") as f:
+        f.write(json.dumps(message).encode() + b"\n")
+        f.flush()
+        for line in f:
+            frame = json.loads(line)
+            if "exit" in frame:
+                return frame["exit"]
+            on_frame(frame)
+    # The daemon went away mid-command
+    return 1
+
+def forward(argv, cwd=None):
+    """Run a command in the daemon, streaming its output.
+
+    Returns the exit code, or None if there is no daemon (run it in-process then).
+    """
+    if not supported() or os.getenv("GH_SKILL_NO_DAEMON"):
+        return None
+    streams = {"out": sys.stdout, "err": sys.stderr}
+
+    def print_frame(frame):
+        for key, stream in streams.items():
+            if key in frame:
+                stream.write(frame[key])
+                stream.flush()
+
+    return _exchange({"argv": list(argv), "isatty": sys.stdout.isatty()}, socket_path(cwd), print_frame)
+
+def control(action, cwd=None):
+    """Send 'status' or 'stop'; returns the daemon's status dict or None if not running."""
+    status = {}
+    code = _exchange({"control": action}, socket_path(cwd), lambda frame: status.update(frame.get("status", {})))
+    return None if code is None else status
+
+# --- server ---
+
+class _Frames(io.TextIOBase):
+    """Text stream that sends every write to the client as a {key: text} frame."""
+
+    def __init__(self, f, key, isatty=False):
+        self.f = f
+        self.key = key
+        self._isatty = isatty
+        self.broken = False
+
+    def write(self, text):
+        if text and not self.broken:
+            try:
+                self.f.write(json.dumps({self.key: text}).encode() + b"\n")
+                self.f.flush()
+            except OSError:
+                # Client hung up (e.g. Ctrl-C); let the command finish quietly
+                self.broken = True
+        return len(text)
+
+    def isatty(self):
+        return self._isatty
+
+    def writable(self):
+        return True
+
+class Daemon:
+    """Serves one command at a time (commands share sys.stdout and module state)."""
+
+    def __init__(self, path, idle_seconds=IDLE_SECONDS, poll_interval=POLL_INTERVAL):
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self.poll_interval = poll_interval
+        self.started = time.time()
+        self.last_active = self.started
+        self.served = 0
+        self.running = True
+        self.server = None
+
+    def listen(self):
+        directory = os.path.dirname(self.path)
+        try:
+            os.mkdir(directory, 0o700)
+            # mkdir applies the umask; the check below wants exactly 0700
+            os.chmod(directory, 0o700)
+        except FileExistsError:
+            pass
+        check_socket_dir(directory)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(self.path)
+        os.chmod(self.path, 0o600)
+        self.server.listen(16)
+        self.server.settimeout(self.poll_interval)
+
+    def warm(self):
+        """Build the client, repo, project ID and schema up front; failures are left to the commands."""
+        try:
+            from utils import load_config, get_github_client, get_current_repo
+            g = get_github_client()
+            repo = get_current_repo(g, raise_error=True)
+            proj_conf = load_config().get('projects_v2', {})
+            if proj_conf.get('enabled'):
+                from bootstrap import ensure_project_v2
+                from project_utils import get_project_schema
+                proj_action = ensure_project_v2(g.get_user().login, proj_conf.get('title') or repo.name, repo.full_name)
+                if proj_action['type'] == 'EXISTS':
+                    get_project_schema(proj_action['id'])
+        except (Exception, SystemExit):
+            pass
+
+    def serve(self):
+        try:
+            while self.running:
+                try:
+                    conn, _ = self.server.accept()
+                except socket.timeout:
+                    if time.time() - self.last_active > self.idle_seconds:
+                        break
+                    continue
+                with conn:
+                    conn.settimeout(None)
+                    self.handle(conn)
+                self.last_active = time.time()
+        finally:
+            self.server.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def handle(self, conn):
+        with conn.makefile("rwb") as f:
+            try:
+                message = json.loads(f.readline())
+            except ValueError:
+                return
+            try:
+                if "control" in message:
+                    code = self.control(message["control"], f)
+                else:
+                    code = self.run(message.get("argv") or [], f, message.get("isatty", False))
+                f.write(json.dumps({"exit": code}).encode() + b"\n")
+                f.flush()
+            except OSError:
+                pass
+
+    def control(self, action, f):
+        if action == "stop":
+            self.running = False
+        status = {"pid": os.getpid(), "uptime": time.time() - self.started,
+                  "served": self.served, "idle_seconds": self.idle_seconds, "running": self.running}
+        f.write(json.dumps({"status": status}).encode() + b"\n")
+        return 0
+
+    def run(self, argv, f, isatty=False):
+        """Run a registry command with stdout/stderr sent to the client."""
+        from registry import COMMANDS, resolve_command, is_routable
+
+        out, err = _Frames(f, "out", isatty), _Frames(f, "err", isatty)
+        if not argv or not is_routable(argv[0], argv[1:]):
+            err.write(f"gh-skill daemon: '{' '.join(argv)}' needs a terminal; run it directly.\n")
+            return 2
+
+        command, args = argv[0], argv[1:]
+        saved = sys.stdout, sys.stderr, sys.stdin, sys.argv
+        sys.stdout, sys.stderr, sys.stdin = out, err, io.StringIO("")
+        sys.argv = [COMMANDS[command]["script"]] + list(args)
+        code = 0
+        try:
+            resolve_command(command)()
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception as e:
+            err.write(f"Error running {command}: {e}\n")
+            code = 1
+        finally:
+            sys.stdout, sys.stderr, sys.stdin, sys.argv = saved
+            self.served += 1
+        return code
+
+def start():
+    """Spawn a detached daemon for the current directory and wait until it listens."""
+    subprocess.Popen([sys.executable, os.path.abspath(__file__), "run"],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     start_new_session=True)
+    deadline = time.time() + START_TIMEOUT
+    while time.time() < deadline:
+        if control("status") is not None:
+            return True
+        time.sleep(0.05)
+    return False
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Keep a warm background process for fast repeat commands")
+    parser.add_argument("action", nargs="?", choices=["start", "stop", "status", "run"], default="start",
+                        help="run stays in the foreground")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not supported():
+        print("gh-skill daemon needs Unix domain sockets, which this platform does not provide.")
+        sys.exit(1)
+
+    path = socket_path()
+    status = control("status")
+
+    if args.action == "status":
+        if status is None:
+            print("gh-skill daemon is not running.")
+            sys.exit(1)
+        print(f"gh-skill daemon running (pid {status['pid']}, up {status['uptime']:.0f}s, "
+              f"{status['served']} command(s) served, idle timeout {status['idle_seconds']}s)")
+    elif args.action == "stop":
+        if status is None:
+            print("gh-skill daemon is not running.")
+            return
+        control("stop")
+        print(f"gh-skill daemon (pid {status['pid']}) stopped.")
+    elif args.action == "start":
+        if status is not None:
+            print(f"gh-skill daemon already running (pid {status['pid']}).")
+            return
+        if not start():
+            print("gh-skill daemon did not start; run `gh-skill daemon run` to see why.")
+            sys.exit(1)
+        print(f"gh-skill daemon started ({path}).")
+    else:
+        if status is not None:
+            print(f"gh-skill daemon already running (pid {status['pid']}).")
+            sys.exit(1)
+        from utils import load_config
+        idle = load_config().get('daemon', {}).get('idle_seconds', IDLE_SECONDS)
+        daemon = Daemon(path, idle_seconds=idle)
+        try:
+            daemon.listen()
+        except UnsafeSocketDir as e:
+            print(f"gh-skill daemon refused to start: {e}", file=sys.stderr)
+            sys.exit(1)
+        daemon.warm()
+        daemon.serve()
+
+if __name__ == "__main__":
+    main()
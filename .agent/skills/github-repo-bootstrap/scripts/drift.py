@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Drift check
+Compares repositories with the bootstrap config without building a plan.
+
+The state bootstrap manages (configured labels, template blob SHAs, project
+field options) is reduced to a fingerprint: one short digest per part plus an
+overall one. `bootstrap --check` computes the fingerprint of the config locally
+and that of the repository from the single bootstrap state query, and exits 1
+when they differ.
+
+The fingerprint of the last apply is kept in the cache and, with
+drift.repo_file set, committed to the repository along with the templates, so
+a failed check can tell a changed config from changes made on GitHub.
+"""
+
+import json
+import time
+import hashlib
+
+from rich.console import Console
+from rich.table import Table
+
+from cache import JsonCache, repo_cache_dir
+from bootstrap import desired_labels, git_blob_sha, local_templates, fetch_bootstrap_state
+
+console = Console()
+
+FINGERPRINT_FILE = "fingerprint.json"
+PARTS = ("labels", "templates", "project")
+# Extra drift entry when the committed fingerprint file is missing or stale
+RECORD = "record"
+
+def _digest(value):
+    data = json.dumps(value, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16]
+
+def fingerprint(managed):
+    """{"labels", "templates", "project", "all"} digests of a managed state."""
+    digests = {part: _digest(managed[part]) for part in PARTS}
+    digests["all"] = _digest([digests[part] for part in PARTS])
+    return digests
+
+def fingerprint_file(digests):
+    """Content of the fingerprint file committed with drift.repo_file."""
+    return json.dumps(digests, indent=2, sort_keys=True) + "\n"
+
+def project_title(conf, repo_name):
+    proj_conf = conf.get('projects_v2', {})
+    if not proj_conf.get('enabled'):
+        return None
+    return proj_conf.get('title') or repo_name
+
+def _desired_fields(conf):
+    fields = conf.get('projects_v2', {}).get('fields', {})
+    wanted = {"Status": fields.get('status'), "Priority": fields.get('priority')}
+    return {name: options for name, options in wanted.items() if options}
+
+def desired_state(conf, templates, title):
+    """The managed state as the config describes it."""
+    labels = {name: {k: v for k, v in want.items() if v is not None}
+              for name, want in desired_labels(conf.get('labels', {})).items()}
+    return {
+        "labels": labels,
+        "templates": {path: git_blob_sha(content.encode("utf-8")) for path, content in templates.items()},
+        "project": _desired_fields(conf) if title else None,
+    }
+
+def observed_state(conf, state, templates, title):
+    """The managed state as the repository has it, in the shape of desired_state.
+
+    Only what the config sets is compared: a label without a configured color
+    may have any color, and extra labels count only with label_sync.prune.
+    """
+    desired = desired_labels(conf.get('labels', {}))
+    labels = {}
+    for name, want in desired.items():
+        have = state["labels"].get(name)
+        if have is None:
+            labels[name] = None
+            continue
+        entry = {}
+        if want['color'] is not None:
+            entry['color'] = (have['color'] or "").lower()
+        if want['description'] is not None:
+            entry['description'] = have['description'] or ""
+        labels[name] = entry
+    if conf.get('label_sync', {}).get('prune'):
+        wanted = {name.lower() for name in desired}
+        labels.update({name: have for name, have in state["labels"].items() if name.lower() not in wanted})
+
+    project = None
+    if title:
+        nodes = (state["user"] or {}).get('projectsV2', {}).get('nodes', [])
+        target = next((p for p in nodes if p['title'] == title), None)
+        if target:
+            options = {f['name']: [o['name'] for o in f.get('options') or []]
+                       for f in target['fields']['nodes'] if f.get('name')}
+            # Bootstrap keeps options it does not manage, so only the configured ones count
+            project = {name: [o for o in wanted if o in options.get(name, [])]
+                       for name, wanted in _desired_fields(conf).items()}
+
+    return {
+        "labels": labels,
+        "templates": {path: state["blobs"].get(path) for path in templates},
+        "project": project,
+    }
+
+def desired_fingerprint(conf, repo_full_name, templates=None):
+    templates = local_templates() if templates is None else templates
+    return fingerprint(desired_state(conf, templates, project_title(conf, repo_full_name.split('/')[1])))
+
+def fingerprint_store(repo_full_name):
+    """Fingerprints of past applies for one repository (never expire)."""
+    return JsonCache(repo_cache_dir(repo_full_name) / FINGERPRINT_FILE, ttl=0)
+
+def record_fingerprint(repo_full_name, conf):
+    """Remember the config fingerprint after an apply left the repository compliant."""
+    fingerprint_store(repo_full_name).set("applied", desired_fingerprint(conf, repo_full_name))
+
+def check_repo(repo_full_name, user_login, conf):
+    """Compare one repository with the config; costs one request in most cases.
+
+    Returns {"repo", "drifted", "desired", "observed", "applied", "requests"},
+    where "drifted" lists the parts that differ.
+    """
+    templates = local_templates()
+    title = project_title(conf, repo_full_name.split('/')[1])
+    repo_file = conf.get('drift', {}).get('repo_file')
+    paths = list(templates) + ([repo_file] if repo_file else [])
+    state = fetch_bootstrap_state(repo_full_name, user_login, paths, title)
+
+    desired = fingerprint(desired_state(conf, templates, title))
+    observed = fingerprint(observed_state(conf, state, templates, title))
+    drifted = [part for part in PARTS if desired[part] != observed[part]]
+    if repo_file and state["blobs"].get(repo_file) != git_blob_sha(fingerprint_file(desired).encode("utf-8")):
+        drifted.append(RECORD)
+    return {"repo": repo_full_name, "drifted": drifted, "desired": desired, "observed": observed,
+            "applied": fingerprint_store(repo_full_name).get("applied"), "requests": state["requests"]}
+
+def print_check(result):
+    table = Table(title=f"Drift Check ({result['repo']})")
+    table.add_column("Part")
+    table.add_column("Config", style="cyan")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Result")
+    for part in PARTS:
+        same = result['desired'][part] == result['observed'][part]
+        table.add_row(part, result['desired'][part], result['observed'][part],
+                      "[green]ok[/]" if same else "[red]drift[/]")
+    console.print(table)
+
+    applied = result['applied']
+    if applied and applied['all'] != result['desired']['all']:
+        changed = [part for part in PARTS if applied[part] != result['desired'][part]]
+        console.print(f"[yellow]The config changed since the last apply ({', '.join(changed)}).[/]")
+    if RECORD in result['drifted']:
+        console.print("[yellow]The committed fingerprint file is missing or out of date.[/]")
+
+def run_check(repo_full_name, user_login, conf):
+    """Print the drift check of one repository; returns the exit code (1 on drift)."""
+    start = time.monotonic()
+    result = check_repo(repo_full_name, user_login, conf)
+    print_check(result)
+    elapsed = time.monotonic() - start
+    console.print(f"[dim]Checked in {elapsed:.2f}s with {result['requests']} "
+                  f"request{'s' if result['requests'] != 1 else ''}[/]")
+    if result['drifted']:
+        console.print(f"[red]Drift in {', '.join(result['drifted'])}; run bootstrap to fix it.[/]")
+        return 1
+    console.print(f"[green]No drift (fingerprint {result['desired']['all']}).[/]")
+    return 0
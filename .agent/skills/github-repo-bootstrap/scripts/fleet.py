@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Fleet bootstrap
+Applies the bootstrap plan to every repository listed in a manifest.
+
+Plans are built concurrently on a bounded pool and shown as one summary table,
+then applied concurrently; the shared rate-limit scheduler keeps the pool within
+GitHub's budget. Progress is saved after every repository, so an interrupted or
+partly failed run resumes where it stopped. With --check every repository is
+only compared with the config (see drift.py), one request each.
+
+Manifest (YAML):
+
+    repos:
+      - acme/api
+      - acme/svc-*          # glob over the owner's repositories
+    org: acme               # optional: every repository of an org or user...
+    include: ["web-*"]      # ...whose name matches one of these (default: all)
+    exclude: ["*-archive"]
+    workers: 8
+    labels: {...}           # optional overrides of the config sections
+    label_sync: {...}
+    projects_v2: {...}
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import threading
+from fnmatch import fnmatch
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import yaml
+import questionary
+from rich.console import Console
+from rich.table import Table
+
+from utils import load_config, get_github_client
+from cache import cache_dir
+from bootstrap import build_plan, apply_plan, plan_is_empty, plan_calls, label_overrides
+from drift import check_repo, record_fingerprint
+
+console = Console()
+
+DEFAULT_WORKERS = 8
+STATE_DIR = "fleet"
+# Repositories in these states are skipped when a run is resumed
+DONE = ("applied", "compliant")
+CONFIG_SECTIONS = ("labels", "label_sync", "projects_v2")
+
+def load_manifest(path):
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = yaml.safe_load(f) or {}
+    if isinstance(manifest, list):
+        manifest = {"repos": manifest}
+    return manifest
+
+def _owner_repos(g, owner):
+    from github import GithubException
+    try:
+        repos = list(g.get_organization(owner).get_repos())
+    except GithubException:
+        repos = list(g.get_user(owner).get_repos())
+    return [r.full_name for r in repos if not r.archived]
+
+def resolve_repos(g, manifest):
+    """Expand the manifest into a sorted list of 'owner/name' repositories."""
+    names = set()
+    listed = {}
+
+    def owner_repos(owner):
+        if owner not in listed:
+            listed[owner] = _owner_repos(g, owner)
+        return listed[owner]
+
+    for entry in manifest.get('repos') or []:
+        if any(c in entry for c in "*?["):
+            owner, pattern = entry.split('/', 1)
+            names.update(n for n in owner_repos(owner) if fnmatch(n.split('/')[1], pattern))
+        else:
+            names.add(entry)
+
+    if manifest.get('org'):
+        include = manifest.get('include') or ["*"]
+        names.update(n for n in owner_repos(manifest['org'])
+                     if any(fnmatch(n.split('/')[1], p) for p in include))
+
+    exclude = manifest.get('exclude') or []
+    return sorted(n for n in names if not any(fnmatch(n, p) or fnmatch(n.split('/')[1], p) for p in exclude))
+
+class FleetState:
+    """Per-manifest progress file: repository -> {"status", "error", "plan_s", "apply_s"}."""
+
+    def __init__(self, manifest_path):
+        digest = hashlib.sha256(os.path.realpath(manifest_path).encode()).hexdigest()[:12]
+        self.path = cache_dir() / STATE_DIR / f"{digest}.json"
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.repos = json.load(f)
+        except (OSError, ValueError):
+            self.repos = {}
+
+    def get(self, name):
+        return self.repos.get(name, {})
+
+    def update(self, name, **fields):
+        with self._lock:
+            self.repos.setdefault(name, {}).update(fields)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.repos, f, indent=2)
+            os.replace(tmp, self.path)
+
+    def reset(self):
+        with self._lock:
+            self.repos = {}
+            if self.path.exists():
+                self.path.unlink()
+
+def _run_pool(fn, names, workers, label):
+    """Run fn(name) for every name on a bounded pool; returns {name: (result, error, seconds)}."""
+    results = {}
+    if not names:
+        return results
+
+    def timed(name):
+        start = time.monotonic()
+        try:
+            return fn(name), None, time.monotonic() - start
+        except Exception as e:
+            return None, str(e) or type(e).__name__, time.monotonic() - start
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        with console.status(f"{label} 0/{len(names)}...") as status:
+            futures = {pool.submit(timed, name): name for name in names}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                status.update(f"{label} {len(results)}/{len(names)}...")
+    except KeyboardInterrupt:
+        pool.shutdown(wait=False, cancel_futures=True)
+        console.print("[yellow]Interrupted; finished repositories are saved. Re-run to resume.[/]")
+        sys.exit(130)
+    pool.shutdown()
+    return results
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))] if values else 0.0
+
+def print_summary(names, plans, state):
+    table = Table(title=f"Fleet Bootstrap ({len(names)} repositories)")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Labels", justify="right")
+    table.add_column("Templates", justify="right")
+    table.add_column("Project")
+    table.add_column("API calls", justify="right")
+    table.add_column("Plan", justify="right")
+    table.add_column("Apply", justify="right")
+    table.add_column("Result")
+
+    styles = {"applied": "green", "compliant": "dim", "planned": "yellow", "failed": "red"}
+    for name in names:
+        entry = state.get(name)
+        plan = plans.get(name)
+        status = entry.get('status', "-")
+        result = f"[{styles.get(status, 'white')}]{status}[/]"
+        if entry.get('error'):
+            result += f" [dim]{entry['error'][:60]}[/]"
+        project = plan["project"]['type'] if plan and plan["project"] else "-"
+        table.add_row(
+            name,
+            str(len(plan["labels"])) if plan else "-",
+            str(len(plan["templates"])) if plan else "-",
+            project,
+            str(plan_calls(plan)) if plan else "-",
+            f"{entry['plan_s']:.1f}s" if 'plan_s' in entry else "-",
+            f"{entry['apply_s']:.1f}s" if 'apply_s' in entry else "-",
+            result,
+        )
+    console.print(table)
+
+def print_timing(phases):
+    """phases: {name: (wall seconds, [per-repo seconds])}."""
+    from rate_limit import get_scheduler
+    table = Table(title="Fleet Timing")
+    table.add_column("Phase")
+    table.add_column("Repos", justify="right")
+    table.add_column("Wall", justify="right")
+    table.add_column("Sum", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("Repos/min", justify="right")
+    for phase, (wall, times) in phases.items():
+        if not times:
+            continue
+        table.add_row(phase, str(len(times)), f"{wall:.1f}s", f"{sum(times):.1f}s",
+                      f"{_percentile(times, 0.5):.1f}s", f"{max(times):.1f}s",
+                      f"{len(times) / wall * 60:.0f}" if wall > 0 else "-")
+    console.print(table)
+    scheduler = get_scheduler()
+    console.print(f"[dim]Rate limit: {scheduler.throttled_seconds:.1f}s throttled, {scheduler.retries} retry(ies)[/]")
+
+def _check_budget(plans):
+    """Warn when the planned writes exceed what is left of the core rate limit."""
+    from rate_limit import get_scheduler
+    needed = sum(plan_calls(p) for p in plans.values())
+    budget = get_scheduler().budget.get('core')
+    if budget and budget['remaining'] < needed:
+        reset = time.strftime('%H:%M:%S', time.localtime(budget['reset']))
+        console.print(f"[yellow]About {needed} API calls planned but only {budget['remaining']} left "
+                      f"until {reset}; the apply will be paced to stay within the limit.[/]")
+
+def create_shared_projects(plans, state):
+    """Create every project that several plans would create, once, before the pool runs.
+
+    A manifest can give all repositories one projects_v2 title; left to the pool,
+    each of them would create its own copy. The plans of a title then reuse the
+    created project (EXISTS); if creating it fails they are dropped and marked failed.
+    """
+    by_title = {}
+    for name, plan in plans.items():
+        if plan["project"] and plan["project"]['type'] == "CREATE":
+            by_title.setdefault(plan["project"]['name'], []).append(name)
+    for title, names in by_title.items():
+        if len(names) < 2:
+            continue
+        try:
+            project = plans[names[0]]["project"]['action']()
+        except Exception as e:
+            for name in names:
+                state.update(name, status="failed", error=f"Creating project {title}: {str(e) or type(e).__name__}")
+                del plans[name]
+            continue
+        for name in names:
+            plans[name]["project"] = {**plans[name]["project"], "type": "EXISTS", "id": project['id'], "url": project['url'],
+                                      "closed": False, "action": lambda url=project['url']: url}
+
+def check_fleet(names, login, conf, workers):
+    """Drift check of every repository; exits 1 if any drifted or could not be checked."""
+    start = time.monotonic()
+    checked = _run_pool(lambda name: check_repo(name, login, conf), names, workers, "Checking")
+    wall = time.monotonic() - start
+
+    table = Table(title=f"Fleet Drift Check ({len(names)} repositories)")
+    table.add_column("Repository", style="cyan")
+    table.add_column("Fingerprint")
+    table.add_column("Result")
+    bad = 0
+    for name in names:
+        result, error, _ = checked[name]
+        if error:
+            table.add_row(name, "-", f"[red]failed[/] [dim]{error[:60]}[/]")
+        elif result['drifted']:
+            table.add_row(name, result['observed']['all'], f"[red]drift[/] [dim]{', '.join(result['drifted'])}[/]")
+        else:
+            table.add_row(name, result['observed']['all'], "[green]ok[/]")
+        bad += bool(error or result['drifted'])
+    console.print(table)
+    print_timing({"check": (wall, [t for _, _, t in checked.values()])})
+    if bad:
+        console.print(f"[red]{bad} of {len(names)} repositories drifted or failed; run without --check to fix them.[/]")
+        sys.exit(1)
+    console.print("[bold green]Fleet is compliant.[/]")
+
+def run_fleet(args):
+    manifest = load_manifest(args.fleet)
+    config = load_config()
+    conf = label_overrides({**config, **{k: manifest[k] for k in CONFIG_SECTIONS if k in manifest}}, args)
+    workers = args.workers or manifest.get('workers') or config.get('fleet', {}).get('workers', DEFAULT_WORKERS)
+
+    console.print("[bold blue]Fleet Bootstrap[/]")
+    g = get_github_client()
+    login = g.get_user().login
+    names = resolve_repos(g, manifest)
+    if not names:
+        console.print("[yellow]The manifest matches no repositories.[/]")
+        return
+    if args.check:
+        check_fleet(names, login, conf, workers)
+        return
+
+    state = FleetState(args.fleet)
+    if args.restart:
+        state.reset()
+    todo = [n for n in names if state.get(n).get('status') not in DONE]
+    done = len(names) - len(todo)
+    console.print(f"{len(names)} repositories, {len(todo)} to do"
+                  + (f" ({done} already done; --restart to redo them)" if done else "")
+                  + f", {workers} workers")
+
+    # 1. Plan every repository concurrently (reads only)
+    phases = {}
+    start = time.monotonic()
+    planned = _run_pool(lambda name: build_plan(g.get_repo(name), login, conf), todo, workers, "Planning")
+    phases["plan"] = (time.monotonic() - start, [t for _, _, t in planned.values()])
+
+    plans = {}
+    for name, (plan, error, seconds) in planned.items():
+        if error:
+            state.update(name, status="failed", error=error, plan_s=seconds)
+        elif plan_is_empty(plan):
+            record_fingerprint(name, conf)
+            state.update(name, status="compliant", error=None, plan_s=seconds)
+        else:
+            plans[name] = plan
+            state.update(name, status="planned", error=None, plan_s=seconds)
+
+    print_summary(names, plans, state)
+    if not plans or args.dry_run:
+        print_timing(phases)
+        sys.exit(1 if any(state.get(n).get('status') == "failed" for n in names) else 0)
+
+    # 2. Confirm
+    if args.no_input and not args.yes:
+        console.print("[red]Pass --yes to apply the plans or --dry-run to only show them.[/]")
+        sys.exit(2)
+    if not args.yes and not questionary.confirm(f"Apply {len(plans)} plan(s)?").ask():
+        console.print("Aborted.")
+        sys.exit(0)
+    _check_budget(plans)
+    create_shared_projects(plans, state)
+
+    # 3. Apply concurrently; each repository is saved as soon as it finishes
+    def apply(name):
+        try:
+            apply_plan(plans[name], conf, log=lambda line: None)
+        except Exception as e:
+            state.update(name, status="failed", error=str(e) or type(e).__name__)
+            raise
+        record_fingerprint(name, conf)
+        state.update(name, status="applied", error=None)
+
+    start = time.monotonic()
+    applied = _run_pool(apply, list(plans), workers, "Applying")
+    phases["apply"] = (time.monotonic() - start, [t for _, _, t in applied.values()])
+    for name, (_, _, seconds) in applied.items():
+        state.update(name, apply_s=seconds)
+
+    print_summary(names, plans, state)
+    print_timing(phases)
+    failed = [n for n in names if state.get(n).get('status') == "failed"]
+    if failed:
+        console.print(f"[red]{len(failed)} repositories failed; re-run the same command to retry them.[/]")
+        sys.exit(1)
+    console.print("[bold green]Fleet is compliant.[/]")
@@ -5,74 +5,27 @@ Unified interface for all GitHub workflow commands.
 """
 
 import sys
-import questionary
-from rich.console import Console
 
-console = Console()
+# Commands are resolved from the registry on dispatch: rich, questionary and PyGithub
+# are imported only by the commands that use them, so `version` and `help` start fast.
+from registry import COMMANDS, resolve_command, is_routable
 
 __version__ = "1.0.0"
 
-COMMANDS = {
-    "version": {
-        "desc": "Show version",
-        "script": None
-    },
-    "bootstrap": {
-        "desc": "Bootstrap repository with labels, templates, and project",
-        "script": "bootstrap.py"
-    },
-    "create-issue": {
-        "desc": "Create a new issue",
-        "script": "create_issue.py"
-    },
-    "create-branch": {
-        "desc": "Create a branch from an issue",
-        "script": "create_branch.py"
-    },
-    "commit": {
-        "desc": "Commit changes with conventional format",
-        "script": "commit_check.py"
-    },
-    "create-pr": {
-        "desc": "Create a pull request",
-        "script": "create_pr.py"
-    },
-    "review-pr": {
-        "desc": "Review a pull request",
-        "script": "review_pr.py"
-    },
-    "merge-pr": {
-        "desc": "Merge a pull request",
-        "script": "merge_pr.py"
-    },
-    "close-issue": {
-        "desc": "Close an issue",
-        "script": "close_issue.py"
-    },
-    "list-issues": {
-        "desc": "List issues",
-        "script": "list_issues.py"
-    },
-    "list-prs": {
-        "desc": "List pull requests",
-        "script": "list_prs.py"
-    },
-    "view-project": {
-        "desc": "View project board",
-        "script": "view_project.py"
-    },
-    "update-project": {
-        "desc": "Update project item status/priority",
-        "script": "update_project.py"
-    },
-    "install-hooks": {
-        "desc": "Install Git hooks",
-        "script": "install_hooks.py"
-    }
-}
+_console = None
+
+def get_console():
+    """Create the rich console on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
 
 def show_menu():
     """Show interactive menu to select command."""
+    import questionary
+    console = get_console()
     console.print("\n[bold blue]GitHub Repo Bootstrap Skill[/]")
     console.print("Select a command:\n")
     
@@ -95,55 +48,113 @@ def show_menu():
     
     return selected
 
-def run_command(command):
-    """Run the selected command by importing and executing its main function."""
+def print_help():
+    # Plain print: help is called from scripts and editors, rich is not worth importing for it
+    print("\nGitHub Repo Bootstrap Skill\n")
+    print("Usage: python gh-skill.py [--profile] [--profile-json PATH] [command] [options]\n")
+    print("Available commands:")
+    for cmd, info in COMMANDS.items():
+        print(f"  {cmd:20} {info['desc']}")
+    print("\nGlobal options:")
+    print(f"  {'--profile':20} Print the command's REST/GraphQL calls, latency, bytes and cost at exit")
+    print(f"  {'--profile-json PATH':20} Also write that profile as JSON (implies --profile)")
+    print("\nRun without arguments for interactive menu.")
+
+def run_command(command, argv=None):
+    """Run the selected command by importing and executing its entry point."""
     if command == "version":
-        console.print(f"GitHub Repo Bootstrap Skill v{__version__}")
+        print(f"GitHub Repo Bootstrap Skill v{__version__}")
         return
 
     script_name = COMMANDS[command]["script"]
-    module_name = script_name.replace(".py", "")
     
     try:
-        # Import the module dynamically
-        module = __import__(module_name)
-        
-        # Run the main function
-        if hasattr(module, 'main'):
-            module.main()
-        else:
-            console.print(f"[red]Error: {script_name} does not have a main() function[/]")
-            sys.exit(1)
-            
+        entry = resolve_command(command)
     except ImportError as e:
-        console.print(f"[red]Error importing {script_name}: {e}[/]")
+        get_console().print(f"[red]Error importing {script_name}: {e}[/]")
         sys.exit(1)
+    
+    if not callable(entry):
+        get_console().print(f"[red]Error: {script_name} does not have a {COMMANDS[command]['entry']}() function[/]")
+        sys.exit(1)
+    
+    try:
+        # Run the entry point with the command's own arguments
+        sys.argv = [script_name] + list(argv or [])
+        entry()
     except Exception as e:
-        console.print(f"[red]Error running {command}: {e}[/]")
+        get_console().print(f"[red]Error running {command}: {e}[/]")
         sys.exit(1)
 
+def parse_global_options(args):
+    """Split the leading global options off the command line: (options, remaining args)."""
+    options = {"profile": False, "profile_json": None}
+    args = list(args)
+    while args and args[0].startswith("--profile"):
+        arg = args.pop(0)
+        if arg == "--profile":
+            options["profile"] = True
+        elif arg == "--profile-json" or arg.startswith("--profile-json="):
+            path = arg.partition("=")[2] or (args.pop(0) if args else None)
+            if not path:
+                print("--profile-json needs a file path", file=sys.stderr)
+                sys.exit(2)
+            options["profile"], options["profile_json"] = True, path
+        else:
+            print(f"Unknown option: {arg}", file=sys.stderr)
+            sys.exit(2)
+    return options, args
+
+def run_profiled(command, argv=None, json_path=None):
+    """Run a command with API call accounting and report it when the command exits."""
+    import profiler
+    prof = profiler.enable()
+    code = 0
+    try:
+        run_command(command, argv)
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        raise
+    except BaseException:
+        code = 1
+        raise
+    finally:
+        prof.print_report(command)
+        if json_path:
+            profiler.write_json(json_path, prof.report(command, argv or [], code))
+
 def main():
     """Main entry point."""
+    options, args = parse_global_options(sys.argv[1:])
     # If command provided as argument, run it directly
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
+    if args:
+        command = args[0]
         if command in COMMANDS:
-            run_command(command)
+            argv = args[1:]
+            if options["profile"]:
+                # Profiled commands run in-process: a daemon's counters would not be ours
+                run_profiled(command, argv, options["profile_json"])
+                return
+            if is_routable(command, argv):
+                # Hand off to a warm `gh-skill daemon` if one is running
+                from daemon import forward
+                code = forward([command] + argv)
+                if code is not None:
+                    sys.exit(code)
+            run_command(command, argv)
         elif command in ["-h", "--help", "help"]:
-            console.print("\n[bold]GitHub Repo Bootstrap Skill[/]\n")
-            console.print("Usage: python gh-skill.py [command]\n")
-            console.print("Available commands:")
-            for cmd, info in COMMANDS.items():
-                console.print(f"  [cyan]{cmd:20}[/] {info['desc']}")
-            console.print("\nRun without arguments for interactive menu.")
+            print_help()
         else:
-            console.print(f"[red]Unknown command: {command}[/]")
-            console.print("Run 'python gh-skill.py help' for available commands.")
+            print(f"Unknown command: {command}", file=sys.stderr)
+            print("Run 'python gh-skill.py help' for available commands.", file=sys.stderr)
             sys.exit(1)
     else:
         # Show interactive menu
         command = show_menu()
-        run_command(command)
+        if options["profile"]:
+            run_profiled(command, json_path=options["profile_json"])
+        else:
+            run_command(command)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,153 @@
+import os
+import re
+import json
+import time
+import atexit
+import threading
+
+import requests
+from rich.console import Console
+from rich.table import Table
+
+import profiler
+from rate_limit import ScheduledAdapter
+
+console = Console()
+
+def graphql_url(api_url):
+    """GraphQL endpoint next to a REST API root.
+
+    GitHub Enterprise Server serves REST at https://host/api/v3 and GraphQL
+    at https://host/api/graphql, so a trailing /v3 is dropped.
+    """
+    root = api_url.rstrip("/")
+    if root.endswith("/v3"):
+        root = root[:-len("/v3")]
+    return root + "/graphql"
+
+# GITHUB_GRAPHQL_URL wins; otherwise the endpoint follows GITHUB_API_URL like the REST client
+GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL") or graphql_url(os.getenv("GITHUB_API_URL") or "https://api.github.com")
+POOL_SIZE = 10
+TIMEOUT = 30
+
+# The first root field, skipping an alias ("{ c0: closeIssue(...)" -> closeIssue)
+_OPERATION_RE = re.compile(r'^\s*(query|mutation)?[^{]*\{\s*(?:\w+\s*:\s*)?(\w+)', re.S)
+
+class GraphQLError(Exception):
+    """Raised when a GraphQL call fails at the transport or API level."""
+
+    def __init__(self, message, errors=None):
+        super().__init__(message)
+        self.errors = errors or []
+
+    @property
+    def types(self):
+        return {e.get('type') for e in self.errors if e.get('type')}
+
+def operation_name(query):
+    """Return a short label for a query, e.g. 'mutation addProjectV2ItemById'."""
+    match = _OPERATION_RE.match(query)
+    if not match:
+        return "query"
+    return f"{match.group(1) or 'query'} {match.group(2)}"
+
+class GraphQLClient:
+    """GraphQL client that keeps one pooled keep-alive HTTPS session."""
+
+    def __init__(self, token, url=GRAPHQL_URL, pool_size=POOL_SIZE, timeout=TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"bearer {token}",
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "gh-skill",
+        })
+        # Shares the rate-limit scheduler with the REST client
+        adapter = ScheduledAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=3)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # One entry per call: {"operation": ..., "ms": ..., "ok": ...}
+        self.calls = []
+
+    def execute(self, query, variables=None, allow_partial=False):
+        """Run a query and return the decoded response (always containing 'data').
+
+        With allow_partial=True a response carrying both 'data' and 'errors' is
+        returned as-is, so callers of aliased documents can map errors to aliases.
+        """
+        payload = {'query': query, 'variables': variables or {}}
+        operation = operation_name(query)
+        # --profile: ask for the query's rate-limit cost alongside its data
+        costed = profiler.with_cost(query) if profiler.active() else None
+        if costed:
+            payload['query'] = costed
+        start = time.perf_counter()
+        ok = False
+        res = cost = None
+        try:
+            try:
+                res = self.session.post(self.url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                raise GraphQLError(f"Query failed: {e}") from e
+
+            try:
+                data = res.json()
+            except ValueError as e:
+                raise GraphQLError(f"Failed to decode GraphQL response (HTTP {res.status_code}): {e}")
+
+            if costed and isinstance(data, dict) and isinstance(data.get('data'), dict):
+                cost = (data['data'].pop(profiler.COST_ALIAS, None) or {}).get('cost')
+            if res.status_code >= 400:
+                message = data.get('message') if isinstance(data, dict) else None
+                raise GraphQLError(f"Query failed: HTTP {res.status_code} {message or res.reason}")
+            if 'errors' in data and not (allow_partial and data.get('data')):
+                raise GraphQLError(f"GraphQL Error: {json.dumps(data['errors'], indent=2)}", data['errors'])
+            if 'data' not in data:
+                raise GraphQLError(f"GraphQL Response missing data: {json.dumps(data, indent=2)}")
+            ok = True
+            return data
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.calls.append({"operation": operation, "ms": elapsed, "ok": ok})
+            if profiler.active() is not None:
+                profiler.record("graphql", operation, elapsed, sent=len(json.dumps(payload)),
+                                received=len(res.content or b"") if res is not None else 0,
+                                status=res.status_code if res is not None else None, cost=cost)
+
+    def close(self):
+        self.session.close()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Return the process-wide GraphQL client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from utils import get_github_token
+                _client = GraphQLClient(get_github_token())
+                if os.getenv("GH_SKILL_TIMING"):
+                    atexit.register(print_latency_report)
+    return _client
+
+def gql_request(query, variables=None, allow_partial=False):
+    """Execute a GraphQL query through the shared client. Raises GraphQLError on failure."""
+    return get_client().execute(query, variables, allow_partial=allow_partial)
+
+def print_latency_report():
+    """Print per-call GraphQL latency (enabled with GH_SKILL_TIMING=1)."""
+    if _client is None or not _client.calls:
+        return
+    table = Table(title="GraphQL Calls")
+    table.add_column("#", style="cyan")
+    table.add_column("Operation", style="green")
+    table.add_column("Latency", style="yellow", justify="right")
+    table.add_column("OK")
+    for i, call in enumerate(_client.calls, 1):
+        table.add_row(str(i), call['operation'], f"{call['ms']:.0f} ms", "✓" if call['ok'] else "✗")
+    total = sum(c['ms'] for c in _client.calls)
+    console.print(table)
+    console.print(f"[dim]{len(_client.calls)} call(s), {total:.0f} ms total[/]")
@@ -0,0 +1,243 @@
+import os
+import json
+import time
+import atexit
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+
+import requests
+import requests.adapters
+from requests.structures import CaseInsensitiveDict
+from github.Requester import Requester, HTTPRequestsConnectionClass, HTTPSRequestsConnectionClass
+from rich.console import Console
+
+import profiler
+from cache import cache_dir
+from rate_limit import ScheduledAdapter
+
+console = Console()
+
+CACHE_FILE = "http-cache.sqlite"
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+POOL_SIZE = 10
+
+# Headers that describe the wire encoding, not the cached (decoded) body
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+class ResponseCache:
+    """On-disk store of GET responses with their validators, evicted LRU by total size."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(path), check_same_thread=False)
+        self.db.executescript(SCHEMA)
+
+    @staticmethod
+    def key(request):
+        """Key by URL, Accept and a digest of the credentials, so tokens never share entries."""
+        auth = hashlib.sha256((request.headers.get("Authorization") or "").encode()).hexdigest()[:16]
+        raw = f"{request.url}\n{request.headers.get('Accept', '')}\n{auth}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            row = self.db.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "headers": json.loads(row[2]), "body": row[3]}
+
+    def touch(self, key):
+        with self._lock:
+            self.db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+
+    def put(self, key, etag, last_modified, headers, body):
+        if len(body) > self.max_bytes:
+            return
+        headers = {k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS}
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, headers, body, size, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(headers), body, len(body), time.time()))
+            self._evict()
+            self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Oldest first until the cache fits again
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def size(self):
+        with self._lock:
+            return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+class CachingAdapter(ScheduledAdapter):
+    """HTTPAdapter that revalidates cached GETs with If-None-Match / If-Modified-Since.
+
+    A 304 Not Modified (which does not count against the primary rate limit)
+    is turned back into a 200 carrying the cached body. Requests that do go
+    out pass through the rate-limit scheduler.
+    """
+
+    def __init__(self, cache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request, stream=False, **kwargs):
+        if profiler.active() is None:
+            return self._send(request, stream=stream, **kwargs)
+        start = time.perf_counter()
+        response = self._send(request, stream=stream, **kwargs)
+        cached = getattr(response, "from_cache", False)
+        body = request.body.encode() if isinstance(request.body, str) else request.body or b""
+        # A replayed 304 carried no body; streamed bodies are not read here
+        received = 0 if cached or stream else len(response.content or b"")
+        profiler.record("rest", profiler.rest_operation(request.method, request.url),
+                        (time.perf_counter() - start) * 1000, sent=len(body), received=received,
+                        status=response.status_code, cached=cached)
+        return response
+
+    def _send(self, request, stream=False, **kwargs):
+        if request.method != "GET" or stream or self.cache is None:
+            return super().send(request, stream=stream, **kwargs)
+
+        key = self.cache.key(request)
+        entry = self.cache.get(key)
+        if entry:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = super().send(request, stream=stream, **kwargs)
+
+        if response.status_code == 304 and entry:
+            self.cache.hits += 1
+            self.cache.touch(key)
+            return self._replay(request, response, entry)
+
+        self.cache.misses += 1
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (etag or last_modified):
+            self.cache.put(key, etag, last_modified, dict(response.headers), response.content)
+        return response
+
+    def _replay(self, request, not_modified, entry):
+        replay = requests.Response()
+        replay.status_code = 200
+        replay.reason = "OK"
+        headers = CaseInsensitiveDict(entry["headers"])
+        # Keep fresh rate-limit and date headers from the 304
+        headers.update({k: v for k, v in not_modified.headers.items() if k.lower() not in _DROP_HEADERS})
+        replay.headers = headers
+        replay._content = entry["body"]
+        replay.encoding = "utf-8"
+        replay.url = request.url
+        replay.request = request
+        replay.connection = self
+        replay.from_cache = True
+        return replay
+
+# Per-thread cap on the TCP connect time of PyGithub requests (see connect_timeout)
+_limits = threading.local()
+
+@contextmanager
+def connect_timeout(seconds):
+    """Give PyGithub requests made in this block (on this thread) a short connect timeout.
+
+    The read timeout is unchanged; only an unreachable host is given up on sooner.
+    """
+    previous = getattr(_limits, 'connect', None)
+    _limits.connect = seconds
+    try:
+        yield
+    finally:
+        _limits.connect = previous
+
+class _SharedSession:
+    """Mixin for PyGithub connection classes that reuse one module-level session.
+
+    PyGithub builds a connection object per request once classes are injected;
+    sharing the session keeps the keep-alive pool (and the cache) across them.
+    """
+
+    session = None
+
+    def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+        self.host = host
+        self.port = port if port else (443 if self.protocol == "https" else 80)
+        connect = getattr(_limits, 'connect', None)
+        # requests takes (connect, read) for separate timeouts
+        self.timeout = (connect, timeout) if connect is not None else timeout
+        self.verify = kwargs.get("verify", True)
+        self.session = _SharedSession.session
+
+    def close(self):
+        # The shared session outlives individual connection objects
+        pass
+
+class SharedHTTPSConnection(_SharedSession, HTTPSRequestsConnectionClass):
+    protocol = "https"
+
+class SharedHTTPConnection(_SharedSession, HTTPRequestsConnectionClass):
+    protocol = "http"
+
+_cache = None
+
+def install(max_bytes=DEFAULT_MAX_BYTES, enabled=True):
+    """Route every PyGithub request through one pooled session with the response cache."""
+    global _cache
+    if _SharedSession.session is not None:
+        return _cache
+    _cache = ResponseCache(cache_dir() / CACHE_FILE, max_bytes) if enabled else None
+    # Rate-limit retries are handled by the scheduler; urllib3 only retries connection errors
+    adapter = CachingAdapter(_cache, max_retries=3, pool_connections=1, pool_maxsize=POOL_SIZE)
+    session = requests.Session()
+    # Same as PyGithub: a non-None auth disables the .netrc fallback
+    session.auth = Requester.noopAuth
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    _SharedSession.session = session
+    Requester.injectConnectionClasses(SharedHTTPConnection, SharedHTTPSConnection)
+    if os.getenv("GH_SKILL_TIMING"):
+        atexit.register(print_cache_report)
+    return _cache
+
+def stats():
+    """Return {"hits", "misses", "bytes"} for this process (zeros when disabled)."""
+    if _cache is None:
+        return {"hits": 0, "misses": 0, "bytes": 0}
+    return {"hits": _cache.hits, "misses": _cache.misses, "bytes": _cache.size()}
+
+def print_cache_report():
+    s = stats()
+    console.print(f"[dim]HTTP cache: {s['hits']} hit(s), {s['misses']} miss(es), {s['bytes'] / 1024:.0f} KiB stored[/]")
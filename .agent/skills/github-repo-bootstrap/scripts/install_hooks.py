@@ -1,15 +1,48 @@
 #!/usr/bin/env python3
 """
-Pre-commit hook installer
-Installs the pre-commit hook to automatically run commit_check.py
+Git hook installer
+Installs the pre-commit hook to automatically run commit_check.py,
+or a fast commit-msg hook that validates messages offline.
 """
 
 import os
 import sys
+import json
 import shutil
+import argparse
 from pathlib import Path
 
-def main():
+def write_commit_msg_snapshot(git_dir):
+    """Compile the commit_assistant config into the JSON snapshot read by commit_msg_hook.py."""
+    from utils import load_config, get_repo_full_name, REPO_CONFIG_PATH, RepositoryNotFoundError
+    from commit_msg_hook import build_snapshot, SNAPSHOT_FILE
+    from cache import repo_cache_dir
+    from local_store import DB_FILE
+    
+    config = load_config()
+    try:
+        mirror = repo_cache_dir(get_repo_full_name(raise_error=True)) / DB_FILE
+    except RepositoryNotFoundError:
+        mirror = None
+    default_config = Path(__file__).resolve().parent.parent / "assets" / "config.yml"
+    sources = [p.resolve() for p in (REPO_CONFIG_PATH, default_config) if p.exists()]
+    
+    snapshot = build_snapshot(config.get('commit_assistant', {}), mirror, sources)
+    snapshot_file = git_dir / SNAPSHOT_FILE
+    with open(snapshot_file, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, indent=2)
+    return snapshot_file
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Install Git hooks")
+    parser.add_argument("--mode", choices=["pre-commit", "commit-msg"], default="pre-commit",
+                        help="pre-commit runs the interactive commit assistant; "
+                             "commit-msg validates messages offline using only the standard library")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    
     # Find git root
     git_dir = Path(".git")
     if not git_dir.exists():
@@ -19,6 +52,10 @@ def main():
     hooks_dir = git_dir / "hooks"
     hooks_dir.mkdir(exist_ok=True)
     
+    if args.mode == "commit-msg":
+        install_commit_msg_hook(git_dir, hooks_dir)
+        return
+    
     # Determine hook content based on OS
     if os.name == 'nt':  # Windows
         hook_content = """#!/usr/bin/env python3
@@ -62,5 +99,51 @@ exit $?
     print("\nThe hook will automatically run commit_check.py before each commit.")
     print("To bypass the hook, use: git commit --no-verify")
 
+def install_commit_msg_hook(git_dir, hooks_dir):
+    snapshot_file = write_commit_msg_snapshot(git_dir)
+    
+    # -S skips site-packages: the hook only needs the standard library and starts faster
+    if os.name == 'nt':  # Windows
+        hook_content = """#!/usr/bin/env python3
+import sys
+import subprocess
+
+# Run commit_msg_hook.py
+result = subprocess.run(
+    ["python", "-S", ".agent/skills/github-repo-bootstrap/scripts/commit_msg_hook.py", sys.argv[1]],
+    capture_output=False
+)
+
+sys.exit(result.returncode)
+"""
+    else:  # Unix-like
+        hook_content = """#!/bin/sh
+# commit-msg hook to validate the message offline
+
+python3 -S .agent/skills/github-repo-bootstrap/scripts/commit_msg_hook.py "$1"
+exit $?
+"""
+    
+    hook_file = hooks_dir / "commit-msg"
+    
+    if hook_file.exists():
+        print(f"Warning: {hook_file} already exists")
+        response = input("Overwrite? (y/n): ")
+        if response.lower() != 'y':
+            print("Installation cancelled")
+            sys.exit(0)
+    
+    with open(hook_file, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(hook_content)
+    
+    # Make executable on Unix
+    if os.name != 'nt':
+        os.chmod(hook_file, 0o755)
+    
+    print(f"✓ commit-msg hook installed at {hook_file}")
+    print(f"✓ Config snapshot written to {snapshot_file}")
+    print("\nRe-run this command after changing commit_assistant settings.")
+    print("To bypass the hook, use: git commit --no-verify")
+
 if __name__ == "__main__":
     main()
@@ -1,40 +1,51 @@
 
 import sys
+import argparse
 import questionary
 from rich.console import Console
 from rich.table import Table
-from utils import load_config, get_github_client, get_current_repo
+from utils import load_config, get_github_client, get_current_repo, add_input_flags, ask
+from local_store import open_store, DEFAULT_MAX_AGE
 
 console = Console()
 config = load_config()
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="List issues")
+    parser.add_argument("--refresh", action="store_true", help="Re-sync the local issue mirror before reading")
+    parser.add_argument("--state", choices=["open", "closed", "all"], help="Issue state (default: open)")
+    parser.add_argument("--label", help="Only show issues with this label")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     console.print("[bold blue]List Issues[/]")
     
     try:
         g = get_github_client()
         repo = get_current_repo(g)
+        store = open_store(repo, refresh=args.refresh, max_age=config.get('local_store', {}).get('max_age_seconds', DEFAULT_MAX_AGE))
     except Exception as e:
         console.print(f"[red]Failed to initialize GitHub client: {e}[/]")
         sys.exit(1)
     
     # 1. Filter options
-    state = questionary.select(
+    state = ask(args.state, "--state", args.no_input, lambda: questionary.select(
         "Issue state:",
         choices=["open", "closed", "all"],
         default="open"
-    ).ask()
+    ), default="open")
     
     if not state:
         sys.exit(0)
     
     # 2. Label filter (optional)
-    filter_by_label = questionary.confirm("Filter by label?", default=False).ask()
-    label_filter = None
+    label_filter = args.label
     
-    if filter_by_label:
+    if label_filter is None and not args.no_input and questionary.confirm("Filter by label?", default=False).ask():
         try:
-            labels = [l.name for l in repo.get_labels()]
+            labels = store.labels()
             if labels:
                 label_filter = questionary.select("Select label:", choices=labels).ask()
         except Exception as e:
@@ -42,13 +53,8 @@ def main():
     
     # 3. Fetch issues
     try:
-        if label_filter:
-            issues_list = list(repo.get_issues(state=state, labels=[label_filter]))
-        else:
-            issues_list = list(repo.get_issues(state=state))
-        
-        # Filter out pull requests
-        issues = [i for i in issues_list if not i.pull_request]
+        # Read from the local mirror (pull requests are stored separately)
+        issues = store.items(kind="issue", state=state, label=label_filter)
     except Exception as e:
         console.print(f"[red]Failed to fetch issues: {e}[/]")
         sys.exit(1)
@@ -66,11 +72,11 @@ def main():
     table.add_column("State", style="blue", width=8)
     
     for issue in issues:
-        labels = ", ".join([l.name for l in issue.labels[:3]]) if issue.labels else "-"
+        labels = ", ".join(issue.labels[:3]) if issue.labels else "-"
         if len(issue.labels) > 3:
             labels += "..."
         
-        assignee = issue.assignee.login if issue.assignee else "-"
+        assignee = issue.assignee or "-"
         state_icon = "🟢" if issue.state == "open" else "🔴"
         
         table.add_row(
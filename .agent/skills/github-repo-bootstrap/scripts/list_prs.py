@@ -1,14 +1,23 @@
 
 import sys
+import argparse
 import questionary
 from rich.console import Console
 from rich.table import Table
-from utils import load_config, get_github_client, get_current_repo
+from utils import load_config, get_github_client, get_current_repo, add_input_flags, ask
+from repo_queries import fetch_pull_requests
 
 console = Console()
 config = load_config()
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="List pull requests")
+    parser.add_argument("--state", choices=["open", "closed", "all"], help="PR state (default: open)")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     console.print("[bold blue]List Pull Requests[/]")
     
     try:
@@ -19,18 +28,18 @@ def main():
         sys.exit(1)
     
     # 1. Filter options
-    state = questionary.select(
+    state = ask(args.state, "--state", args.no_input, lambda: questionary.select(
         "PR state:",
         choices=["open", "closed", "all"],
         default="open"
-    ).ask()
+    ), default="open")
     
     if not state:
         sys.exit(0)
     
     # 2. Fetch PRs
     try:
-        prs = list(repo.get_pulls(state=state))
+        prs = fetch_pull_requests(repo.full_name, state=state)
     except Exception as e:
         console.print(f"[red]Failed to fetch PRs: {e}[/]")
         sys.exit(1)
@@ -49,34 +58,29 @@ def main():
     table.add_column("State", style="white", width=10)
     
     for pr in prs:
-        # Get review status
-        try:
-            reviews = list(pr.get_reviews())
-            approved = any(r.state == "APPROVED" for r in reviews)
-            changes_req = any(r.state == "CHANGES_REQUESTED" for r in reviews)
-            
-            if approved:
-                review_status = "✓ Approved"
-            elif changes_req:
-                review_status = "✗ Changes"
-            else:
-                review_status = "⏳ Pending"
-        except:
-            review_status = "-"
+        # Review status
+        if pr['review_state'] == "APPROVED":
+            review_status = "✓ Approved"
+        elif pr['review_state'] == "CHANGES_REQUESTED":
+            review_status = "✗ Changes"
+        else:
+            review_status = "⏳ Pending"
         
         # State with icon
-        if pr.merged:
+        if pr['merged']:
             state_display = "🟣 Merged"
-        elif pr.state == "open":
+        elif pr['state'] == "open":
             state_display = "🟢 Open"
         else:
             state_display = "🔴 Closed"
         
+        title = pr['title']
+        head_ref = pr['head_ref']
         table.add_row(
-            str(pr.number),
-            pr.title[:40] + "..." if len(pr.title) > 40 else pr.title,
-            pr.user.login,
-            f"{pr.head.ref[:18]}..." if len(pr.head.ref) > 18 else pr.head.ref,
+            str(pr['number']),
+            title[:40] + "..." if len(title) > 40 else title,
+            pr['author'],
+            f"{head_ref[:18]}..." if len(head_ref) > 18 else head_ref,
             review_status,
             state_display
         )
@@ -0,0 +1,248 @@
+import time
+import sqlite3
+from datetime import datetime, timezone
+
+from rich.console import Console
+
+from cache import repo_cache_dir
+
+console = Console()
+
+DB_FILE = "mirror.sqlite"
+DEFAULT_MAX_AGE = 300  # seconds
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    number INTEGER PRIMARY KEY,
+    node_id TEXT NOT NULL,
+    kind TEXT NOT NULL,          -- 'issue' or 'pr'
+    title TEXT NOT NULL,
+    state TEXT NOT NULL,
+    author TEXT,
+    html_url TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_kind_state ON items (kind, state);
+CREATE TABLE IF NOT EXISTS item_labels (
+    number INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (number, name)
+);
+CREATE TABLE IF NOT EXISTS item_assignees (
+    number INTEGER NOT NULL,
+    login TEXT NOT NULL,
+    PRIMARY KEY (number, login)
+);
+CREATE TABLE IF NOT EXISTS repo_labels (
+    name TEXT PRIMARY KEY,
+    color TEXT,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class Item:
+    """Issue or PR as stored in the local mirror."""
+
+    def __init__(self, number, node_id, kind, title, state, author, html_url, updated_at, labels=None, assignees=None):
+        self.number = number
+        self.node_id = node_id
+        self.kind = kind
+        self.title = title
+        self.state = state
+        self.author = author
+        self.html_url = html_url
+        self.updated_at = updated_at
+        self.labels = labels or []
+        self.assignees = assignees or []
+
+    @property
+    def is_pull_request(self):
+        return self.kind == "pr"
+
+    @property
+    def assignee(self):
+        return self.assignees[0] if self.assignees else None
+
+    def __repr__(self):
+        return f"Item(#{self.number} {self.kind} {self.state} {self.title!r})"
+
+class LocalStore:
+    """Per-repo SQLite mirror of issues, PRs, labels and assignees.
+
+    Refreshed incrementally: each sync asks the issues endpoint only for
+    items updated since the last watermark.
+    """
+
+    def __init__(self, repo_full_name, path=None):
+        self.repo_full_name = repo_full_name
+        self.path = path or repo_cache_dir(repo_full_name) / DB_FILE
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path))
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # --- meta ---
+
+    def _meta(self, key):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def last_synced(self):
+        value = self._meta("last_synced")
+        return float(value) if value else None
+
+    def is_stale(self, max_age=DEFAULT_MAX_AGE):
+        last = self.last_synced()
+        return last is None or time.time() - last > max_age
+
+    # --- writes ---
+
+    def upsert_issue(self, issue):
+        """Store a PyGithub Issue after a local mutation (PRs come through the issues API too).
+
+        Reads attributes rather than raw_data, which PyGithub does not refresh on edit().
+        """
+        self._upsert(
+            issue.number, issue.node_id, "pr" if issue.pull_request else "issue", issue.title, issue.state,
+            issue.user.login if issue.user else None, issue.html_url,
+            issue.updated_at.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            [l.name for l in issue.labels], [a.login for a in issue.assignees])
+        self.db.commit()
+
+    def patch(self, number, state=None, labels=None, assignees=None):
+        """Apply a queued (not yet sent) change locally so listings reflect it right away."""
+        if state is not None:
+            self.db.execute("UPDATE items SET state = ? WHERE number = ?", (state, number))
+        if labels is not None:
+            self.db.execute("DELETE FROM item_labels WHERE number = ?", (number,))
+            self.db.executemany("INSERT OR IGNORE INTO item_labels (number, name) VALUES (?, ?)",
+                                [(number, name) for name in labels])
+        if assignees is not None:
+            self.db.execute("DELETE FROM item_assignees WHERE number = ?", (number,))
+            self.db.executemany("INSERT OR IGNORE INTO item_assignees (number, login) VALUES (?, ?)",
+                                [(number, login) for login in assignees])
+        self.db.commit()
+
+    def _upsert_raw(self, raw):
+        self._upsert(
+            raw['number'], raw['node_id'], "pr" if raw.get('pull_request') else "issue", raw['title'], raw['state'],
+            (raw.get('user') or {}).get('login'), raw.get('html_url'), raw['updated_at'],
+            [l['name'] for l in raw.get('labels', [])], [a['login'] for a in raw.get('assignees', [])])
+
+    def _upsert(self, number, node_id, kind, title, state, author, html_url, updated_at, labels, assignees):
+        self.db.execute(
+            "INSERT OR REPLACE INTO items (number, node_id, kind, title, state, author, html_url, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (number, node_id, kind, title, state, author, html_url, updated_at))
+        self.db.execute("DELETE FROM item_labels WHERE number = ?", (number,))
+        self.db.executemany("INSERT OR IGNORE INTO item_labels (number, name) VALUES (?, ?)",
+                            [(number, name) for name in labels])
+        self.db.execute("DELETE FROM item_assignees WHERE number = ?", (number,))
+        self.db.executemany("INSERT OR IGNORE INTO item_assignees (number, login) VALUES (?, ?)",
+                            [(number, login) for login in assignees])
+
+    def sync(self, repo):
+        """Pull everything updated since the last watermark. Returns the number of items written."""
+        watermark = self._meta("watermark")
+        kwargs = {"state": "all", "sort": "updated", "direction": "asc"}
+        if watermark:
+            kwargs["since"] = datetime.strptime(watermark, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+
+        count = 0
+        newest = watermark
+        for issue in repo.get_issues(**kwargs):
+            # Listed issues already hold the full JSON. PyGithub's raw_data is
+            # CompletableGithubObject.raw_data, which calls _completeIfNeeded() and so
+            # GETs the issue again: elements of a PaginatedList are not marked completed.
+            raw = issue._rawData
+            self._upsert_raw(raw)
+            if newest is None or raw['updated_at'] > newest:
+                newest = raw['updated_at']
+            count += 1
+
+        self.db.execute("DELETE FROM repo_labels")
+        self.db.executemany("INSERT OR REPLACE INTO repo_labels (name, color, description) VALUES (?, ?, ?)",
+                            [(l.name, l.color, l.description) for l in repo.get_labels()])
+        if newest:
+            self._set_meta("watermark", newest)
+        self._set_meta("last_synced", time.time())
+        self.db.commit()
+        return count
+
+    # --- reads ---
+
+    def items(self, kind="issue", state="open", label=None):
+        """Return Items of a kind ('issue', 'pr' or None for both), newest first."""
+        sql = "SELECT number, node_id, kind, title, state, author, html_url, updated_at FROM items WHERE 1=1"
+        params = []
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        if state and state != "all":
+            sql += " AND state = ?"
+            params.append(state)
+        if label:
+            sql += " AND number IN (SELECT number FROM item_labels WHERE name = ?)"
+            params.append(label)
+        sql += " ORDER BY number DESC"
+        rows = self.db.execute(sql, params).fetchall()
+        return self._hydrate(rows)
+
+    def get(self, number):
+        rows = self.db.execute(
+            "SELECT number, node_id, kind, title, state, author, html_url, updated_at FROM items WHERE number = ?",
+            (number,)).fetchall()
+        items = self._hydrate(rows)
+        return items[0] if items else None
+
+    def labels(self):
+        return [row[0] for row in self.db.execute("SELECT name FROM repo_labels ORDER BY name")]
+
+    def _hydrate(self, rows):
+        if not rows:
+            return []
+        numbers = [r[0] for r in rows]
+        labels, assignees = {}, {}
+        # Stay under SQLite's bound-parameter limit on big repos
+        for i in range(0, len(numbers), 500):
+            chunk = numbers[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for number, name in self.db.execute(
+                    f"SELECT number, name FROM item_labels WHERE number IN ({marks}) ORDER BY rowid", chunk):
+                labels.setdefault(number, []).append(name)
+            for number, login in self.db.execute(
+                    f"SELECT number, login FROM item_assignees WHERE number IN ({marks}) ORDER BY rowid", chunk):
+                assignees.setdefault(number, []).append(login)
+        return [Item(*r, labels=labels.get(r[0]), assignees=assignees.get(r[0])) for r in rows]
+
+def open_snapshot(repo_full_name):
+    """Open the mirror without syncing (offline mode). Raises if it was never synced."""
+    store = LocalStore(repo_full_name)
+    if store.last_synced() is None:
+        store.close()
+        raise RuntimeError("No local mirror yet; run a command online once first.")
+    return store
+
+def open_store(repo, refresh=False, max_age=DEFAULT_MAX_AGE):
+    """Open the mirror for a PyGithub repo, syncing it first if stale or refresh is set.
+
+    If the sync fails but an older snapshot exists, the snapshot is used.
+    """
+    store = LocalStore(repo.full_name)
+    if refresh or store.is_stale(max_age):
+        try:
+            store.sync(repo)
+        except Exception as e:
+            if store.last_synced() is None:
+                raise
+            console.print(f"[yellow]Could not refresh local mirror ({e}); showing cached data.[/]")
+    return store
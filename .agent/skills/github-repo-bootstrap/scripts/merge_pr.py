@@ -1,15 +1,59 @@
 
 import sys
 import re
+import argparse
 import questionary
 from rich.console import Console
 from rich.table import Table
-from utils import load_config, get_github_client, get_current_repo
+from utils import load_config, get_github_client, get_current_repo, add_input_flags, ask, confirm
+from repo_queries import fetch_pull_requests
 
 console = Console()
 config = load_config()
 
-def main():
+def show_prs(prs):
+    table = Table(title="Open Pull Requests")
+    table.add_column("#", style="cyan")
+    table.add_column("Title", style="green")
+    table.add_column("Author", style="magenta")
+    table.add_column("Reviews", style="yellow")
+    table.add_column("Mergeable", style="blue")
+    
+    for pr in prs:
+        review_status = "✓ Approved" if pr['review_state'] == "APPROVED" else "⏳ Pending"
+        
+        # mergeable is None while GitHub is still computing it
+        mergeable = {True: "✓", False: "✗"}.get(pr['mergeable'], "?")
+        
+        table.add_row(
+            str(pr['number']),
+            pr['title'],
+            pr['author'],
+            review_status,
+            mergeable
+        )
+    
+    console.print(table)
+
+MERGE_METHODS = {
+    "merge": "merge - Create a merge commit",
+    "squash": "squash - Squash and merge",
+    "rebase": "rebase - Rebase and merge",
+}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Merge a pull request")
+    parser.add_argument("--number", type=int, help="PR number to merge")
+    parser.add_argument("--method", choices=list(MERGE_METHODS), help="Merge method (default: merge with --no-input)")
+    parser.add_argument("--force", action="store_true",
+                        help="Merge even if GitHub reports the PR as not mergeable (--yes also confirms this)")
+    parser.add_argument("--delete-branch", action=argparse.BooleanOptionalAction, default=None,
+                        help="Delete the head branch after merging (default: yes with --yes)")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     console.print("[bold blue]Merge Pull Request[/]")
     
     try:
@@ -21,7 +65,8 @@ def main():
     
     # 1. List Open PRs
     try:
-        prs = list(repo.get_pulls(state='open'))
+        # One GraphQL page per 100 PRs, including review decision and mergeability
+        prs = fetch_pull_requests(repo.full_name, state='open')
     except Exception as e:
         console.print(f"[red]Failed to fetch PRs: {e}[/]")
         sys.exit(1)
@@ -30,64 +75,44 @@ def main():
         console.print("[yellow]No open PRs found.[/]")
         sys.exit(0)
     
-    # Display PRs in a table
-    table = Table(title="Open Pull Requests")
-    table.add_column("#", style="cyan")
-    table.add_column("Title", style="green")
-    table.add_column("Author", style="magenta")
-    table.add_column("Reviews", style="yellow")
-    table.add_column("Mergeable", style="blue")
-    
-    for pr in prs:
-        # Get review status
-        reviews = list(pr.get_reviews())
-        approved = any(r.state == "APPROVED" for r in reviews)
-        review_status = "✓ Approved" if approved else "⏳ Pending"
+    # 2. Select PR
+    if args.number is None:
+        show_prs(prs)
+        pr_choices = [f"#{pr['number']} - {pr['title']}" for pr in prs]
+        selected = ask(None, "--number", args.no_input,
+                       lambda: questionary.select("Select PR to merge:", choices=pr_choices))
         
-        # Check if mergeable
-        mergeable = "✓" if pr.mergeable else "✗"
+        if not selected:
+            sys.exit(0)
         
-        table.add_row(
-            str(pr.number),
-            pr.title,
-            pr.user.login,
-            review_status,
-            mergeable
-        )
+        pr_number = int(selected.split(" - ")[0].replace("#", ""))
+    else:
+        pr_number = args.number
+    pr_info = next((p for p in prs if p['number'] == pr_number), None)
     
-    console.print(table)
-    
-    # 2. Select PR
-    pr_choices = [f"#{pr.number} - {pr.title}" for pr in prs]
-    selected = questionary.select("Select PR to merge:", choices=pr_choices).ask()
-    
-    if not selected:
-        sys.exit(0)
-    
-    pr_number = int(selected.split(" - ")[0].replace("#", ""))
-    pr = next((p for p in prs if p.number == pr_number), None)
-    
-    if not pr:
+    if not pr_info:
         console.print("[red]PR not found.[/]")
         sys.exit(1)
     
+    # Only the selected PR is loaded over REST (needed for merge)
+    pr = repo.get_pull(pr_number)
+    
     console.print(f"\n[bold]Merging PR #{pr.number}:[/] {pr.title}")
     console.print(f"[dim]Branch: {pr.head.ref} → {pr.base.ref}[/]")
     
     # 3. Check if mergeable
-    if not pr.mergeable:
+    if pr_info['mergeable'] is False and not args.force:
         console.print("[red]⚠ PR is not mergeable (conflicts or checks failed)[/]")
-        if not questionary.confirm("Continue anyway?").ask():
+        if args.no_input and not args.yes:
+            console.print("[red]Use --force (or --yes) to merge anyway.[/]")
+            sys.exit(1)
+        if not confirm(args, lambda: questionary.confirm("Continue anyway?")):
             sys.exit(0)
     
     # 4. Choose merge method
-    merge_methods = [
-        "merge - Create a merge commit",
-        "squash - Squash and merge",
-        "rebase - Rebase and merge"
-    ]
-    
-    method_choice = questionary.select("Merge method:", choices=merge_methods).ask()
+    method_choice = ask(MERGE_METHODS.get(args.method), "--method", args.no_input,
+                        lambda: questionary.select("Merge method:", choices=list(MERGE_METHODS.values())),
+                        default=MERGE_METHODS["merge"])
     
     if not method_choice:
         sys.exit(0)
@@ -100,7 +125,7 @@ def main():
     console.print(f"  Method: [cyan]{merge_method}[/]")
     console.print(f"  Branch: {pr.head.ref} → {pr.base.ref}")
     
-    if not questionary.confirm("Proceed with merge?").ask():
+    if not confirm(args, lambda: questionary.confirm("Proceed with merge?")):
         console.print("[yellow]Merge cancelled.[/]")
         sys.exit(0)
     
@@ -121,7 +146,10 @@ def main():
              console.print(f"[yellow]Failed to switch/update branch: {e}[/]")
         
         # 7. Delete branch (optional)
-        if questionary.confirm(f"Delete branch '{pr.head.ref}'?", default=True).ask():
+        delete_branch = args.delete_branch
+        if delete_branch is None:
+            delete_branch = confirm(args, lambda: questionary.confirm(f"Delete branch '{pr.head.ref}'?", default=True))
+        if delete_branch:
             try:
                 ref = repo.get_git_ref(f"heads/{pr.head.ref}")
                 ref.delete()
@@ -147,12 +175,12 @@ def main():
             if proj_conf.get('enabled'):
                  try:
                      from bootstrap import ensure_project_v2
-                     from project_utils import set_project_item_status, find_project_item_by_content
+                     from project_utils import set_items_status, find_project_item_by_content, BATCH_SIZE
                      
                      project_title = proj_conf.get('title') or repo.name
                      console.print(f"Updating project '{project_title}' status...")
                      
-                     proj_action = ensure_project_v2(g.get_user().login, project_title)
+                     proj_action = ensure_project_v2(g.get_user().login, project_title, repo.full_name)
                      
                      project_id = None
                      if proj_action['type'] == 'EXISTS':
@@ -162,11 +190,13 @@ def main():
                          project_id = result['id']
                          
                      if project_id:
-                         # Update PR Status
+                         # Collect both items, then update them in one batched mutation
+                         statuses = []
+                         names = {}
                          pr_item_id = find_project_item_by_content(project_id, pr.raw_data['node_id'])
                          if pr_item_id:
-                             set_project_item_status(project_id, pr_item_id, "Done")
-                             console.print(f"[green]Set PR #{pr.number} status to Done[/]")
+                             statuses.append((pr_item_id, "Done"))
+                             names[pr_item_id] = f"PR #{pr.number}"
                          
                          # Update Linked Issue Status
                          if matches:
@@ -175,10 +205,17 @@ def main():
                                  linked_issue = repo.get_issue(issue_num)
                                  issue_item_id = find_project_item_by_content(project_id, linked_issue.raw_data['node_id'])
                                  if issue_item_id:
-                                     set_project_item_status(project_id, issue_item_id, "Done")
-                                     console.print(f"[green]Set Issue #{issue_num} status to Done[/]")
+                                     statuses.append((issue_item_id, "Done"))
+                                     names[issue_item_id] = f"Issue #{issue_num}"
                              except Exception as e:
                                  console.print(f"[yellow]Failed to update linked issue: {e}[/]")
+                         
+                         results = set_items_status(project_id, statuses, proj_conf.get('batch_size', BATCH_SIZE))
+                         for item_id, outcome in results.items():
+                             if outcome is True:
+                                 console.print(f"[green]Set {names[item_id]} status to Done[/]")
+                             else:
+                                 console.print(f"[yellow]Failed to update {names[item_id]}: {outcome}[/]")
                  except Exception as e:
                      console.print(f"[yellow]Failed to update project status: {e}[/]")
 
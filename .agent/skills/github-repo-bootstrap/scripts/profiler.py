@@ -0,0 +1,154 @@
+"""
+API call accounting for `gh-skill.py --profile`.
+Counts the REST and GraphQL requests of one command with their latency, bytes,
+cache hits and GraphQL rate-limit cost, and reports them when the command exits.
+
+Only the standard library is imported here; the transports (http_cache for
+PyGithub, graphql_client for GraphQL) call record() and the report loads rich.
+"""
+
+import re
+import json
+import time
+import threading
+from urllib.parse import urlsplit
+
+# Added to GraphQL queries while profiling so the response carries the query's cost
+COST_ALIAS = "_profileCost"
+COST_SELECTION = f" {COST_ALIAS}: rateLimit {{ cost }}"
+
+_REPO_RE = re.compile(r'/repos/[^/]+/[^/]+')
+_SEGMENT_RE = re.compile(r'/(?:\d+|[0-9a-f]{40})(?=/|$)')
+
+def rest_operation(method, url):
+    """Route label of a REST call, e.g. 'GET /repos/{owner}/{repo}/issues/{n}'."""
+    path = _REPO_RE.sub("/repos/{owner}/{repo}", urlsplit(url).path.rstrip("/"), count=1)
+    return f"{method} {_SEGMENT_RE.sub('/{n}', path)}"
+
+def with_cost(query):
+    """The query with a rateLimit { cost } selection added, or None if it cannot carry one.
+
+    rateLimit is a Query field, so mutations are left alone.
+    """
+    stripped = query.lstrip()
+    if stripped.startswith("mutation") or "rateLimit" in query:
+        return None
+    end = query.rfind("}")
+    if end < 0:
+        return None
+    return query[:end] + COST_SELECTION + " " + query[end:]
+
+def percentile(values, pct):
+    """Nearest-rank percentile of values (0.0 for none)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+class Profiler:
+    """Collects one entry per API request made by this process."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.started = clock()
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def record(self, kind, operation, ms, sent=0, received=0, status=None, cached=False, cost=None):
+        """Add a request; kind is 'rest' or 'graphql', cost the GraphQL points if known."""
+        with self._lock:
+            self.calls.append({"kind": kind, "operation": operation, "ms": round(ms, 2), "sent": sent,
+                               "received": received, "status": status, "cached": cached, "cost": cost})
+
+    @staticmethod
+    def _totals(calls):
+        latencies = [c['ms'] for c in calls]
+        costs = [c['cost'] for c in calls if c['cost'] is not None]
+        return {
+            "calls": len(calls),
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "total_ms": round(sum(latencies), 1),
+            "sent_bytes": sum(c['sent'] for c in calls),
+            "received_bytes": sum(c['received'] for c in calls),
+            "cache_hits": sum(c['cached'] for c in calls),
+            "errors": sum(1 for c in calls if c['status'] is not None and c['status'] >= 400),
+            "cost": sum(costs) if costs else None,
+        }
+
+    def summary(self):
+        """Totals per kind and per operation, busiest operations first."""
+        with self._lock:
+            calls = list(self.calls)
+        operations = {}
+        for call in calls:
+            operations.setdefault((call['kind'], call['operation']), []).append(call)
+        rows = [{"kind": kind, "operation": op, **self._totals(group)} for (kind, op), group in operations.items()]
+        rows.sort(key=lambda r: (-r['calls'], -r['total_ms']))
+        return {
+            "seconds": round(self.clock() - self.started, 3),
+            "totals": {
+                "all": self._totals(calls),
+                "rest": self._totals([c for c in calls if c['kind'] == "rest"]),
+                "graphql": self._totals([c for c in calls if c['kind'] == "graphql"]),
+            },
+            "operations": rows,
+        }
+
+    def report(self, command, argv=(), exit_code=0):
+        """The JSON-serialisable profile of a finished command."""
+        with self._lock:
+            calls = list(self.calls)
+        return {"command": command, "argv": list(argv), "exit": exit_code, **self.summary(), "calls": calls}
+
+    def print_report(self, command, console=None):
+        from rich.console import Console
+        from rich.table import Table
+        # stderr keeps NDJSON and other machine-readable stdout clean
+        console = console or Console(stderr=True)
+        summary = self.summary()
+        table = Table(title=f"API profile: {command}")
+        table.add_column("Operation", style="green")
+        for column in ("Calls", "p50 ms", "p95 ms", "KB sent", "KB recv", "Cache hits", "Cost"):
+            table.add_column(column, justify="right")
+
+        def add(label, t, **kwargs):
+            table.add_row(label, str(t['calls']), f"{t['p50_ms']:.0f}", f"{t['p95_ms']:.0f}",
+                          f"{t['sent_bytes'] / 1024:.1f}", f"{t['received_bytes'] / 1024:.1f}",
+                          str(t['cache_hits']), "-" if t['cost'] is None else str(t['cost']), **kwargs)
+
+        for row in summary['operations']:
+            add(row['operation'], row)
+        table.add_section()
+        add("REST", summary['totals']['rest'], style="bold")
+        add("GraphQL", summary['totals']['graphql'], style="bold")
+        console.print(table)
+        total = summary['totals']['all']
+        console.print(f"[dim]{total['calls']} request(s), {total['errors']} failed, "
+                      f"{total['total_ms'] / 1000:.2f}s in requests, {summary['seconds']:.2f}s total[/]")
+
+_profiler = None
+
+def enable():
+    """Start collecting for this process and return the profiler."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+def disable():
+    global _profiler
+    _profiler = None
+
+def active():
+    """The running profiler, or None when --profile was not given."""
+    return _profiler
+
+def record(kind, operation, ms, **kwargs):
+    if _profiler is not None:
+        _profiler.record(kind, operation, ms, **kwargs)
+
+def write_json(path, report):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
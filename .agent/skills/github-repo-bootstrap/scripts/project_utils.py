@@ -1,31 +1,22 @@
+import re
+import threading
 
-import json
-import subprocess
 from rich.console import Console
+from graphql_client import gql_request, GraphQLError
+from cache import forget_project, schema_cache, item_index_cache
 
 console = Console()
 
-def gql_request(query, variables=None):
-    """Execute GraphQL query using gh CLI."""
-    input_data = {'query': query, 'variables': variables or {}}
-    input_json = json.dumps(input_data)
-    
-    try:
-        # gh api graphql --input -
-        res = subprocess.run(
-            ["gh", "api", "graphql", "--input", "-"],
-            input=input_json,
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        return json.loads(res.stdout)
-    except subprocess.CalledProcessError as e:
-        console.print(f"[red]GraphQL Request Failed: {e.stderr}[/]")
-        raise
-    except json.JSONDecodeError as e:
-        console.print(f"[red]Failed to decode GraphQL response: {e}[/]")
-        raise
+def forget_project_on_not_found(project_id, error):
+    """Drop cached entries for project_id if the API says the project no longer exists."""
+    if not isinstance(error, GraphQLError) or 'NOT_FOUND' not in error.types:
+        return False
+    if not any(project_id in (e.get('message') or '') for e in error.errors):
+        return False
+    with _index_lock:
+        _item_indexes.pop(project_id, None)
+        _item_lookups.pop(project_id, None)
+    return forget_project(project_id) > 0
 
 def get_project_fields(project_id):
     """Get all fields for a project."""
@@ -66,99 +57,276 @@ def get_project_fields(project_id):
     res = gql_request(query, {"projectId": project_id})
     return res['data']['node']['fields']['nodes']
 
+def index_project_fields(fields):
+    """Index fields as {name: {"id": ..., "options": {lowercased option name: option id}}}."""
+    index = {}
+    for f in fields:
+        if not f.get('id') or not f.get('name'):
+            continue
+        options = {opt['name'].lower(): opt['id'] for opt in f.get('options', [])}
+        index[f['name']] = {"id": f['id'], "options": options}
+    return index
+
+def get_project_schema(project_id, refresh=False):
+    """Return the indexed field schema of a project, cached on disk next to the project."""
+    cache = schema_cache(project_id)
+    if not refresh:
+        cached = cache.get("fields")
+        if cached is not None:
+            return cached
+    index = index_project_fields(get_project_fields(project_id))
+    cache.set("fields", index)
+    return index
+
+def invalidate_project_schema(project_id):
+    schema_cache(project_id).invalidate("fields")
+
+def resolve_field_option(project_id, field_name, option_name):
+    """Return (field_id, option_id) for a single-select value; either may be None.
+
+    A miss on the cached schema triggers one lazy refresh, so options added in
+    the web UI are picked up without waiting for the TTL.
+    """
+    schema = get_project_schema(project_id)
+    for attempt in range(2):
+        field = schema.get(field_name)
+        option_id = field['options'].get(option_name.lower()) if field else None
+        if option_id or attempt:
+            return (field['id'] if field else None), option_id
+        schema = get_project_schema(project_id, refresh=True)
+
 def set_project_item_status(project_id, item_id, status_name):
     """Set the status of a project item."""
     try:
-        fields = get_project_fields(project_id)
-        status_field = next((f for f in fields if f['name'] == "Status"), None)
-        
-        if not status_field:
-            console.print("[yellow]Status field not found in project.[/]")
-            return False
-            
-        # Find option ID for the status name (case-insensitive)
-        option = next((opt for opt in status_field.get('options', []) 
-                      if opt['name'].lower() == status_name.lower()), None)
-                      
-        if not option:
-            console.print(f"[yellow]Status '{status_name}' not found in project options.[/]")
-            return False
-            
-        mutation = """
-        mutation($projectId: ID!, $itemId: ID!, $fieldId: ID!, $optionId: String!) {
-          updateProjectV2ItemFieldValue(
-            input: {
-              projectId: $projectId
-              itemId: $itemId
-              fieldId: $fieldId
-              value: {
-                singleSelectOptionId: $optionId
+        for attempt in range(2):
+            field_id, option_id = resolve_field_option(project_id, "Status", status_name)
+
+            if not field_id:
+                console.print("[yellow]Status field not found in project.[/]")
+                return False
+
+            if not option_id:
+                console.print(f"[yellow]Status '{status_name}' not found in project options.[/]")
+                return False
+
+            mutation = """
+            mutation($projectId: ID!, $itemId: ID!, $fieldId: ID!, $optionId: String!) {
+              updateProjectV2ItemFieldValue(
+                input: {
+                  projectId: $projectId
+                  itemId: $itemId
+                  fieldId: $fieldId
+                  value: {
+                    singleSelectOptionId: $optionId
+                  }
+                }
+              ) {
+                projectV2Item {
+                  id
+                }
               }
             }
-          ) {
-            projectV2Item {
-              id
-            }
-          }
-        }
-        """
-        
-        gql_request(mutation, {
-            "projectId": project_id,
-            "itemId": item_id,
-            "fieldId": status_field['id'],
-            "optionId": option['id']
-        })
-        console.print(f"[green]Set item status to '{status_name}'[/]")
-        return True
+            """
+
+            try:
+                gql_request(mutation, {
+                    "projectId": project_id,
+                    "itemId": item_id,
+                    "fieldId": field_id,
+                    "optionId": option_id
+                })
+            except GraphQLError as e:
+                # A stale field or option ID: drop the schema and retry once with fresh IDs
+                if attempt or not is_stale_schema_error(e, (field_id, option_id)):
+                    raise
+                invalidate_project_schema(project_id)
+                continue
+            console.print(f"[green]Set item status to '{status_name}'[/]")
+            return True
         
     except Exception as e:
+        forget_project_on_not_found(project_id, e)
         console.print(f"[red]Failed to set status: {e}[/]")
         return False
 
-def find_project_item_by_content(project_id, content_id):
-    """Find a project item ID by its content (issue/PR) node ID."""
-    # Note: ProjectV2 doesn't have a direct lookup by content ID in the same way.
-    # We have to fetch items and filter, which is inefficient but standard for V2 API currently.
-    # Or we can use the node(id: contentId) { projectItems } query which is better!
-    
-    query = """
-    query($contentId: ID!) {
-      node(id: $contentId) {
-        ... on Issue {
-          projectItems(first: 10, includeArchived: false) {
-            nodes {
-              id
-              project {
-                id
-              }
-            }
-          }
-        }
-        ... on PullRequest {
-          projectItems(first: 10, includeArchived: false) {
-            nodes {
-              id
-              project {
-                id
-              }
-            }
+# GitHub's wording for an option ID the field no longer has, and for an unknown field node ID
+_STALE_SCHEMA_RE = re.compile(r"single select option id|global id of '(?:PVTSSF|PVTIF|PVTF)_", re.I)
+
+def is_stale_schema_message(message, ids=()):
+    """True if an error message rejects a cached field or option ID.
+
+    ids are the field/option IDs the request used; a message naming one of them
+    counts, as do GitHub's invalid-option and unknown-field-node errors. Other
+    validation errors (which often mention "field") do not.
+    """
+    message = message or ''
+    return any(i and i in message for i in ids) or bool(_STALE_SCHEMA_RE.search(message))
+
+def is_stale_schema_error(error, ids=()):
+    """True if a mutation failed because a cached field or option ID is no longer valid."""
+    return any(is_stale_schema_message(e.get('message'), ids) for e in error.errors)
+
+ITEMS_PAGE_SIZE = 100
+
+ITEM_IDS_QUERY = """
+query($projectId: ID!, $first: Int!, $after: String) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      items(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          id
+          isArchived
+          content {
+            ... on Issue { id }
+            ... on PullRequest { id }
+            ... on DraftIssue { id }
           }
         }
       }
     }
+  }
+}
+"""
+
+CONTENT_ITEMS_QUERY = """
+query($contentId: ID!, $after: String) {
+  node(id: $contentId) {
+    ... on Issue {
+      projectItems(first: 100, after: $after, includeArchived: false) {
+        pageInfo { hasNextPage endCursor }
+        nodes { id project { id } }
+      }
+    }
+    ... on PullRequest {
+      projectItems(first: 100, after: $after, includeArchived: false) {
+        pageInfo { hasNextPage endCursor }
+        nodes { id project { id } }
+      }
+    }
+  }
+}
+"""
+
+# project ID -> {content node ID: item ID}, loaded once per process
+_item_indexes = {}
+# project ID -> {content node ID: item ID} found one at a time while no full index is loaded
+_item_lookups = {}
+_index_lock = threading.RLock()
+
+def scan_item_index(project_id, page_size=ITEMS_PAGE_SIZE):
+    """Build {content node ID: item ID} from a full scan of the project's items."""
+    index = {}
+    after = None
+    while True:
+        try:
+            res = gql_request(ITEM_IDS_QUERY, {"projectId": project_id, "first": page_size, "after": after})
+        except GraphQLError as e:
+            forget_project_on_not_found(project_id, e)
+            raise
+        conn = res['data']['node']['items']
+        for node in conn['nodes']:
+            content_id = (node.get('content') or {}).get('id')
+            if content_id and not node.get('isArchived'):
+                index[content_id] = node['id']
+        if not conn['pageInfo']['hasNextPage']:
+            return index
+        after = conn['pageInfo']['endCursor']
+
+def _loaded_item_index(project_id):
+    """The full index from memory or the disk cache, or None; never scans."""
+    with _index_lock:
+        index = _item_indexes.get(project_id)
+        if index is None:
+            index = item_index_cache(project_id).get("items")
+            if index is not None:
+                _item_indexes[project_id] = index
+        return index
+
+def _loaded_item_lookups(project_id):
+    with _index_lock:
+        lookups = _item_lookups.get(project_id)
+        if lookups is None:
+            lookups = _item_lookups[project_id] = item_index_cache(project_id).get("lookups") or {}
+        return lookups
+
+def get_item_index(project_id, refresh=False):
+    """The content -> item index of a project: from memory, the disk cache, or a full scan.
+
+    Meant for callers that need many items of the project (close_issue's bulk
+    mode); a single item is cheaper through find_project_item_by_content.
     """
-    res = gql_request(query, {"contentId": content_id})
-    
-    if not res.get('data') or not res['data'].get('node'):
-        return None
-        
-    items = res['data']['node'].get('projectItems', {}).get('nodes', [])
-    
-    # Find item belonging to our project
-    target_item = next((item for item in items if item['project']['id'] == project_id), None)
-    
-    return target_item['id'] if target_item else None
+    with _index_lock:
+        index = None if refresh else _loaded_item_index(project_id)
+        if index is None:
+            index = scan_item_index(project_id)
+            cache = item_index_cache(project_id)
+            cache.set("items", index)
+            # The scan covers everything found one at a time
+            cache.invalidate("lookups")
+            _item_lookups.pop(project_id, None)
+        _item_indexes[project_id] = index
+        return index
+
+def remember_project_items(project_id, items):
+    """Add {content node ID: item ID} pairs to the index (in memory and on disk).
+
+    Without a full index they are kept as single lookups until a scan replaces them.
+    """
+    if not items:
+        return
+    with _index_lock:
+        index = _loaded_item_index(project_id)
+        key = "items"
+        if index is None:
+            index, key = _loaded_item_lookups(project_id), "lookups"
+        index.update(items)
+        item_index_cache(project_id).set(key, index)
+
+def forget_project_items(project_id, item_ids):
+    """Drop items from the index, e.g. after an update on them failed (removed from the board)."""
+    item_ids = set(item_ids)
+    with _index_lock:
+        for key, index in (("items", _loaded_item_index(project_id)), ("lookups", _loaded_item_lookups(project_id))):
+            if not index or not item_ids & set(index.values()):
+                continue
+            for content_id in [c for c, i in index.items() if i in item_ids]:
+                del index[content_id]
+            item_index_cache(project_id).set(key, index)
+
+def _lookup_item_by_content(project_id, content_id):
+    """Page through the content's projectItems for the one in project_id."""
+    after = None
+    while True:
+        res = gql_request(CONTENT_ITEMS_QUERY, {"contentId": content_id, "after": after})
+        node = (res.get('data') or {}).get('node')
+        if not node or 'projectItems' not in node:
+            return None
+        conn = node['projectItems']
+        target = next((item for item in conn['nodes'] if item['project']['id'] == project_id), None)
+        if target:
+            return target['id']
+        if not conn['pageInfo']['hasNextPage']:
+            return None
+        after = conn['pageInfo']['endCursor']
+
+def find_project_item_by_content(project_id, content_id):
+    """Find a project item ID by its content (issue/PR) node ID.
+
+    Answered from the project's item index or earlier lookups when they have
+    it. Otherwise the content's projectItems are paged through (one request
+    for most issues, however large the board) and the result is remembered;
+    the project's items are not scanned.
+    """
+    with _index_lock:
+        item_id = (_loaded_item_index(project_id) or {}).get(content_id) \
+            or _loaded_item_lookups(project_id).get(content_id)
+    if item_id:
+        return item_id
+    item_id = _lookup_item_by_content(project_id, content_id)
+    if item_id:
+        remember_project_items(project_id, {content_id: item_id})
+    return item_id
 
 def add_item_to_project(project_id, content_id):
     """Add an item (Issue/PR) to the project and return the item ID."""
@@ -169,5 +337,207 @@ def add_item_to_project(project_id, content_id):
       }
     }
     """
-    res = gql_request(query, {"projectId": project_id, "contentId": content_id})
-    return res['data']['addProjectV2ItemById']['item']['id']
+    try:
+        res = gql_request(query, {"projectId": project_id, "contentId": content_id})
+    except GraphQLError as e:
+        forget_project_on_not_found(project_id, e)
+        raise
+    item_id = res['data']['addProjectV2ItemById']['item']['id']
+    remember_project_items(project_id, {content_id: item_id})
+    return item_id
+
+BATCH_SIZE = 50
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+def batch_project_mutations(project_id, updates=(), adds=(), chunk_size=BATCH_SIZE):
+    """Apply many item additions and field updates as aliased GraphQL mutations.
+
+    updates: (item_id, field_id, value) tuples, where value is a ProjectV2FieldValue
+             input such as {"singleSelectOptionId": "..."}.
+    adds: content node IDs to add to the project.
+
+    Each chunk of chunk_size operations is sent as one document, so N operations
+    cost ceil(N / chunk_size) round trips. Additions run before updates.
+    Returns {"added": {content_id: item_id}, "updated": [item_id, ...],
+             "errors": {content_id or item_id: message}}.
+    """
+    ops = [("add", content_id, None, None) for content_id in adds]
+    ops += [("update", item_id, field_id, value) for item_id, field_id, value in updates]
+    result = {"added": {}, "updated": [], "errors": {}}
+
+    for chunk in _chunks(ops, max(1, chunk_size or BATCH_SIZE)):
+        params = ["$projectId: ID!"]
+        fields = []
+        variables = {"projectId": project_id}
+        aliases = {}
+        for i, (kind, key, field_id, value) in enumerate(chunk):
+            alias = f"op{i}"
+            aliases[alias] = (kind, key)
+            if kind == "add":
+                params.append(f"$content{i}: ID!")
+                variables[f"content{i}"] = key
+                fields.append(f"{alias}: addProjectV2ItemById(input: {{projectId: $projectId, contentId: $content{i}}}) {{ item {{ id }} }}")
+            else:
+                params += [f"$item{i}: ID!", f"$field{i}: ID!", f"$value{i}: ProjectV2FieldValue!"]
+                variables.update({f"item{i}": key, f"field{i}": field_id, f"value{i}": value})
+                fields.append(f"{alias}: updateProjectV2ItemFieldValue(input: {{projectId: $projectId, itemId: $item{i}, fieldId: $field{i}, value: $value{i}}}) {{ projectV2Item {{ id }} }}")
+        mutation = f"mutation({', '.join(params)}) {{\n  " + "\n  ".join(fields) + "\n}"
+
+        try:
+            res = gql_request(mutation, variables, allow_partial=True)
+        except GraphQLError as e:
+            forget_project_on_not_found(project_id, e)
+            for kind, key in aliases.values():
+                result["errors"][key] = str(e)
+            continue
+
+        for err in res.get('errors', []):
+            path = err.get('path') or []
+            if path and path[0] in aliases:
+                result["errors"][aliases[path[0]][1]] = err.get('message', 'Unknown error')
+        data = res.get('data') or {}
+        for alias, (kind, key) in aliases.items():
+            node = data.get(alias)
+            if not node:
+                result["errors"].setdefault(key, "No result returned")
+            elif kind == "add":
+                result["added"][key] = node['item']['id']
+            else:
+                result["updated"].append(key)
+
+    remember_project_items(project_id, result["added"])
+    forget_project_items(project_id, [k for kind, k, _, _ in ops if kind == "update" and k in result["errors"]])
+    return result
+
+def set_items_status(project_id, statuses, chunk_size=BATCH_SIZE):
+    """Set the Status of many items in as few round trips as possible.
+
+    statuses: (item_id, status_name) pairs. Returns {item_id: True or error message}.
+    """
+    return set_items_field(project_id, "Status", statuses, chunk_size)
+
+def set_items_field(project_id, field_name, values, chunk_size=BATCH_SIZE):
+    """Set a single-select field (Status, Priority, ...) of many items in batched mutations.
+
+    values: (item_id, option_name) pairs. Returns {item_id: True or error message}.
+    """
+    results = {}
+    updates = []
+    for item_id, option_name in values:
+        field_id, option_id = resolve_field_option(project_id, field_name, option_name)
+        if not field_id:
+            results[item_id] = f"{field_name} field not found in project."
+        elif not option_id:
+            results[item_id] = f"{field_name} '{option_name}' not found in project options."
+        else:
+            updates.append((item_id, field_id, {"singleSelectOptionId": option_id}))
+
+    if updates:
+        res = batch_project_mutations(project_id, updates=updates, chunk_size=chunk_size)
+        for item_id in res["updated"]:
+            results[item_id] = True
+        for item_id, message in res["errors"].items():
+            results[item_id] = message
+        ids = {i for _, field_id, value in updates for i in (field_id, value['singleSelectOptionId'])}
+        if any(is_stale_schema_message(m, ids) for m in res["errors"].values()):
+            invalidate_project_schema(project_id)
+    return results
+
+# Pages fetched ahead of the consumer
+PREFETCH_PAGES = 2
+
+PROJECT_ITEMS_QUERY = """
+query($projectId: ID!, $first: Int!, $after: String) {
+  node(id: $projectId) {
+    ... on ProjectV2 {
+      items(first: $first, after: $after) {
+        totalCount
+        pageInfo { hasNextPage endCursor }
+        nodes {
+          id
+          type
+          isArchived
+          status: fieldValueByName(name: "Status") { ... on ProjectV2ItemFieldSingleSelectValue { name } }
+          priority: fieldValueByName(name: "Priority") { ... on ProjectV2ItemFieldSingleSelectValue { name } }
+          content {
+            ... on Issue { number title state url }
+            ... on PullRequest { number title state url }
+            ... on DraftIssue { title }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+def _board_item(node):
+    content = node.get('content') or {}
+    return {
+        "id": node['id'],
+        "type": node['type'],
+        "number": content.get('number'),
+        "title": content.get('title') or "",
+        "state": content.get('state'),
+        "url": content.get('url'),
+        "status": (node.get('status') or {}).get('name'),
+        "priority": (node.get('priority') or {}).get('name'),
+    }
+
+def iter_project_items(project_id, page_size=ITEMS_PAGE_SIZE, prefetch=PREFETCH_PAGES):
+    """Yield (items, total_count) per page of a project's items, archived ones left out.
+
+    A background thread follows the cursor and keeps up to prefetch pages
+    ready, so the next request is in flight while the caller renders the
+    current page. Errors are raised from the generator.
+    """
+    import queue
+    import threading
+
+    pages = queue.Queue(maxsize=max(1, prefetch))
+    stop = threading.Event()
+    done = object()
+
+    def put(entry):
+        while not stop.is_set():
+            try:
+                pages.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch():
+        after = None
+        try:
+            while True:
+                res = gql_request(PROJECT_ITEMS_QUERY, {"projectId": project_id, "first": page_size, "after": after})
+                conn = res['data']['node']['items']
+                items = [_board_item(n) for n in conn['nodes'] if not n.get('isArchived')]
+                if not put((items, conn['totalCount'])):
+                    return
+                if not conn['pageInfo']['hasNextPage']:
+                    break
+                after = conn['pageInfo']['endCursor']
+        except Exception as e:
+            if isinstance(e, GraphQLError):
+                forget_project_on_not_found(project_id, e)
+            put(e)
+            return
+        put(done)
+
+    threading.Thread(target=fetch, name="project-items", daemon=True).start()
+    try:
+        while True:
+            entry = pages.get()
+            if entry is done:
+                return
+            if isinstance(entry, Exception):
+                raise entry
+            yield entry
+    finally:
+        # Let the fetcher exit if the caller stops early
+        stop.set()
@@ -0,0 +1,189 @@
+import os
+import json
+import time
+import atexit
+import random
+import threading
+
+import requests
+import requests.adapters
+from rich.console import Console
+
+console = Console()
+
+LOW_WATERMARK = 100       # start pacing when fewer requests than this remain
+SECONDARY_WAIT = 60.0     # GitHub asks for at least a minute after a secondary limit
+MAX_BACKOFF = 900.0
+MAX_RETRIES = 5
+
+class RateLimitScheduler:
+    """Paces requests against GitHub's primary and secondary rate limits.
+
+    Tracks the remaining budget per resource (core, graphql, search) from the
+    X-RateLimit-* headers, spreads the last requests of a window over the time
+    left until reset, retries 403/429 limit responses honoring Retry-After
+    with jittered backoff, and serializes content-creating requests.
+    """
+
+    def __init__(self, low_watermark=LOW_WATERMARK, secondary_wait=SECONDARY_WAIT, max_backoff=MAX_BACKOFF,
+                 max_retries=MAX_RETRIES, serialize_writes=True, write_interval=0.0,
+                 sleep=time.sleep, clock=time.time):
+        self.low_watermark = low_watermark
+        self.secondary_wait = secondary_wait
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self.serialize_writes = serialize_writes
+        self.write_interval = write_interval
+        self.sleep = sleep
+        self.clock = clock
+        # resource -> {"remaining": int, "limit": int, "reset": epoch seconds}
+        self.budget = {}
+        self.throttled_seconds = 0.0
+        self.retries = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._last_write = 0.0
+
+    def _wait(self, seconds, reason):
+        if seconds <= 0:
+            return
+        if seconds >= 1:
+            console.print(f"[dim]{reason}; waiting {seconds:.0f}s[/]")
+        self.sleep(seconds)
+        with self._lock:
+            self.throttled_seconds += seconds
+
+    def pace(self, resource):
+        """Sleep before a request if the resource's budget is running low."""
+        with self._lock:
+            budget = self.budget.get(resource)
+        if not budget or budget['remaining'] > self.low_watermark:
+            return
+        until_reset = budget['reset'] - self.clock()
+        if until_reset <= 0:
+            return
+        if budget['remaining'] <= 0:
+            self._wait(min(until_reset + 1, self.max_backoff), f"Rate limit for '{resource}' exhausted")
+        else:
+            # Spread what is left evenly over the rest of the window
+            self._wait(until_reset / budget['remaining'], f"Rate limit for '{resource}' low ({budget['remaining']} left)")
+
+    def record(self, headers):
+        """Update the budget from a response's X-RateLimit-* headers."""
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        resource = headers.get('X-RateLimit-Resource', 'core')
+        with self._lock:
+            self.budget[resource] = {
+                "remaining": int(remaining),
+                "limit": int(headers.get('X-RateLimit-Limit', 0)),
+                "reset": float(reset),
+            }
+
+    def retry_delay(self, status, headers, text, attempt):
+        """Seconds to wait before retrying a rate-limited response, or None if not rate-limited."""
+        graphql_limited = '"RATE_LIMITED"' in text
+        if status not in (403, 429) and not (status == 200 and graphql_limited):
+            return None
+        retry_after = headers.get('Retry-After')
+        if retry_after:
+            return float(retry_after) + random.uniform(0, 1)
+        if headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset'):
+            return max(float(headers['X-RateLimit-Reset']) - self.clock(), 0) + 1
+        if status == 429 or graphql_limited or 'rate limit' in text.lower():
+            backoff = min(self.max_backoff, self.secondary_wait * (2 ** attempt))
+            return backoff * random.uniform(1.0, 1.25)
+        # A plain 403 is a permission error, not a limit
+        return None
+
+    def run(self, send, resource="core", content_creating=False, inspect_body=True):
+        """Call send() under the scheduler and return the final response."""
+        for attempt in range(self.max_retries + 1):
+            self.pace(resource)
+            if content_creating and self.serialize_writes:
+                with self._write_lock:
+                    gap = self._last_write + self.write_interval - self.clock()
+                    if gap > 0:
+                        self._wait(gap, "Spacing content-creating requests")
+                    response = send()
+                    self._last_write = self.clock()
+            else:
+                response = send()
+
+            self.record(response.headers)
+            # GraphQL reports secondary limits as a 200 with a RATE_LIMITED error
+            text = ""
+            if inspect_body and (response.status_code in (403, 429) or
+                                 (response.status_code == 200 and resource == "graphql")):
+                text = response.text
+            delay = self.retry_delay(response.status_code, response.headers, text, attempt)
+            if delay is None or attempt == self.max_retries:
+                return response
+            with self._lock:
+                self.retries += 1
+            self._wait(delay, f"Rate limited (HTTP {response.status_code})")
+        return response
+
+def _resource(url):
+    if url.rstrip('/').endswith('/graphql'):
+        return "graphql"
+    if '/search/' in url:
+        return "search"
+    return "core"
+
+def is_content_creating(request):
+    """REST writes and GraphQL mutations count toward GitHub's content-creation limits."""
+    if request.method in ("POST", "PATCH", "PUT", "DELETE") and _resource(request.url) != "graphql":
+        return True
+    if _resource(request.url) == "graphql" and request.body:
+        try:
+            body = request.body.decode() if isinstance(request.body, bytes) else request.body
+            return json.loads(body).get('query', '').lstrip().startswith('mutation')
+        except (ValueError, AttributeError):
+            return False
+    return False
+
+class ScheduledAdapter(requests.adapters.HTTPAdapter):
+    """HTTPAdapter that sends every request through the shared RateLimitScheduler."""
+
+    def __init__(self, scheduler=None, **kwargs):
+        super().__init__(**kwargs)
+        self.scheduler = scheduler
+
+    def send(self, request, stream=False, **kwargs):
+        scheduler = self.scheduler or get_scheduler()
+        return scheduler.run(
+            lambda: super(ScheduledAdapter, self).send(request, stream=stream, **kwargs),
+            resource=_resource(request.url),
+            content_creating=is_content_creating(request),
+            inspect_body=not stream,
+        )
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """Process-wide scheduler shared by the REST client and the GraphQL transport."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                from utils import load_config
+                conf = load_config().get('rate_limit', {})
+                _scheduler = RateLimitScheduler(
+                    low_watermark=conf.get('low_watermark', LOW_WATERMARK),
+                    secondary_wait=conf.get('secondary_wait', SECONDARY_WAIT),
+                    max_retries=conf.get('max_retries', MAX_RETRIES),
+                    serialize_writes=conf.get('serialize_writes', True),
+                    write_interval=conf.get('write_interval', 0.0),
+                )
+                if os.getenv("GH_SKILL_TIMING"):
+                    atexit.register(print_throttle_report)
+    return _scheduler
+
+def print_throttle_report():
+    if _scheduler is None:
+        return
+    console.print(f"[dim]Rate limit: {_scheduler.throttled_seconds:.1f}s throttled, {_scheduler.retries} retry(ies)[/]")
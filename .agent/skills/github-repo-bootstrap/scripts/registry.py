@@ -0,0 +1,130 @@
+"""
+Command registry for gh-skill.py and the daemon.
+Only the standard library is imported here; command modules load on dispatch.
+"""
+
+import importlib
+
+# command -> script, module and entry point. "interactive": False marks commands
+# that never prompt, which the daemon may run on behalf of a thin client;
+# "stdin": True marks commands that read stdin, which always run in-process.
+COMMANDS = {
+    "version": {
+        "desc": "Show version",
+        "script": None,
+        "module": None,
+        "entry": None
+    },
+    "bootstrap": {
+        "desc": "Bootstrap repository with labels, templates, and project",
+        "script": "bootstrap.py",
+        "module": "bootstrap",
+        "entry": "main"
+    },
+    "create-issue": {
+        "desc": "Create a new issue",
+        "script": "create_issue.py",
+        "module": "create_issue",
+        "entry": "main"
+    },
+    "create-branch": {
+        "desc": "Create a branch from an issue",
+        "script": "create_branch.py",
+        "module": "create_branch",
+        "entry": "main"
+    },
+    "commit": {
+        "desc": "Commit changes with conventional format",
+        "script": "commit_check.py",
+        "module": "commit_check",
+        "entry": "main"
+    },
+    "create-pr": {
+        "desc": "Create a pull request",
+        "script": "create_pr.py",
+        "module": "create_pr",
+        "entry": "main"
+    },
+    "review-pr": {
+        "desc": "Review a pull request",
+        "script": "review_pr.py",
+        "module": "review_pr",
+        "entry": "main"
+    },
+    "merge-pr": {
+        "desc": "Merge a pull request",
+        "script": "merge_pr.py",
+        "module": "merge_pr",
+        "entry": "main"
+    },
+    "close-issue": {
+        "desc": "Close an issue",
+        "script": "close_issue.py",
+        "module": "close_issue",
+        "entry": "main"
+    },
+    "list-issues": {
+        "desc": "List issues",
+        "script": "list_issues.py",
+        "module": "list_issues",
+        "entry": "main"
+    },
+    "list-prs": {
+        "desc": "List pull requests",
+        "script": "list_prs.py",
+        "module": "list_prs",
+        "entry": "main"
+    },
+    "view-project": {
+        "desc": "View project board",
+        "script": "view_project.py",
+        "module": "view_project",
+        "entry": "main",
+        "interactive": False
+    },
+    "update-project": {
+        "desc": "Update project item status/priority",
+        "script": "update_project.py",
+        "module": "update_project",
+        "entry": "main"
+    },
+    "sync": {
+        "desc": "Replay actions queued while offline",
+        "script": "sync.py",
+        "module": "sync",
+        "entry": "main",
+        "interactive": False
+    },
+    "batch": {
+        "desc": "Run NDJSON operations from stdin",
+        "script": "batch.py",
+        "module": "batch",
+        "entry": "main",
+        "stdin": True
+    },
+    "daemon": {
+        "desc": "Keep a warm background process for fast repeat commands",
+        "script": "daemon.py",
+        "module": "daemon",
+        "entry": "main"
+    },
+    "install-hooks": {
+        "desc": "Install Git hooks",
+        "script": "install_hooks.py",
+        "module": "install_hooks",
+        "entry": "main"
+    }
+}
+
+def resolve_command(command):
+    """Import a command's module and return its entry point."""
+    info = COMMANDS[command]
+    module = importlib.import_module(info["module"])
+    return getattr(module, info["entry"], None)
+
+def is_routable(command, argv=()):
+    """True if the daemon can run the command: it never prompts, or was given --no-input."""
+    info = COMMANDS.get(command)
+    if not info or info["module"] is None or info.get("stdin"):
+        return False
+    return info.get("interactive", True) is False or "--no-input" in argv
@@ -0,0 +1,119 @@
+from graphql_client import gql_request
+
+PAGE_SIZE = 100
+
+PR_STATES = {
+    "open": ["OPEN"],
+    "closed": ["CLOSED", "MERGED"],
+    "all": None,
+}
+
+PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $states: [PullRequestState!], $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $first, after: $after, states: $states, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        id
+        number
+        title
+        url
+        body
+        state
+        merged
+        mergeable
+        reviewDecision
+        headRefName
+        baseRefName
+        author { login }
+        latestReviews(first: 20) { nodes { state } }
+      }
+    }
+  }
+}
+"""
+
+def _review_state(node):
+    """APPROVED, CHANGES_REQUESTED or PENDING.
+
+    reviewDecision is null when branch protection does not require reviews,
+    so fall back to the latest review of each reviewer in that case.
+    """
+    decision = node.get('reviewDecision')
+    if decision in ("APPROVED", "CHANGES_REQUESTED"):
+        return decision
+    if decision is None:
+        states = {r['state'] for r in (node.get('latestReviews') or {}).get('nodes', [])}
+        if "APPROVED" in states:
+            return "APPROVED"
+        if "CHANGES_REQUESTED" in states:
+            return "CHANGES_REQUESTED"
+    return "PENDING"
+
+def _pull_request(node):
+    mergeable = {"MERGEABLE": True, "CONFLICTING": False}.get(node.get('mergeable'))
+    return {
+        "node_id": node['id'],
+        "number": node['number'],
+        "title": node['title'],
+        "url": node['url'],
+        "body": node.get('body') or "",
+        "state": "open" if node['state'] == "OPEN" else "closed",
+        "merged": node['merged'],
+        # None while GitHub is still computing mergeability
+        "mergeable": mergeable,
+        "review_state": _review_state(node),
+        "head_ref": node['headRefName'],
+        "base_ref": node['baseRefName'],
+        "author": (node.get('author') or {}).get('login', "ghost"),
+    }
+
+def fetch_pull_requests(repo_full_name, state="open", page_size=PAGE_SIZE):
+    """List PRs with review decision and mergeability in pages of page_size.
+
+    Costs one request per page instead of several REST calls per PR.
+    """
+    owner, name = repo_full_name.split('/')
+    prs = []
+    after = None
+    while True:
+        res = gql_request(PULL_REQUESTS_QUERY, {
+            "owner": owner, "name": name, "states": PR_STATES[state],
+            "first": page_size, "after": after
+        })
+        conn = res['data']['repository']['pullRequests']
+        prs.extend(_pull_request(n) for n in conn['nodes'])
+        if not conn['pageInfo']['hasNextPage']:
+            return prs
+        after = conn['pageInfo']['endCursor']
+
+SEARCH_ISSUES_QUERY = """
+query($q: String!, $first: Int!, $after: String) {
+  search(query: $q, type: ISSUE, first: $first, after: $after) {
+    issueCount
+    pageInfo { hasNextPage endCursor }
+    nodes {
+      ... on Issue { id number title }
+    }
+  }
+}
+"""
+
+def search_issues(repo_full_name, query, page_size=PAGE_SIZE):
+    """Open issues of a repository matching a search query (e.g. 'milestone:"v1.2"').
+
+    Returns ([{"node_id", "number", "title"}], issueCount), read in pages of
+    page_size. The search API stops at 1,000 results, so the count can be
+    larger than the list.
+    """
+    q = f"repo:{repo_full_name} is:issue is:open {query}".strip()
+    issues = []
+    after = None
+    while True:
+        res = gql_request(SEARCH_ISSUES_QUERY, {"q": q, "first": page_size, "after": after})
+        conn = res['data']['search']
+        issues.extend({"node_id": n['id'], "number": n['number'], "title": n['title']}
+                      for n in conn['nodes'] if n)
+        if not conn['pageInfo']['hasNextPage']:
+            return issues, conn['issueCount']
+        after = conn['pageInfo']['endCursor']
@@ -1,25 +1,21 @@
 
 import sys
+import argparse
 import questionary
 from rich.console import Console
 from rich.table import Table
-from utils import load_config, get_github_client, get_current_repo
+from utils import load_config, get_github_client, get_current_repo, add_input_flags, ask, confirm
 
 console = Console()
 config = load_config()
 
-def main():
-    console.print("[bold blue]PR Review Assistant[/]")
-    
-    try:
-        g = get_github_client()
-        repo = get_current_repo(g)
-        user = g.get_user()
-    except Exception as e:
-        console.print(f"[red]Failed to initialize GitHub client: {e}[/]")
-        sys.exit(1)
-    
-    # 1. List Open PRs
+REVIEW_EVENTS = {
+    "APPROVE": "APPROVE - Approve the changes",
+    "REQUEST_CHANGES": "REQUEST_CHANGES - Request changes before merging",
+    "COMMENT": "COMMENT - Add a comment without approval",
+}
+
+def select_pr(repo, no_input):
     try:
         prs = list(repo.get_pulls(state='open'))
     except Exception as e:
@@ -47,9 +43,9 @@ def main():
     
     console.print(table)
     
-    # 2. Select PR
     pr_choices = [f"#{pr.number} - {pr.title}" for pr in prs]
-    selected = questionary.select("Select PR to review:", choices=pr_choices).ask()
+    selected = ask(None, "--number", no_input,
+                   lambda: questionary.select("Select PR to review:", choices=pr_choices))
     
     if not selected:
         sys.exit(0)
@@ -60,19 +56,45 @@ def main():
     if not pr:
         console.print("[red]PR not found.[/]")
         sys.exit(1)
+    return pr
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Review a pull request")
+    parser.add_argument("--number", type=int, help="PR number to review")
+    parser.add_argument("--event", choices=list(REVIEW_EVENTS), help="Review action")
+    parser.add_argument("--comment", help="Review comment (default: 'LGTM!' for APPROVE)")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    console.print("[bold blue]PR Review Assistant[/]")
+    
+    try:
+        g = get_github_client()
+        repo = get_current_repo(g)
+        user = g.get_user()
+    except Exception as e:
+        console.print(f"[red]Failed to initialize GitHub client: {e}[/]")
+        sys.exit(1)
+    
+    # 1. Select PR (only listed when no --number is given)
+    if args.number is not None:
+        try:
+            pr = repo.get_pull(args.number)
+        except Exception as e:
+            console.print(f"[red]PR #{args.number} not found: {e}[/]")
+            sys.exit(1)
+    else:
+        pr = select_pr(repo, args.no_input)
     
     console.print(f"\n[bold]Reviewing PR #{pr.number}:[/] {pr.title}")
     console.print(f"[dim]Author: {pr.user.login} | Branch: {pr.head.ref}[/]")
     console.print(f"[dim]URL: {pr.html_url}[/]\n")
     
     # 3. Review Type
-    review_types = [
-        "APPROVE - Approve the changes",
-        "REQUEST_CHANGES - Request changes before merging",
-        "COMMENT - Add a comment without approval"
-    ]
-    
-    review_choice = questionary.select("Review action:", choices=review_types).ask()
+    review_choice = ask(REVIEW_EVENTS.get(args.event), "--event", args.no_input,
+                        lambda: questionary.select("Review action:", choices=list(REVIEW_EVENTS.values())))
     
     if not review_choice:
         sys.exit(0)
@@ -80,17 +102,18 @@ def main():
     review_event = review_choice.split(" - ")[0]
     
     # 4. Review Comment
-    comment = questionary.text(
+    default_comment = "LGTM!" if review_event == "APPROVE" else ""
+    comment = ask(args.comment, "--comment", args.no_input, lambda: questionary.text(
         "Review comment (optional):",
-        default="LGTM!" if review_event == "APPROVE" else ""
-    ).ask()
+        default=default_comment
+    ), default=default_comment)
     
     # 5. Confirm and Submit
     console.print(f"\n[bold]Review Summary:[/]")
     console.print(f"  Action: [cyan]{review_event}[/]")
     console.print(f"  Comment: {comment if comment else '[dim](none)[/]'}")
     
-    if not questionary.confirm("Submit review?").ask():
+    if not confirm(args, lambda: questionary.confirm("Submit review?")):
         console.print("[yellow]Review cancelled.[/]")
         sys.exit(0)
     
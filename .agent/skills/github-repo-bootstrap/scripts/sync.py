@@ -1,21 +1,98 @@
-
 import sys
+import time
+import argparse
+from datetime import datetime
 from rich.console import Console
-from utils import load_config
+from rich.table import Table
+from utils import load_config, get_github_client, get_current_repo, get_repo_full_name, add_input_flags
+from local_store import open_store, DEFAULT_MAX_AGE
+from action_queue import ActionQueue, coalesce, DEFAULT_WORKERS, SKIPPED
 
 console = Console()
+config = load_config()
+
+def describe(action):
+    args = action['args']
+    if action['op'] == "project_status":
+        return f"project '{args['project_title']}'", f"status → {args['status']}"
+    if action['op'] == "project_field":
+        return f"project '{args['project_title']}'", f"{args['field'].lower()} → {args['value']}"
+    target = f"#{args['number']}"
+    if action['op'] == "comment":
+        return target, args['body'][:50]
+    if action['op'] == "set_labels":
+        return target, ", ".join(args['labels']) or "-"
+    if action['op'] in ("assign", "unassign"):
+        return target, args['login']
+    return target, "-"
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay actions queued while offline")
+    parser.add_argument("--dry-run", action="store_true", help="Show the queued actions without sending them")
+    parser.add_argument("--workers", type=int, help="Issues replayed in parallel")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
 
-def main():
+def main(argv=None):
+    args = parse_args(argv)
     console.print("[bold blue]Sync Pending Actions[/]")
-    
-    # 1. Check Offline Queue (Stub)
-    # in future: read .github/queue.json and replay actions
-    console.print("Checking local queue... [dim]Empty[/]")
-    
-    # 2. Refresh Cache?
-    # Maybe re-fetch Project ID or Label IDs
-    console.print("Syncing configuration... [green]OK[/]")
-    
+
+    # 1. Check Offline Queue
+    queue = ActionQueue(get_repo_full_name())
+    pending = queue.pending()
+    if not pending:
+        console.print("Checking local queue... [dim]Empty[/]")
+    else:
+        plan = coalesce(pending)
+        table = Table(title=f"Queued Actions ({len(pending)} queued, {len(plan)} after coalescing)")
+        table.add_column("Action", style="cyan")
+        table.add_column("Target", style="green")
+        table.add_column("Details")
+        table.add_column("Queued", style="dim")
+        for action, _ in plan:
+            target, details = describe(action)
+            queued_at = datetime.fromtimestamp(action['queued_at']).strftime("%Y-%m-%d %H:%M")
+            table.add_row(action['op'], target, details, queued_at)
+        console.print(table)
+
+    if args.dry_run:
+        return
+
+    try:
+        g = get_github_client()
+        repo = get_current_repo(g)
+    except Exception as e:
+        console.print(f"[red]Failed to initialize GitHub client: {e}[/]")
+        sys.exit(1)
+
+    # 2. Replay
+    if pending:
+        workers = args.workers or config.get('offline_queue', {}).get('workers', DEFAULT_WORKERS)
+        start = time.perf_counter()
+        with console.status(f"Replaying {len(pending)} action(s)..."):
+            results = queue.replay(g, repo, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        sent = sum(1 for r in results.values() if r is True)
+        still_queued = sum(1 for r in results.values() if r == "queued")
+        skipped = sum(1 for r in results.values() if r == SKIPPED)
+        failed = {i: r for i, r in results.items() if r not in (True, "queued", SKIPPED)}
+        console.print(f"Sent {sent} action(s) in {elapsed:.1f}s")
+        if skipped:
+            console.print(f"[dim]Skipped {skipped} project field change(s) of items not on the board.[/]")
+        for action in pending:
+            if action['id'] in failed:
+                target, _ = describe(action)
+                console.print(f"[red]✗ {action['op']} {target}: {failed[action['id']]}[/]")
+        if still_queued:
+            console.print(f"[yellow]{still_queued} action(s) still queued (network unavailable).[/]")
+            sys.exit(1)
+
+    # 3. Refresh the local mirror with what GitHub now has
+    with console.status("Syncing local mirror..."):
+        open_store(repo, refresh=True, max_age=config.get('local_store', {}).get('max_age_seconds', DEFAULT_MAX_AGE))
+    console.print("Syncing local mirror... [green]OK[/]")
+
     console.print("[green]All synced.[/]")
 
 if __name__ == "__main__":
@@ -1,131 +1,279 @@
 
 import sys
+import time
+import argparse
 import questionary
 from rich.console import Console
 from rich.table import Table
-from utils import load_config, get_github_client, get_current_repo
+from utils import load_config, get_github_client, get_current_repo, get_repo_full_name, add_input_flags, ask, confirm
+from local_store import open_store, open_snapshot, DEFAULT_MAX_AGE
+from action_queue import ActionQueue, connect_or_offline, submit, DEFAULT_WORKERS, SKIPPED
 
 console = Console()
 config = load_config()
 
-def main():
+STATUS_LABELS = ["status:backlog", "status:ready", "status:in-progress", "status:review", "status:done"]
+PRIORITY_LABELS = ["p0", "p1", "p2"]
+UPDATE_CHOICES = ["Status", "Priority", "Assignee"]
+
+def project_option(label):
+    """Project field option for a status/priority label ('status:in-progress' -> 'in progress').
+
+    Options are matched case-insensitively, so this finds 'In progress' and 'P1'.
+    """
+    return label.split(":", 1)[-1].replace("-", " ")
+
+def select_items(items, args):
+    """Items matching every --with-* / --match filter given."""
+    selected = []
+    for item in items:
+        if args.with_label and not all(l in item.labels for l in args.with_label):
+            continue
+        if args.with_assignee == "none" and item.assignees:
+            continue
+        if args.with_assignee not in (None, "none") and args.with_assignee not in item.assignees:
+            continue
+        if args.with_status and args.with_status not in item.labels:
+            continue
+        if args.match and args.match.lower() not in item.title.lower():
+            continue
+        selected.append(item)
+    return selected
+
+def has_filters(args):
+    return bool(args.with_label or args.with_assignee or args.with_status or args.match)
+
+def plan_actions(queue, item, change, value, project_title):
+    """Journal the actions for one item; returns (actions, local mirror patch, description)."""
+    actions = []
+    if change in ("Status", "Priority"):
+        group = STATUS_LABELS if change == "Status" else PRIORITY_LABELS
+        labels = [l for l in item.labels if l not in group] + [value]
+        # Labels and assignees of PRs are edited through the issues API
+        actions.append(queue.enqueue("set_labels", number=item.number, labels=labels))
+        if project_title and item.node_id:
+            actions.append(queue.enqueue("project_field", content_id=item.node_id, field=change,
+                                         value=project_option(value), project_title=project_title))
+        return actions, {"labels": labels}, f"{change} updated to '{value}'"
+    if value:
+        actions.append(queue.enqueue("assign", number=item.number, login=value))
+        return actions, {"assignees": item.assignees + [value]}, f"Assigned to '{value}'"
+    if item.assignee:
+        actions.append(queue.enqueue("unassign", number=item.number, login=item.assignee))
+        return actions, {"assignees": item.assignees[1:]}, "Unassigned"
+    return [], {}, "Nothing to unassign"
+
+def item_outcome(actions, results):
+    """True, 'queued', 'skipped' or the first error of an item's actions.
+
+    A board field skipped because the item is not on the board does not fail
+    the item when its labels were written.
+    """
+    outcomes = [results.get(a['id'], "queued") for a in actions]
+    error = next((o for o in outcomes if o not in (True, "queued", SKIPPED)), None)
+    if error:
+        return error
+    if "queued" in outcomes:
+        return "queued"
+    return True if True in outcomes else "skipped"
+
+def print_report(rows, elapsed, workers):
+    table = Table(title="Project Updates")
+    table.add_column("#", style="cyan")
+    table.add_column("Title", style="green")
+    table.add_column("Result")
+    for item, outcome in rows:
+        title = item.title[:50] + "..." if len(item.title) > 50 else item.title
+        if outcome is True:
+            result = "[green]✓[/]"
+        elif outcome == "skipped":
+            result = "[dim]skipped[/]"
+        elif outcome == "queued":
+            result = "[yellow]queued[/]"
+        else:
+            result = f"[red]✗ {outcome}[/]"
+        table.add_row(str(item.number), title, result)
+    console.print(table)
+    failed = sum(o not in (True, "queued", "skipped") for _, o in rows)
+    rate = len(rows) / elapsed if elapsed > 0 else 0.0
+    console.print(f"[dim]{len(rows)} item(s), {failed} failed, {elapsed:.2f}s "
+                  f"({rate:.1f} items/s, {workers} workers)[/]")
+    return failed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Update project item status/priority")
+    parser.add_argument("--refresh", action="store_true", help="Re-sync the local issue mirror before reading")
+    parser.add_argument("--offline", action="store_true", help="Queue the update for `gh-skill sync` instead of sending it")
+    parser.add_argument("--kind", choices=["issue", "pr"], help="Update issues or pull requests")
+    parser.add_argument("--number", type=int, help="Issue or PR number")
+    select = parser.add_argument_group("bulk selection (every open item matching all filters)")
+    select.add_argument("--with-label", action="append", metavar="LABEL", help="Has this label (repeatable)")
+    select.add_argument("--with-assignee", metavar="LOGIN", help="Assigned to this user ('none' for unassigned)")
+    select.add_argument("--with-status", choices=STATUS_LABELS, help="Currently has this status label")
+    select.add_argument("--match", metavar="TEXT", help="Title contains this text")
+    update = parser.add_mutually_exclusive_group()
+    update.add_argument("--status", choices=STATUS_LABELS, help="Set the status (label and project field)")
+    update.add_argument("--priority", choices=PRIORITY_LABELS, help="Set the priority (label and project field)")
+    update.add_argument("--assignee", help="Assign a user")
+    update.add_argument("--unassign", action="store_true", help="Remove the first assignee")
+    parser.add_argument("--workers", type=int, help="Issues updated in parallel")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     console.print("[bold blue]Update Project Status[/]")
-    
-    console.print("[yellow]Note: This is a simplified version.[/]")
-    console.print("[yellow]Full GraphQL implementation for Projects v2 field updates is complex.[/]")
-    console.print("[yellow]For now, use GitHub web UI or gh CLI for project updates.[/]\n")
-    
+    workers = args.workers or config.get('offline_queue', {}).get('workers', DEFAULT_WORKERS)
+    proj_conf = config.get('projects_v2', {})
+
     try:
-        g = get_github_client()
-        repo = get_current_repo(g)
+        def connect():
+            g = get_github_client()
+            repo = get_current_repo(g, raise_error=True)
+            return g, repo, open_store(repo, refresh=args.refresh, max_age=config.get('local_store', {}).get('max_age_seconds', DEFAULT_MAX_AGE))
+
+        g, repo, store = connect_or_offline(args, connect)
+        if args.offline:
+            store = open_snapshot(get_repo_full_name())
+        queue = ActionQueue(store.repo_full_name)
     except Exception as e:
         console.print(f"[red]Failed to initialize GitHub client: {e}[/]")
         sys.exit(1)
-    
+
     # 1. Choose item type
-    item_type = questionary.select(
-        "What to update?",
-        choices=["Issue", "Pull Request"]
-    ).ask()
-    
+    if args.kind:
+        item_type = "Issue" if args.kind == "issue" else "Pull Request"
+    else:
+        item_type = ask(None, "--kind", args.no_input, lambda: questionary.select(
+            "What to update?",
+            choices=["Issue", "Pull Request"]
+        ), default="Issue" if args.number or has_filters(args) else None)
+
     if not item_type:
         sys.exit(0)
-    
+
     # 2. List items
     try:
-        if item_type == "Issue":
-            items_list = list(repo.get_issues(state='open'))
-            items = [i for i in items_list if not i.pull_request]
-        else:
-            items = list(repo.get_pulls(state='open'))
+        kind = "issue" if item_type == "Issue" else "pr"
+        items = store.items(kind=kind, state="open")
     except Exception as e:
         console.print(f"[red]Failed to fetch items: {e}[/]")
         sys.exit(1)
-    
+
     if not items:
         console.print(f"[yellow]No open {item_type.lower()}s found.[/]")
         sys.exit(0)
-    
-    # Display items
-    table = Table(title=f"Open {item_type}s")
-    table.add_column("#", style="cyan")
-    table.add_column("Title", style="green")
-    
-    for item in items:
-        table.add_row(
-            str(item.number),
-            item.title[:60] + "..." if len(item.title) > 60 else item.title
-        )
-    
-    console.print(table)
-    
-    # 3. Select item
-    item_choices = [f"#{i.number} - {i.title}" for i in items]
-    selected = questionary.select(f"Select {item_type.lower()}:", choices=item_choices).ask()
-    
-    if not selected:
-        sys.exit(0)
-    
-    item_number = int(selected.split(" - ")[0].replace("#", ""))
-    item = next((i for i in items if i.number == item_number), None)
-    
-    if not item:
-        console.print(f"[red]{item_type} not found.[/]")
-        sys.exit(1)
-    
-    console.print(f"\n[bold]Selected {item_type} #{item.number}:[/] {item.title}\n")
-    
+
+    # 3. Select items: one by number, all matching the filters, or picked from a list
+    if args.number is not None:
+        selected = [i for i in items if i.number == args.number]
+        if not selected:
+            console.print(f"[red]{item_type} not found.[/]")
+            sys.exit(1)
+    elif has_filters(args):
+        selected = select_items(items, args)
+        if not selected:
+            console.print(f"[yellow]No open {item_type.lower()}s match the filters.[/]")
+            sys.exit(0)
+    else:
+        table = Table(title=f"Open {item_type}s")
+        table.add_column("#", style="cyan")
+        table.add_column("Title", style="green")
+
+        for item in items:
+            table.add_row(
+                str(item.number),
+                item.title[:60] + "..." if len(item.title) > 60 else item.title
+            )
+
+        console.print(table)
+
+        by_choice = {f"#{i.number} - {i.title}": i for i in items}
+        picked = ask(None, "--number or a --with-*/--match filter", args.no_input,
+                     lambda: questionary.checkbox(f"Select {item_type.lower()}s (space to toggle):",
+                                                  choices=list(by_choice)))
+        selected = [by_choice[c] for c in picked or []]
+        if not selected:
+            sys.exit(0)
+
+    if len(selected) == 1:
+        console.print(f"\n[bold]Selected {item_type} #{selected[0].number}:[/] {selected[0].title}\n")
+    else:
+        console.print(f"\n[bold]Selected {len(selected)} {item_type.lower()}s:[/] "
+                      + ", ".join(f"#{i.number}" for i in selected[:20])
+                      + (" ..." if len(selected) > 20 else "") + "\n")
+
     # 4. Choose what to update
-    update_choice = questionary.select(
-        "What to update?",
-        choices=[
-            "Status (via labels)",
-            "Priority (via labels)",
-            "Assignee"
-        ]
-    ).ask()
-    
-    if not update_choice:
+    if args.status:
+        update_choice, value = "Status", args.status
+    elif args.priority:
+        update_choice, value = "Priority", args.priority
+    elif args.assignee or args.unassign:
+        update_choice, value = "Assignee", "" if args.unassign else args.assignee
+    else:
+        update_choice = ask(None, "--status, --priority, --assignee or --unassign", args.no_input,
+                            lambda: questionary.select("What to update?", choices=UPDATE_CHOICES))
+        if update_choice == "Status":
+            value = questionary.select("New status:", choices=STATUS_LABELS).ask()
+        elif update_choice == "Priority":
+            value = questionary.select("New priority:", choices=PRIORITY_LABELS).ask()
+        elif update_choice == "Assignee":
+            value = questionary.text("Assignee username (leave empty to unassign):").ask()
+
+    if not update_choice or value is None:
+        sys.exit(0)
+
+    if len(selected) > 1 and not confirm(args, lambda: questionary.confirm(
+            f"Apply to {len(selected)} {item_type.lower()}s?")):
+        console.print("Aborted.")
         sys.exit(0)
-    
-    # 5. Apply update
+
+    # 5. Journal the updates; project field changes are sent as batched mutations
+    project_title = (proj_conf.get('title') or store.repo_full_name.split('/')[1]) if proj_conf.get('enabled') else None
+    planned = []
+    for item in selected:
+        actions, local, done = plan_actions(queue, item, update_choice, value, project_title)
+        planned.append((item, actions, local, done))
+    all_actions = [a for _, actions, _, _ in planned for a in actions]
+    if not all_actions:
+        console.print(f"[yellow]{planned[0][3]}.[/]")
+        sys.exit(0)
+
+    # 6. Send them now unless offline
+    start = time.monotonic()
     try:
-        if "Status" in update_choice:
-            status_labels = ["status:backlog", "status:ready", "status:in-progress", "status:review", "status:done"]
-            status = questionary.select("New status:", choices=status_labels).ask()
-            
-            if status:
-                # Remove old status labels
-                current_labels = [l.name for l in item.labels if not l.name.startswith("status:")]
-                current_labels.append(status)
-                item.edit(labels=current_labels)
-                console.print(f"[green]✓ Status updated to '{status}'[/]")
-        
-        elif "Priority" in update_choice:
-            priority_labels = ["p0", "p1", "p2"]
-            priority = questionary.select("New priority:", choices=priority_labels).ask()
-            
-            if priority:
-                # Remove old priority labels
-                current_labels = [l.name for l in item.labels if l.name not in ["p0", "p1", "p2"]]
-                current_labels.append(priority)
-                item.edit(labels=current_labels)
-                console.print(f"[green]✓ Priority updated to '{priority}'[/]")
-        
-        elif "Assignee" in update_choice:
-            assignee = questionary.text("Assignee username (leave empty to unassign):").ask()
-            
-            if assignee:
-                item.add_to_assignees(assignee)
-                console.print(f"[green]✓ Assigned to '{assignee}'[/]")
-            else:
-                if item.assignee:
-                    item.remove_from_assignees(item.assignee)
-                    console.print(f"[green]✓ Unassigned[/]")
-    
+        results = submit(queue, all_actions, g, repo, offline=args.offline, workers=workers)
     except Exception as e:
         console.print(f"[red]Failed to update: {e}[/]")
         sys.exit(1)
+    elapsed = time.monotonic() - start
+
+    rows = []
+    for item, actions, local, done in planned:
+        outcome = item_outcome(actions, results) if actions else "skipped"
+        if outcome is True or outcome == "queued":
+            # The mirror is patched in place rather than re-read per item
+            store.patch(item.number, **local)
+        rows.append((item, outcome))
+
+    if len(rows) == 1:
+        (item, outcome), done = rows[0], planned[0][3]
+        if outcome == "queued":
+            console.print(f"[yellow]{done} (queued; run `gh-skill sync` when back online)[/]")
+        elif outcome is not True:
+            console.print(f"[red]Failed to update: {outcome}[/]")
+            sys.exit(1)
+        else:
+            console.print(f"[green]✓ {done}[/]")
+            if SKIPPED in (results.get(a['id']) for a in planned[0][1]):
+                console.print("[dim]The item is not on the project board; only its labels were changed.[/]")
+        return
+
+    failed = print_report(rows, elapsed, workers)
+    if any(o == "queued" for _, o in rows):
+        console.print("[yellow]Some updates are queued; run `gh-skill sync` when back online.[/]")
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
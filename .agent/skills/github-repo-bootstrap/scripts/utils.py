@@ -3,19 +3,29 @@ import sys
 import yaml
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, TYPE_CHECKING
 
-from github import Github, Auth
 from rich.console import Console
-from rich.panel import Panel
+
+if TYPE_CHECKING:
+    # PyGithub takes a while to import; commands that never talk to GitHub skip it
+    from github import Github
 
 console = Console()
 
 CONFIG_PATH = Path("../assets/config.yml")
 REPO_CONFIG_PATH = Path(".github/repo-skill.yml")
 
+_config_cache: Dict[str, Dict[str, Any]] = {}
+
 def load_config() -> Dict[str, Any]:
-    """Load config from repo override or default asset."""
+    """Load config from repo override or default asset (parsed once per working directory)."""
+    cwd = os.getcwd()
+    if cwd not in _config_cache:
+        _config_cache[cwd] = _read_config()
+    return _config_cache[cwd]
+
+def _read_config() -> Dict[str, Any]:
     # 1. Check repo-local config
     if REPO_CONFIG_PATH.exists():
         try:
@@ -36,8 +46,8 @@ def load_config() -> Dict[str, Any]:
     console.print("[red]Error: No configuration found![/]")
     sys.exit(1)
 
-def get_github_client() -> Github:
-    """Initialize GitHub client from token."""
+def get_github_token() -> str:
+    """Discover the GitHub token from the environment or the gh CLI."""
     token = os.getenv("GITHUB_TOKEN")
     if not token:
         # Try finding via gh cli
@@ -52,18 +62,87 @@ def get_github_client() -> Github:
                 pass
                 
     if not token:
+        from rich.panel import Panel
         console.print(Panel("[red]GITHUB_TOKEN not found![/]\nPlease export GITHUB_TOKEN or login with `gh auth login`.", title="Authentication Error"))
         sys.exit(1)
         
-    auth = Auth.Token(token)
-    return Github(auth=auth)
+    return token
+
+def add_input_flags(parser):
+    """Add --no-input and --yes, shared by every command."""
+    parser.add_argument("--no-input", action="store_true",
+                        help="Never prompt: use flags and defaults, fail if a required value is missing")
+    parser.add_argument("-y", "--yes", action="store_true", help="Answer yes to confirmations")
+    return parser
+
+def ask(value, flag, no_input, question, default=None):
+    """Return a value given on the command line, or prompt for it.
+
+    question is a callable returning a questionary question, so nothing is
+    prompted (or imported) when the flag is set. With --no-input the default
+    is used, and the command exits if there is none.
+    """
+    if value is not None:
+        return value
+    if no_input:
+        if default is not None:
+            return default
+        console.print(f"[red]{flag} is required with --no-input.[/]")
+        sys.exit(2)
+    return question().ask()
+
+def confirm(args, question):
+    """Ask a yes/no question unless --yes was given.
+
+    --no-input alone does not confirm anything: a command that would act on
+    a confirmation exits unless --yes is given too (as bootstrap does).
+    """
+    if args.yes:
+        return True
+    if args.no_input:
+        console.print("[red]--yes is required with --no-input to confirm this action.[/]")
+        sys.exit(2)
+    return question().ask()
+
+DEFAULT_API_URL = "https://api.github.com"
+
+def get_api_url() -> str:
+    """REST API root: GITHUB_API_URL (GitHub Enterprise, Actions, the simulator) or api.github.com."""
+    return (os.getenv("GITHUB_API_URL") or DEFAULT_API_URL).rstrip("/")
+
+_client = None
+_repos: Dict[tuple, Any] = {}
+_full_names: Dict[str, str] = {}
+
+def get_github_client() -> "Github":
+    """Initialize GitHub client from token (once per process, so the daemon keeps it warm)."""
+    global _client
+    if _client is not None:
+        return _client
+    from github import Github, Auth
+    from http_cache import install, DEFAULT_MAX_BYTES
+    
+    # Conditional requests: unchanged GETs come back as 304 and are replayed from disk
+    cache_conf = load_config().get('cache', {})
+    install(cache_conf.get('http_max_bytes', DEFAULT_MAX_BYTES), enabled=cache_conf.get('enabled', True))
+    
+    auth = Auth.Token(get_github_token())
+    # 100 is the API maximum; the default of 30 triples the requests for long lists
+    _client = Github(auth=auth, per_page=100, base_url=get_api_url())
+    return _client
 
 class RepositoryNotFoundError(Exception):
     """Raised when local git repository is not found or has no remote."""
     pass
 
-def get_current_repo(g: Github, raise_error: bool = False):
-    """Detect current repository from git remote."""
+def get_repo_full_name(raise_error: bool = False) -> str:
+    """Detect 'owner/repo' from the git remote without calling the API."""
+    cwd = os.getcwd()
+    if cwd not in _full_names:
+        _full_names[cwd] = _read_repo_full_name(raise_error)
+    return _full_names[cwd]
+
+def _read_repo_full_name(raise_error: bool) -> str:
     import subprocess
     try:
         remote_url = subprocess.check_output(["git", "config", "--get", "remote.origin.url"], text=True).strip()
@@ -84,9 +163,26 @@ def get_current_repo(g: Github, raise_error: bool = False):
         owner = parts[0]
         repo_name = parts[1]
         
-        return g.get_repo(f"{owner}/{repo_name}")
+        return f"{owner}/{repo_name}"
+    except RepositoryNotFoundError:
+        raise
     except Exception as e:
         if raise_error:
             raise RepositoryNotFoundError(f"Failed to detect repository: {e}")
         console.print(f"[red]Failed to detect repository: {e}[/]")
         sys.exit(1)
+
+def get_current_repo(g: "Github", raise_error: bool = False):
+    """Detect current repository from git remote."""
+    full_name = get_repo_full_name(raise_error)
+    key = (id(g), full_name)
+    try:
+        if key not in _repos:
+            _repos[key] = g.get_repo(full_name)
+        return _repos[key]
+    except Exception as e:
+        if raise_error:
+            # Chained so callers can tell a network failure from a missing repository
+            raise RepositoryNotFoundError(f"Failed to detect repository: {e}") from e
+        console.print(f"[red]Failed to detect repository: {e}[/]")
+        sys.exit(1)
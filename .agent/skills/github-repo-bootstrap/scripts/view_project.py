@@ -1,15 +1,94 @@
 
 import sys
+import time
+import argparse
 from collections import defaultdict
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from utils import load_config, get_github_client, get_current_repo
+from rich.live import Live
+from utils import load_config, get_github_client, get_current_repo, add_input_flags
+from local_store import open_store, DEFAULT_MAX_AGE
 
 console = Console()
 config = load_config()
 
-def main():
+NO_STATUS = "No Status"
+DEFAULT_LIMIT = 15
+TITLE_WIDTH = 40
+
+class Board:
+    """Project items grouped into Status columns, filled as pages arrive."""
+
+    def __init__(self, statuses, priorities=(), limit=DEFAULT_LIMIT):
+        self.columns = {status: [] for status in statuses}
+        self.configured = set(statuses)
+        self.priorities = {p: i for i, p in enumerate(priorities)}
+        self.limit = limit
+        self.loaded = 0
+
+    def add(self, items):
+        for item in items:
+            self.columns.setdefault(item['status'] or NO_STATUS, []).append(item)
+        self.loaded += len(items)
+
+    def _cell(self, item):
+        if item['type'] == "DRAFT_ISSUE":
+            label = "[dim]draft[/]"
+        else:
+            label = f"{'PR ' if item['type'] == 'PULL_REQUEST' else ''}#{item['number']}"
+        title = item['title'] if len(item['title']) <= TITLE_WIDTH else item['title'][:TITLE_WIDTH - 3] + "..."
+        priority = f"[yellow]{item['priority']}[/] " if item['priority'] else ""
+        return f"{priority}[cyan]{label}[/] {title}"
+
+    def render(self, caption=None):
+        # Configured columns keep their order (even when empty); items without a status go last
+        names = [n for n, items in self.columns.items() if n != NO_STATUS and (items or n in self.configured)]
+        if self.columns.get(NO_STATUS):
+            names.append(NO_STATUS)
+        table = Table(title="Project Board", caption=caption, expand=True, show_lines=False)
+        shown = {}
+        for name in names:
+            items = self.columns[name]
+            table.add_column(f"{name} ({len(items)})", ratio=1, overflow="fold")
+            ranked = sorted(items, key=lambda i: self.priorities.get(i['priority'], len(self.priorities)))
+            shown[name] = [self._cell(i) for i in ranked[:self.limit]]
+            if len(items) > self.limit:
+                shown[name].append(f"[dim]... {len(items) - self.limit} more[/]")
+        for row in range(max((len(cells) for cells in shown.values()), default=0)):
+            table.add_row(*[cells[row] if row < len(cells) else "" for cells in shown.values()])
+        return table
+
+def show_project_board(project_id, args):
+    """Stream the project's items into the board, redrawing after every page."""
+    from project_utils import iter_project_items
+    fields = config.get('projects_v2', {}).get('fields', {})
+    board = Board(fields.get('status', []), fields.get('priority', []), args.limit)
+    start = time.monotonic()
+    first_page = None
+    pages = 0
+    with Live(board.render("Loading items..."), console=console, auto_refresh=False) as live:
+        for items, total in iter_project_items(project_id, page_size=args.page_size):
+            pages += 1
+            if first_page is None:
+                first_page = time.monotonic() - start
+            board.add(items)
+            live.update(board.render(f"Loaded {board.loaded} of {total} items..."), refresh=True)
+        elapsed = time.monotonic() - start
+        live.update(board.render(f"{board.loaded} items · {pages} page(s) · first page "
+                                 f"{first_page or 0.0:.2f}s · {elapsed:.2f}s total"), refresh=True)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="View project board")
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="Items shown per column")
+    parser.add_argument("--page-size", type=int, default=100, help="Items fetched per request (max 100)")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-sync the local issue mirror before reading (label view only)")
+    add_input_flags(parser)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     console.print("[bold blue]View Project Board[/]")
     
     try:
@@ -18,15 +97,39 @@ def main():
     except Exception as e:
         console.print(f"[red]Failed to initialize GitHub client: {e}[/]")
         sys.exit(1)
+
+    proj_conf = config.get('projects_v2', {})
+    if not proj_conf.get('enabled'):
+        show_label_board(repo, args)
+        return
+
+    try:
+        from bootstrap import ensure_project_v2
+        title = proj_conf.get('title') or repo.name
+        proj_action = ensure_project_v2(g.get_user().login, title, repo.full_name)
+        if proj_action['type'] != "EXISTS":
+            console.print(f"[yellow]No project '{title}' yet; run bootstrap to create it.[/]")
+            sys.exit(1)
+        show_project_board(proj_action['id'], args)
+        console.print(f"[dim]{proj_action['url']}[/]")
+    except Exception as e:
+        console.print(f"[red]Failed to load the project board: {e}[/]")
+        sys.exit(1)
+
+def show_label_board(repo, args):
+    """Issues/PRs grouped by status: labels, for repositories without a project."""
+    try:
+        store = open_store(repo, refresh=args.refresh, max_age=config.get('local_store', {}).get('max_age_seconds', DEFAULT_MAX_AGE))
+    except Exception as e:
+        console.print(f"[red]Failed to open the local issue mirror: {e}[/]")
+        sys.exit(1)
     
-    console.print("[yellow]Note: This displays issues/PRs grouped by status labels.[/]")
-    console.print("[yellow]For full Projects v2 view, use GitHub web UI or gh CLI.[/]\n")
+    console.print("[yellow]Note: Projects v2 is disabled; showing issues/PRs grouped by status labels.[/]\n")
     
     # Fetch all open issues and PRs
     try:
-        issues_list = list(repo.get_issues(state='open'))
-        issues = [i for i in issues_list if not i.pull_request]
-        prs = list(repo.get_pulls(state='open'))
+        issues = store.items(kind="issue", state="open")
+        prs = store.items(kind="pr", state="open")
     except Exception as e:
         console.print(f"[red]Failed to fetch items: {e}[/]")
         sys.exit(1)
@@ -39,8 +142,8 @@ def main():
     for issue in issues:
         status = "backlog"  # default
         for label in issue.labels:
-            if label.name.startswith("status:"):
-                status = label.name.replace("status:", "")
+            if label.startswith("status:"):
+                status = label.replace("status:", "")
                 break
         status_groups[status].append(("Issue", issue))
     
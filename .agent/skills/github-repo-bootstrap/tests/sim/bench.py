@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark
+Runs every gh-skill command non-interactively against the fake GitHub server
+(fake_github.py) for repositories seeded with 10 / 1k / 50k issues, and records
+wall-clock time, request counts and bytes transferred per command.
+
+Each size gets a fresh server and a fresh git working copy whose `origin` is
+https://github.com/bench/repo.git, redirected to a local bare repository so that
+push and pull work offline. Commands run as subprocesses of gh-skill.py with
+their own cache directory, so the first run of a size is a cold start.
+
+    python tests/sim/bench.py
+    python tests/sim/bench.py --sizes 10,1000 --latency 0.05 --json bench.json
+    python tests/sim/bench.py --only list-issues,bootstrap --timeout 60
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from rich.console import Console
+from rich.table import Table
+
+from fake_github import FakeGitHub, BATCH_LABEL, RELEASE_LABEL
+
+console = Console()
+
+SKILL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+GH_SKILL = os.path.join(SKILL_DIR, "scripts", "gh-skill.py")
+REMOTE_URL = "https://github.com/bench/repo.git"
+DEFAULT_SIZES = [10, 1000, 50000]
+DEFAULT_TIMEOUT = 600
+
+BATCH_INPUT = "\n".join(json.dumps(op) for op in [
+    {"op": "comment", "number": 3, "body": "Benchmark comment"},
+    {"op": "set-labels", "number": 3, "labels": ["type:bug", "p1"]},
+    {"op": "assign", "number": 5, "login": "bench-user"},
+    {"op": "create-issue", "title": "Created by batch", "labels": ["type:chore"]},
+    {"op": "close-issue", "number": 7},
+]) + "\n"
+
+def _pr_number(state):
+    return [str(state.get('pr', 0))]
+
+# (name, argv or callable(state) -> extra argv, stdin); run in this order for every size.
+# Later steps rely on earlier ones (the PR of create-pr is reviewed and merged).
+SCENARIOS = [
+    ("version", ["version"], None),
+    ("list-issues (cold)", ["list-issues", "--refresh", "--no-input"], None),
+    ("list-issues (warm)", ["list-issues", "--no-input"], None),
+    ("bootstrap", ["bootstrap", "--yes"], None),
+    ("bootstrap --check", ["bootstrap", "--check"], None),
+    ("create-issue", ["create-issue", "--type", "Bug", "--title", "Benchmark issue", "--no-input", "-y"], None),
+    ("update-project", ["update-project", "--number", "1", "--status", "status:ready", "--no-input", "-y"], None),
+    ("update-project (bulk)", ["update-project", "--with-label", BATCH_LABEL, "--priority", "p1",
+                               "--no-input", "-y"], None),
+    ("close-issue", ["close-issue", "--number", "2", "--comment", "Done", "--no-input", "-y"], None),
+    ("close-issue (bulk)", ["close-issue", "--label", RELEASE_LABEL, "--no-input", "-y"], None),
+    ("list-prs", ["list-prs", "--state", "open", "--no-input"], None),
+    ("create-branch", ["create-branch", "--issue", "1", "--type", "feat", "--no-input", "-y"], None),
+    ("commit", ["commit", "--stage-all", "--type", "feat", "--subject", "add benchmark file",
+                "--no-input", "-y"], None),
+    ("create-pr", ["create-pr", "--push", "--no-input", "-y"], None),
+    ("review-pr", lambda state: ["review-pr", "--number", *_pr_number(state), "--event", "APPROVE",
+                                 "--no-input", "-y"], None),
+    ("merge-pr", lambda state: ["merge-pr", "--number", *_pr_number(state), "--method", "squash",
+                                "--no-input", "-y"], None),
+    ("view-project", ["view-project", "--no-input"], None),
+    ("update-project (offline)", ["update-project", "--offline", "--number", "5", "--priority", "p2",
+                                  "--no-input", "-y"], None),
+    ("sync", ["sync", "--no-input", "-y"], None),
+    ("batch", ["batch", "--no-input"], BATCH_INPUT),
+    ("install-hooks", ["install-hooks"], None),
+]
+
+def _git(*args, cwd=None):
+    subprocess.run(["git", *args], cwd=cwd, check=True, capture_output=True)
+
+def make_workdir(root):
+    """A git working copy whose GitHub remote is served by a local bare repository."""
+    bare, work = os.path.join(root, "remote.git"), os.path.join(root, "work")
+    _git("init", "-q", "--bare", bare)
+    _git("init", "-q", "-b", "main", work)
+    for key, value in (("remote.origin.url", REMOTE_URL), ("remote.origin.fetch", "+refs/heads/*:refs/remotes/origin/*"),
+                       (f"url.{bare}.insteadOf", REMOTE_URL), ("user.name", "Bench"),
+                       ("user.email", "bench@example.com"), ("commit.gpgsign", "false")):
+        _git("config", key, value, cwd=work)
+    _git("commit", "-q", "--allow-empty", "-m", "Initial commit", cwd=work)
+    _git("push", "-q", "-u", "origin", "main", cwd=work)
+    return work
+
+def run_command(sim, argv, stdin, env, cwd, timeout):
+    """Run one gh-skill command; returns its measurements and output."""
+    sim.reset_stats()
+    start = time.monotonic()
+    try:
+        proc = subprocess.run([sys.executable, GH_SKILL, *argv], cwd=cwd, env=env, input=stdin or "",
+                              capture_output=True, text=True, timeout=timeout)
+        code, output = proc.returncode, proc.stdout + proc.stderr
+    except subprocess.TimeoutExpired as e:
+        # The partial output of a killed process comes back as bytes
+        output = e.stdout.decode(errors="replace") if isinstance(e.stdout, bytes) else e.stdout or ""
+        code = "timeout"
+    elapsed = time.monotonic() - start
+    stats = sim.stats()
+    return {
+        "seconds": round(elapsed, 3),
+        "exit": code,
+        "requests": stats['requests'],
+        "rest": stats['rest'],
+        "graphql": stats['graphql'],
+        "not_modified": stats['not_modified'],
+        "rate_limited": stats['rate_limited'],
+        "sent_bytes": stats['sent_bytes'],
+        "received_bytes": stats['received_bytes'],
+        "routes": stats['routes'],
+    }, output
+
+def run_size(size, args):
+    """Seed a server with `size` issues and run the scenarios against it."""
+    results = []
+    root = tempfile.mkdtemp(prefix=f"gh-skill-bench-{size}-")
+    console.print(f"[bold]Seeding {size} issues...[/]")
+    sim = FakeGitHub(issues=size, latency=args.latency, rate_limit=args.rate_limit,
+                     secondary_every=args.secondary_every)
+    url = sim.start()
+    try:
+        work = make_workdir(root)
+        env = dict(os.environ, GITHUB_API_URL=url, GITHUB_TOKEN="bench", GH_SKILL_CACHE_DIR=os.path.join(root, "cache"),
+                   GH_SKILL_NO_DAEMON="1", GIT_TERMINAL_PROMPT="0", NO_COLOR="1", COLUMNS="120")
+        env.pop("GITHUB_GRAPHQL_URL", None)
+        state = {}
+        for name, argv, stdin in SCENARIOS:
+            if args.only and not any(name.startswith(o) for o in args.only):
+                continue
+            if callable(argv):
+                argv = argv(state)
+            if name == "commit":
+                with open(os.path.join(work, "BENCHMARK.md"), "w") as f:
+                    f.write(f"Benchmark run with {size} issues.\n")
+            console.print(f"  {name}...", end=" ")
+            result, output = run_command(sim, argv, stdin, env, work, args.timeout)
+            if name == "create-pr":
+                match = re.search(r'/pull/(\d+)', output)
+                state['pr'] = int(match.group(1)) if match else 0
+            ok = result['exit'] == 0
+            console.print(f"[{'green' if ok else 'red'}]{result['exit']}[/] {result['seconds']:.2f}s, "
+                          f"{result['requests']} request(s)")
+            if not ok and args.verbose:
+                console.print(output[-2000:], markup=False, highlight=False)
+            results.append({"size": size, "command": name, "argv": argv, **result})
+    finally:
+        sim.stop()
+        shutil.rmtree(root, ignore_errors=True)
+    return results
+
+def print_results(results):
+    table = Table(title="gh-skill benchmark")
+    for column in ("Issues", "Command", "Exit", "Seconds", "Requests", "REST", "GraphQL", "304", "Limited", "KB sent", "KB recv"):
+        table.add_column(column, justify="left" if column == "Command" else "right")
+    for r in results:
+        exit_code = f"[green]{r['exit']}[/]" if r['exit'] == 0 else f"[red]{r['exit']}[/]"
+        table.add_row(str(r['size']), r['command'], exit_code, f"{r['seconds']:.2f}", str(r['requests']), str(r['rest']),
+                      str(r['graphql']), str(r['not_modified']), str(r['rate_limited']),
+                      f"{r['sent_bytes'] / 1024:.1f}", f"{r['received_bytes'] / 1024:.1f}")
+    console.print(table)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark gh-skill commands against a simulated GitHub")
+    parser.add_argument("--sizes", type=lambda s: [int(n) for n in s.split(",")], default=DEFAULT_SIZES,
+                        help="Comma-separated issue counts (default: 10,1000,50000)")
+    parser.add_argument("--only", type=lambda s: s.split(","), help="Comma-separated command names to run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every API response")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="Requests per hour and resource")
+    parser.add_argument("--secondary-every", type=int, default=0, help="Answer every Nth write with a secondary limit")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="Seconds before a command is killed")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show the output of failed commands")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for size in args.sizes:
+        results.extend(run_size(size, args))
+    print_results(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        console.print(f"Wrote {args.json}")
+    if any(r['exit'] != 0 for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1107 @@
+#!/usr/bin/env python3
+"""
+Fake GitHub API server
+In-memory stand-in for the parts of api.github.com the skill talks to, for
+end-to-end runs and benchmarks without a network or a token.
+
+Serves the REST endpoints PyGithub uses for issues, pulls, labels, contents,
+git refs/trees/commits, users and orgs, and the GraphQL queries and mutations
+of bootstrap, project_utils, repo_queries and close_issue through a small
+executor (graphql_exec). Responses carry X-RateLimit-* headers, ETags (a
+matching If-None-Match gets a free 304) and optional injected latency,
+primary rate limits and secondary limits on writes.
+
+Point the skill at it with GITHUB_API_URL (GraphQL follows at /graphql):
+
+    python tests/sim/fake_github.py --issues 1000 --port 8765
+    GITHUB_API_URL=http://127.0.0.1:8765 GITHUB_TOKEN=fake python scripts/gh-skill.py list-issues
+"""
+
+import re
+import sys
+import json
+import time
+import base64
+import hashlib
+import calendar
+import argparse
+import threading
+from urllib.parse import urlsplit, parse_qs, unquote, quote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from graphql_exec import execute, FieldError
+
+DEFAULT_OWNER = "bench"
+DEFAULT_REPO = "repo"
+DEFAULT_LOGIN = "bench-user"
+DEFAULT_RATE_LIMIT = 5000
+DEFAULT_WINDOW = 3600
+SEARCH_LIMIT = 1000
+# GitHub's options of a new project's Status field
+DEFAULT_STATUS_OPTIONS = ["Todo", "In Progress", "Done"]
+# Labels put on the first open issues so benchmarks can select small, fixed sets
+BATCH_LABEL = "bench:batch"
+RELEASE_LABEL = "bench:release"
+MARKED_ISSUES = 20
+EPOCH = 1_700_000_000
+
+def _iso(ts):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(ts))
+
+def _parse_iso(value):
+    return calendar.timegm(time.strptime(value[:19], "%Y-%m-%dT%H:%M:%S"))
+
+def git_blob_sha(content):
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+def _sha(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True).encode()).hexdigest()
+
+def _connection(nodes, first=None, after=None):
+    start = int(after) if after else 0
+    end = len(nodes) if first is None else start + first
+    page = nodes[start:end]
+    return {"totalCount": len(nodes), "nodes": page,
+            "pageInfo": {"hasNextPage": end < len(nodes), "endCursor": str(start + len(page)) if page else after}}
+
+class NotFound(Exception):
+    pass
+
+class Unprocessable(Exception):
+    pass
+
+class Repository:
+    """State of the one simulated repository, its owner's projects and git data."""
+
+    def __init__(self, owner=DEFAULT_OWNER, name=DEFAULT_REPO, login=DEFAULT_LOGIN, issues=10,
+                 pull_requests=None, project=True):
+        self.owner, self.name, self.login = owner, name, login
+        self.full_name = f"{owner}/{name}"
+        self.node_id = "R_" + _sha(self.full_name)[:12]
+        self.clock = EPOCH
+        self.issues = {}          # number -> record (issues and PRs share numbers)
+        self.labels = {}          # lower-cased name -> {"name", "color", "description", "id"}
+        self.comments = {}        # number -> [{"id", "body", "user", "created_at"}]
+        self.projects = {}        # project id -> project record
+        self.nodes = {}           # node id -> ("issue", number) | ("project", id) | ("item", (project id, item id))
+        self.blobs, self.trees, self.commits, self.refs = {}, {}, {}, {}
+        self._next_id = 1
+        self._order = None
+
+        tree = self._write_tree({"README.md": f"# {name}\n"})
+        self.refs["heads/main"] = self._write_commit("Initial commit", tree, [])
+        for label, color in (("type:bug", "d73a4a"), ("type:feature", "a2eeef"),
+                             (BATCH_LABEL, "ededed"), (RELEASE_LABEL, "ededed")):
+            self.create_label(label, color, None)
+        self.seed(issues, issues // 10 if pull_requests is None else pull_requests)
+        if project:
+            self.seed_project()
+
+    # --- ids and time ---
+
+    def next_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    def tick(self):
+        self.clock += 1
+        return self.clock
+
+    # --- seeding ---
+
+    def seed(self, issues, pull_requests):
+        marked = 0
+        for number in range(1, issues + 1):
+            state = "closed" if number % 5 == 4 else "open"
+            labels = ["type:bug" if number % 2 else "type:feature"]
+            if state == "open" and marked < 2 * MARKED_ISSUES:
+                labels.append(BATCH_LABEL if marked < MARKED_ISSUES else RELEASE_LABEL)
+                marked += 1
+            self.add_issue(f"Issue {number}", f"Body of issue {number}.", labels, state=state,
+                           milestone="v1.0" if number % 10 == 0 else None, when=EPOCH + number)
+        self.clock = EPOCH + issues
+        for i in range(pull_requests):
+            self.add_pull(f"PR {i + 1}", f"Change {i + 1}", f"feat/seed-{i + 1}", "main")
+
+    def seed_project(self):
+        project = self.create_project(self.name)
+        for record in self.issues.values():
+            if record['state'] == "open" and not record['pr']:
+                item = self.add_item(project['id'], record['node_id'])
+                status = project['fields'][1]['options'][record['number'] % 3]
+                item['values']["Status"] = status['id']
+
+    # --- issues and pulls ---
+
+    def add_issue(self, title, body, labels=(), state="open", milestone=None, when=None, pr=None):
+        number = len(self.issues) + 1
+        when = when or self.tick()
+        node_id = ("PR_" if pr else "I_") + _sha([self.full_name, number])[:12]
+        record = {"number": number, "id": self.next_id(), "node_id": node_id, "title": title, "body": body,
+                  "state": state, "state_reason": "completed" if state == "closed" else None,
+                  "labels": [self.labels.get(l.lower(), {}).get('name', l) for l in labels],
+                  "assignees": [], "user": self.login, "milestone": milestone,
+                  "created_at": when, "updated_at": when, "pr": pr}
+        for label in labels:
+            if label.lower() not in self.labels:
+                self.create_label(label, "ededed", None)
+        self.issues[number] = record
+        self.comments[number] = []
+        self.nodes[node_id] = ("issue", number)
+        self._order = None
+        return record
+
+    def add_pull(self, title, body, head, base):
+        pr = {"head": head, "base": base, "merged": False, "reviews": [],
+              "head_sha": _sha(["head", head])}
+        # Pushes go to a local remote, so the head branch appears with its PR
+        self.refs.setdefault(f"heads/{head}", self.refs["heads/main"])
+        return self.add_issue(title, body, pr=pr)
+
+    def touch(self, record):
+        record['updated_at'] = self.tick()
+        self._order = None
+
+    def issue(self, number):
+        record = self.issues.get(int(number))
+        if record is None:
+            raise NotFound()
+        return record
+
+    def by_updated(self):
+        if self._order is None:
+            self._order = sorted(self.issues.values(), key=lambda r: (r['updated_at'], r['number']))
+        return self._order
+
+    def close_issue(self, record, reason=None):
+        record['state'] = "closed"
+        record['state_reason'] = (reason or "completed").lower()
+        self.touch(record)
+
+    def comment(self, number, body):
+        comment = {"id": self.next_id(), "body": body, "user": self.login, "created_at": self.tick()}
+        self.comments[number].append(comment)
+        self.touch(self.issue(number))
+        return comment
+
+    # --- labels ---
+
+    def create_label(self, name, color, description):
+        if name.lower() in self.labels:
+            raise Unprocessable("Validation Failed: already_exists")
+        label = {"id": self.next_id(), "name": name, "color": (color or "ededed").lower(), "description": description}
+        self.labels[name.lower()] = label
+        return label
+
+    def label(self, name):
+        label = self.labels.get(name.lower())
+        if label is None:
+            raise NotFound()
+        return label
+
+    # --- git data ---
+
+    def _write_tree(self, files):
+        sha = _sha(sorted(files.items()))
+        self.trees[sha] = dict(files)
+        for content in files.values():
+            self.blobs[git_blob_sha(content.encode())] = content
+        return sha
+
+    def _write_commit(self, message, tree, parents):
+        sha = _sha([message, tree, parents, self.tick()])
+        self.commits[sha] = {"message": message, "tree": tree, "parents": parents}
+        return sha
+
+    def files(self, ref="main"):
+        sha = self.refs.get(f"heads/{ref}") or self.refs["heads/main"]
+        return self.trees[self.commits[sha]['tree']]
+
+    def commit_files(self, message, changes, branch="main"):
+        files = dict(self.files(branch))
+        files.update(changes)
+        parent = self.refs[f"heads/{branch}"]
+        self.refs[f"heads/{branch}"] = self._write_commit(message, self._write_tree(files), [parent])
+        return self.refs[f"heads/{branch}"]
+
+    # --- projects ---
+
+    def create_project(self, title):
+        project_id = "PVT_" + _sha([title, self.next_id()])[:12]
+        number = len(self.projects) + 1
+        project = {"id": project_id, "number": number, "title": title, "closed": False,
+                   "url": f"https://github.com/users/{self.login}/projects/{number}",
+                   "fields": [], "items": [], "repos": set()}
+        self.projects[project_id] = project
+        self.nodes[project_id] = ("project", project_id)
+        self.add_field(project, "Title", "TITLE")
+        self.add_field(project, "Status", "SINGLE_SELECT", DEFAULT_STATUS_OPTIONS)
+        return project
+
+    def add_field(self, project, name, data_type, options=None):
+        field = {"id": "PVTF_" + _sha([project['id'], name])[:12], "name": name, "dataType": data_type}
+        if data_type == "SINGLE_SELECT":
+            field['options'] = [{"id": _sha([name, o, self.next_id()])[:8], "name": o} for o in options or []]
+        project['fields'].append(field)
+        return field
+
+    def project(self, project_id):
+        kind, key = self.nodes.get(project_id, (None, None))
+        if kind != "project":
+            raise FieldError(f"Could not resolve to a node with the global id of '{project_id}'", "NOT_FOUND")
+        return self.projects[key]
+
+    def add_item(self, project_id, content_id):
+        project = self.project(project_id)
+        existing = next((i for i in project['items'] if i['content'] == content_id), None)
+        if existing:
+            return existing
+        item = {"id": "PVTI_" + _sha([project_id, content_id])[:12], "content": content_id,
+                "archived": False, "values": {}}
+        project['items'].append(item)
+        self.nodes[item['id']] = ("item", (project_id, item['id']))
+        return item
+
+class FakeGitHub:
+    """HTTP server around a simulated Repository, with request accounting."""
+
+    def __init__(self, issues=10, pull_requests=None, owner=DEFAULT_OWNER, repo=DEFAULT_REPO, login=DEFAULT_LOGIN,
+                 project=True, latency=0.0, rate_limit=DEFAULT_RATE_LIMIT, window=DEFAULT_WINDOW,
+                 secondary_every=0, retry_after=1):
+        self.repo = Repository(owner, repo, login, issues, pull_requests, project)
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.window = window
+        self.secondary_every = secondary_every
+        self.retry_after = retry_after
+        self.lock = threading.RLock()
+        self.server = None
+        self.url = None
+        self._budget = {}
+        self._writes = 0
+        self.reset_stats()
+
+    # --- lifecycle ---
+
+    def start(self, host="127.0.0.1", port=0):
+        handler = type("Handler", (_Handler,), {"sim": self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.url
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- accounting ---
+
+    def reset_stats(self):
+        with self.lock:
+            self._stats = {"requests": 0, "rest": 0, "graphql": 0, "not_modified": 0, "rate_limited": 0,
+                           "sent_bytes": 0, "received_bytes": 0, "routes": {}}
+
+    def stats(self):
+        """Counters since the last reset_stats(); bytes are request/response bodies."""
+        with self.lock:
+            return json.loads(json.dumps(self._stats))
+
+    def _count(self, route, kind, sent, received, status, limited):
+        with self.lock:
+            s = self._stats
+            s['requests'] += 1
+            s[kind] += 1
+            s['sent_bytes'] += sent
+            s['received_bytes'] += received
+            s['not_modified'] += status == 304
+            s['rate_limited'] += limited
+            s['routes'][route] = s['routes'].get(route, 0) + 1
+
+    def _spend(self, resource, writing):
+        """Charge one request; returns (headers, (status, payload) of a limited response or None).
+
+        An exhausted GraphQL budget is reported like GitHub does, as a 200
+        carrying a RATE_LIMITED error; REST gets a 403.
+        """
+        with self.lock:
+            now = time.time()
+            budget = self._budget.get(resource)
+            if budget is None or now >= budget['reset']:
+                budget = self._budget[resource] = {"remaining": self.rate_limit, "reset": int(now + self.window)}
+            headers = {"X-RateLimit-Limit": str(self.rate_limit), "X-RateLimit-Resource": resource,
+                       "X-RateLimit-Reset": str(budget['reset'])}
+            if budget['remaining'] <= 0:
+                headers["X-RateLimit-Remaining"] = "0"
+                if resource == "graphql":
+                    return headers, (200, {"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]})
+                return headers, (403, {"message": "API rate limit exceeded for user."})
+            budget['remaining'] -= 1
+            headers["X-RateLimit-Remaining"] = str(budget['remaining'])
+            headers["X-RateLimit-Used"] = str(self.rate_limit - budget['remaining'])
+            if writing and self.secondary_every:
+                self._writes += 1
+                if self._writes % self.secondary_every == 0:
+                    budget['remaining'] += 1
+                    headers["Retry-After"] = str(self.retry_after)
+                    return headers, (403, {"message": "You have exceeded a secondary rate limit."})
+            return headers, None
+
+    def _refund(self, resource):
+        with self.lock:
+            self._budget[resource]['remaining'] += 1
+
+    def rate_limit_node(self, cost=1):
+        budget = self._budget.get("graphql") or {"remaining": self.rate_limit, "reset": int(time.time() + self.window)}
+        return {"cost": cost, "limit": self.rate_limit, "remaining": budget['remaining'],
+                "used": self.rate_limit - budget['remaining'], "resetAt": _iso(budget['reset'])}
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    sim = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle()
+
+    do_POST = do_PATCH = do_PUT = do_DELETE = do_GET
+
+    def _handle(self):
+        sim = self.sim
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        split = urlsplit(self.path)
+        path, query = split.path.rstrip("/") or "/", parse_qs(split.query)
+
+        if path == "/_sim/stats":
+            return self._send(200, sim.stats(), {})
+        if path == "/_sim/reset":
+            sim.reset_stats()
+            return self._send(204, b"", {})
+
+        is_graphql = path == "/graphql"
+        kind = "graphql" if is_graphql else "rest"
+        try:
+            body = json.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        writing = (self.command != "GET" and not is_graphql) or \
+            (is_graphql and body.get('query', '').lstrip().startswith("mutation"))
+        if sim.latency:
+            time.sleep(sim.latency)
+
+        resource = "graphql" if is_graphql else "core"
+        headers, limited = sim._spend(resource, writing)
+        route = "POST /graphql"
+        if limited:
+            status, payload = limited
+        elif is_graphql:
+            with sim.lock:
+                route, payload = _graphql(sim, body)
+            status = 200
+        else:
+            with sim.lock:
+                route, status, payload, extra = _rest(sim, self.command, path, query, body)
+            headers.update(extra)
+
+        data = b"" if payload is None else json.dumps(payload).encode()
+        if status == 200 and self.command == "GET" and data:
+            etag = f'W/"{hashlib.sha1(data).hexdigest()}"'
+            headers["ETag"] = etag
+            if self.headers.get("If-None-Match") == etag:
+                status, data = 304, b""
+                sim._refund(resource)
+        sim._count(route, kind, len(raw), len(data), status, limited is not None)
+        self._send(status, data, headers)
+
+    def _send(self, status, data, headers):
+        if not isinstance(data, bytes):
+            data = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+
+# --- REST ---
+
+_ROUTES = []
+
+def route(method, pattern):
+    regex = re.compile("^" + re.sub(r"\{(\w+)\}", r"(?P<\1>[^/]+)", pattern.replace("{path*}", "(?P<path>.*)")) + "$")
+
+    def register(fn):
+        _ROUTES.append((method, regex, pattern, fn))
+        return fn
+    return register
+
+def _rest(sim, method, path, query, body):
+    for route_method, regex, pattern, fn in _ROUTES:
+        match = regex.match(path)
+        if route_method != method or not match:
+            continue
+        params = {k: unquote(v) for k, v in match.groupdict().items()}
+        if "owner" in params and f"{params['owner']}/{params['repo']}".lower() != sim.repo.full_name.lower():
+            break
+        ctx = _Context(sim, query, body)
+        try:
+            status, payload = fn(ctx, **{k: v for k, v in params.items() if k not in ("owner", "repo")})
+        except NotFound:
+            status, payload = 404, {"message": "Not Found"}
+        except Unprocessable as e:
+            status, payload = 422, {"message": str(e)}
+        return f"{method} {pattern}", status, payload, ctx.headers
+    return f"{method} (unknown)", 404, {"message": "Not Found"}, {}
+
+class _Context:
+    def __init__(self, sim, query, body):
+        self.sim = sim
+        self.repo = sim.repo
+        self.query = query
+        self.body = body
+        self.headers = {}
+
+    def arg(self, name, default=None):
+        return self.query.get(name, [default])[0]
+
+    @property
+    def base(self):
+        return self.sim.url
+
+    @property
+    def repo_url(self):
+        return f"{self.base}/repos/{self.repo.full_name}"
+
+    def paginate(self, items, url):
+        per_page = min(int(self.arg("per_page", 30)), 100)
+        page = max(int(self.arg("page", 1)), 1)
+        last = max(1, -(-len(items) // per_page))
+        params = {k: v[0] for k, v in self.query.items() if k != "page"}
+        link = lambda n: "<{}?{}>".format(url, "&".join(f"{k}={quote(str(v))}" for k, v in {**params, "page": n}.items()))
+        links = []
+        if page < last:
+            links += [f'{link(page + 1)}; rel="next"', f'{link(last)}; rel="last"']
+        if page > 1:
+            links += [f'{link(1)}; rel="first"', f'{link(page - 1)}; rel="prev"']
+        if links:
+            self.headers["Link"] = ", ".join(links)
+        return items[(page - 1) * per_page:page * per_page]
+
+    # --- JSON shapes ---
+
+    def user(self, login):
+        return {"login": login, "id": int(_sha(login)[:7], 16), "node_id": f"U_{login}", "type": "User",
+                "url": f"{self.base}/users/{login}", "html_url": f"https://github.com/{login}"}
+
+    def repository(self):
+        r = self.repo
+        return {"id": 1, "node_id": r.node_id, "name": r.name, "full_name": r.full_name, "private": False,
+                "owner": self.user(r.owner), "html_url": f"https://github.com/{r.full_name}", "url": self.repo_url,
+                "default_branch": "main", "has_issues": True, "has_projects": True, "archived": False,
+                "open_issues_count": sum(i['state'] == "open" for i in r.issues.values())}
+
+    def label(self, label):
+        return {**label, "url": f"{self.repo_url}/labels/{quote(label['name'])}", "default": False}
+
+    def issue(self, record):
+        number = record['number']
+        data = {
+            "id": record['id'], "node_id": record['node_id'], "number": number, "title": record['title'],
+            "body": record['body'], "state": record['state'], "state_reason": record['state_reason'],
+            "user": self.user(record['user']), "labels": [self.label(self.repo.label(l)) for l in record['labels']],
+            "assignees": [self.user(a) for a in record['assignees']],
+            "assignee": self.user(record['assignees'][0]) if record['assignees'] else None,
+            "milestone": {"title": record['milestone'], "number": 1, "state": "open"} if record['milestone'] else None,
+            "comments": len(self.repo.comments[number]), "created_at": _iso(record['created_at']),
+            "updated_at": _iso(record['updated_at']), "closed_at": None if record['state'] == "open" else _iso(record['updated_at']),
+            "url": f"{self.repo_url}/issues/{number}", "html_url": f"https://github.com/{self.repo.full_name}/issues/{number}",
+            "repository_url": self.repo_url,
+        }
+        if record['pr']:
+            data["pull_request"] = {"url": f"{self.repo_url}/pulls/{number}",
+                                    "html_url": f"https://github.com/{self.repo.full_name}/pull/{number}"}
+        return data
+
+    def pull(self, record):
+        pr = record['pr']
+        number = record['number']
+        part = lambda ref, sha: {"ref": ref, "sha": sha, "label": f"{self.repo.owner}:{ref}",
+                                 "user": self.user(self.repo.owner), "repo": self.repository()}
+        return {**self.issue(record),
+                "url": f"{self.repo_url}/pulls/{number}",
+                "html_url": f"https://github.com/{self.repo.full_name}/pull/{number}",
+                "issue_url": f"{self.repo_url}/issues/{number}",
+                "head": part(pr['head'], pr['head_sha']), "base": part(pr['base'], self.repo.refs["heads/main"]),
+                "merged": pr['merged'], "mergeable": not pr['merged'], "mergeable_state": "clean", "draft": False}
+
+    def comment(self, number, comment):
+        return {"id": comment['id'], "body": comment['body'], "user": self.user(comment['user']),
+                "created_at": _iso(comment['created_at']), "updated_at": _iso(comment['created_at']),
+                "url": f"{self.repo_url}/issues/comments/{comment['id']}",
+                "html_url": f"https://github.com/{self.repo.full_name}/issues/{number}#issuecomment-{comment['id']}"}
+
+    def ref(self, name):
+        sha = self.repo.refs.get(name)
+        if sha is None:
+            raise NotFound()
+        return {"ref": f"refs/{name}", "url": f"{self.repo_url}/git/refs/{name}",
+                "object": {"sha": sha, "type": "commit", "url": f"{self.repo_url}/git/commits/{sha}"}}
+
+    def commit(self, sha):
+        commit = self.repo.commits.get(sha)
+        if commit is None:
+            raise NotFound()
+        return {"sha": sha, "url": f"{self.repo_url}/git/commits/{sha}", "message": commit['message'],
+                "tree": {"sha": commit['tree'], "url": f"{self.repo_url}/git/trees/{commit['tree']}"},
+                "parents": [{"sha": p, "url": f"{self.repo_url}/git/commits/{p}"} for p in commit['parents']]}
+
+    def content(self, path, content=None, kind="file"):
+        entry = {"type": kind, "path": path, "name": path.rsplit("/", 1)[-1],
+                 "url": f"{self.repo_url}/contents/{path}", "html_url": f"https://github.com/{self.repo.full_name}/blob/main/{path}"}
+        if kind == "file":
+            data = content.encode()
+            entry.update(sha=git_blob_sha(data), size=len(data), encoding="base64",
+                         content=base64.b64encode(data).decode())
+        else:
+            entry.update(sha=_sha(path), size=0)
+        return entry
+
+@route("GET", "/user")
+def _get_user(ctx):
+    return 200, ctx.user(ctx.repo.login)
+
+@route("GET", "/users/{login}")
+def _get_named_user(ctx, login):
+    return 200, ctx.user(login)
+
+@route("GET", "/orgs/{org}")
+def _get_org(ctx, org):
+    return 200, {**ctx.user(org), "type": "Organization", "url": f"{ctx.base}/orgs/{org}",
+                 "repos_url": f"{ctx.base}/orgs/{org}/repos"}
+
+@route("GET", "/orgs/{org}/repos")
+def _get_org_repos(ctx, org):
+    return 200, ctx.paginate([ctx.repository()] if org == ctx.repo.owner else [], f"{ctx.base}/orgs/{org}/repos")
+
+@route("GET", "/rate_limit")
+def _get_rate_limit(ctx):
+    node = ctx.sim.rate_limit_node()
+    core = {"limit": node['limit'], "remaining": node['remaining'], "reset": _parse_iso(node['resetAt']), "used": node['used']}
+    return 200, {"resources": {"core": core, "graphql": core, "search": core}, "rate": core}
+
+@route("GET", "/repos/{owner}/{repo}")
+def _get_repo(ctx):
+    return 200, ctx.repository()
+
+@route("GET", "/repos/{owner}/{repo}/issues")
+def _list_issues(ctx):
+    records = ctx.repo.by_updated()
+    if ctx.arg("direction", "desc") == "desc":
+        records = records[::-1]
+    state = ctx.arg("state", "open")
+    since = ctx.arg("since")
+    since = _parse_iso(since) if since else None
+    labels = [l for l in (ctx.arg("labels") or "").split(",") if l]
+    selected = [r for r in records
+                if (state == "all" or r['state'] == state) and (since is None or r['updated_at'] >= since)
+                and all(l in r['labels'] for l in labels)]
+    return 200, [ctx.issue(r) for r in ctx.paginate(selected, f"{ctx.repo_url}/issues")]
+
+@route("POST", "/repos/{owner}/{repo}/issues")
+def _create_issue(ctx):
+    record = ctx.repo.add_issue(ctx.body['title'], ctx.body.get('body') or "", ctx.body.get('labels') or [])
+    record['assignees'] = list(ctx.body.get('assignees') or [])
+    return 201, ctx.issue(record)
+
+@route("GET", "/repos/{owner}/{repo}/issues/{number}")
+def _get_issue(ctx, number):
+    return 200, ctx.issue(ctx.repo.issue(number))
+
+@route("PATCH", "/repos/{owner}/{repo}/issues/{number}")
+def _edit_issue(ctx, number):
+    record = ctx.repo.issue(number)
+    body = ctx.body
+    for key in ("title", "body"):
+        if key in body:
+            record[key] = body[key]
+    if "labels" in body:
+        for label in body['labels']:
+            if label.lower() not in ctx.repo.labels:
+                ctx.repo.create_label(label, "ededed", None)
+        record['labels'] = [ctx.repo.label(l)['name'] for l in body['labels']]
+    if "assignees" in body:
+        record['assignees'] = list(body['assignees'])
+    if body.get('state') == "closed" and record['state'] != "closed":
+        ctx.repo.close_issue(record, body.get('state_reason'))
+    elif body.get('state') == "open":
+        record['state'], record['state_reason'] = "open", None
+    ctx.repo.touch(record)
+    return 200, ctx.issue(record)
+
+@route("GET", "/repos/{owner}/{repo}/issues/{number}/comments")
+def _list_comments(ctx, number):
+    comments = ctx.repo.comments.get(int(number))
+    if comments is None:
+        raise NotFound()
+    return 200, [ctx.comment(int(number), c) for c in ctx.paginate(comments, f"{ctx.repo_url}/issues/{number}/comments")]
+
+@route("POST", "/repos/{owner}/{repo}/issues/{number}/comments")
+def _create_comment(ctx, number):
+    ctx.repo.issue(number)
+    return 201, ctx.comment(int(number), ctx.repo.comment(int(number), ctx.body['body']))
+
+@route("POST", "/repos/{owner}/{repo}/issues/{number}/assignees")
+def _add_assignees(ctx, number):
+    record = ctx.repo.issue(number)
+    record['assignees'] += [a for a in ctx.body.get('assignees', []) if a not in record['assignees']]
+    ctx.repo.touch(record)
+    return 201, ctx.issue(record)
+
+@route("DELETE", "/repos/{owner}/{repo}/issues/{number}/assignees")
+def _remove_assignees(ctx, number):
+    record = ctx.repo.issue(number)
+    record['assignees'] = [a for a in record['assignees'] if a not in ctx.body.get('assignees', [])]
+    ctx.repo.touch(record)
+    return 200, ctx.issue(record)
+
+@route("GET", "/repos/{owner}/{repo}/labels")
+def _list_labels(ctx):
+    labels = sorted(ctx.repo.labels.values(), key=lambda l: l['name'])
+    return 200, [ctx.label(l) for l in ctx.paginate(labels, f"{ctx.repo_url}/labels")]
+
+@route("POST", "/repos/{owner}/{repo}/labels")
+def _create_label(ctx):
+    label = ctx.repo.create_label(ctx.body['name'], ctx.body.get('color'), ctx.body.get('description'))
+    return 201, ctx.label(label)
+
+@route("GET", "/repos/{owner}/{repo}/labels/{name}")
+def _get_label(ctx, name):
+    return 200, ctx.label(ctx.repo.label(name))
+
+@route("PATCH", "/repos/{owner}/{repo}/labels/{name}")
+def _edit_label(ctx, name):
+    label = ctx.repo.labels.pop(ctx.repo.label(name)['name'].lower())
+    new_name = ctx.body.get('new_name') or ctx.body.get('name') or label['name']
+    if new_name != label['name']:
+        for record in ctx.repo.issues.values():
+            record['labels'] = [new_name if l == label['name'] else l for l in record['labels']]
+    label.update(name=new_name, color=(ctx.body.get('color') or label['color']).lower(),
+                 description=ctx.body.get('description', label['description']))
+    ctx.repo.labels[new_name.lower()] = label
+    return 200, ctx.label(label)
+
+@route("DELETE", "/repos/{owner}/{repo}/labels/{name}")
+def _delete_label(ctx, name):
+    label = ctx.repo.labels.pop(ctx.repo.label(name)['name'].lower())
+    for record in ctx.repo.issues.values():
+        record['labels'] = [l for l in record['labels'] if l != label['name']]
+    return 204, None
+
+@route("GET", "/repos/{owner}/{repo}/contents")
+def _get_root(ctx):
+    return _get_contents(ctx, "")
+
+@route("GET", "/repos/{owner}/{repo}/contents/{path*}")
+def _get_contents(ctx, path):
+    files = ctx.repo.files(ctx.arg("ref", "main"))
+    if path in files:
+        return 200, ctx.content(path, files[path])
+    prefix = f"{path}/" if path else ""
+    entries = {}
+    for name, content in files.items():
+        if name.startswith(prefix):
+            head, _, rest = name[len(prefix):].partition("/")
+            entries[head] = ctx.content(prefix + head, content) if not rest else ctx.content(prefix + head, kind="dir")
+    if not entries:
+        raise NotFound()
+    return 200, [entries[k] for k in sorted(entries)]
+
+@route("PUT", "/repos/{owner}/{repo}/contents/{path*}")
+def _put_contents(ctx, path):
+    branch = ctx.body.get('branch') or "main"
+    content = base64.b64decode(ctx.body['content']).decode()
+    sha = ctx.repo.commit_files(ctx.body.get('message') or f"Update {path}", {path: content}, branch)
+    return 201, {"content": ctx.content(path, content), "commit": ctx.commit(sha)}
+
+@route("GET", "/repos/{owner}/{repo}/git/ref/{path*}")
+def _get_ref(ctx, path):
+    return 200, ctx.ref(path)
+
+@route("GET", "/repos/{owner}/{repo}/git/refs/{path*}")
+def _get_ref_plural(ctx, path):
+    return 200, ctx.ref(path)
+
+@route("POST", "/repos/{owner}/{repo}/git/refs")
+def _create_ref(ctx):
+    name = ctx.body['ref'].removeprefix("refs/")
+    if name in ctx.repo.refs:
+        raise Unprocessable("Reference already exists")
+    ctx.repo.refs[name] = ctx.body['sha']
+    return 201, ctx.ref(name)
+
+@route("PATCH", "/repos/{owner}/{repo}/git/refs/{path*}")
+def _update_ref(ctx, path):
+    ctx.ref(path)
+    ctx.repo.refs[path] = ctx.body['sha']
+    return 200, ctx.ref(path)
+
+@route("DELETE", "/repos/{owner}/{repo}/git/refs/{path*}")
+def _delete_ref(ctx, path):
+    if ctx.repo.refs.pop(path, None) is None:
+        raise Unprocessable("Reference does not exist")
+    return 204, None
+
+@route("GET", "/repos/{owner}/{repo}/git/commits/{sha}")
+def _get_commit(ctx, sha):
+    return 200, ctx.commit(sha)
+
+@route("POST", "/repos/{owner}/{repo}/git/trees")
+def _create_tree(ctx):
+    base = ctx.repo.trees.get(ctx.body.get('base_tree'), {})
+    files = dict(base)
+    for element in ctx.body.get('tree', []):
+        if element.get('content') is not None:
+            files[element['path']] = element['content']
+        elif element.get('sha') in ctx.repo.blobs:
+            files[element['path']] = ctx.repo.blobs[element['sha']]
+        else:
+            files.pop(element['path'], None)
+    sha = ctx.repo._write_tree(files)
+    return 201, {"sha": sha, "url": f"{ctx.repo_url}/git/trees/{sha}",
+                 "tree": [{"path": p, "mode": "100644", "type": "blob", "sha": git_blob_sha(c.encode())}
+                          for p, c in sorted(files.items())]}
+
+@route("POST", "/repos/{owner}/{repo}/git/commits")
+def _create_commit(ctx):
+    sha = ctx.repo._write_commit(ctx.body.get('message', ""), ctx.body['tree'], ctx.body.get('parents', []))
+    return 201, ctx.commit(sha)
+
+@route("GET", "/repos/{owner}/{repo}/pulls")
+def _list_pulls(ctx):
+    state = ctx.arg("state", "open")
+    pulls = sorted((r for r in ctx.repo.issues.values() if r['pr'] and (state == "all" or r['state'] == state)),
+                   key=lambda r: -r['number'])
+    return 200, [ctx.pull(r) for r in ctx.paginate(pulls, f"{ctx.repo_url}/pulls")]
+
+@route("POST", "/repos/{owner}/{repo}/pulls")
+def _create_pull(ctx):
+    head = ctx.body['head'].split(":")[-1]
+    if any(r['pr'] and r['state'] == "open" and r['pr']['head'] == head for r in ctx.repo.issues.values()):
+        raise Unprocessable(f"A pull request already exists for {ctx.repo.owner}:{head}.")
+    record = ctx.repo.add_pull(ctx.body.get('title') or head, ctx.body.get('body') or "", head, ctx.body.get('base', "main"))
+    return 201, ctx.pull(record)
+
+def _pull_record(ctx, number):
+    record = ctx.repo.issue(number)
+    if not record['pr']:
+        raise NotFound()
+    return record
+
+@route("GET", "/repos/{owner}/{repo}/pulls/{number}")
+def _get_pull(ctx, number):
+    return 200, ctx.pull(_pull_record(ctx, number))
+
+@route("PUT", "/repos/{owner}/{repo}/pulls/{number}/merge")
+def _merge_pull(ctx, number):
+    record = _pull_record(ctx, number)
+    if record['pr']['merged'] or record['state'] != "open":
+        raise Unprocessable("Pull Request is not mergeable")
+    record['pr']['merged'] = True
+    ctx.repo.close_issue(record)
+    sha = ctx.repo.commit_files(f"Merge pull request #{record['number']}", {})
+    # Closing keywords close the linked issues, as on GitHub
+    for linked in re.findall(r'(?:fixes|closes|resolves)\s+#(\d+)', record['body'] or "", re.I):
+        issue = ctx.repo.issues.get(int(linked))
+        if issue and issue['state'] == "open":
+            ctx.repo.close_issue(issue)
+    return 200, {"sha": sha, "merged": True, "message": "Pull Request successfully merged"}
+
+@route("POST", "/repos/{owner}/{repo}/pulls/{number}/reviews")
+def _create_review(ctx, number):
+    record = _pull_record(ctx, number)
+    state = {"APPROVE": "APPROVED", "REQUEST_CHANGES": "CHANGES_REQUESTED"}.get(ctx.body.get('event'), "COMMENTED")
+    review = {"id": ctx.repo.next_id(), "state": state, "body": ctx.body.get('body') or "",
+              "user": ctx.user(ctx.repo.login), "submitted_at": _iso(ctx.repo.tick()),
+              "html_url": f"https://github.com/{ctx.repo.full_name}/pull/{number}"}
+    record['pr']['reviews'].append(state)
+    return 200, review
+
+# --- GraphQL ---
+
+def _graphql(sim, body):
+    query = body.get('query') or ""
+    response = execute(query, _Root(sim), body.get('variables') or {})
+    match = re.search(r'\{\s*(?:\w+\s*:\s*)?(\w+)', query)
+    op = "mutation" if query.lstrip().startswith("mutation") else "query"
+    return f"{op} {match.group(1) if match else '?'}", response
+
+class _Root:
+    """Query and mutation fields; objects below are dicts with __typename."""
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.repo = sim.repo
+
+    # --- object shapes ---
+
+    def issue_node(self, record):
+        number = record['number']
+        url = f"https://github.com/{self.repo.full_name}/{'pull' if record['pr'] else 'issues'}/{number}"
+
+        def project_items(first=100, after=None, includeArchived=True):
+            items = [self.item_node(p['id'], i) for p in self.repo.projects.values() for i in p['items']
+                     if i['content'] == record['node_id'] and (includeArchived or not i['archived'])]
+            return _connection(items, first, after)
+
+        node = {"__typename": "PullRequest" if record['pr'] else "Issue", "id": record['node_id'],
+                "number": number, "title": record['title'], "url": url, "body": record['body'],
+                "state": record['state'].upper(), "author": {"login": record['user']},
+                "projectItems": project_items}
+        if record['pr']:
+            pr = record['pr']
+            reviews = pr['reviews']
+            decision = "CHANGES_REQUESTED" if reviews and reviews[-1] == "CHANGES_REQUESTED" else \
+                "APPROVED" if "APPROVED" in reviews else "REVIEW_REQUIRED"
+            node.update(state="MERGED" if pr['merged'] else record['state'].upper(), merged=pr['merged'],
+                        mergeable="UNKNOWN" if pr['merged'] else "MERGEABLE", reviewDecision=decision,
+                        headRefName=pr['head'], baseRefName=pr['base'],
+                        latestReviews=lambda first=20: {"nodes": [{"state": s} for s in reviews[-first:]]})
+        return node
+
+    def project_node(self, project):
+        def field_node(field):
+            typename = "ProjectV2SingleSelectField" if field['dataType'] == "SINGLE_SELECT" else "ProjectV2Field"
+            return {"__typename": typename, **field}
+
+        return {"__typename": "ProjectV2", "id": project['id'], "title": project['title'], "url": project['url'],
+                "closed": project['closed'], "number": project['number'],
+                "fields": lambda first=20, after=None: _connection([field_node(f) for f in project['fields']], first, after),
+                "items": lambda first=100, after=None: _connection(
+                    [self.item_node(project['id'], i) for i in project['items']], first, after)}
+
+    def item_node(self, project_id, item):
+        project = self.repo.projects[project_id]
+        kind, number = self.repo.nodes.get(item['content'], (None, None))
+        record = self.repo.issues.get(number) if kind == "issue" else None
+
+        def value_by_name(name):
+            field = next((f for f in project['fields'] if f['name'] == name), None)
+            option_id = item['values'].get(name)
+            option = next((o for o in (field or {}).get('options', []) if o['id'] == option_id), None)
+            if not option:
+                return None
+            return {"__typename": "ProjectV2ItemFieldSingleSelectValue", "name": option['name'], "optionId": option['id']}
+
+        return {"__typename": "ProjectV2Item", "id": item['id'], "isArchived": item['archived'],
+                "type": "PULL_REQUEST" if record and record['pr'] else "ISSUE",
+                "content": self.issue_node(record) if record else None,
+                "project": {"__typename": "ProjectV2", "id": project_id},
+                "fieldValueByName": value_by_name}
+
+    def user_node(self, login):
+        def projects(first=20, after=None, query=None):
+            found = [self.project_node(p) for p in self.repo.projects.values()
+                     if not query or query.lower() in p['title'].lower()]
+            return _connection(found, first, after)
+        return {"__typename": "User", "id": f"U_{login}", "login": login, "projectsV2": projects}
+
+    def _issue_record(self, node_id):
+        kind, number = self.repo.nodes.get(node_id, (None, None))
+        if kind != "issue":
+            raise FieldError(f"Could not resolve to a node with the global id of '{node_id}'", "NOT_FOUND")
+        return self.repo.issues[number]
+
+    def _item(self, project, item_id):
+        item = next((i for i in project['items'] if i['id'] == item_id), None)
+        if item is None:
+            raise FieldError(f"Could not resolve to ProjectV2Item with the global id of '{item_id}'", "NOT_FOUND")
+        return item
+
+    # --- queries ---
+
+    def gql_rateLimit(self, dryRun=False):
+        return self.sim.rate_limit_node()
+
+    def gql_viewer(self):
+        return self.user_node(self.repo.login)
+
+    def gql_user(self, login):
+        if login != self.repo.login:
+            raise FieldError(f"Could not resolve to a User with the login of '{login}'.", "NOT_FOUND")
+        return self.user_node(login)
+
+    def gql_repository(self, owner, name):
+        if f"{owner}/{name}".lower() != self.repo.full_name.lower():
+            raise FieldError(f"Could not resolve to a Repository with the name '{owner}/{name}'.", "NOT_FOUND")
+        repo = self.repo
+
+        def labels(first=100, after=None):
+            nodes = [{"name": l['name'], "color": l['color'], "description": l['description']}
+                     for l in sorted(repo.labels.values(), key=lambda l: l['name'])]
+            return _connection(nodes, first, after)
+
+        def blob(expression):
+            ref, _, path = expression.partition(":")
+            content = repo.files("main" if ref == "HEAD" else ref).get(path)
+            return None if content is None else {"__typename": "Blob", "oid": git_blob_sha(content.encode())}
+
+        def pull_requests(first=100, after=None, states=None, orderBy=None):
+            records = [r for r in sorted(repo.issues.values(), key=lambda r: -r['number']) if r['pr']]
+            nodes = [self.issue_node(r) for r in records]
+            if states:
+                nodes = [n for n in nodes if n['state'] in states]
+            return _connection(nodes, first, after)
+
+        return {"__typename": "Repository", "id": repo.node_id, "name": repo.name, "labels": labels,
+                "object": blob, "pullRequests": pull_requests}
+
+    def gql_node(self, id):
+        kind, key = self.repo.nodes.get(id, (None, None))
+        if kind == "issue":
+            return self.issue_node(self.repo.issues[key])
+        if kind == "project":
+            return self.project_node(self.repo.projects[key])
+        if kind == "item":
+            project_id, item_id = key
+            return self.item_node(project_id, self._item(self.repo.projects[project_id], item_id))
+        if id == self.repo.node_id:
+            return self.gql_repository(self.repo.owner, self.repo.name)
+        raise FieldError(f"Could not resolve to a node with the global id of '{id}'", "NOT_FOUND")
+
+    def gql_search(self, query, type="ISSUE", first=10, after=None):
+        terms = re.findall(r'(\w+):"([^"]*)"|(\w+):(\S+)|"([^"]*)"|(\S+)', query)
+        want = {"is": set(), "label": [], "milestone": None, "repo": None}
+        text = []
+        for quoted_key, quoted_value, key, value, phrase, word in terms:
+            key, value = (quoted_key, quoted_value) if quoted_key else (key, value)
+            if key == "is":
+                want["is"].add(value)
+            elif key == "label":
+                want["label"].append(value)
+            elif key in ("milestone", "repo"):
+                want[key] = value
+            else:
+                text.append((phrase or word or f"{key}:{value}").lower())
+        if want["repo"] and want["repo"].lower() != self.repo.full_name.lower():
+            return _connection([], first, after) | {"issueCount": 0}
+        matches = []
+        for record in sorted(self.repo.issues.values(), key=lambda r: -r['updated_at']):
+            if ("issue" in want["is"] and record['pr']) or ("pr" in want["is"] and not record['pr']):
+                continue
+            if ("open" in want["is"] and record['state'] != "open") or ("closed" in want["is"] and record['state'] != "closed"):
+                continue
+            if not all(l in record['labels'] for l in want["label"]):
+                continue
+            if want["milestone"] and record['milestone'] != want["milestone"]:
+                continue
+            if not all(t in f"{record['title']} {record['body']}".lower() for t in text):
+                continue
+            matches.append(record)
+        conn = _connection([self.issue_node(r) for r in matches[:SEARCH_LIMIT]], first, after)
+        conn["issueCount"] = len(matches)
+        return conn
+
+    # --- mutations ---
+
+    def gql_createProjectV2(self, input):
+        if input['ownerId'] != f"U_{self.repo.login}":
+            raise FieldError("Could not resolve to an owner.", "NOT_FOUND")
+        return {"projectV2": self.project_node(self.repo.create_project(input['title']))}
+
+    def gql_linkProjectV2ToRepository(self, input):
+        self.repo.project(input['projectId'])['repos'].add(input['repositoryId'])
+        return {"repository": {"id": input['repositoryId']}}
+
+    def gql_createProjectV2Field(self, input):
+        project = self.repo.project(input['projectId'])
+        if any(f['name'].lower() == input['name'].lower() for f in project['fields']):
+            raise FieldError("Name has already been taken", "UNPROCESSABLE")
+        options = [o['name'] for o in input.get('singleSelectOptions') or []]
+        field = self.repo.add_field(project, input['name'], input.get('dataType', "TEXT"), options)
+        return {"projectV2Field": {"__typename": "ProjectV2SingleSelectField", **field}}
+
+    def gql_updateProjectV2Field(self, input):
+        for project in self.repo.projects.values():
+            field = next((f for f in project['fields'] if f['id'] == input['fieldId']), None)
+            if field is None:
+                continue
+            if input.get('singleSelectOptions') is not None:
+                current = {o['name'].lower(): o['id'] for o in field.get('options', [])}
+                field['options'] = [{"id": current.get(o['name'].lower()) or _sha([o['name'], self.repo.next_id()])[:8],
+                                     "name": o['name']} for o in input['singleSelectOptions']]
+                valid = {o['id'] for o in field['options']}
+                for item in project['items']:
+                    if item['values'].get(field['name']) not in valid:
+                        item['values'].pop(field['name'], None)
+            if input.get('name'):
+                field['name'] = input['name']
+            return {"projectV2Field": {"__typename": "ProjectV2SingleSelectField", **field}}
+        raise FieldError(f"Could not resolve to a node with the global id of '{input['fieldId']}'", "NOT_FOUND")
+
+    def gql_addProjectV2ItemById(self, input):
+        self._issue_record(input['contentId'])
+        item = self.repo.add_item(input['projectId'], input['contentId'])
+        return {"item": self.item_node(input['projectId'], item)}
+
+    def gql_updateProjectV2ItemFieldValue(self, input):
+        project = self.repo.project(input['projectId'])
+        item = self._item(project, input['itemId'])
+        field = next((f for f in project['fields'] if f['id'] == input['fieldId']), None)
+        if field is None:
+            raise FieldError(f"Could not resolve to a field with the global id of '{input['fieldId']}'", "NOT_FOUND")
+        option_id = (input.get('value') or {}).get('singleSelectOptionId')
+        if option_id not in {o['id'] for o in field.get('options', [])}:
+            raise FieldError("The single select option Id does not belong to the field", "UNPROCESSABLE")
+        item['values'][field['name']] = option_id
+        return {"projectV2Item": self.item_node(project['id'], item)}
+
+    def gql_addComment(self, input):
+        record = self._issue_record(input['subjectId'])
+        self.repo.comment(record['number'], input['body'])
+        return {"clientMutationId": input.get('clientMutationId'), "subject": {"id": record['node_id']}}
+
+    def gql_closeIssue(self, input):
+        record = self._issue_record(input['issueId'])
+        if record['state'] != "closed":
+            self.repo.close_issue(record, input.get('stateReason'))
+        return {"issue": self.issue_node(record)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a simulated GitHub API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--issues", type=int, default=100, help="Issues seeded in the repository")
+    parser.add_argument("--pull-requests", type=int, help="Pull requests seeded (default: issues / 10)")
+    parser.add_argument("--owner", default=DEFAULT_OWNER)
+    parser.add_argument("--repo", default=DEFAULT_REPO)
+    parser.add_argument("--login", default=DEFAULT_LOGIN)
+    parser.add_argument("--no-project", action="store_true", help="Do not seed the user's project")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--rate-limit", type=int, default=DEFAULT_RATE_LIMIT, help="Requests per window and resource")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Rate-limit window in seconds")
+    parser.add_argument("--secondary-every", type=int, default=0, help="Answer every Nth write with a secondary limit")
+    args = parser.parse_args()
+
+    sim = FakeGitHub(args.issues, args.pull_requests, args.owner, args.repo, args.login, not args.no_project,
+                     args.latency, args.rate_limit, args.window, args.secondary_every)
+    url = sim.start(port=args.port)
+    print(f"Serving {sim.repo.full_name} ({args.issues} issues) as {args.login} at {url}", file=sys.stderr)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        sim.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""
+Minimal GraphQL executor for the GitHub simulator.
+
+Parses the subset of GraphQL the skill sends (operations with variables,
+aliases, arguments, inline fragments, @include/@skip) and resolves it against
+plain Python objects. It validates nothing beyond what resolving needs: unknown
+fields resolve to null, errors are reported per field with their path.
+"""
+
+import re
+
+_TOKEN_RE = re.compile(r'''
+    (?P<skip>[\s,]+|\#[^\n]*)
+  | (?P<spread>\.\.\.)
+  | (?P<punct>[{}()\[\]:!$=@])
+  | (?P<string>"(?:\\.|[^"\\])*")
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+''', re.X)
+
+class GraphQLSyntaxError(Exception):
+    pass
+
+class FieldError(Exception):
+    """Raised by a resolver; becomes an entry of the response's "errors"."""
+
+    def __init__(self, message, type=None):
+        super().__init__(message)
+        self.type = type
+
+def _tokenize(source):
+    tokens = []
+    pos = 0
+    while pos < len(source):
+        match = _TOKEN_RE.match(source, pos)
+        if not match:
+            raise GraphQLSyntaxError(f"Unexpected character {source[pos]!r} at {pos}")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == "skip":
+            continue
+        value = match.group(kind)
+        if kind == "string":
+            value = re.sub(r'\\(u[0-9a-fA-F]{4}|.)', _unescape, value[1:-1])
+        tokens.append((kind, value))
+    tokens.append(("eof", None))
+    return tokens
+
+def _unescape(match):
+    code = match.group(1)
+    if code.startswith("u") and len(code) == 5:
+        return chr(int(code[1:], 16))
+    return {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}.get(code, code)
+
+class _Parser:
+    def __init__(self, source):
+        self.tokens = _tokenize(source)
+        self.pos = 0
+
+    def peek(self, value=None):
+        kind, token = self.tokens[self.pos]
+        return token == value if value is not None else (kind, token)
+
+    def take(self, value=None):
+        kind, token = self.tokens[self.pos]
+        if value is not None and token != value:
+            raise GraphQLSyntaxError(f"Expected {value!r}, got {token!r}")
+        self.pos += 1
+        return kind, token
+
+    def name(self):
+        kind, token = self.take()
+        if kind != "name":
+            raise GraphQLSyntaxError(f"Expected a name, got {token!r}")
+        return token
+
+    def document(self):
+        """(operation type, {variable: default}, selections)."""
+        op = "query"
+        defaults = {}
+        if self.peek()[0] == "name":
+            op = self.name()
+            if self.peek()[0] == "name":
+                self.name()
+            if self.peek("("):
+                self.take("(")
+                while not self.peek(")"):
+                    self.take("$")
+                    var = self.name()
+                    self.take(":")
+                    self.type_ref()
+                    if self.peek("="):
+                        self.take("=")
+                        defaults[var] = self.value({})
+                self.take(")")
+            self.directives()
+        selections = self.selection_set()
+        return op, defaults, selections
+
+    def type_ref(self):
+        if self.peek("["):
+            self.take("[")
+            self.type_ref()
+            self.take("]")
+        else:
+            self.name()
+        if self.peek("!"):
+            self.take("!")
+
+    def directives(self):
+        found = []
+        while self.peek("@"):
+            self.take("@")
+            name = self.name()
+            found.append((name, self.arguments()))
+        return found
+
+    def arguments(self):
+        """Arguments as unresolved value nodes."""
+        args = {}
+        if self.peek("("):
+            self.take("(")
+            while not self.peek(")"):
+                key = self.name()
+                self.take(":")
+                args[key] = self.value_node()
+            self.take(")")
+        return args
+
+    def value_node(self):
+        kind, token = self.peek()
+        if token == "$":
+            self.take("$")
+            return ("var", self.name())
+        if token == "[":
+            self.take("[")
+            items = []
+            while not self.peek("]"):
+                items.append(self.value_node())
+            self.take("]")
+            return ("list", items)
+        if token == "{":
+            self.take("{")
+            fields = {}
+            while not self.peek("}"):
+                key = self.name()
+                self.take(":")
+                fields[key] = self.value_node()
+            self.take("}")
+            return ("object", fields)
+        self.take()
+        if kind == "string":
+            return ("const", token)
+        if kind == "number":
+            return ("const", float(token) if any(c in token for c in ".eE") else int(token))
+        if kind == "name":
+            return ("const", {"true": True, "false": False, "null": None}.get(token, token))
+        raise GraphQLSyntaxError(f"Unexpected token {token!r}")
+
+    def value(self, variables):
+        return resolve_value(self.value_node(), variables)
+
+    def selection_set(self):
+        self.take("{")
+        selections = []
+        while not self.peek("}"):
+            if self.peek("..."):
+                self.take("...")
+                type_name = None
+                if self.peek("on"):
+                    self.take("on")
+                    type_name = self.name()
+                directives = self.directives()
+                selections.append(("fragment", type_name, directives, self.selection_set()))
+                continue
+            alias = name = self.name()
+            if self.peek(":"):
+                self.take(":")
+                name = self.name()
+            args = self.arguments()
+            directives = self.directives()
+            children = self.selection_set() if self.peek("{") else None
+            selections.append(("field", alias, name, args, directives, children))
+        self.take("}")
+        return selections
+
+def resolve_value(node, variables):
+    kind, value = node
+    if kind == "var":
+        return variables.get(value)
+    if kind == "list":
+        return [resolve_value(v, variables) for v in value]
+    if kind == "object":
+        return {k: resolve_value(v, variables) for k, v in value.items()}
+    return value
+
+def _included(directives, variables):
+    for name, args in directives:
+        condition = resolve_value(args.get("if", ("const", True)), variables)
+        if name == "include" and not condition:
+            return False
+        if name == "skip" and condition:
+            return False
+    return True
+
+def typename(obj):
+    if isinstance(obj, dict):
+        return obj.get("__typename")
+    return getattr(obj, "typename", None)
+
+def _resolve_field(obj, name, args):
+    if name == "__typename":
+        return typename(obj)
+    if isinstance(obj, dict):
+        value = obj.get(name)
+        return value(**args) if callable(value) else value
+    method = getattr(obj, f"gql_{name}", None)
+    if method is None:
+        return None
+    return method(**args)
+
+def _collect(selections, obj, variables):
+    """Fields that apply to obj, with inline fragments flattened."""
+    fields = []
+    for selection in selections:
+        if selection[0] == "fragment":
+            _, type_name, directives, children = selection
+            if (type_name is None or type_name == typename(obj)) and _included(directives, variables):
+                fields.extend(_collect(children, obj, variables))
+        elif _included(selection[4], variables):
+            fields.append(selection)
+    return fields
+
+def _complete(value, children, variables, path, errors):
+    if value is None or children is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_complete(v, children, variables, path + [i], errors) for i, v in enumerate(value)]
+    return _select(value, children, variables, path, errors)
+
+def _select(obj, selections, variables, path, errors):
+    result = {}
+    for _, alias, name, args, _, children in _collect(selections, obj, variables):
+        field_path = path + [alias]
+        try:
+            value = _resolve_field(obj, name, {k: resolve_value(v, variables) for k, v in args.items()})
+            result[alias] = _complete(value, children, variables, field_path, errors)
+        except FieldError as e:
+            error = {"message": str(e), "path": field_path}
+            if e.type:
+                error["type"] = e.type
+            errors.append(error)
+            result[alias] = None
+    return result
+
+def parse(source):
+    """(operation type, variable defaults, selections) of a GraphQL document."""
+    return _Parser(source).document()
+
+def execute(source, root, variables=None):
+    """Run a document against root (an object answering gql_<field> for
+    queries, and gql_<mutation> for mutations, in document order).
+
+    Returns a response dict {"data": ...} with "errors" when any field failed.
+    """
+    try:
+        op, defaults, selections = parse(source)
+    except GraphQLSyntaxError as e:
+        return {"errors": [{"message": f"Parse error: {e}", "type": "PARSE_ERROR"}]}
+    values = {**defaults, **(variables or {})}
+    errors = []
+    data = _select(root, selections, values, [], errors)
+    response = {"data": data}
+    if errors:
+        response["errors"] = errors
+    return response
@@ -0,0 +1,13 @@
+import sys
+import pytest
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep the on-disk cache of every test in its own temp directory."""
+    monkeypatch.setenv("GH_SKILL_CACHE_DIR", str(tmp_path / "cache"))
+    # In-process copies of cached data follow the same isolation
+    project_utils = sys.modules.get("project_utils")
+    if project_utils:
+        monkeypatch.setattr(project_utils, "_item_indexes", {})
+        monkeypatch.setattr(project_utils, "_item_lookups", {})
+    return tmp_path / "cache"
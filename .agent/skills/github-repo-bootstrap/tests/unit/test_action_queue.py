@@ -0,0 +1,160 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+import requests
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+from action_queue import ActionQueue, coalesce, is_network_error, submit, COMMENT_MARKER, SKIPPED
+from github import GithubException
+
+# --- Fixtures ---
+
+@pytest.fixture
+def queue():
+    return ActionQueue("owner/repo")
+
+@pytest.fixture
+def repo():
+    repo = MagicMock()
+    issues = {}
+
+    def get_issue(number):
+        return issues.setdefault(number, MagicMock(name=f"issue{number}"))
+
+    repo.get_issue.side_effect = get_issue
+    repo.issues = issues
+    return repo
+
+# --- Tests for coalescing ---
+
+def test_coalesce_keeps_last_of_each_key(queue):
+    first = queue.enqueue("project_status", content_id="I_1", status="Ready", project_title="P")
+    comment = queue.enqueue("comment", number=1, body="hi")
+    second = queue.enqueue("project_status", content_id="I_1", status="Review", project_title="P")
+    third = queue.enqueue("project_status", content_id="I_1", status="Done", project_title="P")
+    plan = coalesce(queue.pending())
+    assert [a['id'] for a, _ in plan] == [comment['id'], third['id']]
+    assert plan[1][1] == [first['id'], second['id']]
+
+def test_coalesce_never_merges_comments(queue):
+    queue.enqueue("comment", number=1, body="a")
+    queue.enqueue("comment", number=1, body="b")
+    assert len(coalesce(queue.pending())) == 2
+
+# --- Tests for the journal ---
+
+def test_journal_survives_torn_line(queue):
+    action = queue.enqueue("close", number=3)
+    with open(queue.path, "a") as f:
+        f.write('{"type": "action", "id": "x", "op')
+    assert [a['id'] for a in ActionQueue("owner/repo").pending()] == [action['id']]
+
+def test_replay_sends_in_order_per_issue(queue, repo):
+    queue.enqueue("comment", number=1, body="bye")
+    queue.enqueue("close", number=1)
+    queue.enqueue("set_labels", number=2, labels=["p0"])
+    queue.enqueue("set_labels", number=2, labels=["p1"])
+    results = queue.replay(MagicMock(), repo)
+    assert all(r is True for r in results.values())
+    issue1 = repo.issues[1]
+    assert [c[0] for c in issue1.mock_calls if c[0] in ("create_comment", "edit")] == ["create_comment", "edit"]
+    issue1.edit.assert_called_once_with(state='closed')
+    repo.issues[2].edit.assert_called_once_with(labels=["p1"])
+    assert queue.pending() == []
+    assert queue.path.read_text() == ""
+
+def test_replay_is_idempotent(queue, repo):
+    queue.enqueue("close", number=1)
+    queue.replay(MagicMock(), repo)
+    queue.replay(MagicMock(), repo)
+    repo.issues[1].edit.assert_called_once()
+
+def test_network_error_keeps_actions_queued(queue, repo):
+    action = queue.enqueue("close", number=1)
+    repo.get_issue.side_effect = requests.ConnectionError("offline")
+    results = queue.replay(MagicMock(), repo)
+    assert results == {action['id']: "queued"}
+    assert [a['id'] for a in queue.pending()] == [action['id']]
+
+def test_rejected_action_is_dropped(queue, repo):
+    action = queue.enqueue("assign", number=1, login="ghost")
+    repo.get_issue.side_effect = GithubException(422, {"message": "Validation Failed"}, None)
+    results = queue.replay(MagicMock(), repo)
+    assert "Validation Failed" in results[action['id']]
+    assert queue.pending() == []
+
+def test_interrupted_comment_is_not_posted_twice(queue, repo):
+    action = queue.enqueue("comment", number=1, body="hi")
+    # Simulate a crash after the request went out but before 'done' was written
+    queue._append([{"type": "started", "id": action['id']}])
+    posted = MagicMock(body="hi\n\n" + COMMENT_MARKER.format(id=action['id']))
+    repo.get_issue(1).get_comments.return_value = [posted]
+    queue.replay(MagicMock(), repo)
+    repo.issues[1].create_comment.assert_not_called()
+
+@patch("project_utils.set_items_field")
+@patch("project_utils.find_project_item_by_content")
+@patch("bootstrap.ensure_project_v2")
+def test_project_statuses_are_batched(mock_ensure, mock_find, mock_set, queue, repo):
+    mock_ensure.return_value = {"type": "EXISTS", "id": "P_1"}
+    mock_find.side_effect = lambda project_id, content_id: f"item-{content_id}"
+    mock_set.side_effect = lambda project_id, field, values: {i: True for i, _ in values}
+    queue.enqueue("project_status", content_id="I_1", status="In Progress", project_title="repo")
+    queue.enqueue("project_status", content_id="I_1", status="Done", project_title="repo")
+    queue.enqueue("project_status", content_id="I_2", status="Done", project_title="repo")
+    results = queue.replay(MagicMock(), repo)
+    assert all(r is True for r in results.values())
+    mock_set.assert_called_once_with("P_1", "Status", [("item-I_1", "Done"), ("item-I_2", "Done")])
+
+@patch("project_utils.set_items_field")
+@patch("project_utils.find_project_item_by_content")
+@patch("bootstrap.ensure_project_v2")
+def test_project_fields_are_batched_per_field(mock_ensure, mock_find, mock_set, queue, repo):
+    mock_ensure.return_value = {"type": "EXISTS", "id": "P_1"}
+    mock_find.side_effect = lambda project_id, content_id: f"item-{content_id}"
+    mock_set.side_effect = lambda project_id, field, values: {i: True for i, _ in values}
+    queue.enqueue("project_field", content_id="I_1", field="Priority", value="P1", project_title="repo")
+    queue.enqueue("project_status", content_id="I_1", status="Done", project_title="repo")
+    queue.enqueue("project_field", content_id="I_2", field="Priority", value="P0", project_title="repo")
+    results = queue.replay(MagicMock(), repo)
+    assert all(r is True for r in results.values())
+    # A priority change does not supersede a status change of the same item
+    assert sorted(c.args[1] for c in mock_set.call_args_list) == ["Priority", "Status"]
+    mock_set.assert_any_call("P_1", "Priority", [("item-I_1", "P1"), ("item-I_2", "P0")])
+
+@patch("project_utils.set_items_field")
+@patch("project_utils.find_project_item_by_content", return_value=None)
+@patch("bootstrap.ensure_project_v2")
+def test_project_field_of_item_off_the_board_is_skipped(mock_ensure, mock_find, mock_set, queue, repo):
+    mock_ensure.return_value = {"type": "EXISTS", "id": "P_1"}
+    labels = queue.enqueue("set_labels", number=1, labels=["p1"])
+    field = queue.enqueue("project_field", content_id="I_1", field="Priority", value="P1", project_title="repo")
+    assert queue.replay(MagicMock(), repo) == {labels['id']: True, field['id']: SKIPPED}
+    mock_set.assert_not_called()
+    # Nothing is left to retry
+    assert queue.pending() == []
+
+# --- Tests for submit ---
+
+def test_submit_offline_only_journals(queue, repo):
+    action = queue.enqueue("close", number=1)
+    assert submit(queue, [action], offline=True) == {action['id']: "queued"}
+    repo.get_issue.assert_not_called()
+
+def test_submit_refreshes_store(queue, repo):
+    action = queue.enqueue("close", number=1)
+    store = MagicMock()
+    submit(queue, [action], MagicMock(), repo, store=store)
+    store.upsert_issue.assert_called_once_with(repo.issues[1])
+
+def test_is_network_error():
+    assert is_network_error(requests.Timeout())
+    assert is_network_error(GithubException(502, None, None))
+    assert not is_network_error(GithubException(404, None, None))
+    wrapped = RuntimeError("Query failed")
+    wrapped.__cause__ = requests.ConnectionError()
+    assert is_network_error(wrapped)
@@ -0,0 +1,125 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import io
+import json
+import threading
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+import batch
+from batch import Batch, parse_ops, group_ops, run_batch
+
+# --- Fixtures ---
+
+@pytest.fixture
+def repo():
+    repo = MagicMock()
+    repo.name = "repo"
+    repo.full_name = "owner/repo"
+    issues = {}
+
+    def get_issue(number):
+        return issues.setdefault(number, MagicMock(name=f"issue{number}", number=number))
+
+    repo.get_issue.side_effect = get_issue
+    repo.issues = issues
+    return repo
+
+def ndjson(*ops):
+    return [json.dumps(op) + "\n" for op in ops]
+
+def run(repo, lines, workers=4):
+    results = []
+    ops, errors = parse_ops(lines)
+    failed = run_batch(Batch(MagicMock(), repo), ops, results.append, workers)
+    return sorted(errors + results, key=lambda r: r['index']), failed + len(errors)
+
+# --- Tests for parsing and grouping ---
+
+def test_parse_ops_reports_bad_lines():
+    ops, errors = parse_ops(["not json\n", "\n", '{"op": "explode"}\n', '{"op": "close-issue", "number": 1}\n'])
+    assert [i for i, _ in ops] == [3]
+    assert [e['index'] for e in errors] == [0, 2]
+    assert not any(e['ok'] for e in errors)
+
+def test_group_ops_keeps_order_per_number():
+    ops, _ = parse_ops(ndjson(
+        {"op": "comment", "number": 1, "body": "a"},
+        {"op": "create-issue", "title": "x"},
+        {"op": "close-issue", "number": 1},
+        {"op": "create-issue", "title": "y"},
+    ))
+    assert [[i for i, _ in g] for g in group_ops(ops)] == [[0, 2], [1], [3]]
+
+# --- Tests for execution ---
+
+def test_ops_on_one_issue_run_in_order_and_fetch_once(repo):
+    calls = []
+    issue = repo.get_issue(1)
+    issue.create_comment.side_effect = lambda body: calls.append("comment") or MagicMock()
+    issue.edit.side_effect = lambda **kw: calls.append(kw)
+    repo.get_issue.reset_mock()
+
+    results, failed = run(repo, ndjson(
+        {"op": "comment", "number": 1, "body": "bye"},
+        {"op": "set-labels", "number": 1, "labels": ["p0"]},
+        {"op": "close-issue", "number": 1, "id": "c1"},
+    ))
+    assert failed == 0
+    assert calls == ["comment", {"labels": ["p0"]}, {"state": "closed"}]
+    assert repo.get_issue.call_count == 1
+    assert results[2] == {"index": 2, "op": "close-issue", "id": "c1", "ok": True,
+                          "result": {"number": 1, "state": "closed"}}
+
+def test_failures_are_reported_per_op(repo):
+    repo.get_issue(2).edit.side_effect = Exception("Not Found")
+    results, failed = run(repo, ndjson(
+        {"op": "close-issue", "number": 2},
+        {"op": "set-labels", "number": 3},
+        {"op": "assign", "number": 4, "logins": ["a", "b"]},
+    ))
+    assert failed == 2
+    assert results[0]['error'] == "Not Found"
+    assert results[1]['error'] == "Missing field 'labels'."
+    assert results[2]['ok']
+    repo.issues[4].add_to_assignees.assert_called_once_with("a", "b")
+
+def test_different_issues_run_in_parallel(repo):
+    barrier = threading.Barrier(3, timeout=5)
+    for number in (1, 2, 3):
+        repo.get_issue(number).edit.side_effect = lambda **kw: barrier.wait()
+    _, failed = run(repo, ndjson(*[{"op": "close-issue", "number": n} for n in (1, 2, 3)]), workers=3)
+    assert failed == 0
+
+def test_set_status_resolves_project_once(repo):
+    b = Batch(MagicMock(), repo)
+    with patch("bootstrap.ensure_project_v2", return_value={"type": "EXISTS", "id": "P_1"}) as ensure, \
+         patch("project_utils.find_project_item_by_content", side_effect=[None, "PVTI_2"]), \
+         patch("project_utils.add_item_to_project", return_value="PVTI_1") as add, \
+         patch("project_utils.set_items_status", side_effect=lambda p, s: {s[0][0]: True}):
+        ops, _ = parse_ops(ndjson(
+            {"op": "set-status", "number": 1, "status": "Done"},
+            {"op": "set-status", "number": 2, "status": "Ready"},
+        ))
+        assert run_batch(b, ops, lambda r: None) == 0
+    ensure.assert_called_once()
+    add.assert_called_once()
+
+def test_main_streams_results_and_summary(repo, monkeypatch, capsys):
+    monkeypatch.setattr(batch, "get_github_client", MagicMock())
+    monkeypatch.setattr(batch, "get_current_repo", lambda g, raise_error=False: repo)
+    monkeypatch.setattr(sys, "stdin", io.StringIO("".join(ndjson(
+        {"op": "close-issue", "number": 1},
+        {"op": "nope"},
+    ))))
+    with pytest.raises(SystemExit) as e:
+        batch.main(["--workers", "2"])
+    assert e.value.code == 1
+    captured = capsys.readouterr()
+    lines = [json.loads(l) for l in captured.out.splitlines()]
+    assert sorted(r['ok'] for r in lines) == [False, True]
+    assert "2 op(s), 1 failed" in captured.err
+    assert "ops/s" in captured.err
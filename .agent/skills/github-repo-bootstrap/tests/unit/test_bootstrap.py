@@ -0,0 +1,252 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+from github import GithubException
+
+import bootstrap
+from bootstrap import desired_labels, diff_labels, sync_labels, apply_label_actions, plan_calls
+from bootstrap import git_blob_sha, plan_templates, commit_templates
+from bootstrap import build_plan, apply_plan, ProjectQueryError, ProjectSetupError
+
+# --- Fixtures ---
+
+def make_label(name, color, description=None):
+    label = MagicMock(color=color, description=description)
+    label.name = name
+    return label
+
+@pytest.fixture
+def repo():
+    repo = MagicMock()
+    repo.get_labels.return_value = [
+        make_label("type:bug", "d73a4a", "Something isn't working"),
+        make_label("P1", "ededed"),
+        make_label("wontfix", "ffffff"),
+    ]
+    return repo
+
+LABELS = {
+    "type": [{"name": "type:bug", "color": "D73A4A", "description": "Something isn't working"},
+             {"name": "type:docs", "color": "#0075ca", "description": "Documentation"}],
+    "priority": ["p1", "p3"],
+}
+
+# --- Tests for the diff ---
+
+def test_desired_labels_accepts_names_and_mappings():
+    desired = desired_labels(LABELS)
+    assert desired["type:docs"] == {"color": "0075ca", "description": "Documentation"}
+    # Name-only entries use the default color table, or leave the color alone
+    assert desired["p1"] == {"color": "ff9f1c", "description": None}
+    assert desired["p3"] == {"color": None, "description": None}
+
+def test_diff_labels_create_update_delete():
+    existing = {
+        "type:bug": {"color": "d73a4a", "description": "Something isn't working"},
+        "P1": {"color": "ededed", "description": "old"},
+        "wontfix": {"color": "ffffff", "description": None},
+    }
+    changes = diff_labels(existing, desired_labels(LABELS), prune=True)
+    assert ("CREATE", "type:docs", {"color": "0075ca", "description": "Documentation"}) in changes
+    assert ("CREATE", "p3", {"color": "ededed", "description": ""}) in changes
+    # Case-only differences are renamed rather than duplicated; no description configured
+    assert ("UPDATE", "P1", {"name": "p1", "color": "ff9f1c"}) in changes
+    assert ("DELETE", "wontfix", {}) in changes
+    assert not any(name == "type:bug" for _, name, _ in changes)
+
+def test_diff_labels_keeps_extra_labels_without_prune():
+    existing = {"wontfix": {"color": "ffffff", "description": None}}
+    assert diff_labels(existing, {}) == []
+
+# --- Tests for sync_labels / apply ---
+
+def test_sync_labels_fetches_once_and_builds_actions(repo):
+    actions = sync_labels(repo, LABELS, prune=True)
+    repo.get_labels.assert_called_once()
+    by_name = {a['name']: a for a in actions}
+    assert set(by_name) == {"type:docs", "p3", "P1", "wontfix"}
+    assert by_name["P1"]['detail'] == "name → p1, color → ff9f1c"
+
+    apply_label_actions(actions, workers=2, log=lambda line: None)
+    repo.create_label.assert_any_call(name="type:docs", color="0075ca", description="Documentation")
+    labels = {l.name: l for l in repo.get_labels.return_value}
+    labels["P1"].edit.assert_called_once_with("p1", "ff9f1c")
+    labels["wontfix"].delete.assert_called_once()
+
+def test_apply_label_actions_reports_failures_after_all_ran():
+    ok = MagicMock()
+    actions = [
+        {"name": "a", "type": "CREATE", "action": MagicMock(side_effect=Exception("422 already_exists"))},
+        {"name": "b", "type": "CREATE", "action": ok},
+    ]
+    with pytest.raises(RuntimeError, match="1 label change"):
+        apply_label_actions(actions, log=lambda line: None)
+    ok.assert_called_once()
+
+def test_plan_calls_counts_one_write_per_label(repo):
+    plan = {"labels": sync_labels(repo, LABELS), "templates": [], "project": None}
+    assert plan_calls(plan) == 3
+
+# --- Tests for build_plan ---
+
+EXISTING_PROJECT = {"name": "Board", "type": "EXISTS", "id": "P_1", "url": "u", "repo_id": "R_1", "action": lambda: "u"}
+
+def state_response(labels, blobs=(), has_next=False, projects=()):
+    repository = {"id": "R_1", "labels": {"pageInfo": {"hasNextPage": has_next, "endCursor": "c1"},
+                                          "nodes": labels}}
+    repository.update({f"t{i}": blob for i, blob in enumerate(blobs)})
+    return {"data": {"repository": repository, "user": {"id": "U_1", "projectsV2": {"nodes": list(projects)}}}}
+
+BUG_LABEL = {"name": "type:bug", "color": "d73a4a", "description": "Something isn't working"}
+BOARD = {"id": "P_1", "title": "Board", "url": "u", "closed": False, "fields": {"nodes": [{"name": "Status"}]}}
+
+@patch("bootstrap.gql_request")
+def test_fetch_bootstrap_state_pages_labels(mock_gql):
+    extra = {"data": {"repository": {"labels": {"pageInfo": {"hasNextPage": False, "endCursor": None},
+                                                "nodes": [{"name": "p0", "color": "b60205", "description": None}]}}}}
+    mock_gql.side_effect = [state_response([BUG_LABEL], [{"oid": "abc"}, None], has_next=True), extra]
+    state = bootstrap.fetch_bootstrap_state("owner/repo", "me", ["a.md", "b.md"], "Board")
+    assert state["requests"] == 2
+    assert set(state["labels"]) == {"type:bug", "p0"}
+    # Paths missing on the default branch come back as null objects
+    assert state["blobs"] == {"a.md": "abc"}
+    variables = mock_gql.call_args_list[0].args[1]
+    assert (variables["t0"], variables["t1"], variables["withProject"]) == ("HEAD:a.md", "HEAD:b.md", True)
+    assert mock_gql.call_args_list[1].args[1]["after"] == "c1"
+
+@patch("bootstrap.gql_request")
+def test_fetch_bootstrap_state_project_error(mock_gql):
+    response = state_response([])
+    response["errors"] = [{"path": ["user", "projectsV2"], "message": "INSUFFICIENT_SCOPES"}]
+    mock_gql.return_value = response
+    with pytest.raises(ProjectQueryError, match="INSUFFICIENT_SCOPES"):
+        bootstrap.fetch_bootstrap_state("owner/repo", "me", [], "Board")
+
+@patch("bootstrap.local_templates", return_value={".github/PULL_REQUEST_TEMPLATE.md": "pr\n"})
+@patch("bootstrap.gql_request")
+def test_build_plan_compliant_repository_costs_one_request(mock_gql, mock_local):
+    mock_gql.return_value = state_response([BUG_LABEL], [{"oid": git_blob_sha(b"pr\n")}], projects=[BOARD])
+    repo = MagicMock(full_name="owner/repo")
+    conf = {"labels": {"type": [BUG_LABEL]}, "projects_v2": {"enabled": True, "title": "Board"}}
+    plan = build_plan(repo, "me", conf)
+    assert mock_gql.call_count == 1
+    assert plan["requests"] == 1
+    assert bootstrap.plan_is_empty(plan)
+    assert plan["project"]["repo_id"] == "R_1"
+    assert plan["fields"] == [{"name": "Status"}]
+    assert set(plan["timings"]) == {"query", "diff", "total"}
+    repo.get_labels.assert_not_called()
+    repo.get_contents.assert_not_called()
+
+@patch("bootstrap.local_templates", return_value={})
+@patch("bootstrap.gql_request")
+def test_build_plan_reads_label_only_when_applying(mock_gql, mock_local):
+    mock_gql.return_value = state_response([{**BUG_LABEL, "color": "ffffff"}])
+    repo = MagicMock(full_name="owner/repo")
+    plan = build_plan(repo, "me", {"labels": {"type": [BUG_LABEL]}})
+    assert plan["project"] is None
+    assert mock_gql.call_args.args[1]["withProject"] is False
+    # The update reads its label first
+    assert plan_calls(plan) == 2
+    repo.get_label.assert_not_called()
+    apply_label_actions(plan["labels"], log=lambda line: None)
+    repo.get_label.assert_called_once_with("type:bug")
+    repo.get_label.return_value.edit.assert_called_once_with("type:bug", "d73a4a")
+
+@patch("bootstrap.link_project_to_repo", return_value=True)
+@patch("bootstrap.update_single_select_field")
+@patch("bootstrap.get_project_fields")
+def test_apply_plan_reuses_planned_fields(mock_fields, mock_update, mock_link):
+    status = {"id": "F_1", "name": "Status", "options": []}
+    plan = {"repo": MagicMock(full_name="owner/repo"), "labels": [], "templates": [],
+            "project": EXISTING_PROJECT, "fields": [status]}
+    conf = {"projects_v2": {"fields": {"status": ["Todo", "Done"]}}}
+    assert apply_plan(plan, conf, log=lambda line: None) == "u"
+    mock_fields.assert_not_called()
+    mock_update.assert_called_once_with(status, ["Todo", "Done"])
+
+@patch("bootstrap.gql_request")
+@patch("bootstrap.create_single_select_field", return_value=False)
+@patch("bootstrap.update_single_select_field", return_value=True)
+def test_apply_plan_raises_when_project_setup_fails(mock_update, mock_create, mock_gql):
+    plan = {"repo": MagicMock(full_name="owner/repo"), "labels": [], "templates": [],
+            "project": EXISTING_PROJECT, "fields": [{"id": "F_1", "name": "Status", "options": []}]}
+    conf = {"projects_v2": {"fields": {"status": ["Todo"], "priority": ["P1"]}}}
+    # An already linked project is fine, a failed field is not
+    mock_gql.side_effect = Exception("Project is already linked")
+    with pytest.raises(ProjectSetupError, match="create Priority field"):
+        apply_plan(plan, conf, log=lambda line: None)
+
+    mock_gql.side_effect = Exception("Resource not accessible by integration")
+    mock_create.return_value = True
+    with pytest.raises(ProjectSetupError, match="Resource not accessible"):
+        apply_plan(plan, conf, log=lambda line: None)
+
+# --- Tests for templates ---
+
+TEMPLATES = {
+    ".github/ISSUE_TEMPLATE/bug_report.md": "bug\n",
+    ".github/ISSUE_TEMPLATE/feature_request.md": "feature\n",
+    ".github/PULL_REQUEST_TEMPLATE.md": "pr\n",
+}
+
+def content_file(path, content):
+    return MagicMock(path=path, sha=git_blob_sha(content.encode()))
+
+def test_git_blob_sha_matches_git():
+    # git hash-object of "hello\n"
+    assert git_blob_sha(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
+
+@patch("bootstrap.local_templates", return_value=TEMPLATES)
+def test_plan_templates_skips_identical_files(mock_local):
+    repo = MagicMock(default_branch="main")
+    listings = {
+        ".github": [content_file(".github/PULL_REQUEST_TEMPLATE.md", "old pr\n"), MagicMock(path=".github/ISSUE_TEMPLATE")],
+        ".github/ISSUE_TEMPLATE": [content_file(".github/ISSUE_TEMPLATE/bug_report.md", "bug\n")],
+    }
+    repo.get_contents.side_effect = lambda path, ref: listings[path]
+    actions = plan_templates(repo)
+    assert [(a['name'], a['type']) for a in actions] == [
+        (".github/ISSUE_TEMPLATE/feature_request.md", "CREATE"),
+        (".github/PULL_REQUEST_TEMPLATE.md", "UPDATE"),
+    ]
+    # One listing per directory, not one request per file
+    assert repo.get_contents.call_count == 2
+
+@patch("bootstrap.local_templates", return_value=TEMPLATES)
+def test_plan_templates_missing_directory(mock_local):
+    repo = MagicMock(default_branch="main")
+    repo.get_contents.side_effect = GithubException(404, {"message": "Not Found"}, None)
+    assert len(plan_templates(repo)) == 3
+
+def test_commit_templates_makes_one_commit():
+    repo = MagicMock(default_branch="main")
+    ref = repo.get_git_ref.return_value
+    ref.object.sha = "head"
+    head = repo.get_git_commit.return_value
+    repo.create_git_commit.return_value.sha = "new"
+    actions = [{"name": path, "type": "CREATE", "content": content} for path, content in TEMPLATES.items()]
+
+    assert commit_templates(repo, actions) == "new"
+    repo.get_git_ref.assert_called_once_with("heads/main")
+    repo.get_git_commit.assert_called_once_with("head")
+    elements, = repo.create_git_tree.call_args.args
+    assert {e._identity["path"]: e._identity["content"] for e in elements} == TEMPLATES
+    assert repo.create_git_tree.call_args.kwargs == {"base_tree": head.tree}
+    repo.create_git_commit.assert_called_once_with(bootstrap.TEMPLATE_COMMIT_MESSAGE, repo.create_git_tree.return_value, [head])
+    ref.edit.assert_called_once_with("new")
+    repo.create_file.assert_not_called()
+
+def test_commit_templates_empty_repository_falls_back_to_contents_api():
+    repo = MagicMock(default_branch="main")
+    repo.get_git_ref.side_effect = GithubException(409, {"message": "Git Repository is empty."}, None)
+    actions = [{"name": ".github/PULL_REQUEST_TEMPLATE.md", "type": "CREATE", "content": "pr\n"}]
+    assert commit_templates(repo, actions) is None
+    repo.create_file.assert_called_once_with(".github/PULL_REQUEST_TEMPLATE.md", bootstrap.TEMPLATE_COMMIT_MESSAGE,
+                                             "pr\n", branch="main")
+    repo.create_git_tree.assert_not_called()
@@ -0,0 +1,89 @@
+import pytest
+from unittest.mock import patch
+import time
+import sys
+import os
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+from cache import JsonCache, project_cache, project_key, forget_project, repo_cache_dir
+from graphql_client import GraphQLError
+from project_utils import forget_project_on_not_found
+import bootstrap
+
+LOOKUP_RESPONSE = {
+    "data": {
+        "user": {
+            "id": "user1",
+            "projectsV2": {"nodes": [{"id": "proj1", "title": "Work", "url": "https://x/1", "closed": False}]}
+        },
+        "repository": {"id": "repo1"}
+    }
+}
+
+# --- Tests for JsonCache ---
+
+def test_json_cache_roundtrip(tmp_path):
+    cache = JsonCache(tmp_path / "c.json")
+    assert cache.get("k") is None
+    cache.set("k", {"id": 1})
+    assert JsonCache(tmp_path / "c.json").get("k") == {"id": 1}
+    cache.invalidate("k")
+    assert cache.get("k") is None
+
+def test_json_cache_ttl(tmp_path):
+    cache = JsonCache(tmp_path / "c.json", ttl=10)
+    cache.set("k", "v")
+    with patch("cache.time.time", return_value=time.time() + 11):
+        assert cache.get("k") is None
+
+def test_repo_cache_dir(isolated_cache):
+    assert repo_cache_dir("owner/repo") == isolated_cache / "owner" / "repo"
+
+def test_forget_project():
+    cache = project_cache("owner/repo")
+    cache.set(project_key("me", "Work"), {"id": "proj1", "url": "u"})
+    cache.set(project_key("me", "Other"), {"id": "proj2", "url": "u"})
+    assert forget_project("proj1") == 1
+    assert cache.get(project_key("me", "Work")) is None
+    assert cache.get(project_key("me", "Other")) == {"id": "proj2", "url": "u"}
+
+def test_forget_project_on_not_found():
+    cache = project_cache("owner/repo")
+    cache.set(project_key("me", "Work"), {"id": "proj1", "url": "u"})
+    other = GraphQLError("boom", [{"type": "FORBIDDEN", "message": "proj1"}])
+    assert forget_project_on_not_found("proj1", other) is False
+    missing = GraphQLError("boom", [{"type": "NOT_FOUND", "message": "Could not resolve to a node with the global id of 'proj1'"}])
+    assert forget_project_on_not_found("proj1", missing) is True
+    assert cache.get(project_key("me", "Work")) is None
+
+# --- Tests for ensure_project_v2 caching ---
+
+@patch("bootstrap.gql_request")
+def test_ensure_project_v2_warm_run_skips_lookup(mock_gql):
+    mock_gql.return_value = LOOKUP_RESPONSE
+    first = bootstrap.ensure_project_v2("me", "Work", "owner/repo")
+    assert first["id"] == "proj1"
+    assert first["repo_id"] == "repo1"
+    assert mock_gql.call_count == 1
+
+    second = bootstrap.ensure_project_v2("me", "Work", "owner/repo")
+    assert second["type"] == "EXISTS"
+    assert second["id"] == "proj1"
+    assert second["cached"] is True
+    assert mock_gql.call_count == 1
+
+@patch("bootstrap.gql_request")
+def test_ensure_project_v2_refresh(mock_gql):
+    mock_gql.return_value = LOOKUP_RESPONSE
+    bootstrap.ensure_project_v2("me", "Work", "owner/repo")
+    bootstrap.ensure_project_v2("me", "Work", "owner/repo", refresh=True)
+    assert mock_gql.call_count == 2
+
+@patch("bootstrap.gql_request")
+def test_ensure_project_v2_without_repo_is_uncached(mock_gql):
+    mock_gql.return_value = LOOKUP_RESPONSE
+    bootstrap.ensure_project_v2("me", "Work")
+    bootstrap.ensure_project_v2("me", "Work")
+    assert mock_gql.call_count == 2
@@ -0,0 +1,167 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+import close_issue
+from close_issue import close_mutation, bulk_close, close_checkpoint, select_targets, parse_args
+from graphql_client import GraphQLError
+from local_store import Item
+from action_queue import ActionQueue
+
+# --- Fixtures ---
+
+def target(number, item_id=None):
+    return {"number": number, "node_id": f"I_{number}", "title": f"Issue {number}", "item_id": item_id}
+
+STATUS = {"project_id": "P_1", "field_id": "F_1", "option_id": "done"}
+
+def entry(targets, comment="Released in v1.2", reason="completed"):
+    return {"targets": targets, "comment": comment, "reason": reason, "done": {}}
+
+def fake_gql(fail=()):
+    """gql_request answering every alias, with an error for the aliases in fail."""
+    def request(mutation, variables, allow_partial=False):
+        aliases = [line.split(":")[0].strip() for line in mutation.splitlines()[1:-1]]
+        errors = [{"path": [a], "message": "Could not resolve"} for a in aliases if a in fail]
+        return {"data": {a: None if a in fail else {"ok": True} for a in aliases}, "errors": errors}
+    return MagicMock(side_effect=request)
+
+# --- Tests for the mutation ---
+
+def test_close_mutation_shares_variables_and_skips_done_steps():
+    batch = [dict(target(1, "PVTI_1"), steps=["comment", "close", "status"]),
+             dict(target(2), steps=["status"])]
+    batch[1]['item_id'] = "PVTI_2"
+    mutation, variables, aliases = close_mutation(batch, "bye", "not_planned", STATUS)
+    assert aliases == {"c0": (1, "comment"), "x0": (1, "close"), "s0": (1, "status"), "s1": (2, "status")}
+    assert mutation.count("addComment") == 1 and mutation.count("updateProjectV2ItemFieldValue") == 2
+    assert variables["body"] == "bye" and variables["reason"] == "NOT_PLANNED"
+    # The issue ID of #2 is not needed for its status change alone
+    assert "issue1" not in variables and "$issue1" not in mutation
+    assert variables["item1"] == "PVTI_2"
+
+    mutation, variables, _ = close_mutation([dict(target(3), steps=["close"])], None, None)
+    assert "$body" not in mutation and "$projectId" not in mutation
+    assert variables == {"issue0": "I_3", "reason": None}
+
+# --- Tests for bulk_close ---
+
+def test_bulk_close_batches_and_resumes_without_duplicate_comments():
+    checkpoint = close_checkpoint("owner/repo")
+    state = entry([target(1, "PVTI_1"), target(2, "PVTI_2"), target(3)])
+    batches = []
+
+    with patch("close_issue.gql_request", fake_gql(fail={"x1"})) as gql:
+        results = bulk_close(state, checkpoint, "label:released", STATUS, batch_size=2, on_batch=batches.append)
+    assert gql.call_count == 2
+    assert [len(b) for b in batches] == [2, 1]
+    # #2 stays open, so it is not moved to Done; #1 is, in the next document
+    assert results[2] == {"comment": True, "close": "Could not resolve"}
+    assert results[1] == {"comment": True, "close": True, "status": True}
+    assert "updateProjectV2ItemFieldValue" not in gql.call_args_list[0].args[0]
+    # #3 is not in the project, so it has no status step
+    assert results[3] == {"comment": True, "close": True}
+    assert checkpoint.get("label:released")['done']["2"] == ["comment"]
+
+    # A re-run only sends the failed close, then the status change
+    with patch("close_issue.gql_request", fake_gql()) as gql:
+        results = bulk_close(checkpoint.get("label:released"), checkpoint, "label:released", STATUS)
+    assert results == {2: {"close": True, "status": True}}
+    assert "addComment" not in gql.call_args_list[0].args[0]
+    assert gql.call_count == 2
+
+def test_bulk_close_reports_whole_batch_errors():
+    gql = MagicMock(side_effect=GraphQLError("Something went wrong", [{"message": "Something went wrong"}]))
+    with patch("close_issue.gql_request", gql):
+        results = bulk_close(entry([target(1)], comment=None), close_checkpoint("owner/repo"), "k")
+    assert results == {1: {"close": "Something went wrong"}}
+
+# --- Tests for selection ---
+
+def make_item(number, labels, state="open", kind="issue"):
+    return Item(number, f"I_{number}", kind, f"Issue {number}", state, "me", "", "", labels)
+
+def test_select_targets_from_the_mirror_and_search():
+    store = MagicMock()
+    store.items.return_value = [make_item(1, ["released", "type:bug"]), make_item(2, ["released"])]
+    args = parse_args(["--label", "released", "--label", "type:bug"])
+    assert [t['number'] for t in select_targets(store, args, "owner/repo")] == [1]
+    store.items.assert_called_once_with(kind="issue", state="open", label="released")
+
+    items = {5: make_item(5, []), 6: make_item(6, [], state="closed"), 7: make_item(7, [], kind="pr")}
+    store.get.side_effect = items.get
+    args = parse_args(["--numbers", "7", "5", "6", "8"])
+    assert [t['number'] for t in select_targets(store, args, "owner/repo")] == [5]
+
+    with patch("repo_queries.search_issues", return_value=([{"number": 9, "node_id": "I_9", "title": "t"}], 1)) as search:
+        args = parse_args(["--milestone", "v1.2", "--label", "released"])
+        assert [t['number'] for t in select_targets(store, args, "owner/repo")] == [9]
+    search.assert_called_once_with("owner/repo", 'label:"released" milestone:"v1.2"')
+
+def test_select_targets_warns_about_the_search_cap(capsys):
+    found = [{"number": n, "node_id": f"I_{n}", "title": "t"} for n in range(1000)]
+    with patch("repo_queries.search_issues", return_value=(found, 1500)):
+        assert len(select_targets(MagicMock(), parse_args(["--search", "stale"]), "owner/repo")) == 1000
+    assert "matches 1500 issues but returns only 1000" in capsys.readouterr().out
+
+def test_parse_args_rejects_mixed_selections():
+    with pytest.raises(SystemExit):
+        parse_args(["--number", "1", "--label", "x"])
+    with pytest.raises(SystemExit):
+        parse_args(["--numbers", "1", "--milestone", "v1"])
+
+# --- Tests for main ---
+
+@patch("close_issue.open_store")
+@patch("close_issue.get_current_repo")
+@patch("close_issue.get_github_client")
+def test_bulk_main_closes_and_drops_checkpoint(mock_client, mock_repo, mock_store, capsys):
+    store = mock_store.return_value
+    store.repo_full_name = "owner/repo"
+    store.items.return_value = [make_item(1, ["released"]), make_item(2, ["released"])]
+    with patch.dict(close_issue.config, {"projects_v2": {"enabled": False}}), \
+         patch("close_issue.gql_request", fake_gql()) as gql:
+        close_issue.main(["--label", "released", "--comment", "Shipped", "--yes"])
+    assert gql.call_count == 1
+    store.patch.assert_any_call(1, state="closed")
+    store.patch.assert_any_call(2, state="closed")
+    assert close_checkpoint("owner/repo").get("label:released") is None
+    assert "2/2 closed, 0 failed" in capsys.readouterr().out
+
+@patch("close_issue.open_store")
+@patch("close_issue.get_current_repo")
+@patch("close_issue.get_github_client")
+def test_bulk_main_resume_refuses_other_comment(mock_client, mock_repo, mock_store, capsys):
+    store = mock_store.return_value
+    store.repo_full_name = "owner/repo"
+    close_checkpoint("owner/repo").set("label:released", entry([target(1)], comment="Shipped", reason=None))
+    with patch.dict(close_issue.config, {"projects_v2": {"enabled": False}}), \
+         patch("close_issue.gql_request", fake_gql()) as gql:
+        with pytest.raises(SystemExit) as e:
+            close_issue.main(["--label", "released", "--comment", "Released", "--yes"])
+        assert e.value.code == 2
+        gql.assert_not_called()
+        assert "--restart" in capsys.readouterr().out
+        # The same command resumes the saved run
+        close_issue.main(["--label", "released", "--comment", "Shipped", "--yes"])
+    assert gql.call_args.args[1]["body"] == "Shipped"
+    assert close_checkpoint("owner/repo").get("label:released") is None
+
+@patch("close_issue.get_repo_full_name", return_value="owner/repo")
+@patch("close_issue.open_snapshot")
+def test_bulk_main_offline_resume_queues_only_pending_steps(mock_snapshot, mock_name):
+    mock_snapshot.return_value.repo_full_name = "owner/repo"
+    saved = entry([target(1, "PVTI_1"), target(2)], comment="Shipped", reason=None)
+    saved['done'] = {"1": ["comment", "close"]}
+    close_checkpoint("owner/repo").set("label:released", saved)
+    with patch.dict(close_issue.config, {"projects_v2": {"enabled": True, "title": "Board"}}):
+        close_issue.main(["--label", "released", "--comment", "Shipped", "--offline", "--yes"])
+    queued = [(a['op'], a['args'].get('number') or a['args'].get('content_id'))
+              for a in ActionQueue("owner/repo").pending()]
+    # #1 was already commented on and closed; only its board status is left
+    assert queued == [("project_status", "I_1"), ("comment", 2), ("close", 2), ("project_status", "I_2")]
+    assert close_checkpoint("owner/repo").get("label:released") is None
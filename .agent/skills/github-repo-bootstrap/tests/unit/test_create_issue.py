@@ -7,6 +7,7 @@ import os
 # Add scripts directory to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
 
+import create_issue
 from create_issue import add_issue_to_project
 
 # Patch where the functions are defined, not where they are imported (since they are imported inside the function)
@@ -25,10 +26,10 @@ def test_add_issue_to_project_success(mock_console, mock_set_status, mock_add_it
     mock_add_item.return_value = "item456"
     
     # Execute
-    add_issue_to_project("issueNode789", "userLogin", "MyProject")
+    add_issue_to_project("issueNode789", "userLogin", "MyProject", "owner/repo")
     
     # Verify
-    mock_ensure_project.assert_called_with("userLogin", "MyProject")
+    mock_ensure_project.assert_called_with("userLogin", "MyProject", "owner/repo")
     mock_add_item.assert_called_with("proj123", "issueNode789")
     mock_set_status.assert_called_with("proj123", "item456", "Backlog")
     mock_console.print.assert_called_with("[green]Added Issue to Project 'MyProject'[/]")
@@ -61,3 +62,31 @@ def test_add_issue_to_project_failure(mock_ensure_project):
         add_issue_to_project("node1", "user", "proj")
         
         mock_console.print.assert_called_with("[red]Failed to add to project: API Error[/]")
+
+# --- Tests for the non-interactive flags ---
+
+@patch("create_issue.get_current_repo")
+@patch("create_issue.get_github_client")
+def test_main_no_input_uses_flags(mock_client, mock_repo):
+    repo = mock_repo.return_value
+    repo.create_issue.return_value = MagicMock(number=7, html_url="https://example/7")
+    with patch("create_issue.questionary") as mock_questionary:
+        create_issue.main(["--no-input", "--yes", "--no-project", "--type", "Bug", "--title", "Crash", "--label", "p0"])
+    assert mock_questionary.method_calls == []
+    repo.create_issue.assert_called_once_with(title="Crash", body="", labels=["p0", "type:bug"])
+
+@patch("create_issue.get_current_repo")
+@patch("create_issue.get_github_client")
+def test_main_no_input_does_not_confirm(mock_client, mock_repo):
+    with pytest.raises(SystemExit) as e:
+        create_issue.main(["--no-input", "--no-project", "--type", "Bug", "--title", "Crash"])
+    assert e.value.code == 2
+    mock_repo.return_value.create_issue.assert_not_called()
+
+@patch("create_issue.get_current_repo")
+@patch("create_issue.get_github_client")
+def test_main_no_input_requires_title(mock_client, mock_repo):
+    with pytest.raises(SystemExit) as e:
+        create_issue.main(["--no-input"])
+    assert e.value.code == 2
+    mock_repo.return_value.create_issue.assert_not_called()
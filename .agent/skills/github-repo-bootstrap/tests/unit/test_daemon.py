@@ -0,0 +1,88 @@
+import pytest
+import sys
+import os
+import threading
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+import registry
+import daemon
+from daemon import Daemon, forward, control, socket_path, UnsafeSocketDir
+
+pytestmark = pytest.mark.skipif(not daemon.supported(), reason="needs Unix domain sockets")
+
+# --- Fixtures ---
+
+@pytest.fixture
+def running(tmp_path, monkeypatch):
+    """A daemon serving in a background thread, with a fake non-interactive command."""
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    monkeypatch.delenv("GH_SKILL_NO_DAEMON", raising=False)
+
+    def echo():
+        print("args:", " ".join(sys.argv[1:]))
+        print("oops", file=sys.stderr)
+        sys.exit(3)
+
+    monkeypatch.setitem(registry.COMMANDS, "echo", {
+        "desc": "Echo", "script": "echo.py", "module": "echo", "entry": "main", "interactive": False})
+    monkeypatch.setattr(registry, "resolve_command", lambda command: echo)
+
+    d = Daemon(socket_path(), idle_seconds=60, poll_interval=0.05)
+    d.listen()
+    thread = threading.Thread(target=d.serve, daemon=True)
+    thread.start()
+    yield d
+    d.running = False
+    thread.join(timeout=5)
+
+# --- Tests ---
+
+def test_forward_streams_output_and_exit_code(running, capsys):
+    assert forward(["echo", "a", "b"]) == 3
+    captured = capsys.readouterr()
+    assert captured.out == "args: a b\n"
+    assert captured.err == "oops\n"
+    assert running.served == 1
+
+def test_interactive_commands_are_refused(running, capsys):
+    assert forward(["create-issue"]) == 2
+    assert "needs a terminal" in capsys.readouterr().err
+
+def test_status_and_stop(running):
+    status = control("status")
+    assert status["pid"] == os.getpid()
+    control("stop")
+    for _ in range(100):
+        if not os.path.exists(running.path):
+            break
+        threading.Event().wait(0.05)
+    assert not os.path.exists(running.path)
+    assert control("status") is None
+
+def test_no_daemon_falls_back(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    assert forward(["view-project"]) is None
+
+def test_shared_socket_dir_is_refused(running, capsys):
+    # Another user (or a loose umask) left the directory group/world accessible
+    os.chmod(os.path.dirname(running.path), 0o755)
+    assert forward(["echo"]) is None
+    assert "not a private directory" in capsys.readouterr().err
+    with pytest.raises(UnsafeSocketDir):
+        Daemon(running.path).listen()
+    os.chmod(os.path.dirname(running.path), 0o700)
+
+def test_idle_shutdown(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    d = Daemon(socket_path(), idle_seconds=0, poll_interval=0.05)
+    d.listen()
+    d.serve()
+    assert not os.path.exists(d.path)
+
+def test_is_routable():
+    assert registry.is_routable("view-project")
+    assert not registry.is_routable("create-issue")
+    assert registry.is_routable("create-issue", ["--no-input"])
+    assert not registry.is_routable("version")
@@ -0,0 +1,91 @@
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+from bootstrap import git_blob_sha
+from drift import check_repo, record_fingerprint, desired_fingerprint, fingerprint_file, run_check
+
+# --- Fixtures ---
+
+TEMPLATES = {".github/PULL_REQUEST_TEMPLATE.md": "pr\n"}
+
+CONF = {
+    "labels": {"type": [{"name": "type:bug", "color": "d73a4a", "description": "Bug"}, "p3"]},
+    "projects_v2": {"enabled": True, "title": "Board", "fields": {"status": ["Todo", "Done"]}},
+}
+
+def compliant_state():
+    status = {"id": "F_1", "name": "Status", "options": [{"id": "o1", "name": "Todo"}, {"id": "o2", "name": "Done"},
+                                                        {"id": "o3", "name": "Extra"}]}
+    return {
+        "repo_id": "R_1",
+        # A name-only label may have any color
+        "labels": {"type:bug": {"color": "D73A4A", "description": "Bug"}, "p3": {"color": "123456", "description": None},
+                   "wontfix": {"color": "ffffff", "description": None}},
+        "blobs": {".github/PULL_REQUEST_TEMPLATE.md": git_blob_sha(b"pr\n")},
+        "user": {"id": "U_1", "projectsV2": {"nodes": [{"id": "P_1", "title": "Board", "url": "u", "closed": False,
+                                                        "fields": {"nodes": [status, {}]}}]}},
+        "requests": 1,
+    }
+
+@pytest.fixture(autouse=True)
+def templates():
+    with patch("drift.local_templates", return_value=dict(TEMPLATES)):
+        yield
+
+def check(state, conf=CONF):
+    with patch("drift.fetch_bootstrap_state", return_value=state) as fetch:
+        result = check_repo("owner/repo", "me", conf)
+    return result, fetch
+
+# --- Tests ---
+
+def test_compliant_repository_has_no_drift():
+    result, fetch = check(compliant_state())
+    assert result['drifted'] == []
+    assert result['observed'] == result['desired']
+    fetch.assert_called_once_with("owner/repo", "me", list(TEMPLATES), "Board")
+
+@pytest.mark.parametrize("change, part", [
+    (lambda s: s['labels'].pop("type:bug"), "labels"),
+    (lambda s: s['labels']["type:bug"].update(description="Old"), "labels"),
+    (lambda s: s['blobs'].clear(), "templates"),
+    (lambda s: s['user']['projectsV2']['nodes'][0]['fields']['nodes'][0]['options'].pop(0), "project"),
+    (lambda s: s['user']['projectsV2'].update(nodes=[]), "project"),
+])
+def test_drift_is_reported_per_part(change, part):
+    state = compliant_state()
+    change(state)
+    result, _ = check(state)
+    assert result['drifted'] == [part]
+
+def test_extra_labels_drift_only_with_prune():
+    conf = {**CONF, "label_sync": {"prune": True}}
+    result, _ = check(compliant_state(), conf)
+    assert result['drifted'] == ["labels"]
+
+def test_repo_file_is_checked_in_the_same_query():
+    conf = {**CONF, "drift": {"repo_file": ".github/bootstrap-fingerprint.json"}}
+    state = compliant_state()
+    result, fetch = check(state, conf)
+    assert fetch.call_args.args[2] == [*TEMPLATES, ".github/bootstrap-fingerprint.json"]
+    assert result['drifted'] == ["record"]
+
+    content = fingerprint_file(desired_fingerprint(conf, "owner/repo"))
+    state['blobs'][".github/bootstrap-fingerprint.json"] = git_blob_sha(content.encode())
+    result, _ = check(state, conf)
+    assert result['drifted'] == []
+
+def test_run_check_exit_code_and_applied_fingerprint(capsys):
+    record_fingerprint("owner/repo", {**CONF, "labels": {}})
+    state = compliant_state()
+    state['blobs'].clear()
+    with patch("drift.fetch_bootstrap_state", return_value=state):
+        assert run_check("owner/repo", "me", CONF) == 1
+    out = capsys.readouterr().out
+    assert "config changed since the last apply (labels)" in out
+    assert "Drift in templates" in out
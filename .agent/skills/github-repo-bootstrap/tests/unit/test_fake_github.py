@@ -0,0 +1,120 @@
+import pytest
+import sys
+import os
+import json
+import urllib.request
+import urllib.error
+import subprocess
+
+# Add simulator directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../sim')))
+
+from graphql_exec import execute, FieldError
+from fake_github import FakeGitHub, BATCH_LABEL
+import bench
+
+# --- Fixtures ---
+
+@pytest.fixture
+def sim():
+    with FakeGitHub(issues=30) as server:
+        yield server
+
+def call(sim, path, body=None, method=None, headers=None):
+    request = urllib.request.Request(sim.url + path, data=json.dumps(body).encode() if body is not None else None,
+                                     method=method, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            data = response.read()
+            return response.status, response.headers, json.loads(data) if data else None
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, json.loads(e.read() or b"null")
+
+# --- Tests for the GraphQL executor ---
+
+class Root:
+    def gql_repo(self, name):
+        if name == "missing":
+            raise FieldError("Could not resolve to a Repository", type="NOT_FOUND")
+        return {"__typename": "Repository", "name": name, "stars": lambda first=1: list(range(first))}
+
+def test_execute_resolves_aliases_variables_fragments_and_errors():
+    query = """query($n: Int = 2, $full: Boolean!) {
+      a: repo(name: "x") { name stars(first: $n) ... on Repository @include(if: $full) { kind: __typename } }
+      b: repo(name: "missing") { name }
+    }"""
+    response = execute(query, Root(), {"full": True})
+    assert response['data'] == {"a": {"name": "x", "stars": [0, 1], "kind": "Repository"}, "b": None}
+    assert response['errors'] == [{"message": "Could not resolve to a Repository", "path": ["b"], "type": "NOT_FOUND"}]
+    assert execute("{ repo(", Root())['errors'][0]['type'] == "PARSE_ERROR"
+
+# --- Tests for the server ---
+
+def test_rest_listing_with_etag_and_stats(sim):
+    status, headers, issues = call(sim, "/repos/bench/repo/issues?state=open&per_page=5")
+    assert status == 200 and len(issues) == 5
+    assert 'rel="next"' in headers['Link']
+    status, _, _ = call(sim, "/repos/bench/repo/issues?state=open&per_page=5", headers={"If-None-Match": headers['ETag']})
+    assert status == 304
+    stats = sim.stats()
+    assert (stats['requests'], stats['rest'], stats['not_modified']) == (2, 2, 1)
+
+def test_graphql_search_and_mutation(sim):
+    status, _, response = call(sim, "/graphql", {"query": f"""{{
+      search(query: "repo:bench/repo is:issue is:open label:{BATCH_LABEL}", type: ISSUE, first: 100) {{
+        issueCount nodes {{ ... on Issue {{ id number }} }} }}
+      rateLimit {{ cost remaining }} }}"""})
+    assert status == 200
+    nodes = response['data']['search']['nodes']
+    assert response['data']['search']['issueCount'] == len(nodes) == 20
+    assert response['data']['rateLimit']['cost'] == 1
+    _, _, response = call(sim, "/graphql", {"query": "mutation($id: ID!) { c0: closeIssue(input: {issueId: $id}) "
+                                                     "{ issue { number state } } }", "variables": {"id": nodes[0]['id']}})
+    assert response['data']['c0']['issue'] == {"number": nodes[0]['number'], "state": "CLOSED"}
+    assert sim.stats()['routes'] == {"query search": 1, "mutation closeIssue": 1}
+
+def test_rate_limits():
+    with FakeGitHub(issues=1, rate_limit=1, secondary_every=1) as sim:
+        status, headers, _ = call(sim, "/repos/bench/repo/labels", {"name": "x"}, method="POST")
+        assert status == 403 and headers['Retry-After'] == "1"
+        assert call(sim, "/repos/bench/repo")[0] == 200
+        status, headers, _ = call(sim, "/repos/bench/repo")
+        assert status == 403 and headers['X-RateLimit-Remaining'] == "0"
+        assert call(sim, "/graphql", {"query": "{ viewer { login } }"})[2]['data']['viewer']['login'] == "bench-user"
+        assert call(sim, "/graphql", {"query": "{ viewer { login } }"})[2]['errors'][0]['type'] == "RATE_LIMITED"
+        assert sim.stats()['rate_limited'] == 3
+
+# --- Tests for the benchmark harness ---
+
+def test_bench_runs_commands_end_to_end(tmp_path):
+    with FakeGitHub(issues=12) as sim:
+        work = bench.make_workdir(str(tmp_path))
+        env = dict(os.environ, GITHUB_API_URL=sim.url, GITHUB_TOKEN="bench", GH_SKILL_NO_DAEMON="1",
+                   GH_SKILL_CACHE_DIR=str(tmp_path / "cache"), GIT_TERMINAL_PROMPT="0")
+        result, output = bench.run_command(sim, ["list-issues", "--refresh", "--no-input"], None, env, work, 120)
+        assert result['exit'] == 0, output
+        assert "Issue 12" in output
+        assert result['rest'] >= 2 and result['received_bytes'] > 0
+        result, output = bench.run_command(sim, ["bootstrap", "--check"], None, env, work, 120)
+        assert result['exit'] == 1, output  # nothing applied yet
+        assert result['graphql'] == 1
+
+def test_commands_queue_when_the_api_is_unreachable(tmp_path):
+    work = bench.make_workdir(str(tmp_path))
+    env = dict(os.environ, GITHUB_TOKEN="bench", GH_SKILL_NO_DAEMON="1",
+               GH_SKILL_CACHE_DIR=str(tmp_path / "cache"), GIT_TERMINAL_PROMPT="0")
+    env.pop("GITHUB_GRAPHQL_URL", None)
+    with FakeGitHub(issues=3) as sim:
+        env["GITHUB_API_URL"] = sim.url
+        result, output = bench.run_command(sim, ["list-issues", "--refresh", "--no-input"], None, env, work, 120)
+        assert result['exit'] == 0, output
+    # The server is gone; without --offline the close is journaled instead of failing
+    result = subprocess.run([sys.executable, bench.GH_SKILL, "close-issue", "--number", "2", "--no-input", "-y"],
+                            cwd=work, env=env, capture_output=True, text=True, timeout=60)
+    output = result.stdout + result.stderr
+    assert result.returncode == 0, output
+    assert "unreachable" in output and "queued" in output
+    result = subprocess.run([sys.executable, bench.GH_SKILL, "sync", "--no-input", "-y"],
+                            cwd=work, env=env, capture_output=True, text=True, timeout=60)
+    # Still offline: the close stays queued
+    assert result.returncode == 1 and "close" in result.stdout
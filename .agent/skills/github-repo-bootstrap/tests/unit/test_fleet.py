@@ -0,0 +1,140 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import argparse
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+from fleet import resolve_repos, FleetState, load_manifest, run_fleet
+
+# --- Fixtures ---
+
+def make_repo(full_name, archived=False):
+    repo = MagicMock(full_name=full_name, archived=archived)
+    repo.name = full_name.split('/')[1]
+    return repo
+
+@pytest.fixture
+def g():
+    g = MagicMock()
+    g.get_user.return_value.login = "me"
+    g.get_organization.return_value.get_repos.return_value = [
+        make_repo("acme/svc-a"), make_repo("acme/svc-b"), make_repo("acme/web"),
+        make_repo("acme/svc-old", archived=True), make_repo("acme/svc-b-archive"),
+    ]
+    g.get_repo.side_effect = make_repo
+    return g
+
+@pytest.fixture
+def manifest(tmp_path):
+    path = tmp_path / "fleet.yml"
+    path.write_text("repos:\n  - acme/one\n  - acme/two\n  - acme/three\n")
+    return str(path)
+
+def fleet_args(manifest, **kwargs):
+    defaults = {"fleet": manifest, "workers": 2, "restart": False, "prune_labels": False, "check": False, "dry_run": False, "yes": True, "no_input": True}
+    return argparse.Namespace(**{**defaults, **kwargs})
+
+def plan_for(repo, login, conf):
+    labels = [] if repo.name == "one" else [{"name": "p0", "type": "CREATE", "action": MagicMock()}]
+    return {"repo": repo, "labels": labels, "templates": [], "project": None}
+
+# --- Tests for the manifest ---
+
+def test_load_manifest_accepts_plain_list(tmp_path):
+    path = tmp_path / "fleet.yml"
+    path.write_text("- acme/api\n- acme/web\n")
+    assert load_manifest(path) == {"repos": ["acme/api", "acme/web"]}
+
+def test_resolve_repos_expands_globs_and_excludes(g):
+    manifest = {"repos": ["acme/svc-*", "other/tool"], "exclude": ["*-archive"]}
+    assert resolve_repos(g, manifest) == ["acme/svc-a", "acme/svc-b", "other/tool"]
+    # The owner's repositories are listed once
+    g.get_organization.assert_called_once_with("acme")
+
+def test_resolve_repos_org_include(g):
+    assert resolve_repos(g, {"org": "acme", "include": ["web*"]}) == ["acme/web"]
+
+# --- Tests for the state file ---
+
+def test_state_survives_reload(manifest):
+    FleetState(manifest).update("acme/one", status="applied")
+    assert FleetState(manifest).get("acme/one") == {"status": "applied"}
+    FleetState(manifest).reset()
+    assert FleetState(manifest).get("acme/one") == {}
+
+# --- Tests for run_fleet ---
+
+@patch("fleet.print_timing")
+@patch("fleet.apply_plan")
+@patch("fleet.build_plan", side_effect=plan_for)
+@patch("fleet.get_github_client")
+def test_run_fleet_applies_and_resumes(mock_client, mock_plan, mock_apply, mock_timing, g, manifest):
+    mock_client.return_value = g
+    def apply(plan, conf, log):
+        if plan["repo"].name == "three":
+            raise Exception("boom")
+    mock_apply.side_effect = apply
+
+    with pytest.raises(SystemExit) as e:
+        run_fleet(fleet_args(manifest))
+    assert e.value.code == 1
+    state = FleetState(manifest)
+    assert state.get("acme/one")['status'] == "compliant"
+    assert state.get("acme/two")['status'] == "applied"
+    assert state.get("acme/three")['status'] == "failed"
+    assert state.get("acme/three")['error'] == "boom"
+
+    # A second run only retries the failed repository
+    mock_plan.reset_mock()
+    mock_apply.side_effect = None
+    run_fleet(fleet_args(manifest))
+    assert [c.args[0].full_name for c in mock_plan.call_args_list] == ["acme/three"]
+    assert FleetState(manifest).get("acme/three")['status'] == "applied"
+
+@patch("fleet.print_timing")
+@patch("fleet.apply_plan")
+@patch("fleet.build_plan", side_effect=plan_for)
+@patch("fleet.get_github_client")
+def test_run_fleet_dry_run_does_not_apply(mock_client, mock_plan, mock_apply, mock_timing, g, manifest):
+    mock_client.return_value = g
+    with pytest.raises(SystemExit) as e:
+        run_fleet(fleet_args(manifest, dry_run=True))
+    assert e.value.code == 0
+    mock_apply.assert_not_called()
+    assert FleetState(manifest).get("acme/two")['status'] == "planned"
+
+@patch("fleet.build_plan", side_effect=plan_for)
+@patch("fleet.get_github_client")
+def test_run_fleet_no_input_needs_yes(mock_client, mock_plan, g, manifest):
+    mock_client.return_value = g
+    with pytest.raises(SystemExit) as e:
+        run_fleet(fleet_args(manifest, yes=False))
+    assert e.value.code == 2
+
+@patch("fleet.print_timing")
+@patch("fleet.apply_plan")
+@patch("fleet.build_plan")
+@patch("fleet.get_github_client")
+def test_run_fleet_creates_shared_project_once(mock_client, mock_plan, mock_apply, mock_timing, g, manifest):
+    mock_client.return_value = g
+    create = MagicMock(return_value={"id": "P_1", "url": "u"})
+    mock_plan.side_effect = lambda repo, login, conf: {
+        "repo": repo, "labels": [], "templates": [],
+        "project": {"name": "Board", "type": "CREATE", "repo_id": repo.name, "action": create}}
+
+    run_fleet(fleet_args(manifest))
+    create.assert_called_once_with()
+    projects = [c.args[0]["project"] for c in mock_apply.call_args_list]
+    assert sorted(p['repo_id'] for p in projects) == ["one", "three", "two"]
+    assert all((p['type'], p['id'], p['action']()) == ("EXISTS", "P_1", "u") for p in projects)
+
+    # If the project cannot be created, none of its repositories are applied
+    mock_apply.reset_mock()
+    create.side_effect = Exception("boom")
+    with pytest.raises(SystemExit):
+        run_fleet(fleet_args(manifest, restart=True))
+    mock_apply.assert_not_called()
+    assert FleetState(manifest).get("acme/two")['error'] == "Creating project Board: boom"
@@ -0,0 +1,102 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+
+import requests
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+import graphql_client
+from graphql_client import GraphQLClient, GraphQLError, operation_name, graphql_url
+
+# --- Fixtures ---
+
+@pytest.fixture
+def client():
+    c = GraphQLClient("token123", url="https://api.example.test/graphql")
+    c.session = MagicMock()
+    return c
+
+def make_response(status=200, payload=None, json_error=False):
+    res = MagicMock()
+    res.status_code = status
+    res.reason = "Reason"
+    if json_error:
+        res.json.side_effect = ValueError("Expecting value")
+    else:
+        res.json.return_value = payload
+    return res
+
+# --- Tests for GraphQLClient.execute ---
+
+def test_execute_success(client):
+    client.session.post.return_value = make_response(payload={"data": {"key": "value"}})
+    result = client.execute("query { viewer { login } }", {"a": 1})
+    assert result == {"data": {"key": "value"}}
+    _, kwargs = client.session.post.call_args
+    assert kwargs["json"] == {"query": "query { viewer { login } }", "variables": {"a": 1}}
+    assert client.calls[0]["operation"] == "query viewer"
+    assert client.calls[0]["ok"] is True
+
+def test_execute_graphql_errors(client):
+    errors = [{"type": "NOT_FOUND", "message": "Could not resolve"}]
+    client.session.post.return_value = make_response(payload={"data": None, "errors": errors})
+    with pytest.raises(GraphQLError) as exc:
+        client.execute("query { node(id: \"x\") { id } }")
+    assert exc.value.types == {"NOT_FOUND"}
+    assert client.calls[0]["ok"] is False
+
+def test_execute_allow_partial(client):
+    payload = {"data": {"op0": {"id": "a"}, "op1": None}, "errors": [{"path": ["op1"], "message": "nope"}]}
+    client.session.post.return_value = make_response(payload=payload)
+    assert client.execute("mutation { op0: a op1: b }", allow_partial=True) == payload
+    with pytest.raises(GraphQLError):
+        client.execute("mutation { op0: a op1: b }")
+
+def test_execute_http_error(client):
+    client.session.post.return_value = make_response(status=401, payload={"message": "Bad credentials"})
+    with pytest.raises(GraphQLError, match="Bad credentials"):
+        client.execute("query { viewer { login } }")
+
+def test_execute_json_error(client):
+    client.session.post.return_value = make_response(json_error=True)
+    with pytest.raises(GraphQLError, match="Failed to decode"):
+        client.execute("query { viewer { login } }")
+
+def test_execute_connection_error(client):
+    client.session.post.side_effect = requests.ConnectionError("boom")
+    with pytest.raises(GraphQLError, match="Query failed"):
+        client.execute("query { viewer { login } }")
+
+def test_session_reused_across_calls(client):
+    client.session.post.return_value = make_response(payload={"data": {}})
+    client.execute("query { a }")
+    client.execute("query { b }")
+    assert client.session.post.call_count == 2
+    assert len(client.calls) == 2
+
+# --- Tests for module helpers ---
+
+def test_operation_name():
+    assert operation_name("mutation($id: ID!) { addProjectV2ItemById(input: {}) { item { id } } }") == "mutation addProjectV2ItemById"
+    assert operation_name("{ viewer { login } }") == "query viewer"
+    assert operation_name("mutation { c0: closeIssue(input: {}) { issue { id } } }") == "mutation closeIssue"
+
+def test_graphql_url_follows_the_api_url():
+    assert graphql_url("https://api.github.com") == "https://api.github.com/graphql"
+    # GitHub Enterprise Server: REST under /api/v3, GraphQL under /api/graphql
+    assert graphql_url("https://ghe.example/api/v3/") == "https://ghe.example/api/graphql"
+    assert graphql_url("http://127.0.0.1:8080") == "http://127.0.0.1:8080/graphql"
+
+@patch("utils.get_github_token", return_value="token123")
+def test_gql_request_uses_shared_client(mock_token):
+    with patch.object(graphql_client, "_client", None):
+        with patch.object(GraphQLClient, "execute", return_value={"data": {}}) as mock_execute:
+            graphql_client.gql_request("query { a }")
+            graphql_client.gql_request("query { b }")
+            first = graphql_client.get_client()
+            assert graphql_client.get_client() is first
+        assert mock_execute.call_count == 2
+        mock_token.assert_called_once()
@@ -0,0 +1,86 @@
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+import requests
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+from http_cache import ResponseCache, CachingAdapter, SharedHTTPSConnection, connect_timeout
+
+def make_response(status, body=b"", headers=None):
+    res = requests.Response()
+    res.status_code = status
+    res._content = body
+    res.headers.update(headers or {})
+    return res
+
+def prepared(url="https://api.github.com/repos/o/r/labels", token="token abc"):
+    return requests.Request("GET", url, headers={"Authorization": token, "Accept": "application/json"}).prepare()
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path / "http.sqlite", max_bytes=1000)
+
+def test_etag_revalidation_replays_body(cache):
+    adapter = CachingAdapter(cache)
+    first = make_response(200, b'[{"name": "bug"}]', {"ETag": '"abc"', "Content-Encoding": "gzip", "X-RateLimit-Remaining": "10"})
+    not_modified = make_response(304, b"", {"ETag": '"abc"', "X-RateLimit-Remaining": "9"})
+
+    with patch.object(requests.adapters.HTTPAdapter, "send", side_effect=[first, not_modified]) as mock_send:
+        r1 = adapter.send(prepared())
+        r2 = adapter.send(prepared())
+
+    assert r1.content == b'[{"name": "bug"}]'
+    assert r2.status_code == 200
+    assert r2.content == b'[{"name": "bug"}]'
+    assert r2.headers["X-RateLimit-Remaining"] == "9"
+    assert "Content-Encoding" not in r2.headers
+    second_request = mock_send.call_args_list[1][0][0]
+    assert second_request.headers["If-None-Match"] == '"abc"'
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_last_modified_revalidation(cache):
+    adapter = CachingAdapter(cache)
+    first = make_response(200, b"{}", {"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    with patch.object(requests.adapters.HTTPAdapter, "send", side_effect=[first, make_response(304)]) as mock_send:
+        adapter.send(prepared())
+        adapter.send(prepared())
+    assert mock_send.call_args_list[1][0][0].headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert cache.hits == 1
+
+def test_tokens_do_not_share_entries(cache):
+    adapter = CachingAdapter(cache)
+    responses = [make_response(200, b"a", {"ETag": '"1"'}), make_response(200, b"b", {"ETag": '"2"'})]
+    with patch.object(requests.adapters.HTTPAdapter, "send", side_effect=responses) as mock_send:
+        adapter.send(prepared(token="token one"))
+        adapter.send(prepared(token="token two"))
+    assert "If-None-Match" not in mock_send.call_args_list[1][0][0].headers
+
+def test_non_get_is_not_cached(cache):
+    adapter = CachingAdapter(cache)
+    post = requests.Request("POST", "https://api.github.com/graphql", data="{}").prepare()
+    with patch.object(requests.adapters.HTTPAdapter, "send", return_value=make_response(200, b"{}", {"ETag": '"x"'})):
+        adapter.send(post)
+    assert (cache.hits, cache.misses, cache.size()) == (0, 0, 0)
+
+def test_lru_eviction_bounds_size(cache):
+    cache.put("a", '"a"', None, {}, b"x" * 400)
+    cache.put("b", '"b"', None, {}, b"x" * 400)
+    cache.touch("a")
+    cache.put("c", '"c"', None, {}, b"x" * 400)
+    assert cache.size() <= 1000
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+def test_oversized_body_is_skipped(cache):
+    cache.put("big", '"x"', None, {}, b"x" * 2000)
+    assert cache.get("big") is None
+
+def test_connect_timeout_only_shortens_connecting():
+    assert SharedHTTPSConnection("api.github.com", timeout=15).timeout == 15
+    with connect_timeout(3.0):
+        assert SharedHTTPSConnection("api.github.com", timeout=15).timeout == (3.0, 15)
+    assert SharedHTTPSConnection("api.github.com", timeout=15).timeout == 15
@@ -0,0 +1,142 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from datetime import datetime, timezone
+import sys
+import os
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+from local_store import LocalStore, open_store, open_snapshot
+
+def raw_issue(number, updated_at, state="open", labels=(), assignees=(), pr=False):
+    raw = {
+        "number": number,
+        "node_id": f"I_{number}",
+        "title": f"Issue {number}",
+        "state": state,
+        "user": {"login": "dev"},
+        "html_url": f"https://github.com/o/r/issues/{number}",
+        "updated_at": updated_at,
+        "labels": [{"name": l} for l in labels],
+        "assignees": [{"login": a} for a in assignees],
+    }
+    if pr:
+        raw["pull_request"] = {"url": "x"}
+    return MagicMock(_rawData=raw)
+
+def make_repo(*batches):
+    repo = MagicMock()
+    repo.full_name = "owner/repo"
+    repo.get_issues.side_effect = [list(b) for b in batches]
+    label = MagicMock(color="d73a4a", description="Bug")
+    label.name = "type:bug"
+    repo.get_labels.return_value = [label]
+    return repo
+
+def test_sync_and_read():
+    repo = make_repo([
+        raw_issue(1, "2024-01-01T00:00:00Z", labels=["type:bug", "p1"], assignees=["alice"]),
+        raw_issue(2, "2024-01-02T00:00:00Z", pr=True),
+        raw_issue(3, "2024-01-03T00:00:00Z", state="closed"),
+    ])
+    store = LocalStore("owner/repo")
+    assert store.is_stale()
+    assert store.sync(repo) == 3
+    assert not store.is_stale()
+
+    issues = store.items(kind="issue", state="open")
+    assert [i.number for i in issues] == [1]
+    assert issues[0].labels == ["type:bug", "p1"]
+    assert issues[0].assignee == "alice"
+    assert [i.number for i in store.items(kind="pr")] == [2]
+    assert [i.number for i in store.items(kind="issue", state="all")] == [3, 1]
+    assert [i.number for i in store.items(label="p1")] == [1]
+    assert store.labels() == ["type:bug"]
+
+    _, kwargs = repo.get_issues.call_args
+    assert kwargs == {"state": "all", "sort": "updated", "direction": "asc"}
+
+def test_sync_reads_listed_issues_without_completing_them():
+    from github.Issue import Issue
+    from github.PaginatedList import PaginatedList
+    requester = MagicMock(per_page=100)
+    page = [raw_issue(n, f"2024-01-0{n}T00:00:00Z")._rawData for n in (1, 2)]
+    for raw in page:
+        raw["url"] = f"https://api.github.com/repos/o/r/issues/{raw['number']}"
+    requester.requestJsonAndCheck.return_value = ({}, page)
+    repo = make_repo()
+    repo.get_issues.side_effect = None
+    repo.get_issues.return_value = PaginatedList(Issue, requester, "/repos/o/r/issues", None)
+    assert LocalStore("owner/repo").sync(repo) == 2
+    # One request for the page, none per issue
+    requester.requestJsonAndCheck.assert_called_once()
+    assert not next(iter(repo.get_issues.return_value)).completed
+
+def test_incremental_sync_uses_watermark():
+    repo = make_repo(
+        [raw_issue(1, "2024-01-01T00:00:00Z"), raw_issue(2, "2024-01-05T10:00:00Z")],
+        [raw_issue(1, "2024-01-06T00:00:00Z", state="closed")],
+    )
+    store = LocalStore("owner/repo")
+    store.sync(repo)
+    assert store.sync(repo) == 1
+
+    _, kwargs = repo.get_issues.call_args
+    assert kwargs["since"] == datetime(2024, 1, 5, 10, 0, tzinfo=timezone.utc)
+    assert store.get(1).state == "closed"
+    assert [i.number for i in store.items(state="open")] == [2]
+
+def test_open_store_respects_staleness():
+    repo = make_repo([raw_issue(1, "2024-01-01T00:00:00Z")], [])
+    open_store(repo).close()
+    open_store(repo).close()
+    assert repo.get_issues.call_count == 1
+    open_store(repo, refresh=True).close()
+    assert repo.get_issues.call_count == 2
+
+def test_open_store_falls_back_to_snapshot():
+    repo = make_repo([raw_issue(1, "2024-01-01T00:00:00Z")])
+    open_store(repo).close()
+    repo.get_issues.side_effect = ConnectionError("offline")
+    with patch("local_store.console"):
+        store = open_store(repo, refresh=True)
+    assert [i.number for i in store.items()] == [1]
+
+def test_open_store_without_snapshot_raises():
+    repo = make_repo()
+    repo.get_issues.side_effect = ConnectionError("offline")
+    with pytest.raises(ConnectionError):
+        open_store(repo)
+
+def test_upsert_issue_uses_attributes():
+    store = LocalStore("owner/repo")
+    issue = MagicMock()
+    issue.number = 7
+    issue.node_id = "I_7"
+    issue.pull_request = None
+    issue.title = "Closed now"
+    issue.state = "closed"
+    issue.user.login = "dev"
+    issue.html_url = "u"
+    issue.updated_at = datetime(2024, 2, 1, tzinfo=timezone.utc)
+    issue.labels = []
+    issue.assignees = []
+    store.upsert_issue(issue)
+    item = store.get(7)
+    assert item.state == "closed"
+    assert item.updated_at == "2024-02-01T00:00:00Z"
+
+def test_patch_applies_queued_change_locally():
+    store = LocalStore("owner/repo")
+    store.sync(make_repo([raw_issue(1, "2024-01-01T00:00:00Z", labels=["p1"])]))
+    store.patch(1, state="closed", labels=["p0"])
+    item = store.get(1)
+    assert item.state == "closed"
+    assert item.labels == ["p0"]
+
+def test_open_snapshot_requires_a_sync():
+    with pytest.raises(RuntimeError):
+        open_snapshot("owner/repo")
+    LocalStore("owner/repo").sync(make_repo([]))
+    assert open_snapshot("owner/repo").last_synced() is not None
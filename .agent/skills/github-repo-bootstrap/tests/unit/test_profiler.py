@@ -0,0 +1,128 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import json
+import importlib.util
+
+import requests
+
+# Add scripts directory to path
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts'))
+sys.path.append(SCRIPTS_DIR)
+
+import profiler
+from profiler import Profiler, rest_operation, with_cost, percentile, COST_ALIAS
+from graphql_client import GraphQLClient
+from http_cache import ResponseCache, CachingAdapter
+
+# --- Fixtures ---
+
+@pytest.fixture
+def prof():
+    p = profiler.enable()
+    yield p
+    profiler.disable()
+
+def load_cli():
+    spec = importlib.util.spec_from_file_location("gh_skill", os.path.join(SCRIPTS_DIR, "gh-skill.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# --- Tests for helpers ---
+
+def test_rest_operation_templates_repo_and_ids():
+    assert rest_operation("GET", "https://api.github.com/repos/o/r/issues/12?per_page=100") == \
+        "GET /repos/{owner}/{repo}/issues/{n}"
+    assert rest_operation("GET", "https://api.github.com/repos/o/r/git/commits/" + "a" * 40) == \
+        "GET /repos/{owner}/{repo}/git/commits/{n}"
+    assert rest_operation("POST", "https://ghe.example/api/v3/user/") == "POST /api/v3/user"
+
+def test_with_cost_only_touches_queries():
+    assert with_cost("query($n: Int) { viewer { login } }") == \
+        f"query($n: Int) {{ viewer {{ login }}  {COST_ALIAS}: rateLimit {{ cost }} }}"
+    assert with_cost("mutation { a: closeIssue(input: {}) { clientMutationId } }") is None
+    assert with_cost("{ rateLimit { cost } }") is None
+
+def test_summary_percentiles_and_totals():
+    assert percentile([], 95) == 0.0
+    assert percentile([5, 1, 3, 2, 4], 50) == 3
+    p = Profiler(clock=iter([0.0, 2.5]).__next__)
+    for ms in (10, 20, 30):
+        p.record("rest", "GET /user", ms, received=100, status=200)
+    p.record("rest", "GET /user", 1, status=200, cached=True)
+    p.record("graphql", "query node", 50, sent=300, received=900, status=200, cost=2)
+    p.record("graphql", "mutation closeIssue", 70, status=502)
+    summary = p.summary()
+    assert summary['seconds'] == 2.5
+    rest, graphql = summary['totals']['rest'], summary['totals']['graphql']
+    assert (rest['calls'], rest['p50_ms'], rest['p95_ms'], rest['cache_hits'], rest['received_bytes']) == (4, 10, 30, 1, 300)
+    assert (graphql['calls'], graphql['cost'], graphql['errors'], rest['cost']) == (2, 2, 1, None)
+    assert summary['operations'][0]['operation'] == "GET /user"
+
+# --- Tests for the transports ---
+
+def test_graphql_cost_is_requested_and_stripped(prof):
+    client = GraphQLClient("token123", url="https://api.example.test/graphql")
+    client.session = MagicMock()
+    res = client.session.post.return_value
+    res.status_code = 200
+    res.content = b'{"data": {}}'
+    res.json.return_value = {"data": {"viewer": {"login": "me"}, COST_ALIAS: {"cost": 3}}}
+
+    assert client.execute("query { viewer { login } }") == {"data": {"viewer": {"login": "me"}}}
+    assert "rateLimit" in client.session.post.call_args.kwargs['json']['query']
+    call = prof.calls[0]
+    assert (call['kind'], call['operation'], call['cost'], call['status']) == ("graphql", "query viewer", 3, 200)
+
+    res.json.return_value = {"data": {"c0": None}}
+    client.execute("mutation { c0: closeIssue(input: {}) { clientMutationId } }")
+    assert "rateLimit" not in client.session.post.call_args.kwargs['json']['query']
+    assert prof.calls[1]['cost'] is None
+
+def test_rest_calls_are_recorded_with_cache_hits(prof, tmp_path):
+    adapter = CachingAdapter(ResponseCache(tmp_path / "http.sqlite"))
+    responses = []
+    for status, body in ((200, b'{"login": "me"}'), (304, b"")):
+        res = requests.Response()
+        res.status_code, res._content = status, body
+        res.headers.update({"ETag": '"abc"'})
+        responses.append(res)
+    request = requests.Request("GET", "https://api.github.com/user", headers={"Authorization": "t"}).prepare()
+    with patch.object(requests.adapters.HTTPAdapter, "send", side_effect=responses):
+        adapter.send(request)
+        adapter.send(request.copy())
+    assert [(c['operation'], c['received'], c['cached']) for c in prof.calls] == \
+        [("GET /user", 15, False), ("GET /user", 0, True)]
+
+def test_nothing_is_recorded_without_profile():
+    profiler.disable()
+    profiler.record("rest", "GET /user", 1.0)
+    assert profiler.active() is None
+
+# --- Tests for gh-skill.py --profile ---
+
+def test_global_options_are_split_off():
+    cli = load_cli()
+    assert cli.parse_global_options(["--profile", "list-issues", "--state", "open"]) == \
+        ({"profile": True, "profile_json": None}, ["list-issues", "--state", "open"])
+    assert cli.parse_global_options(["--profile-json=p.json", "sync"])[0] == {"profile": True, "profile_json": "p.json"}
+    with pytest.raises(SystemExit):
+        cli.parse_global_options(["--profile-json"])
+
+def test_run_profiled_reports_and_writes_json(tmp_path, capsys):
+    cli = load_cli()
+
+    def command():
+        profiler.record("rest", "GET /user", 12.0, received=50, status=200)
+        sys.exit(1)
+
+    path = tmp_path / "profile.json"
+    with patch.object(cli, "resolve_command", return_value=command), pytest.raises(SystemExit):
+        cli.run_profiled("list-issues", ["--no-input"], str(path))
+    profiler.disable()
+    report = json.loads(path.read_text())
+    assert (report['command'], report['argv'], report['exit']) == ("list-issues", ["--no-input"], 1)
+    assert report['totals']['rest']['calls'] == 1
+    assert "API profile: list-issues" in capsys.readouterr().err
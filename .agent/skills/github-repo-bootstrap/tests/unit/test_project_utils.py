@@ -1,48 +1,25 @@
 
 import pytest
 from unittest.mock import patch, MagicMock
-import json
-import subprocess
 import sys
 import os
+import threading
 
 # Add scripts directory to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
 
-from project_utils import gql_request, get_project_fields, set_project_item_status, add_item_to_project, find_project_item_by_content
+from graphql_client import GraphQLError
+from project_utils import get_project_fields, get_project_schema, set_project_item_status, add_item_to_project, find_project_item_by_content, batch_project_mutations, set_items_status
+import project_utils
+from project_utils import iter_project_items, get_item_index
 
 # --- Fixtures ---
 
-@pytest.fixture
-def mock_subprocess():
-    with patch("subprocess.run") as mock:
-        yield mock
-
 @pytest.fixture
 def mock_console():
     with patch("project_utils.console") as mock:
         yield mock
 
-# --- Tests for gql_request ---
-
-def test_gql_request_success(mock_subprocess):
-    mock_subprocess.return_value.stdout = '{"data": {"key": "value"}}'
-    result = gql_request("query { ... }")
-    assert result == {"data": {"key": "value"}}
-    mock_subprocess.assert_called_once()
-
-def test_gql_request_failure(mock_subprocess, mock_console):
-    mock_subprocess.side_effect = subprocess.CalledProcessError(1, ["gh"], stderr="Error message")
-    with pytest.raises(subprocess.CalledProcessError):
-        gql_request("query { ... }")
-    mock_console.print.assert_called_with("[red]GraphQL Request Failed: Error message[/]")
-
-def test_gql_request_json_error(mock_subprocess, mock_console):
-    mock_subprocess.return_value.stdout = "Invalid JSON"
-    with pytest.raises(json.JSONDecodeError):
-        gql_request("query { ... }")
-    mock_console.print.assert_called()
-
 # --- Tests for get_project_fields ---
 
 @patch("project_utils.gql_request")
@@ -109,6 +86,71 @@ def test_set_project_item_status_no_option(mock_get_fields, mock_console):
     assert result is False
     mock_console.print.assert_called_with("[yellow]Status 'InvalidStatus' not found in project options.[/]")
 
+STATUS_FIELDS = [
+    {
+        "id": "status_field_id",
+        "name": "Status",
+        "options": [
+            {"id": "opt1", "name": "Backlog"},
+            {"id": "opt2", "name": "Done"}
+        ]
+    }
+]
+
+@patch("project_utils.get_project_fields")
+def test_get_project_schema_is_indexed_and_cached(mock_get_fields):
+    mock_get_fields.return_value = STATUS_FIELDS
+    schema = get_project_schema("proj123")
+    assert schema["Status"] == {"id": "status_field_id", "options": {"backlog": "opt1", "done": "opt2"}}
+    assert get_project_schema("proj123") == schema
+    mock_get_fields.assert_called_once()
+
+@patch("project_utils.gql_request")
+@patch("project_utils.get_project_fields")
+def test_set_project_item_status_uses_cached_schema(mock_get_fields, mock_gql, mock_console):
+    mock_get_fields.return_value = STATUS_FIELDS
+    assert set_project_item_status("proj123", "item1", "Backlog") is True
+    assert set_project_item_status("proj123", "item2", "done") is True
+    mock_get_fields.assert_called_once()
+    assert mock_gql.call_count == 2
+    assert mock_gql.call_args[0][1]["optionId"] == "opt2"
+
+@patch("project_utils.gql_request")
+@patch("project_utils.get_project_fields")
+def test_set_project_item_status_refreshes_on_unknown_option(mock_get_fields, mock_gql, mock_console):
+    mock_get_fields.return_value = STATUS_FIELDS
+    get_project_schema("proj123")
+    # Option added in the web UI after the schema was cached
+    mock_get_fields.return_value = [dict(STATUS_FIELDS[0], options=STATUS_FIELDS[0]["options"] + [{"id": "opt3", "name": "Review"}])]
+    assert set_project_item_status("proj123", "item1", "Review") is True
+    assert mock_get_fields.call_count == 2
+    assert mock_gql.call_args[0][1]["optionId"] == "opt3"
+
+@patch("project_utils.gql_request")
+@patch("project_utils.get_project_fields")
+def test_set_project_item_status_retries_stale_option(mock_get_fields, mock_gql, mock_console):
+    mock_get_fields.return_value = STATUS_FIELDS
+    get_project_schema("proj123")
+    mock_get_fields.return_value = [dict(STATUS_FIELDS[0], options=[{"id": "opt9", "name": "Backlog"}])]
+    mock_gql.side_effect = [GraphQLError("stale", [{"message": "The single select option Id does not belong to the field"}]), {"data": {}}]
+    assert set_project_item_status("proj123", "item1", "Backlog") is True
+    assert mock_gql.call_count == 2
+    assert mock_gql.call_args[0][1]["optionId"] == "opt9"
+
+@patch("project_utils.gql_request")
+@patch("project_utils.get_project_fields")
+def test_set_project_item_status_keeps_schema_on_other_errors(mock_get_fields, mock_gql, mock_console):
+    mock_get_fields.return_value = STATUS_FIELDS
+    mock_gql.side_effect = GraphQLError("invalid", [{"message": "Argument 'fieldId' on InputObject has an invalid value"}])
+    assert set_project_item_status("proj123", "item1", "Backlog") is False
+    assert mock_gql.call_count == 1
+    assert mock_get_fields.call_count == 1
+
+def test_stale_schema_message_needs_the_cached_id():
+    assert project_utils.is_stale_schema_message("Could not resolve to a node with the global id of 'opt1'", ["f1", "opt1"])
+    assert project_utils.is_stale_schema_message("Could not resolve to a node with the global id of 'PVTSSF_x'")
+    assert not project_utils.is_stale_schema_message("Field 'value' is missing required arguments", ["f1", "opt1"])
+
 # --- Tests for add_item_to_project ---
 
 @patch("project_utils.gql_request")
@@ -126,33 +168,167 @@ def test_add_item_to_project(mock_gql):
 
 # --- Tests for find_project_item_by_content ---
 
+def item_ids_page(pairs, has_next=False, cursor=None):
+    nodes = [{"id": item_id, "isArchived": False, "content": {"id": content_id}} for content_id, item_id in pairs]
+    return {"data": {"node": {"items": {"pageInfo": {"hasNextPage": has_next, "endCursor": cursor}, "nodes": nodes}}}}
+
+def content_items_page(pairs, has_next=False, cursor=None):
+    nodes = [{"id": item_id, "project": {"id": project_id}} for project_id, item_id in pairs]
+    return {"data": {"node": {"projectItems": {"pageInfo": {"hasNextPage": has_next, "endCursor": cursor}, "nodes": nodes}}}}
+
 @patch("project_utils.gql_request")
-def test_find_project_item_by_content_found(mock_gql):
-    mock_gql.return_value = {
-        "data": {
-            "node": {
-                "projectItems": {
-                    "nodes": [
-                        {"id": "item1", "project": {"id": "otherProj"}},
-                        {"id": "targetItem", "project": {"id": "targetProj"}}
-                    ]
-                }
-            }
-        }
-    }
-    item_id = find_project_item_by_content("targetProj", "content123")
-    assert item_id == "targetItem"
+def test_find_project_item_by_content_uses_index(mock_gql):
+    mock_gql.side_effect = [item_ids_page([("c1", "item1")], True, "p1"), item_ids_page([("c2", "item2")])]
+    get_item_index("targetProj")
+    assert find_project_item_by_content("targetProj", "c2") == "item2"
+    assert find_project_item_by_content("targetProj", "c1") == "item1"
+    # One scan of all pages; later lookups are free, also in a new process
+    assert mock_gql.call_count == 2
+    project_utils._item_indexes.clear()
+    assert find_project_item_by_content("targetProj", "c1") == "item1"
+    assert mock_gql.call_count == 2
+
+@patch("project_utils.gql_request")
+def test_find_project_item_by_content_does_not_scan(mock_gql):
+    mock_gql.side_effect = [content_items_page([("targetProj", "item1")])]
+    assert find_project_item_by_content("targetProj", "c1") == "item1"
+    assert mock_gql.call_args.args[0] == project_utils.CONTENT_ITEMS_QUERY
+    # The result is remembered, also in a new process, until a full scan replaces it
+    project_utils._item_lookups.clear()
+    assert find_project_item_by_content("targetProj", "c1") == "item1"
+    assert mock_gql.call_count == 1
+    mock_gql.side_effect = [item_ids_page([("c2", "item2")])]
+    assert get_item_index("targetProj") == {"c2": "item2"}
+    project_utils._item_lookups.clear()
+    assert project_utils._loaded_item_lookups("targetProj") == {}
+
+@patch("project_utils.gql_request")
+def test_find_project_item_by_content_pages_project_items(mock_gql):
+    # More than one page of projects: the old first-10 lookup missed these
+    mock_gql.side_effect = [
+        content_items_page([(f"proj{i}", f"item{i}") for i in range(100)], True, "c1"),
+        content_items_page([("targetProj", "targetItem")]),
+    ]
+    assert find_project_item_by_content("targetProj", "content123") == "targetItem"
+    assert mock_gql.call_args_list[1].args[1] == {"contentId": "content123", "after": "c1"}
+    assert find_project_item_by_content("targetProj", "content123") == "targetItem"
+    assert mock_gql.call_count == 2
 
 @patch("project_utils.gql_request")
 def test_find_project_item_by_content_not_found(mock_gql):
+    mock_gql.side_effect = [content_items_page([])]
+    assert find_project_item_by_content("targetProj", "content123") is None
+
+@patch("project_utils.gql_request")
+def test_added_items_extend_the_index(mock_gql):
+    mock_gql.side_effect = [item_ids_page([]), {"data": {"addProjectV2ItemById": {"item": {"id": "newItem"}}}}]
+    get_item_index("proj123")
+    add_item_to_project("proj123", "content456")
+    assert find_project_item_by_content("proj123", "content456") == "newItem"
+    assert mock_gql.call_count == 2
+
+@patch("project_utils.gql_request")
+def test_failed_updates_leave_the_index(mock_gql):
+    mock_gql.side_effect = [item_ids_page([("c1", "item1")]),
+                            {"data": {"op0": None}, "errors": [{"path": ["op0"], "message": "Item not found"}]}]
+    get_item_index("proj123")
+    batch_project_mutations("proj123", updates=[("item1", "field1", {"text": "x"})])
+    assert get_item_index("proj123") == {}
+
+# --- Tests for batched mutations ---
+
+@patch("project_utils.gql_request")
+def test_batch_project_mutations_chunks_and_aliases(mock_gql):
+    def respond(mutation, variables, allow_partial=False):
+        data = {}
+        for alias in [line.split(":")[0].strip() for line in mutation.splitlines() if line.strip().startswith("op")]:
+            i = alias[2:]
+            if f"content{i}" in variables:
+                data[alias] = {"item": {"id": "item-" + variables[f"content{i}"]}}
+            else:
+                data[alias] = {"projectV2Item": {"id": variables[f"item{i}"]}}
+        return {"data": data}
+    mock_gql.side_effect = respond
+
+    updates = [(f"item{n}", "field1", {"singleSelectOptionId": "opt1"}) for n in range(5)]
+    result = batch_project_mutations("proj123", updates=updates, adds=["c1", "c2"], chunk_size=3)
+
+    # 7 operations in chunks of 3 -> 3 round trips
+    assert mock_gql.call_count == 3
+    assert result["added"] == {"c1": "item-c1", "c2": "item-c2"}
+    assert result["updated"] == [f"item{n}" for n in range(5)]
+    assert result["errors"] == {}
+    first_doc = mock_gql.call_args_list[0][0][0]
+    assert "op0: addProjectV2ItemById" in first_doc
+    assert "op2: updateProjectV2ItemFieldValue" in first_doc
+
+@patch("project_utils.gql_request")
+def test_batch_project_mutations_partial_errors(mock_gql):
     mock_gql.return_value = {
-        "data": {
-            "node": {
-                "projectItems": {
-                    "nodes": []
-                }
-            }
-        }
+        "data": {"op0": {"projectV2Item": {"id": "item1"}}, "op1": None},
+        "errors": [{"path": ["op1"], "message": "Item not found"}]
     }
-    item_id = find_project_item_by_content("targetProj", "content123")
-    assert item_id is None
+    updates = [("item1", "f", {"text": "a"}), ("item2", "f", {"text": "b"})]
+    result = batch_project_mutations("proj123", updates=updates)
+    assert result["updated"] == ["item1"]
+    assert result["errors"] == {"item2": "Item not found"}
+
+@patch("project_utils.gql_request")
+def test_batch_project_mutations_request_failure(mock_gql):
+    mock_gql.side_effect = GraphQLError("Query failed: boom")
+    result = batch_project_mutations("proj123", adds=["c1"])
+    assert result["errors"] == {"c1": "Query failed: boom"}
+
+@patch("project_utils.gql_request")
+@patch("project_utils.get_project_fields")
+def test_set_items_status_single_round_trip(mock_get_fields, mock_gql):
+    mock_get_fields.return_value = STATUS_FIELDS
+    mock_gql.return_value = {"data": {"op0": {"projectV2Item": {"id": "a"}}, "op1": {"projectV2Item": {"id": "b"}}}}
+    results = set_items_status("proj123", [("a", "Done"), ("b", "Backlog"), ("c", "Nope")])
+    assert results == {"a": True, "b": True, "c": "Status 'Nope' not found in project options."}
+    mock_gql.assert_called_once()
+    variables = mock_gql.call_args[0][1]
+    assert variables["value0"] == {"singleSelectOptionId": "opt2"}
+    assert variables["value1"] == {"singleSelectOptionId": "opt1"}
+
+# --- Tests for iter_project_items ---
+
+def items_page(numbers, has_next, cursor=None, total=3):
+    nodes = [{"id": f"item{n}", "type": "ISSUE", "isArchived": n == 0, "status": {"name": "Done"}, "priority": None,
+              "content": {"number": n, "title": f"Issue {n}", "state": "OPEN", "url": f"u{n}"}} for n in numbers]
+    return {"data": {"node": {"items": {"totalCount": total, "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+                                        "nodes": nodes}}}}
+
+@patch("project_utils.gql_request")
+def test_iter_project_items_follows_cursor(mock_gql):
+    mock_gql.side_effect = [items_page([0, 1], True, "c1"), items_page([2, 3], False)]
+    pages = list(iter_project_items("proj123", page_size=2))
+    # Archived items are left out
+    assert [[i['number'] for i in items] for items, _ in pages] == [[1], [2, 3]]
+    assert pages[0][0][0]['status'] == "Done"
+    assert mock_gql.call_args_list[1].args[1] == {"projectId": "proj123", "first": 2, "after": "c1"}
+
+@patch("project_utils.gql_request")
+def test_iter_project_items_prefetches_next_page(mock_gql):
+    second_requested = threading.Event()
+
+    def fetch(query, variables):
+        if variables["after"]:
+            second_requested.set()
+            return items_page([2], False)
+        return items_page([1], True, "c1")
+
+    mock_gql.side_effect = fetch
+    pages = iter_project_items("proj123")
+    next(pages)
+    # The next page is requested while the caller still holds the first one
+    assert second_requested.wait(timeout=5)
+    assert [i['number'] for i in next(pages)[0]] == [2]
+
+@patch("project_utils.gql_request")
+def test_iter_project_items_raises_fetch_errors(mock_gql):
+    mock_gql.side_effect = [items_page([1], True, "c1"), GraphQLError("Query failed: boom")]
+    pages = iter_project_items("proj123")
+    next(pages)
+    with pytest.raises(GraphQLError, match="boom"):
+        next(pages)
@@ -0,0 +1,148 @@
+import pytest
+from unittest.mock import MagicMock
+import sys
+import os
+import json
+import threading
+
+import requests
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+from rate_limit import RateLimitScheduler, is_content_creating, _resource
+
+# --- Fixtures ---
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def scheduler(clock):
+    return RateLimitScheduler(sleep=clock.sleep, clock=clock.time)
+
+def make_response(status=200, headers=None, text=""):
+    res = MagicMock()
+    res.status_code = status
+    res.headers = requests.structures.CaseInsensitiveDict(headers or {})
+    res.text = text
+    return res
+
+def limit_headers(remaining, reset, resource="core"):
+    return {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": str(reset),
+            "X-RateLimit-Limit": "5000", "X-RateLimit-Resource": resource}
+
+# --- Tests for primary limit pacing ---
+
+def test_no_pacing_with_plenty_left(scheduler, clock):
+    scheduler.record(limit_headers(4000, clock.now + 600))
+    scheduler.pace("core")
+    assert clock.sleeps == []
+
+def test_pacing_spreads_low_budget(scheduler, clock):
+    scheduler.record(limit_headers(10, clock.now + 100))
+    scheduler.pace("core")
+    assert clock.sleeps == [pytest.approx(10.0)]
+    assert scheduler.throttled_seconds == pytest.approx(10.0)
+
+def test_pacing_waits_for_reset_when_exhausted(scheduler, clock):
+    scheduler.record(limit_headers(0, clock.now + 30, resource="graphql"))
+    scheduler.pace("core")
+    assert clock.sleeps == []
+    scheduler.pace("graphql")
+    assert clock.sleeps == [pytest.approx(31.0)]
+
+# --- Tests for retries ---
+
+def test_retry_after_is_honored(scheduler, clock):
+    responses = [make_response(403, {"Retry-After": "5"}, "secondary rate limit"), make_response(200)]
+    res = scheduler.run(lambda: responses.pop(0))
+    assert res.status_code == 200
+    assert scheduler.retries == 1
+    assert 5 <= clock.sleeps[0] <= 6
+
+def test_secondary_limit_backs_off_exponentially(clock):
+    scheduler = RateLimitScheduler(secondary_wait=10, sleep=clock.sleep, clock=clock.time)
+    responses = [make_response(403, text="You have exceeded a secondary rate limit")] * 2 + [make_response(201)]
+    res = scheduler.run(lambda: responses.pop(0))
+    assert res.status_code == 201
+    assert 10 <= clock.sleeps[0] <= 12.5
+    assert 20 <= clock.sleeps[1] <= 25
+
+def test_graphql_rate_limited_error_is_retried(scheduler, clock):
+    body = json.dumps({"errors": [{"type": "RATE_LIMITED", "message": "API rate limit exceeded"}]})
+    responses = [make_response(200, text=body), make_response(200, text='{"data": {}}')]
+    res = scheduler.run(lambda: responses.pop(0), resource="graphql")
+    assert res.text == '{"data": {}}'
+    assert scheduler.retries == 1
+
+def test_plain_forbidden_is_not_retried(scheduler, clock):
+    send = MagicMock(return_value=make_response(403, text='{"message": "Resource not accessible"}'))
+    res = scheduler.run(send)
+    assert res.status_code == 403
+    assert send.call_count == 1
+    assert clock.sleeps == []
+
+def test_gives_up_after_max_retries(clock):
+    scheduler = RateLimitScheduler(max_retries=2, sleep=clock.sleep, clock=clock.time)
+    send = MagicMock(return_value=make_response(429))
+    res = scheduler.run(send)
+    assert res.status_code == 429
+    assert send.call_count == 3
+
+# --- Tests for content-creating requests ---
+
+def test_writes_are_spaced(clock):
+    scheduler = RateLimitScheduler(write_interval=1.0, sleep=clock.sleep, clock=clock.time)
+    scheduler.run(lambda: make_response(201), content_creating=True)
+    scheduler.run(lambda: make_response(201), content_creating=True)
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+def test_writes_are_serialized():
+    scheduler = RateLimitScheduler()
+    active = []
+    peak = []
+
+    def send():
+        active.append(1)
+        peak.append(len(active))
+        threading.Event().wait(0.01)
+        active.pop()
+        return make_response(201)
+
+    threads = [threading.Thread(target=scheduler.run, args=(send,), kwargs={"content_creating": True})
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(peak) == 1
+
+def test_is_content_creating():
+    post = requests.Request("POST", "https://api.github.com/repos/o/r/issues", json={}).prepare()
+    get = requests.Request("GET", "https://api.github.com/repos/o/r/issues").prepare()
+    mutation = requests.Request("POST", "https://api.github.com/graphql",
+                                json={"query": "mutation { a }"}).prepare()
+    query = requests.Request("POST", "https://api.github.com/graphql", json={"query": "query { a }"}).prepare()
+    assert is_content_creating(post)
+    assert not is_content_creating(get)
+    assert is_content_creating(mutation)
+    assert not is_content_creating(query)
+
+def test_resource():
+    assert _resource("https://api.github.com/graphql") == "graphql"
+    assert _resource("https://api.github.com/search/issues?q=x") == "search"
+    assert _resource("https://api.github.com/repos/o/r") == "core"
@@ -0,0 +1,78 @@
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+from repo_queries import fetch_pull_requests, search_issues
+
+def pr_node(number, **overrides):
+    node = {
+        "id": f"PR_{number}",
+        "number": number,
+        "title": f"PR {number}",
+        "url": f"https://github.com/o/r/pull/{number}",
+        "body": "Fixes #1",
+        "state": "OPEN",
+        "merged": False,
+        "mergeable": "MERGEABLE",
+        "reviewDecision": "REVIEW_REQUIRED",
+        "headRefName": f"feat/{number}",
+        "baseRefName": "main",
+        "author": {"login": "dev"},
+        "latestReviews": {"nodes": []},
+    }
+    node.update(overrides)
+    return node
+
+def page(nodes, has_next=False, cursor=None):
+    return {"data": {"repository": {"pullRequests": {
+        "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+        "nodes": nodes
+    }}}}
+
+@patch("repo_queries.gql_request")
+def test_fetch_pull_requests_paginates(mock_gql):
+    mock_gql.side_effect = [
+        page([pr_node(3), pr_node(2)], has_next=True, cursor="c1"),
+        page([pr_node(1)]),
+    ]
+    prs = fetch_pull_requests("owner/repo", state="open", page_size=2)
+    assert [p["number"] for p in prs] == [3, 2, 1]
+    assert mock_gql.call_count == 2
+    first_vars = mock_gql.call_args_list[0][0][1]
+    assert first_vars["owner"] == "owner" and first_vars["name"] == "repo"
+    assert first_vars["states"] == ["OPEN"] and first_vars["after"] is None
+    assert mock_gql.call_args_list[1][0][1]["after"] == "c1"
+
+@patch("repo_queries.gql_request")
+def test_fetch_pull_requests_normalizes(mock_gql):
+    mock_gql.return_value = page([
+        pr_node(1, reviewDecision="APPROVED"),
+        pr_node(2, reviewDecision=None, latestReviews={"nodes": [{"state": "CHANGES_REQUESTED"}]}, mergeable="CONFLICTING"),
+        pr_node(3, reviewDecision=None, mergeable="UNKNOWN", state="MERGED", merged=True, author=None),
+    ])
+    one, two, three = fetch_pull_requests("owner/repo", state="all")
+    assert mock_gql.call_args[0][1]["states"] is None
+    assert one["review_state"] == "APPROVED" and one["mergeable"] is True
+    assert two["review_state"] == "CHANGES_REQUESTED" and two["mergeable"] is False
+    assert three["review_state"] == "PENDING" and three["mergeable"] is None
+    assert three["state"] == "closed" and three["merged"] is True
+    assert three["author"] == "ghost"
+
+@patch("repo_queries.gql_request")
+def test_search_issues_scopes_query_and_paginates(mock_gql):
+    def search(nodes, has_next=False):
+        return {"data": {"search": {"issueCount": 3, "pageInfo": {"hasNextPage": has_next, "endCursor": "c1"},
+                                    "nodes": nodes}}}
+    mock_gql.side_effect = [search([{"id": "I_1", "number": 1, "title": "a"}, {}], has_next=True),
+                            search([{"id": "I_2", "number": 2, "title": "b"}])]
+    issues, total = search_issues("o/r", 'milestone:"v1"')
+    # Non-issue results come back as empty objects
+    assert [i['number'] for i in issues] == [1, 2]
+    assert total == 3
+    first = mock_gql.call_args_list[0].args[1]
+    assert first["q"] == 'repo:o/r is:issue is:open milestone:"v1"'
+    assert mock_gql.call_args_list[1].args[1]["after"] == "c1"
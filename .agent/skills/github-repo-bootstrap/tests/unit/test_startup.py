@@ -0,0 +1,79 @@
+import pytest
+import sys
+import os
+import subprocess
+import importlib.util
+
+# Add scripts directory to path
+SCRIPTS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts'))
+sys.path.append(SCRIPTS_DIR)
+
+CLI = os.path.join(SCRIPTS_DIR, "gh-skill.py")
+
+# Import time the dispatcher may add on top of interpreter startup for `version`/`help`;
+# only enforced with GH_SKILL_BENCH=1, wall-clock checks are noisy on a loaded machine
+STARTUP_BUDGET_MS = 15
+BENCH_ENABLED = bool(os.getenv("GH_SKILL_BENCH"))
+HEAVY_MODULES = {"rich", "questionary", "github", "yaml", "requests"}
+
+def load_cli():
+    spec = importlib.util.spec_from_file_location("gh_skill", CLI)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def import_profile(*args):
+    """Run the CLI under -X importtime.
+
+    Returns ({top-level module: cumulative us}, all module names) for imports after site.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", CLI, *args],
+                            capture_output=True, text=True, cwd=SCRIPTS_DIR, check=True)
+    modules, names = {}, set()
+    after_site = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line[12:]:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        if name.strip() == "site" and not name.startswith("  "):
+            after_site = True
+            continue
+        if not after_site:
+            continue
+        names.add(name.strip())
+        # Nested imports are indented and already counted in their parent's cumulative time
+        if not name.startswith("  "):
+            modules[name.strip()] = int(cumulative)
+    return modules, names
+
+# --- Tests for the registry ---
+
+def test_every_command_resolves():
+    cli = load_cli()
+    for command, info in cli.COMMANDS.items():
+        if info["module"] is None:
+            continue
+        assert callable(cli.resolve_command(command)), command
+
+def test_run_command_passes_arguments(monkeypatch):
+    cli = load_cli()
+    seen = {}
+    monkeypatch.setattr(cli, "resolve_command", lambda command: lambda: seen.setdefault("argv", list(sys.argv)))
+    cli.run_command("list-issues", ["--refresh"])
+    assert seen["argv"] == ["list_issues.py", "--refresh"]
+
+# --- Benchmark ---
+
+@pytest.mark.parametrize("args", [("version",), ("help",)])
+def test_startup_skips_heavy_imports(args):
+    _, names = import_profile(*args)
+    assert not HEAVY_MODULES & {m.split(".")[0] for m in names}
+
+@pytest.mark.skipif(not BENCH_ENABLED, reason="startup budget runs with GH_SKILL_BENCH=1")
+@pytest.mark.parametrize("args", [("version",), ("help",)])
+def test_startup_budget(args):
+    modules, _ = import_profile(*args)
+    total_ms = sum(modules.values()) / 1000
+    assert total_ms < STARTUP_BUDGET_MS, f"gh-skill {' '.join(args)} imports took {total_ms:.1f} ms"
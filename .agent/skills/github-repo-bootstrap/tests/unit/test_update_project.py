@@ -0,0 +1,90 @@
+import pytest
+from unittest.mock import patch, MagicMock
+import sys
+import os
+import argparse
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+import update_project
+from update_project import select_items, project_option, plan_actions, item_outcome
+from action_queue import ActionQueue
+from local_store import Item
+
+# --- Fixtures ---
+
+def make_item(number, labels=(), assignees=(), title="Fix things"):
+    return Item(number, f"I_{number}", "issue", title, "open", "me", "", "", list(labels), list(assignees))
+
+ITEMS = [
+    make_item(1, ["type:bug", "status:ready"], ["alice"], title="Crash on start"),
+    make_item(2, ["type:bug", "status:backlog"]),
+    make_item(3, ["type:docs", "status:ready"], ["bob"], title="Docs for start"),
+]
+
+def filters(**kwargs):
+    defaults = {"with_label": None, "with_assignee": None, "with_status": None, "match": None}
+    return argparse.Namespace(**{**defaults, **kwargs})
+
+@pytest.fixture
+def queue(tmp_path):
+    return ActionQueue("owner/repo", path=tmp_path / "queue.jsonl")
+
+# --- Tests for selection ---
+
+def test_select_items_combines_filters():
+    assert [i.number for i in select_items(ITEMS, filters(with_label=["type:bug"]))] == [1, 2]
+    assert [i.number for i in select_items(ITEMS, filters(with_status="status:ready", match="START"))] == [1, 3]
+    assert [i.number for i in select_items(ITEMS, filters(with_assignee="none"))] == [2]
+    assert [i.number for i in select_items(ITEMS, filters(with_label=["type:bug"], with_assignee="alice"))] == [1]
+
+# --- Tests for planning ---
+
+def test_project_option_matches_field_options():
+    assert project_option("status:in-progress") == "in progress"
+    assert project_option("p1") == "p1"
+
+def test_status_change_writes_label_and_project_field(queue):
+    actions, local, _ = plan_actions(queue, ITEMS[0], "Status", "status:in-progress", "Board")
+    assert [a['op'] for a in actions] == ["set_labels", "project_field"]
+    assert local == {"labels": ["type:bug", "status:in-progress"]}
+    assert actions[1]['args'] == {"content_id": "I_1", "field": "Status", "value": "in progress", "project_title": "Board"}
+    # Without a project only the label changes
+    actions, _, _ = plan_actions(queue, ITEMS[0], "Priority", "p0", None)
+    assert [a['op'] for a in actions] == ["set_labels"]
+
+def test_item_outcome_reports_first_error():
+    actions = [{"id": "a"}, {"id": "b"}]
+    assert item_outcome(actions, {"a": True, "b": True}) is True
+    assert item_outcome(actions, {"a": True, "b": "queued"}) == "queued"
+    assert item_outcome(actions, {"a": "queued", "b": "Field not found."}) == "Field not found."
+    # A label change counts even when the item is not on the board
+    assert item_outcome(actions, {"a": True, "b": "skipped"}) is True
+    assert item_outcome(actions, {"a": "skipped", "b": "skipped"}) == "skipped"
+
+# --- Tests for main ---
+
+@patch("update_project.submit")
+@patch("update_project.open_store")
+@patch("update_project.get_current_repo")
+@patch("update_project.get_github_client")
+def test_bulk_update_sends_one_batch_and_reports(mock_client, mock_repo, mock_store, mock_submit, queue, capsys):
+    store = mock_store.return_value
+    store.repo_full_name = "owner/repo"
+    store.items.return_value = ITEMS
+
+    def submit(queue, actions, g, repo, offline, workers):
+        # The label of #2 fails; everything else goes through
+        return {a['id']: "Not Found" if a['args'].get('number') == 2 else True for a in actions}
+
+    mock_submit.side_effect = submit
+    with patch("update_project.ActionQueue", return_value=queue), pytest.raises(SystemExit) as e:
+        update_project.main(["--with-label", "type:bug", "--status", "status:done", "--no-input", "--yes", "--workers", "3"])
+    assert e.value.code == 1
+    mock_submit.assert_called_once()
+    assert len(mock_submit.call_args.args[1]) == 4
+    store.patch.assert_called_once_with(1, labels=["type:bug", "status:done"])
+    out = capsys.readouterr().out
+    assert "2 item(s), 1 failed" in out
+    assert "items/s, 3 workers" in out
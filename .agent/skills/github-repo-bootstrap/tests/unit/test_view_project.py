@@ -0,0 +1,46 @@
+import pytest
+from unittest.mock import patch
+import sys
+import os
+import argparse
+
+# Add scripts directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../scripts')))
+
+import view_project
+from view_project import Board, NO_STATUS
+
+# --- Fixtures ---
+
+def item(number, status, priority=None, kind="ISSUE"):
+    return {"id": f"item{number}", "type": kind, "number": number, "title": f"Issue {number}",
+            "state": "OPEN", "url": None, "status": status, "priority": priority}
+
+# --- Tests for Board ---
+
+def test_board_columns_keep_config_order():
+    board = Board(["Backlog", "Ready", "Done"], ["P0", "P1"])
+    board.add([item(1, "Done"), item(2, None), item(3, "Blocked")])
+    board.add([item(4, "Done")])
+    assert board.loaded == 4
+    headers = [c.header for c in board.render().columns]
+    assert headers == ["Backlog (0)", "Ready (0)", "Done (2)", "Blocked (1)", f"{NO_STATUS} (1)"]
+
+def test_board_ranks_by_priority_and_limits_rows():
+    board = Board(["Ready"], ["P0", "P1"], limit=2)
+    board.add([item(1, "Ready"), item(2, "Ready", "P1"), item(3, "Ready", "P0")])
+    cells = list(board.render().columns[0].cells)
+    assert "#3" in cells[0] and "#2" in cells[1]
+    assert cells[2] == "[dim]... 1 more[/]"
+
+def test_show_project_board_streams_pages(monkeypatch):
+    pages = [([item(1, "Ready")], 2), ([item(2, "Done", kind="PULL_REQUEST")], 2)]
+    renders = []
+    original = Board.render
+    monkeypatch.setattr(Board, "render", lambda self, caption=None: renders.append(caption) or original(self, caption))
+    with patch("project_utils.iter_project_items", return_value=iter(pages)) as items:
+        view_project.show_project_board("P_1", argparse.Namespace(limit=5, page_size=50))
+    items.assert_called_once_with("P_1", page_size=50)
+    # One redraw per page, then the summary
+    assert renders[1:3] == ["Loaded 1 of 2 items...", "Loaded 2 of 2 items..."]
+    assert renders[-1].startswith("2 items · 2 page(s)")